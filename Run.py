@@ -1,91 +1,77 @@
 import sys
 import os
+import multiprocessing
 os.environ['NUMBA_THREADING_LAYER'] = 'workqueue'
-from tools.cli_utils import get_argument_parser
 import logging
 _itk_log = logging.getLogger("IsotopeTrack.Run")
 
-cli_parser = get_argument_parser()
-if __name__ == '__main__':
-    cli_parser.parse_args()
-
-
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QIcon
-from PySide6.QtCore import Qt, QEvent, QCoreApplication
-
-QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
-
-from tools.render_settings import cluster_gpu_enabled
-
-if not cluster_gpu_enabled():
-    _chromium_flags = os.environ.get("QTWEBENGINE_CHROMIUM_FLAGS", "")
-    if "--disable-gpu" not in _chromium_flags:
-        os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = (
-            _chromium_flags + " --disable-gpu").strip()
-
-from tools.splash_screen import SplashCoordinator
-from utils.pyqtgraph_patches import apply_pyqtgraph_patches
-from utils.file_dialog_memory import install_file_dialog_memory
-from mainwindow import MainWindow
-
-apply_pyqtgraph_patches()
-install_file_dialog_memory()
-
-
-class IsotopeTrackApplication(QApplication):
-    """QApplication that handles the macOS 'open document' event.
-
-    When a .itproj file is double-clicked in Finder while IsotopeTrack is already
-    running, macOS delivers a QFileOpenEvent rather than a command-line argument.
-    This routes that file to an open window — or queues it until one exists. A
-    cold launch is handled separately by ``argv_emulation`` plus the CLI parser.
-    """
-
-    def __init__(self, argv):
-        super().__init__(argv)
-        self._pending_open_files = []
-
-    def event(self, e):
-        if e.type() == QEvent.Type.FileOpen:
+# Detection worker processes are started with 'spawn' and import this module
+# as __mp_main__. Keep everything above main() to the standard library: the
+# GUI imports and their side effects happen in main(), so a worker loads only
+# what its detection work needs.
+
+
+def _application_class():
+    """Return the QApplication subclass; Qt is imported on first call."""
+    from PySide6.QtCore import QEvent
+    from PySide6.QtWidgets import QApplication
+
+    class IsotopeTrackApplication(QApplication):
+        """QApplication that handles the macOS 'open document' event.
+
+        When a .itproj file is double-clicked in Finder while IsotopeTrack is already
+        running, macOS delivers a QFileOpenEvent rather than a command-line argument.
+        This routes that file to an open window — or queues it until one exists. A
+        cold launch is handled separately by ``argv_emulation`` plus the CLI parser.
+        """
+
+        def __init__(self, argv):
+            super().__init__(argv)
+            self._pending_open_files = []
+
+        def event(self, e):
+            if e.type() == QEvent.Type.FileOpen:
+                try:
+                    path = e.file()
+                except Exception:
+                    path = ""
+                if path:
+                    if not self._dispatch_open(path):
+                        self._pending_open_files.append(path)
+                return True
+            return super().event(e)
+
+        def _dispatch_open(self, path):
+            """Load ``path`` into a visible window. Returns False if none exists yet."""
+            windows = list(getattr(self, 'main_windows', []) or [])
+            target = None
+            for w in windows:
+                try:
+                    if w.isVisible():
+                        target = w
+                        break
+                except RuntimeError:
+                    continue
+            if target is None and windows:
+                target = windows[-1]
+            if target is None:
+                return False
             try:
-                path = e.file()
+                target.load_project(filepath=path)
+                target.raise_()
+                target.activateWindow()
             except Exception:
-                path = ""
-            if path:
-                if not self._dispatch_open(path):
-                    self._pending_open_files.append(path)
-            return True
-        return super().event(e)
-
-    def _dispatch_open(self, path):
-        """Load ``path`` into a visible window. Returns False if none exists yet."""
-        windows = list(getattr(self, 'main_windows', []) or [])
-        target = None
-        for w in windows:
-            try:
-                if w.isVisible():
-                    target = w
-                    break
-            except RuntimeError:
-                continue
-        if target is None and windows:
-            target = windows[-1]
-        if target is None:
-            return False
-        try:
-            target.load_project(filepath=path)
-            target.raise_()
-            target.activateWindow()
-        except Exception:
-            _itk_log.exception("Could not open project file %s", path)
-        return True  
+                _itk_log.exception("Could not open project file %s", path)
+            return True  
+
+        def flush_pending_opens(self):
+            """Load any open requests that arrived before a window existed."""
+            pending, self._pending_open_files = self._pending_open_files, []
+            for path in pending:
+                self._dispatch_open(path)
+
+    return IsotopeTrackApplication
 
-    def flush_pending_opens(self):
-        """Load any open requests that arrived before a window existed."""
-        pending, self._pending_open_files = self._pending_open_files, []
-        for path in pending:
-            self._dispatch_open(path)
 
 def resource_path(relative_path):
     """Get absolute path to resource — works for dev and PyInstaller."""
@@ -94,19 +80,51 @@ def resource_path(relative_path):
     return os.path.join(os.path.abspath("."), relative_path)
 
 
-if __name__ == "__main__":
+def main():
     """
     Main application entry point.
 
-    Creates QApplication instance, initializes MainWindow, and starts event loop.
+    Parses the command line, imports the GUI, creates the QApplication and
+    MainWindow, and runs the event loop.
     """
-    app = IsotopeTrackApplication(sys.argv)
+    from tools.cli_utils import get_argument_parser
+    cli_parser = get_argument_parser()
+    cli_parser.parse_args()
+
+    from PySide6.QtGui import QIcon
+    from PySide6.QtCore import Qt, QCoreApplication
+
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+
+    from tools.render_settings import cluster_gpu_enabled
+
+    if not cluster_gpu_enabled():
+        _chromium_flags = os.environ.get("QTWEBENGINE_CHROMIUM_FLAGS", "")
+        if "--disable-gpu" not in _chromium_flags:
+            os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = (
+                _chromium_flags + " --disable-gpu").strip()
+
+    from tools.splash_screen import SplashCoordinator
+    from utils.pyqtgraph_patches import apply_pyqtgraph_patches
+    from utils.file_dialog_memory import install_file_dialog_memory
+    from mainwindow import MainWindow
+
+    apply_pyqtgraph_patches()
+    install_file_dialog_memory()
+
+    app = _application_class()(sys.argv)
     app.setAttribute(Qt.AA_DontShowIconsInMenus, False)
     app.setQuitOnLastWindowClosed(True)
     app.main_windows = []
 
     app.setWindowIcon(QIcon(resource_path("images/isotrack_icon.ico")))
 
+    try:
+        from processing.threshold_cache import enable_persistence
+        enable_persistence()
+    except Exception:
+        _itk_log.exception("Handled exception in main")
+
     coordinator = SplashCoordinator(main_window_class=MainWindow, cli_parser=cli_parser)
     coordinator.start()
 
@@ -116,9 +134,21 @@ if __name__ == "__main__":
         try:
             w.close()
         except Exception:
-            _itk_log.exception("Handled exception in <module>")
+            _itk_log.exception("Handled exception in main")
     app.main_windows.clear()
 
+    try:
+        from processing.detection_pool import shutdown_detection_pool
+        shutdown_detection_pool()
+    except Exception:
+        _itk_log.exception("Handled exception in main")
+
+    try:
+        from processing.threshold_cache import save_shared_cache
+        save_shared_cache()
+    except Exception:
+        _itk_log.exception("Handled exception in main")
+
     try:
         from joblib.externals.loky import get_reusable_executor
         get_reusable_executor().shutdown(wait=True)
@@ -130,4 +160,12 @@ if __name__ == "__main__":
         sys.stdout.flush()
     if sys.stderr is not None:
         sys.stderr.flush()
-    os._exit(exit_code if isinstance(exit_code, int) else 0)
\ No newline at end of file
+    os._exit(exit_code if isinstance(exit_code, int) else 0)
+
+
+if __name__ == "__main__":
+    # In the packaged app, detection worker processes start this executable
+    # again; hand them off before the command line is parsed or the GUI is
+    # imported.
+    multiprocessing.freeze_support()
+    main()
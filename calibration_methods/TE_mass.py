@@ -2863,7 +2863,7 @@ class MassMethodWidget(QMainWindow):
         
         for folder in folders:
             try:
-                masses, _, _ = loading.vitesse_loading.read_nu_directory(folder, max_integ_files=1)
+                masses = loading.vitesse_loading.probe_nu_directory(folder)["masses"]
                 
                 if len(masses) == len(self.all_masses):
                     mass_differences = np.abs(masses - self.all_masses)
@@ -4384,7 +4384,7 @@ class IonicCalibrationWindow(QMainWindow):
             QApplication.processEvents()
             
             try:
-                masses, _, _ = loading.vitesse_loading.read_nu_directory(folder)
+                masses = loading.vitesse_loading.probe_nu_directory(folder)["masses"]
 
                 mismatch_msg = None
 
@@ -1,21 +1,25 @@
 from __future__ import annotations
 
+import importlib.util
+import itertools
+import multiprocessing
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 import pandas as pd
-from PySide6.QtCore import Qt, QTimer, Signal, QThread
+from PySide6.QtCore import Qt, QSettings, QTimer, Signal, QThread
 from PySide6.QtGui import QColor, QKeySequence, QShortcut
 from PySide6.QtWidgets import (
     QAbstractScrollArea, QApplication, QComboBox, QDialog, QDoubleSpinBox,
     QGridLayout,
     QGroupBox, QHBoxLayout, QHeaderView, QLabel, QLineEdit, QListWidget,
     QListWidgetItem, QMenu, QMessageBox, QPushButton, QRadioButton,
-    QButtonGroup, QSizePolicy, QSplitter, QTableView, QToolButton,
+    QButtonGroup, QSizePolicy, QSpinBox, QSplitter, QTableView, QToolButton,
     QVBoxLayout, QWidget,
 )
 
@@ -31,8 +35,10 @@ from loading.csv.exclusions import (
 )
 from loading.csv.file_list import THUMB_ROWS, FileListPanel
 from loading.csv.profiles import (
-    ImportProfile, clear_profiles, load_profiles, save_profile,
+    ImportProfile, clear_profiles, import_cache_settings, load_profiles,
+    save_profile,
 )
+import loading.run_cache
 import logging
 _itk_log = logging.getLogger("IsotopeTrack.loading.csv.dialog")
 
@@ -44,6 +50,16 @@ _itk_log = logging.getLogger("IsotopeTrack.loading.csv.dialog")
 PREVIEW_MAX_ROWS = INITIAL_VISIBLE_ROWS
 
 
+def _available_csv_engines() -> tuple[str, ...]:
+    """Return the typed-read parser engines to try, fastest first."""
+    if importlib.util.find_spec('pyarrow') is None:
+        return ('c',)
+    return ('pyarrow', 'c')
+
+
+_FAST_CSV_ENGINES = _available_csv_engines()
+
+
 _ISOTOPE_RE = re.compile(
     r'(?:Mass[_\s]*|M(?=\d))?'
     r'(?:(\d{1,3})[_\-\s\[\]]*([A-Z][a-z]?)'
@@ -774,43 +790,253 @@ class ApplyTargetsDialog(QDialog):
 # Data-processing thread (unchanged public API; light internal cleanup)
 # ---------------------------------------------------------------------------
 
+EXCEL_BLOCK_ROWS = 4096
+DEFAULT_CHUNK_ROWS = 250_000
+SETTINGS_CHUNK_ROWS = "csv_import/chunk_rows"
+
+
+def estimate_row_count(path, sample_bytes: int = 1 << 20) -> int:
+    """Estimate the number of lines in a text file from its first megabyte.
+
+    Args:
+        path (str | Path): File to look at.
+        sample_bytes (int): Bytes read to measure the average line length.
+
+    Returns:
+        int: Approximate line count, 0 if the file cannot be read.
+    """
+    try:
+        size = Path(path).stat().st_size
+        with open(path, 'rb') as fp:
+            head = fp.read(sample_bytes)
+    except OSError:
+        return 0
+    lines = head.count(b'\n')
+    if len(head) >= size:
+        return lines + (1 if head and not head.endswith(b'\n') else 0)
+    return int(size * max(lines, 1) / max(len(head), 1))
+
+
+def estimate_import_peak_bytes(rows: int, signal_columns: int, time_column: bool,
+                               chunk_rows: int, file_columns: int) -> int:
+    """Estimate the peak memory of a chunked delimited import.
+
+    The result arrays are counted twice, for the copy made when a buffer
+    outgrows its size estimate, plus one parsed block of the file.
+
+    Args:
+        rows (int): Expected data rows.
+        signal_columns (int): Isotope columns kept (float32).
+        time_column (bool): Whether a time column is kept (float64).
+        chunk_rows (int): Rows parsed per block.
+        file_columns (int): Columns the parser tokenises in each block.
+
+    Returns:
+        int: Estimated peak in bytes.
+    """
+    row_bytes = 4 * signal_columns + (8 if time_column else 0)
+    block = min(rows, chunk_rows) * (row_bytes + 16 * max(file_columns, 1))
+    return 2 * rows * row_bytes + block
+
+
+class _ColumnBuffer:
+    """Per-column arrays that grow by doubling as row blocks are appended.
+
+    Memory is the final arrays plus, while a buffer outgrows its capacity,
+    one copy of them; the buffer is trimmed in place when it is handed out.
+    """
+
+    def __init__(self, names, dtypes, capacity: int = 0):
+        self.names = list(names)
+        self.dtypes = list(dtypes)
+        self.rows = 0
+        self._arrays = [np.empty(max(int(capacity), 1), dtype=dt) for dt in self.dtypes]
+
+    @property
+    def capacity(self) -> int:
+        return len(self._arrays[0])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in self._arrays)
+
+    def append(self, columns) -> None:
+        """Append one block; ``columns`` holds one 1D array per name, equal lengths."""
+        n = len(columns[0])
+        end = self.rows + n
+        if end > self.capacity:
+            capacity = max(2 * self.capacity, end)
+            for i, old in enumerate(self._arrays):
+                grown = np.empty(capacity, dtype=old.dtype)
+                grown[:self.rows] = old[:self.rows]
+                self._arrays[i] = grown
+        for array, values in zip(self._arrays, columns):
+            array[self.rows:end] = values
+        self.rows = end
+
+    def frame(self) -> pd.DataFrame:
+        """Return the rows appended so far as a frame sharing the buffers."""
+        for i, array in enumerate(self._arrays):
+            if array.size != self.rows:
+                try:
+                    array.resize(self.rows, refcheck=False)
+                except ValueError:
+                    self._arrays[i] = array[:self.rows].copy()
+        return pd.DataFrame(dict(zip(self.names, self._arrays)), copy=False)
+
+
+class ImportCancelled(Exception):
+    """Raised inside a file read when the import was asked to stop."""
+
+
+def _cell_to_float(value) -> float:
+    """Return a worksheet cell as a number, or NaN if it does not hold one."""
+    if value is None or isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _cells_to_floats(block: list[tuple]) -> np.ndarray:
+    """Convert rows of worksheet values to a float64 array, NaN where not numeric.
+
+    A block of plain numbers and blanks converts in one call; only a block
+    holding text (a footer, a note) goes cell by cell.
+    """
+    try:
+        return np.array(block, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array([[_cell_to_float(v) for v in row] for row in block],
+                        dtype=np.float64)
+
+
+def _column_floats(series: pd.Series) -> pd.Series | None:
+    """Return a block column as numbers, or None if a filled cell is not one."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    values = pd.to_numeric(series, errors='coerce')
+    if (values.isna() & series.notna()).any():
+        return None
+    return values
+
+
+def _holds_numbers(block: pd.DataFrame) -> bool:
+    """Return True if any cell of ``block`` holds a number."""
+    for column in block.columns:
+        series = block[column]
+        if not pd.api.types.is_numeric_dtype(series):
+            series = pd.to_numeric(series.astype(str).str.strip(), errors='coerce')
+        if series.notna().any():
+            return True
+    return False
+
+
 class DataProcessThread(QThread):
-    """Worker thread that loads CSV/TXT/Excel files per the import config."""
+    """Worker thread that loads CSV/TXT/Excel files per the import config.
+
+    Files are independent samples, so several are parsed at once on a small
+    thread pool (pandas' C parser does its tokenising without the GIL).
+    Samples are still delivered through ``finished`` in the order of
+    ``config['files']``, whichever file completes first; ``file_progress``
+    reports each file as it completes.
+
+    Worksheets are streamed row by row into arrays; ``rows_read`` reports
+    (file index, rows read, rows expected) while that happens. Delimited
+    files read in blocks report rows the same way, and ``memory_peak``
+    reports (file index, MB) once each is read: an estimate of the peak,
+    counted from the arrays and the largest parsed block, not measured.
+
+    When the run cache is enabled, each processed sample is kept there keyed
+    on the file's content and import profile, so importing the same file
+    the same way again skips parsing altogether.
+    """
 
     progress = Signal(int)
+    file_progress = Signal(int, int, str)
+    rows_read = Signal(int, int, int)
+    memory_peak = Signal(int, float)
     finished = Signal(object, object, object, str, str)
     error    = Signal(str)
 
-    def __init__(self, config, parent=None):
+    def __init__(self, config, parent=None, max_workers=None):
+        """
+        Args:
+            config (dict): Import config from the structure dialog.
+            parent (QObject | None): Qt parent.
+            max_workers (int | None): Files parsed at once. Falls back to
+                ``config['max_workers']``, then to one less than the CPU count.
+        """
         super().__init__(parent)
         self.config = config
+        self.run_cache = loading.run_cache.default_cache()
+        if max_workers is None:
+            max_workers = config.get('max_workers')
+        if max_workers is None:
+            max_workers = multiprocessing.cpu_count() - 1
+        self.max_workers = max(1, int(max_workers))
 
     def run(self):
         try:
-            total_files = max(1, len(self.config['files']))
-            for file_index, file_config in enumerate(self.config['files']):
-                try:
-                    self.progress.emit(int((file_index / total_files) * 90))
-                    result = self.process_file(file_config, file_index)
-                    if result:
-                        sample_name, sample_data = result
-                        self.finished.emit(
-                            sample_data['signals'],
-                            sample_data['run_info'],
-                            sample_data['time_array'],
-                            sample_name,
-                            sample_data.get('datetime', ''),
-                        )
-                except Exception as e:
-                    _itk_log.exception("Handled exception in run")
-                    self.error.emit(
-                        f"Error processing file {file_config['name']}: {e}")
-                    continue
+            files = self.config['files']
+            total_files = max(1, len(files))
+            workers = max(1, min(self.max_workers, len(files)))
+            self.progress.emit(0)
+
+            ready = {}
+            next_index = 0
+            completed = 0
+            with ThreadPoolExecutor(max_workers=workers,
+                                    thread_name_prefix="csv-import") as pool:
+                futures = {pool.submit(self._process_guarded, file_config, i): i
+                           for i, file_config in enumerate(files)}
+                for future in as_completed(futures):
+                    file_index = futures[future]
+                    if future.cancelled():
+                        ready[file_index] = None
+                    else:
+                        ready[file_index] = future.result()
+                        completed += 1
+                        self.progress.emit(int((completed / total_files) * 90))
+                        self.file_progress.emit(
+                            completed, len(files), files[file_index].get('name', ''))
+
+                    while next_index in ready:
+                        self._emit_sample(ready.pop(next_index))
+                        next_index += 1
+
+                    if self.isInterruptionRequested():
+                        for pending in futures:
+                            pending.cancel()
             self.progress.emit(100)
         except Exception as e:
             _itk_log.exception("Handled exception in run")
             self.error.emit(f"Data processing error: {e}")
 
+    def _process_guarded(self, file_config, file_index):
+        """Run process_file on a pool thread, reporting any error it lets through."""
+        try:
+            return self.process_file(file_config, file_index)
+        except Exception as e:
+            _itk_log.exception("Handled exception in _process_guarded")
+            self.error.emit(
+                f"Error processing file {file_config['name']}: {e}")
+            return None
+
+    def _emit_sample(self, result):
+        """Deliver one processed file, if it produced a sample."""
+        if not result:
+            return
+        sample_name, sample_data = result
+        self.finished.emit(
+            sample_data['signals'],
+            sample_data['run_info'],
+            sample_data['time_array'],
+            sample_name,
+            sample_data.get('datetime', ''),
+        )
+
     # -- per-file pipeline ------------------------------------------------
 
     def process_file(self, file_config, file_index):
@@ -830,11 +1056,26 @@ class DataProcessThread(QThread):
                 if key in file_config:
                     settings[target] = file_config[key]
             ext = Path(file_path).suffix.lower()
+            sample_name = Path(file_path).stem
+
+            cache_key = self._cache_key(file_path, settings, file_config)
+            if cache_key is not None:
+                cached = self._cached_sample(cache_key, settings, file_path, ext)
+                if cached is not None:
+                    return sample_name, cached
 
             if ext in DELIMITED_EXTS:
-                df = self._load_delimited(file_path, settings)
+                df = self._load_delimited_columns(
+                    file_path, settings, self._wanted_columns(file_config, settings),
+                    file_index)
+                if df is None:
+                    df = self._load_delimited(file_path, settings)
             elif ext in EXCEL_EXTS:
-                df = self._load_excel(file_path, settings)
+                df = self._load_excel_columns(
+                    file_path, settings, self._wanted_columns(file_config, settings),
+                    file_index)
+                if df is None:
+                    df = self._load_excel(file_path, settings)
             else:
                 raise ValueError(f"Unsupported file format: {ext}")
 
@@ -848,11 +1089,12 @@ class DataProcessThread(QThread):
                     "Every row was removed from this file; "
                     "restore some rows before importing.")
 
-            sample_name = Path(file_path).stem
             time_array, final_dwell = self._process_time(df, settings)
             signals = self._process_isotopes(
                 df, file_config['mappings'], settings, final_dwell)
             run_info = self._run_info(df, settings, file_path, final_dwell, ext)
+            if cache_key is not None:
+                self._store_sample(cache_key, time_array, signals, final_dwell)
 
             return sample_name, {
                 'signals': signals,
@@ -860,11 +1102,66 @@ class DataProcessThread(QThread):
                 'run_info': run_info,
                 'datetime': '',
             }
+        except ImportCancelled:
+            _itk_log.info(f"Import of {file_path} cancelled")
+            return None
         except Exception as e:
             _itk_log.exception("Handled exception in process_file")
             self.error.emit(f"Error processing {file_path}: {e}")
             return None
 
+    # -- convert-once cache ------------------------------------------------
+
+    def _cache_key(self, file_path, settings, file_config):
+        """Return the run-cache key for one file's import, or None if uncached.
+
+        The key is the file's content digest plus its import profile, so the
+        same bytes imported the same way hit the same entry wherever the file
+        now lives.
+        """
+        if self.run_cache is None:
+            return None
+        try:
+            digest = self.run_cache.content_digest(file_path)
+        except OSError:
+            _itk_log.exception("Handled exception in _cache_key")
+            return None
+        return loading.run_cache.content_cache_key(
+            "csv", [digest], import_cache_settings(settings, file_config))
+
+    def _cached_sample(self, key, settings, file_path, ext):
+        """Return a previously imported sample from the run cache, or None.
+
+        Signals come back memory-mapped copy-on-write. The run info is rebuilt
+        rather than stored, so it names the file as it is now.
+        """
+        hit = self.run_cache.get(key)
+        if hit is None:
+            return None
+        arrays, meta = hit
+        try:
+            time_array = arrays['time']
+            signals = {mass: arrays[f"signal_{i}"]
+                       for i, mass in enumerate(meta['masses'])}
+            dwell_s = float(meta['dwell'])
+        except (KeyError, TypeError, ValueError):
+            _itk_log.exception("Handled exception in _cached_sample")
+            return None
+        return {
+            'signals': signals,
+            'time_array': time_array,
+            'run_info': self._run_info(time_array, settings, file_path, dwell_s, ext),
+            'datetime': '',
+        }
+
+    def _store_sample(self, key, time_array, signals, dwell_s):
+        """Keep one processed sample in the run cache."""
+        arrays = {'time': np.asarray(time_array)}
+        for i, data in enumerate(signals.values()):
+            arrays[f"signal_{i}"] = np.asarray(data)
+        self.run_cache.put(
+            key, arrays, {'masses': [float(m) for m in signals], 'dwell': dwell_s})
+
     def _load_delimited(self, file_path, settings):
         """Read a delimited file with the settings the preview showed.
 
@@ -879,6 +1176,17 @@ class DataProcessThread(QThread):
         Returns:
             pandas.DataFrame: The file's data, trimmed at any trailing footer.
         """
+        read_args = self._delimited_read_args(settings)
+        read_args['low_memory'] = False
+        df = pd.read_csv(file_path, **read_args)
+        stop = find_first_stopping_row(df)
+        if stop < len(df):
+            df = df.iloc[:stop].copy()
+        return df
+
+    @staticmethod
+    def _delimited_read_args(settings):
+        """Return the ``pd.read_csv`` arguments shared by both delimited readers."""
         delim = settings['delimiter']
         if delim == "\\t":
             delim = "\t"
@@ -888,7 +1196,6 @@ class DataProcessThread(QThread):
             'header': (settings['header_row']
                        if settings['header_row'] >= 0 else None),
             'encoding': settings['encoding'],
-            'low_memory': False,
         }
         if settings['skip_rows'] > 0:
             read_args['skiprows'] = range(settings['skip_rows'])
@@ -896,20 +1203,169 @@ class DataProcessThread(QThread):
         full_width = settings.get('full_width')
         if width and full_width and full_width > width:
             read_args['usecols'] = list(range(width))
+        return read_args
 
-        df = pd.read_csv(file_path, **read_args)
-        stop = find_first_stopping_row(df)
-        if stop < len(df):
-            df = df.iloc[:stop].copy()
-        return df
+    @staticmethod
+    def _wanted_columns(file_config, settings):
+        """Return the columns the import uses: the time column and every mapped one.
+
+        Args:
+            file_config (dict): Per-file import config.
+            settings (dict): Parse settings for this file.
+
+        Returns:
+            list[str]: Column names in file order of first use, without the
+            columns the user removed.
+        """
+        excluded = {str(c) for c in file_config.get('excluded_columns', ())}
+        wanted = []
+        time_column = settings.get('time_column')
+        if time_column:
+            wanted.append(str(time_column))
+        for mapping in file_config.get('mappings', {}).values():
+            wanted.append(str(mapping['column_name']))
+        return [c for c in dict.fromkeys(wanted) if c not in excluded]
+
+    def _load_delimited_columns(self, file_path, settings, columns, file_index=0):
+        """Read only ``columns`` of a delimited file, parsed straight to floats.
+
+        Isotope columns are stored as float32 and the time column as float64,
+        and nothing outside the kept columns is ever turned into Python
+        objects. The file is parsed in blocks of ``settings['chunk_rows']``
+        rows, each appended straight into per-column arrays sized from an
+        estimate of the row count, so peak memory is a small multiple of the
+        result whatever the size of the file. pyarrow is used instead of
+        pandas' C parser when it is installed and the file fits in one block.
+
+        A block holding text or a row with every kept column blank is checked
+        with find_first_stopping_row, and the data is cut at its stopping row
+        as ``_load_delimited`` would. Only a value that is not a number before
+        that row, or numbers after it, return None; the caller then falls back
+        to ``_load_delimited``, whose rules decide.
+
+        Args:
+            file_path (str): File to read.
+            settings (dict): Parse settings for this file.
+            columns (list[str]): Columns to keep.
+            file_index (int): Position of the file in the batch, for progress.
+
+        Returns:
+            pandas.DataFrame | None: The projected columns, or None if the
+            fast path does not apply to this file.
+
+        Raises:
+            ImportCancelled: If interruption was requested between blocks.
+        """
+        if not columns:
+            return None
+        read_args = self._delimited_read_args(settings)
+        try:
+            header = pd.read_csv(file_path, nrows=0, **read_args).columns
+        except (OSError, ValueError, UnicodeDecodeError):
+            _itk_log.exception("Handled exception in _load_delimited_columns")
+            return None
+        names = [str(c) for c in header]
+        positions = sorted(names.index(c) for c in columns if c in names)
+        if not positions:
+            return None
+        time_column = settings.get('time_column')
+        dtype = {header[p]: (np.float64 if names[p] == time_column else np.float32)
+                 for p in positions}
+
+        chunk_rows = max(1, int(settings.get('chunk_rows') or DEFAULT_CHUNK_ROWS))
+        expected = max(0, estimate_row_count(file_path) - settings['skip_rows'] - 1)
+
+        for engine in _FAST_CSV_ENGINES:
+            # No dtype: a forced float parse would fail on the whole block
+            # that holds a footer. Numeric columns still parse straight to
+            # arrays and are cast as they are appended.
+            args = dict(read_args, usecols=positions, engine=engine)
+            if engine == 'pyarrow':
+                # pyarrow reads the whole file at once; keep it to files that
+                # fit in a single block.
+                if expected > chunk_rows:
+                    continue
+                if 'skiprows' in args:
+                    args['skiprows'] = settings['skip_rows']
+            else:
+                args['chunksize'] = chunk_rows
+            try:
+                return self._read_delimited_blocks(
+                    file_path, args, [header[p] for p in positions],
+                    [dtype[header[p]] for p in positions], expected, file_index)
+            except (ValueError, TypeError, NotImplementedError) as exc:
+                _itk_log.debug(f"Typed {engine} read of {file_path} failed: {exc}")
+                continue
+        return None
+
+    def _read_delimited_blocks(self, file_path, args, names, dtypes, expected,
+                               file_index):
+        """Parse a delimited file block by block into a _ColumnBuffer.
+
+        Args:
+            file_path (str): File to read.
+            args (dict): ``pd.read_csv`` arguments; with ``chunksize`` the file
+                is read in blocks of that many rows, otherwise at once.
+            names (list): Column labels, in file order.
+            dtypes (list): Dtype of each column.
+            expected (int): Estimated data rows, used to size the buffers.
+            file_index (int): Position of the file in the batch, for progress.
+
+        Returns:
+            pandas.DataFrame | None: The columns, cut at the first stopping
+            row, or None if a value before that row is not a number or a
+            number follows it, so the caller's footer rules must decide.
+
+        Raises:
+            ImportCancelled: If interruption was requested between blocks.
+        """
+        buffer = _ColumnBuffer(names, dtypes, capacity=int(expected * 1.02) + 1)
+        peak = 0
+        ended = False
+        if 'chunksize' in args:
+            blocks = pd.read_csv(file_path, **args)
+        else:
+            blocks = iter([pd.read_csv(file_path, **args)])
+        try:
+            for block in blocks:
+                if self.isInterruptionRequested():
+                    raise ImportCancelled(file_path)
+                if ended:
+                    if _holds_numbers(block):
+                        return None
+                    continue
+                values = [block[name] for name in names]
+                if (not all(pd.api.types.is_numeric_dtype(v) for v in values)
+                        or block.isna().all(axis=1).any()):
+                    stop = find_first_stopping_row(block, names)
+                    if stop < len(block):
+                        if _holds_numbers(block.iloc[stop:]):
+                            return None
+                        ended = True
+                    values = [_column_floats(v.iloc[:stop]) for v in values]
+                    if any(v is None for v in values):
+                        return None
+                peak = max(peak, buffer.nbytes
+                           + int(block.memory_usage(index=False).sum()))
+                buffer.append([v.to_numpy() for v in values])
+                peak = max(peak, buffer.nbytes)
+                self.rows_read.emit(file_index, buffer.rows, max(expected, buffer.rows))
+        finally:
+            close = getattr(blocks, 'close', None)
+            if close is not None:
+                close()
+
+        # Counted from the buffers and the largest parsed block, not measured.
+        peak_mb = peak / 1e6
+        _itk_log.info(f"Read {buffer.rows} rows of {file_path} in blocks, "
+                      f"estimated peak {peak_mb:.1f} MB for "
+                      f"{buffer.nbytes / 1e6:.1f} MB of data")
+        self.memory_peak.emit(file_index, peak_mb)
+        return buffer.frame()
 
     def _load_excel(self, file_path, settings):
         """Read a worksheet with the settings the preview showed.
 
-        The reader is imported by name rather than fetched dynamically so that
-        a frozen build can see the dependency without being told about it in
-        the packaging spec.
-
         Args:
             file_path (str): Workbook to read.
             settings (dict): Parse settings for this file.
@@ -917,6 +1373,30 @@ class DataProcessThread(QThread):
         Returns:
             pandas.DataFrame: The sheet's data, trimmed at any trailing footer.
         """
+        read_args = self._excel_read_args(settings)
+        try:
+            df = pd.read_excel(file_path, **read_args)
+        except Exception:
+            _itk_log.exception("Handled exception in _load_excel")
+            df = pd.read_excel(file_path, header=None, engine=read_args['engine'])
+
+        stop = find_first_stopping_row(df)
+        if stop < len(df):
+            df = df.iloc[:stop].copy()
+        return df
+
+    @staticmethod
+    def _excel_read_args(settings):
+        """Return the ``pd.read_excel`` arguments shared by both Excel readers.
+
+        As for delimited files, ``skip_rows`` rows are dropped first and
+        ``header_row`` counts from the row after them. The reader is imported
+        by name rather than fetched dynamically so that a frozen build can see
+        the dependency without being told about it in the packaging spec.
+
+        Raises:
+            ImportError: If openpyxl is not installed.
+        """
         try:
             import openpyxl
         except ImportError:
@@ -924,29 +1404,96 @@ class DataProcessThread(QThread):
                 "openpyxl is required for Excel files. "
                 "Install with: pip install openpyxl")
 
-        sheet_index = max(0, settings.get('sheet_name', 0) or 0)
-        header_row  = settings['header_row'] if settings['header_row'] >= 0 else None
-        skip_rows   = max(0, settings['skip_rows'])
-
-        read_args = {'sheet_name': sheet_index, 'engine': openpyxl.__name__}
+        skip_rows = max(0, settings['skip_rows'])
+        read_args = {
+            'sheet_name': max(0, settings.get('sheet_name', 0) or 0),
+            'engine': openpyxl.__name__,
+            'header': settings['header_row'] if settings['header_row'] >= 0 else None,
+        }
         if skip_rows > 0:
             read_args['skiprows'] = list(range(skip_rows))
-        if header_row is not None:
-            read_args['header'] = (header_row - skip_rows
-                                   if header_row >= skip_rows else None)
-        else:
-            read_args['header'] = None
+        return read_args
+
+    def _load_excel_columns(self, file_path, settings, columns, file_index=0):
+        """Stream only ``columns`` of a worksheet into preallocated float arrays.
+
+        The workbook is opened read-only and walked row by row, so neither
+        openpyxl's cell objects nor a frame of the whole sheet is ever held.
+        Column names are the ones ``_load_excel`` gives the sheet (an empty
+        header cell is "Unnamed: <n>", a repeated name gets a ".1" suffix), so
+        both readers find the same mapped columns.
 
+        The data ends, as in ``_load_excel``, at the first row with no number
+        in any cell: a blank line or a text footer. A row where only the kept
+        columns are empty is data, but whether the whole-sheet rules would end
+        there depends on every column; the streamed read then gives up and the
+        caller falls back to ``_load_excel``. Isotope columns are float32, the
+        time column float64. ``rows_read`` is emitted as the sheet is read,
+        and an interruption request stops the read between blocks of rows.
+
+        Args:
+            file_path (str): Workbook to read.
+            settings (dict): Parse settings for this file.
+            columns (list[str]): Columns to keep.
+            file_index (int): Position of the file in the batch, for progress.
+
+        Returns:
+            pandas.DataFrame | None: The kept columns, or None if the sheet
+            has none of them, has no header row, or needs the whole-sheet read.
+
+        Raises:
+            ImportCancelled: If interruption was requested mid-sheet.
+        """
+        if not columns or settings['header_row'] < 0:
+            return None
         try:
-            df = pd.read_excel(file_path, **read_args)
-        except Exception:
-            _itk_log.exception("Handled exception in _load_excel")
-            df = pd.read_excel(file_path, header=None, engine='openpyxl')
+            read_args = self._excel_read_args(settings)
+            import openpyxl
+        except ImportError:
+            return None
 
-        stop = find_first_stopping_row(df)
-        if stop < len(df):
-            df = df.iloc[:stop].copy()
-        return df
+        header_names = [str(c) for c in
+                        pd.read_excel(file_path, nrows=0, **read_args).columns]
+        if any(c not in header_names for c in columns):
+            return None
+        positions = sorted(header_names.index(c) for c in set(columns))
+        first_data_row = max(0, settings['skip_rows']) + settings['header_row'] + 2
+
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            names = workbook.sheetnames
+            sheet = workbook[names[min(read_args['sheet_name'], len(names) - 1)]]
+            time_column = settings.get('time_column')
+            dtypes = [np.float64 if header_names[p] == time_column else np.float32
+                      for p in positions]
+            total = max(0, (sheet.max_row or 0) - first_data_row + 1)
+            buffer = _ColumnBuffer([header_names[p] for p in positions], dtypes,
+                                   capacity=max(total, EXCEL_BLOCK_ROWS))
+
+            rows = sheet.iter_rows(min_row=first_data_row, values_only=True)
+            ended = False
+            while not ended:
+                if self.isInterruptionRequested():
+                    raise ImportCancelled(file_path)
+                block = list(itertools.islice(rows, EXCEL_BLOCK_ROWS))
+                if not block:
+                    break
+                values = _cells_to_floats(
+                    [tuple(r[p] if p < len(r) else None for p in positions)
+                     for r in block])
+                empty = np.flatnonzero(np.isnan(values).all(axis=1))
+                if empty.size:
+                    row = block[int(empty[0])]
+                    if any(not np.isnan(_cell_to_float(v)) for v in row):
+                        return None
+                    values = values[:int(empty[0])]
+                    ended = True
+                buffer.append(list(values.T))
+                self.rows_read.emit(file_index, buffer.rows, max(total, buffer.rows))
+        finally:
+            workbook.close()
+
+        return buffer.frame()
 
     def _process_time(self, df, settings):
         time_column = settings.get('time_column')
@@ -977,13 +1524,14 @@ class DataProcessThread(QThread):
             col = mapping['column_name']
             iso = mapping['isotope']
             if col in df.columns:
-                data = df[col].values.astype(float)
+                data = df[col].to_numpy().astype(np.float32, copy=False)
                 if is_cps:
                     data = data * dwell_s
                 signals[iso['mass']] = data
         return signals
 
     def _run_info(self, df, settings, file_path, dwell_s, ext):
+        # ``df`` is only counted, so a cached time axis works as well.
         n = len(df)
         duration = (n - 1) * dwell_s if n > 1 else 0
         data_type = ('Excel' if ext in EXCEL_EXTS
@@ -1032,6 +1580,7 @@ class FileStructureDialog(QDialog):
         self._load_failed: set[int] = set()
         self._detected: dict[int, dict] = {}
         self._params: dict[int, dict] = {}
+        self._row_estimates: dict[str, int] = {}
         self._loading_settings = False
 
         self.exclusions = ExclusionManager(len(self.file_paths), self)
@@ -1167,8 +1716,37 @@ class FileStructureDialog(QDialog):
             "What this file contributes to the import once removed rows and "
             "columns are taken out")
         tg.addWidget(self._effective_label, 3, 0, 1, 4)
+
+        tg.addWidget(QLabel("Read in blocks of:"), 4, 0)
+        self.chunk_rows_spin = QSpinBox()
+        self.chunk_rows_spin.setRange(10_000, 10_000_000)
+        self.chunk_rows_spin.setSingleStep(50_000)
+        self.chunk_rows_spin.setGroupSeparatorShown(True)
+        self.chunk_rows_spin.setSuffix(" rows")
+        self.chunk_rows_spin.setToolTip(
+            "Text files are parsed this many rows at a time. Smaller blocks\n"
+            "lower the memory needed for very large files; larger blocks\n"
+            "parse slightly faster.")
+        try:
+            chunk_rows = int(QSettings("IsotopeTrack", "IsotopeTrack").value(
+                SETTINGS_CHUNK_ROWS, DEFAULT_CHUNK_ROWS))
+        except (TypeError, ValueError):
+            chunk_rows = DEFAULT_CHUNK_ROWS
+        self.chunk_rows_spin.setValue(chunk_rows)
+        self.chunk_rows_spin.valueChanged.connect(self._on_chunk_rows_changed)
+        tg.addWidget(self.chunk_rows_spin, 4, 1)
+        self._memory_label = QLabel()
+        self._memory_label.setToolTip(
+            "Approximate peak memory for importing this file: the signal\n"
+            "arrays, room for them to grow, and one block being parsed")
+        tg.addWidget(self._memory_label, 4, 2, 1, 2)
         return group
 
+    def _on_chunk_rows_changed(self, value: int):
+        """Remember the block size and refresh the memory estimate."""
+        QSettings("IsotopeTrack", "IsotopeTrack").setValue(SETTINGS_CHUNK_ROWS, value)
+        self._refresh_effective_readout()
+
     def _build_preview_group(self) -> QGroupBox:
         """Build the preview table, its badge strip and the selection toolbar."""
         group = QGroupBox("Preview and column mapping")
@@ -1940,6 +2518,28 @@ class FileStructureDialog(QDialog):
                 f"{self.dwell_time_spin.value():.6g} ms {source}"
                 f" · {(rows - 1) * dwell_s:,.3f} s duration")
         self._effective_label.setText("  ·  ".join(parts))
+        self._refresh_memory_estimate(model, dropped, signals)
+
+    def _refresh_memory_estimate(self, model, dropped: int, signals: int):
+        """Show the expected peak memory of importing the current file."""
+        if not hasattr(self, '_memory_label'):
+            return
+        path = self.file_paths[self.current_file_index]
+        if file_type_of(path) != 'delimited' or not signals:
+            self._memory_label.setText("")
+            return
+        if model.is_exhausted():
+            rows = model.data_row_count()
+        else:
+            skip = self._detected_settings(self.current_file_index).get('skip_rows', 0)
+            if path not in self._row_estimates:
+                self._row_estimates[path] = estimate_row_count(path)
+            rows = max(model.data_row_count(), self._row_estimates[path] - skip - 1)
+        rows = max(0, rows - dropped)
+        peak = estimate_import_peak_bytes(
+            rows, signals, self._time_column_position() is not None,
+            self.chunk_rows_spin.value(), len(self._current_columns))
+        self._memory_label.setText(f"Peak memory ≈ {peak / 1e6:,.0f} MB")
 
     def _load_all_rows(self):
         """Pull the rest of the current file into the preview immediately."""
@@ -3006,6 +3606,7 @@ class FileStructureDialog(QDialog):
                 'dwell_time_ms': current_params['dwell_time_ms'],
                 'use_calculated_dwell': current_params['use_calculated_dwell'],
                 'data_type': current_params['data_type'],
+                'chunk_rows': self.chunk_rows_spin.value(),
             },
         }
         for i, fp in enumerate(self.file_paths):
@@ -15,6 +15,8 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from PySide6.QtCore import QObject, Signal
 
 _itk_log = logging.getLogger("IsotopeTrack.loading.csv.exclusions")
@@ -394,7 +396,10 @@ def apply_exclusions(frame, excluded_columns, excluded_rows):
         if drop:
             result = result.drop(columns=drop)
     if rows:
-        keep = [i for i in range(len(result)) if i not in rows]
-        if len(keep) != len(result):
-            result = result.iloc[keep]
+        n = len(result)
+        drop = np.fromiter((r for r in rows if 0 <= r < n), dtype=np.int64)
+        if drop.size:
+            keep = np.ones(n, dtype=bool)
+            keep[drop] = False
+            result = result.iloc[np.flatnonzero(keep)]
     return result.reset_index(drop=True)
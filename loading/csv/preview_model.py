@@ -348,7 +348,7 @@ def numeric_like_columns(df: pd.DataFrame) -> list:
     return numeric
 
 
-def find_first_stopping_row(df: pd.DataFrame) -> int:
+def find_first_stopping_row(df: pd.DataFrame, columns=None) -> int:
     """Return the index of the first row where the usable data ends.
 
     Instrument exports often append a footer such as "End of acquisition" after
@@ -362,6 +362,9 @@ def find_first_stopping_row(df: pd.DataFrame) -> int:
 
     Args:
         df (pd.DataFrame): Frame to scan.
+        columns (list | None): The measurement columns, when the caller
+            already knows them (e.g. it scans one block of a file, too few
+            rows to tell). Default: the columns numeric_like_columns finds.
 
     Returns:
         int: Row index of the first stopping row, or ``len(df)`` if there is none.
@@ -372,7 +375,7 @@ def find_first_stopping_row(df: pd.DataFrame) -> int:
     blank = _blank_mask(df)
     row_all_blank = blank.all(axis=1).to_numpy()
 
-    numeric = numeric_like_columns(df)
+    numeric = numeric_like_columns(df) if columns is None else list(columns)
     if not numeric:
         if not row_all_blank.any():
             return len(df)
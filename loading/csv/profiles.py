@@ -143,3 +143,61 @@ def _same_setup(left: ImportProfile, right: ImportProfile) -> bool:
                  for m in left.mappings]
             == [(m.get('column'), m.get('isotope', {}).get('label'))
                 for m in right.mappings])
+
+
+def import_profile_for(settings: dict, file_config: dict) -> ImportProfile:
+    """Return the setup one file of an import is read with.
+
+    Args:
+        settings (dict): Parse settings for the file, with the per-file
+            overrides already applied.
+        file_config (dict): Per-file import config carrying the mappings and
+            the removed columns.
+
+    Returns:
+        ImportProfile: The setup, without a label or save time.
+    """
+    return ImportProfile(
+        file_count=1,
+        header_row=settings.get('skip_rows', 0),
+        delimiter=settings.get('delimiter', ','),
+        params={key: settings.get(key) for key in (
+            'time_column', 'time_unit', 'dwell_time_ms',
+            'use_calculated_dwell', 'data_type')},
+        mappings=[
+            {'column': m['column_name'],
+             'isotope': {'label': m['isotope'].get('label'),
+                         'mass': m['isotope'].get('mass')}}
+            for m in file_config.get('mappings', {}).values()
+        ],
+        removed_columns=sorted(str(c) for c in file_config.get('excluded_columns', ())),
+    )
+
+
+def import_cache_settings(settings: dict, file_config: dict) -> dict:
+    """Return everything that decides the arrays an import produces.
+
+    This is the file's import profile plus the read details a profile does
+    not carry (encoding, sheet, table width and removed rows), in a form the
+    run cache can key on.
+
+    Args:
+        settings (dict): Parse settings for the file, with the per-file
+            overrides already applied.
+        file_config (dict): Per-file import config.
+
+    Returns:
+        dict: JSON-serialisable description of the import.
+    """
+    profile = asdict(import_profile_for(settings, file_config))
+    for key in ('created', 'label', 'file_count'):
+        profile.pop(key)
+    profile.update({
+        'encoding': settings.get('encoding'),
+        'sheet': settings.get('sheet_name'),
+        'width': settings.get('width'),
+        'full_width': settings.get('full_width'),
+        'header': settings.get('header_row'),
+        'removed_rows': sorted(int(r) for r in file_config.get('excluded_rows', ())),
+    })
+    return profile
@@ -1,9 +1,12 @@
 from PySide6.QtCore import QThread, Signal
 from pathlib import Path
 import json
+import multiprocessing
 import numpy as np
 import loading.vitesse_loading
 import loading.tofwerk_loading
+import loading.lazy_channels
+import loading.run_cache
 import logging
 _itk_log = logging.getLogger("IsotopeTrack.loading.data_thread")
 
@@ -30,6 +33,8 @@ class DataProcessThread(QThread):
         self.selected_masses = selected_masses
         self.sample_name = sample_name  
         self.max_mass_diff = 0.5
+        self.max_workers = max(1, multiprocessing.cpu_count() - 1)
+        self.run_cache = loading.run_cache.default_cache()
 
     def cleanup(self):
         """
@@ -95,12 +100,8 @@ class DataProcessThread(QThread):
             _itk_log.debug(f"Data format detected: {data_format}")
             
             if data_format == "nu":
-                masses, _, _ = loading.vitesse_loading.read_nu_directory(
-                    path=folder_path,
-                    max_integ_files=1,
-                    autoblank=False,
-                    raw=False
-                )
+                probe = loading.vitesse_loading.probe_nu_directory(folder_path)
+                masses = probe["masses"]
                 _itk_log.debug(f"NU masses found: {len(masses)} masses")
                 return masses
             
@@ -118,45 +119,19 @@ class DataProcessThread(QThread):
                     h5_file = h5_files[0]
                     _itk_log.debug(f"Using first .h5 file in directory: {h5_file}")
                 
-                _itk_log.debug(f"Reading TOFWERK file...")
-                data, info, dwell_time = loading.tofwerk_loading.read_tofwerk_file(h5_file)
-                
-                _itk_log.debug(f"\n--- TOFWERK FILE STRUCTURE ---")
-                _itk_log.debug(f"Data shape: {data.shape}")
-                _itk_log.debug(f"Data dtype: {data.dtype}")
-                if hasattr(data.dtype, 'names') and data.dtype.names:
-                    _itk_log.debug(f"Data field names: {data.dtype.names}")
-                    _itk_log.debug(f"Number of fields: {len(data.dtype.names)}")
-                
-                _itk_log.debug(f"\nInfo shape: {info.shape}")
-                _itk_log.debug(f"Info dtype: {info.dtype}")
-                _itk_log.debug(f"Info field names: {info.dtype.names}")
-                
-                _itk_log.debug(f"\nDwell time: {dwell_time}")
-                
-                _itk_log.debug(f"\nFirst 5 entries of info:")
-                for i in range(min(5, len(info))):
-                    _itk_log.debug(f"  Entry {i}: {info[i]}")
-                
-                if 'mass' in info.dtype.names:
-                    masses = info['mass']
-                    _itk_log.debug(f"\nFound 'mass' field in info")
-                    _itk_log.debug(f"Mass values (first 10): {masses[:10]}")
-                    _itk_log.debug(f"Mass range: {np.min(masses):.4f} to {np.max(masses):.4f}")
-                else:
-                    _itk_log.debug(f"\nNo 'mass' field found, trying to extract from labels...")
-                    _itk_log.debug(f"Label field sample: {info['label'][:5]}")
-                    try:
-                        masses = np.array([float(label.decode() if isinstance(label, bytes) else label) 
-                                         for label in info['label']])
-                        _itk_log.debug(f"Successfully extracted masses from labels")
-                        _itk_log.debug(f"Mass values (first 10): {masses[:10]}")
-                        _itk_log.debug(f"Mass range: {np.min(masses):.4f} to {np.max(masses):.4f}")
-                    except (ValueError, KeyError, TypeError, AttributeError) as e:
-                        _itk_log.exception("Handled exception in get_masses_only")
-                        _itk_log.error(f"Failed to extract masses from labels: {e}")
-                        return None
-                
+                _itk_log.debug(f"Probing TOFWERK file...")
+                try:
+                    probe = loading.tofwerk_loading.probe_tofwerk_file(h5_file)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    _itk_log.exception("Handled exception in get_masses_only")
+                    _itk_log.error(f"Failed to extract masses from PeakTable: {e}")
+                    return None
+                masses = probe["masses"]
+
+                _itk_log.debug(f"Acquisitions: {probe['num_acquisitions']}")
+                _itk_log.debug(f"Dwell time: {probe['dwell_time']}")
+                _itk_log.debug(f"Mass values (first 10): {masses[:10]}")
+                _itk_log.debug(f"Mass range: {np.min(masses):.4f} to {np.max(masses):.4f}")
                 _itk_log.debug(f"Total masses found: {len(masses)}")
                 _itk_log.debug(f"=== END DEBUG ===\n")
                 return masses
@@ -220,6 +195,18 @@ class DataProcessThread(QThread):
         def _read_progress(frac):
             self.progress.emit(int(20 + frac * 40))
 
+        all_masses = loading.vitesse_loading.probe_nu_directory(self.folder_path)["masses"]
+
+        mass_mapping = self.find_closest_masses(all_masses, self.selected_masses)
+        
+        if not mass_mapping:
+            raise ValueError("No matching masses found within tolerance. Available masses: " + 
+                        ", ".join(f"{m:.4f}" for m in all_masses))
+
+        mass_indices = np.searchsorted(
+            all_masses, np.fromiter(mass_mapping.values(), dtype=all_masses.dtype)
+        )
+
         masses, signals, run_info = loading.vitesse_loading.read_nu_directory(
             path=self.folder_path,
             max_integ_files=None,
@@ -228,16 +215,13 @@ class DataProcessThread(QThread):
             segment=None,
             raw=False,
             progress_callback=_read_progress,
+            mass_indices=mass_indices,
+            max_workers=self.max_workers,
+            cache=self.run_cache,
         )
         
         self.progress.emit(60)
 
-        mass_mapping = self.find_closest_masses(masses, self.selected_masses)
-        
-        if not mass_mapping:
-            raise ValueError("No matching masses found within tolerance. Available masses: " + 
-                        ", ".join(f"{m:.4f}" for m in masses))
-
         selected_masses_dict = {
             f"{int(target_mass)}": actual_mass 
             for target_mass, actual_mass in mass_mapping.items()
@@ -299,9 +283,38 @@ class DataProcessThread(QThread):
         def _read_progress(frac):
             self.progress.emit(int(20 + frac * 40))
 
+        masses = loading.tofwerk_loading.probe_tofwerk_file(h5_file)["masses"]
+        _itk_log.debug(f"Available masses: {masses[:10]}... (showing first 10)")
+        _itk_log.debug(f"Mass range: {np.min(masses):.4f} to {np.max(masses):.4f}")
+
+        mass_mapping = self.find_closest_masses(masses, self.selected_masses)
+        _itk_log.debug(f"Mass mapping found: {mass_mapping}")
+
+        if not mass_mapping:
+            raise ValueError("No matching masses found within tolerance. Available masses: " + 
+                        ", ".join(f"{m:.4f}" for m in masses[:20]))
+
+        # Only the matched peaks are read (or integrated from TofData).
+        peak_idx = np.unique([
+            int(np.argmin(np.abs(masses - actual_mass)))
+            for actual_mass in mass_mapping.values()
+        ])
+
+        lazy, keep_loaded = loading.lazy_channels.tofwerk_lazy_settings()
+        if lazy:
+            return self._open_tofwerk_lazy(h5_file, masses, mass_mapping, keep_loaded)
+
+        def _read_stats(stats):
+            _itk_log.info(
+                f"TofData integrated at {stats.decoded_mb_per_s:.0f} MB/s "
+                f"({stats.stored_mb_per_s:.0f} MB/s from disk, {stats.chunks} chunks, "
+                f"{stats.workers} workers)"
+            )
+
         _itk_log.debug(f"Reading TOFWERK data...")
         data, info, dwell_time = loading.tofwerk_loading.read_tofwerk_file(
-            h5_file, progress_callback=_read_progress
+            h5_file, idx=peak_idx, progress_callback=_read_progress, cache=self.run_cache,
+            max_workers=self.max_workers, stats_callback=_read_stats,
         )
         
         _itk_log.debug(f"\n--- TOFWERK DATA PROCESSING ---")
@@ -314,31 +327,6 @@ class DataProcessThread(QThread):
         _itk_log.debug(f"Info shape: {info.shape}")
         _itk_log.debug(f"Dwell time: {dwell_time}")
         
-        self.progress.emit(60)
-        
-        if 'mass' in info.dtype.names:
-            masses = info['mass']
-            _itk_log.debug(f"Using 'mass' field from info")
-        else:
-            _itk_log.debug(f"No 'mass' field, extracting from labels...")
-            try:
-                masses = np.array([float(label.decode() if isinstance(label, bytes) else label) 
-                                 for label in info['label']])
-                _itk_log.debug(f"Successfully extracted masses from labels")
-            except Exception as e:
-                _itk_log.error(f"Failed to extract masses from labels: {e}")
-                raise ValueError("Could not extract masses from TOFWERK data")
-        
-        _itk_log.debug(f"Available masses: {masses[:10]}... (showing first 10)")
-        _itk_log.debug(f"Mass range: {np.min(masses):.4f} to {np.max(masses):.4f}")
-        
-        mass_mapping = self.find_closest_masses(masses, self.selected_masses)
-        _itk_log.debug(f"Mass mapping found: {mass_mapping}")
-        
-        if not mass_mapping:
-            raise ValueError("No matching masses found within tolerance. Available masses: " + 
-                        ", ".join(f"{m:.4f}" for m in masses[:20]))
-        
         self.progress.emit(75)
         
         selected_data_dict = {}
@@ -349,7 +337,8 @@ class DataProcessThread(QThread):
                 actual_mass = mass_mapping[target_mass]
                 _itk_log.debug(f"Processing target mass {target_mass} -> actual mass {actual_mass}")
                 
-                mass_idx = np.argmin(np.abs(masses - actual_mass))
+                mass_idx = int(np.searchsorted(
+                    peak_idx, np.argmin(np.abs(masses - actual_mass))))
                 _itk_log.debug(f"Mass index: {mass_idx}")
                 
                 if hasattr(data.dtype, 'names') and data.dtype.names and len(data.dtype.names) > mass_idx:
@@ -388,6 +377,46 @@ class DataProcessThread(QThread):
         _itk_log.debug(f"=== END DEBUG ===\n")
         return selected_data_dict, run_info, time_array, analysis_datetime
 
+    def _open_tofwerk_lazy(self, h5_file, masses, mass_mapping, keep_loaded):
+        """
+        Open a TOFWERK file without reading any signal yet.
+
+        Args:
+            h5_file (Path): TOFWERK file
+            masses (np.ndarray): Peak masses from the PeakTable
+            mass_mapping (dict): Selected mass to closest peak mass
+            keep_loaded (bool): Keep channels in memory after the first read
+
+        Returns:
+            tuple: (LazyChannelData, run_info, time_array, analysis_datetime)
+        """
+        probe = loading.tofwerk_loading.probe_tofwerk_file(h5_file)
+        dwell_time = probe["dwell_time"]
+        peak_of = {
+            target: int(np.argmin(np.abs(masses - mass_mapping[target])))
+            for target in self.selected_masses if target in mass_mapping
+        }
+        source = loading.tofwerk_loading.TofwerkChannelSource(
+            h5_file, max_workers=self.max_workers)
+
+        def _load(keys):
+            columns = source.read([peak_of[k] for k in keys])
+            return {k: columns[:, i].copy() for i, k in enumerate(keys)}
+
+        selected_data_dict = loading.lazy_channels.LazyChannelData(
+            peak_of, _load, keep_loaded=keep_loaded)
+        _itk_log.debug(f"Opened {h5_file} lazily with {len(peak_of)} channels")
+
+        self.progress.emit(90)
+        time_array = np.arange(probe["num_acquisitions"]) * dwell_time
+        run_info = {
+            "DataFormat": "TOFWERK",
+            "DwellTime": dwell_time,
+            "NumberOfMasses": len(masses),
+            "OriginalFile": str(h5_file)
+        }
+        return selected_data_dict, run_info, time_array, "Unknown"
+
     def run(self):
         """Execute the data processing thread.
 
@@ -0,0 +1,139 @@
+"""Sample data whose channels are read from the raw file on first use.
+
+A sample's data is a dict of channel key to signal array. LazyChannelData
+behaves like that dict, but it only knows the keys up front. Each signal is
+read through a loader the first time detection, plotting or export asks for
+it, and is then optionally kept. Opening a large batch therefore costs only
+the metadata, and only the channels someone actually looks at are ever
+read.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import MutableMapping
+
+import numpy as np
+from PySide6.QtCore import QSettings
+
+_itk_log = logging.getLogger("IsotopeTrack.loading.lazy_channels")
+
+SETTINGS_TOFWERK_LAZY = "tofwerk/lazy_channels"
+SETTINGS_TOFWERK_KEEP = "tofwerk/keep_loaded_channels"
+
+
+def tofwerk_lazy_settings() -> tuple[bool, bool]:
+    """Return (read TOFWERK channels on first use, keep them once read)."""
+    settings = QSettings("IsotopeTrack", "IsotopeTrack")
+    return (
+        settings.value(SETTINGS_TOFWERK_LAZY, False, type=bool),
+        settings.value(SETTINGS_TOFWERK_KEEP, True, type=bool),
+    )
+
+
+class LazyChannelData(MutableMapping):
+    """Mapping of channel key to signal, filled in on first access.
+
+    Assigned values (e.g. corrected signals) are stored like in a dict and
+    take precedence over the loader. copy() returns a new mapping that
+    shares the loader and the signals loaded so far, so the usual
+    ``data.copy()`` hand-offs between threads and windows stay cheap.
+    """
+
+    def __init__(self, keys, loader, keep_loaded: bool = True):
+        """
+        Args:
+            keys (iterable): Channel keys, in display order
+            loader (callable): Called with a list of keys, returns a dict of
+                key to np.ndarray for them
+            keep_loaded (bool): Keep signals after the first read, instead of
+                reading them again on every access
+        """
+        self._keys = list(dict.fromkeys(keys))
+        self._loader = loader
+        self.keep_loaded = keep_loaded
+        self._loaded: dict = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        value = self._loaded.get(key)
+        if value is not None:
+            return value
+        if key not in self._keys:
+            raise KeyError(key)
+        return self.load([key])[key]
+
+    def __setitem__(self, key, value):
+        if key not in self._keys:
+            self._keys.append(key)
+        self._loaded[key] = value
+
+    def __delitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        self._keys.remove(key)
+        self._loaded.pop(key, None)
+
+    def __iter__(self):
+        return iter(list(self._keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __repr__(self):
+        return (f"LazyChannelData({len(self._keys)} channels, "
+                f"{len(self._loaded)} loaded)")
+
+    def load(self, keys) -> dict:
+        """
+        Read several channels with one loader call.
+
+        Args:
+            keys (iterable): Channel keys to make available
+
+        Returns:
+            dict: Key to signal for the requested keys
+        """
+        keys = list(keys)
+        with self._lock:
+            missing = [k for k in keys if k not in self._loaded]
+            fresh = {}
+            if missing:
+                fresh = self._loader(missing)
+                if self.keep_loaded:
+                    self._loaded.update(fresh)
+        return {k: self._loaded[k] if k in self._loaded else fresh[k] for k in keys}
+
+    def is_loaded(self, key) -> bool:
+        """Return True if the signal for ``key`` is held in memory."""
+        return key in self._loaded
+
+    def release(self, key=None) -> None:
+        """
+        Drop loaded signals; they are read again on next access.
+
+        Args:
+            key (Any | None): Channel to drop, or None for all
+        """
+        with self._lock:
+            if key is None:
+                self._loaded.clear()
+            else:
+                self._loaded.pop(key, None)
+
+    def loaded_nbytes(self) -> int:
+        """Return the memory held by loaded signals in bytes."""
+        return sum(np.asarray(v).nbytes for v in list(self._loaded.values()))
+
+    def copy(self) -> LazyChannelData:
+        """Return a mapping sharing the loader and the signals loaded so far."""
+        other = LazyChannelData(self._keys, self._loader, self.keep_loaded)
+        other._loaded = dict(self._loaded)
+        return other
+
+    def materialize(self) -> dict:
+        """Read every channel and return a plain dict."""
+        return self.load(self._keys)
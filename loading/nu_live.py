@@ -0,0 +1,759 @@
+"""Live ("tail") reading of a Nu run folder that is still being acquired.
+
+The Vitesse software writes a run folder progressively: '.integ' and '.autob'
+files are added one at a time and listed in the index files as they are
+created. NuRunTail follows such a folder. Each poll() decodes only the files
+that have been completed since the previous poll and appends their
+signals, so the signals acquired so far are available within seconds of
+acquisition instead of after the run ends.
+
+An index entry counts as complete when a later entry is already listed, or
+when its '.integ' file (and '.autob' file, when autoblanking) has not
+changed size or modification time between two polls and decodes to whole
+records. The last file of a finished run is picked up by the second rule.
+
+NuLiveWatchThread runs the tail on a timer and passes each new segment to
+IncrementalParticleDetector, up to NuRunTail.settled_rows so that no row a
+later blanker event can still blank is committed, and NuLiveWatchDialog
+shows the running particle counts and size distribution.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pyqtgraph as pg
+from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtWidgets import (QAbstractItemView, QComboBox, QDialog, QDoubleSpinBox,
+                               QFileDialog, QFormLayout, QHBoxLayout, QHeaderView,
+                               QLabel, QLineEdit, QPushButton, QSpinBox, QTableWidget,
+                               QTableWidgetItem, QVBoxLayout)
+
+from loading.vitesse_loading import (_empty_nu_autob_events, blank_nu_signal_events,
+                                     get_dwelltime_from_info, get_masses_from_nu_data,
+                                     is_nu_directory, nu_integ_dtype,
+                                     parse_nu_integ_buffer, read_nu_autob_events,
+                                     select_nu_integ_channels)
+
+_itk_log = logging.getLogger("IsotopeTrack.loading.nu_live")
+
+DEFAULT_POLL_INTERVAL_S = 1.0
+
+#: Particles per channel kept for the median and histogram of the live view.
+RECENT_PARTICLES = 100_000
+
+
+def _read_index(path: Path) -> list[dict] | None:
+    """
+    Read an index file that may be in the middle of being rewritten.
+
+    Args:
+        path (Path): Path to 'integrated.index' or 'autob.index'
+
+    Returns:
+        list[dict] | None: Index entries, or None if the file cannot be read yet
+    """
+    try:
+        with path.open("r") as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+
+def _concat_nu_autob_events(a: dict, b: dict) -> dict:
+    """
+    Join two event dictionaries from read_nu_autob_events.
+
+    Args:
+        a (dict): Earlier events
+        b (dict): Later events
+
+    Returns:
+        dict: Events of a followed by events of b
+    """
+    events = {
+        key: np.concatenate([a[key], b[key]])
+        for key in ("cyc_number", "seg_number", "acq_number", "type", "num_edges")
+    }
+    events["edge_start"] = np.concatenate([a["edge_start"], b["edge_start"] + a["edges"].size])
+    events["edges"] = np.concatenate([a["edges"], b["edges"]])
+    return events
+
+
+def _unmatched_open_event(events: dict) -> dict:
+    """
+    Return the trailing blanker-open event that has no close event yet.
+
+    blank_nu_signal_events pairs each open with the next close. When a chunk
+    of events ends on an open, its close is in a later file, so the open has
+    to be carried over and prepended to the next chunk.
+
+    Args:
+        events (dict): Events from read_nu_autob_events
+
+    Returns:
+        dict: The unmatched open event, or no events
+    """
+    types = events["type"]
+    relevant = np.flatnonzero((types == 0) | (types == 1))
+    if relevant.size == 0:
+        return _empty_nu_autob_events()
+    t = types[relevant]
+    prev = np.concatenate(([1], t[:-1]))
+    starts = relevant[(t == 0) & (prev != 0)]
+    ends = relevant[(t == 1) & (prev == 0)]
+    if starts.size <= ends.size:
+        return _empty_nu_autob_events()
+    i = int(starts[-1])
+    first = int(events["edge_start"][i])
+    count = max(int(events["num_edges"][i]), 0)
+    out = {
+        key: events[key][i : i + 1]
+        for key in ("cyc_number", "seg_number", "acq_number", "type", "num_edges")
+    }
+    out["edge_start"] = np.zeros(1, dtype=np.int64)
+    out["edges"] = events["edges"][first : first + count]
+    return out
+
+
+class _RecentValues:
+    """Fixed-size ring buffer of the most recent values appended."""
+
+    def __init__(self, capacity: int = RECENT_PARTICLES):
+        """
+        Args:
+            capacity (int): Number of values kept
+        """
+        self._data = np.empty(max(1, int(capacity)), dtype=np.float64)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def extend(self, values) -> None:
+        """Append values, overwriting the oldest once the buffer is full."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        capacity = self._data.size
+        if values.size >= capacity:
+            self._data[:] = values[-capacity:]
+            self._next, self._size = 0, capacity
+            return
+        end = self._next + values.size
+        if end <= capacity:
+            self._data[self._next:end] = values
+        else:
+            split = capacity - self._next
+            self._data[self._next:] = values[:split]
+            self._data[:end - capacity] = values[split:]
+        self._next = end % capacity
+        self._size = min(capacity, self._size + values.size)
+
+    def values(self) -> np.ndarray:
+        """Return the values held, in no particular order."""
+        return self._data[:self._size]
+
+
+class NuRunTail:
+    """Incrementally read a Nu run folder while it is being written.
+
+    The signals read so far are held in a buffer that grows by doubling, so
+    appending a file costs time proportional to that file only. Rows are
+    placed exactly as get_signals_from_nu_data places them, and autoblanking
+    and the single-ion scaling are the same as in read_nu_directory, so
+    once the run is finished ``signals`` equals a full read of the folder.
+    """
+
+    def __init__(self, path: str | Path, autoblank: bool = True, raw: bool = False,
+                 mass_indices: np.ndarray | None = None):
+        """
+        Args:
+            path (str | Path): Run folder
+            autoblank (bool): Apply autoblanking to overrange regions
+            raw (bool): Keep raw ADC counts instead of ions
+            mass_indices (np.ndarray | None): Only keep these mass columns, or
+                None for all
+        """
+        self.path = Path(path)
+        self.autoblank = autoblank
+        self.raw = raw
+        self.mass_indices = (None if mass_indices is None
+                             else np.unique(np.asarray(mass_indices, dtype=np.intp)))
+
+        self.run_info: dict | None = None
+        self.masses: np.ndarray | None = None
+        self.dwell_time: float | None = None
+        self.files_read = 0
+
+        self._buffer: np.ndarray | None = None
+        self._rows = 0
+        self._next = 0
+        self._pending: dict[str, list[tuple[int, int]]] = {}
+        self._cycle = None
+        self._cycle_offset = 0
+        self._cycle_rows = 0
+        self._open_event = _empty_nu_autob_events()
+
+    @property
+    def signals(self) -> np.ndarray:
+        """Signals acquired so far, (acquisitions, masses)."""
+        if self._buffer is None:
+            width = 0 if self.masses is None else self.masses.size
+            return np.empty((0, width), dtype=np.float32)
+        return self._buffer[: self._rows]
+
+    @property
+    def num_acquisitions(self) -> int:
+        """Number of acquisitions read so far."""
+        return self._rows
+
+    @property
+    def settled_rows(self) -> int:
+        """Number of leading rows that later files can no longer change.
+
+        A blanker window still open at the end of the files read so far is
+        only blanked once its close event is read, so the rows from its open
+        event on may still turn to NaN. Detection should not commit them yet.
+        """
+        if not self.autoblank or self._open_event["acq_number"].size == 0:
+            return self._rows
+        num_acc = self.run_info["NumAccumulations1"] * self.run_info["NumAccumulations2"]
+        row = int(self._open_event["acq_number"][0] // num_acc) - 1
+        return min(max(row, 0), self._rows)
+
+    def _load_run_info(self) -> bool:
+        """Read run.info once it exists."""
+        if self.run_info is not None:
+            return True
+        if not is_nu_directory(self.path):
+            return False
+        try:
+            with self.path.joinpath("run.info").open("r") as fp:
+                self.run_info = json.load(fp)
+        except (OSError, ValueError):
+            return False
+        self.dwell_time = float(get_dwelltime_from_info(self.run_info))
+        return True
+
+    def _is_complete(self, paths: list[Path], has_successor: bool) -> bool:
+        """Decide whether the files written for one index entry are finished."""
+        stamps = []
+        for p in paths:
+            try:
+                st = p.stat()
+            except OSError:
+                return False
+            stamps.append((st.st_size, st.st_mtime_ns))
+        if has_successor:
+            return True
+        key = paths[0].name
+        previous = self._pending.get(key)
+        self._pending[key] = stamps
+        return previous == stamps and all(size > 0 for size, _ in stamps)
+
+    def _decode(self, idx: dict) -> np.ndarray | None:
+        """Decode one completed '.integ' file, or None if it is not whole yet."""
+        raw = self.path.joinpath(f"{idx['FileNum']}.integ").read_bytes()
+        try:
+            buffer = gzip.decompress(raw) if raw[:2] == b"\x1f\x8b" else raw
+        except (EOFError, OSError, zlib.error):
+            return None
+        if len(buffer) < 16:
+            return None
+        num_results = int.from_bytes(buffer[12:16], "little")
+        if len(buffer) % nu_integ_dtype(num_results).itemsize != 0:
+            return None
+        data = parse_nu_integ_buffer(
+            buffer, idx["FirstCycNum"], idx["FirstSegNum"], idx["FirstAcqNum"]
+        )
+        if self.mass_indices is not None:
+            data = select_nu_integ_channels(data, self.mass_indices)
+        return data
+
+    def _append(self, integ: np.ndarray) -> tuple[int, int]:
+        """Place one file's records into the buffer; return the new row range."""
+        num_acc = self.run_info["NumAccumulations1"] * self.run_info["NumAccumulations2"]
+        signal = integ["result"]["signal"]
+        if not self.raw:
+            signal = signal / self.run_info["AverageSingleIonArea"]
+
+        cyc = integ["cyc_number"].astype(np.int64)
+        acq_rows = integ["acq_number"].astype(np.int64) // num_acc
+        target = np.empty(cyc.size, dtype=np.int64)
+        for c in np.unique(cyc):
+            in_cycle = cyc == c
+            if self._cycle is None:
+                self._cycle = c
+            elif c != self._cycle:
+                # A new cycle starts after every row of the previous one.
+                self._cycle_offset += self._cycle_rows
+                self._cycle_rows = 0
+                self._cycle = c
+            self._cycle_rows = max(self._cycle_rows, int(acq_rows[in_cycle].max()))
+            target[in_cycle] = acq_rows[in_cycle] - 1 + self._cycle_offset
+
+        first = self._rows
+        rows = max(self._rows, self._cycle_offset + self._cycle_rows)
+        self._reserve(rows, signal.shape[1])
+        valid = (target >= 0) & (target < rows)
+        self._buffer[target[valid]] = signal[valid]
+        self._rows = rows
+        return first, rows
+
+    def _reserve(self, rows: int, width: int) -> None:
+        """Grow the buffer (doubling) so that it holds at least ``rows`` rows."""
+        if self._buffer is None:
+            self._buffer = np.full((max(rows, 1024), width), np.nan, dtype=np.float32)
+            return
+        if rows <= self._buffer.shape[0]:
+            return
+        grown = np.full((max(rows, 2 * self._buffer.shape[0]), width), np.nan,
+                        dtype=np.float32)
+        grown[: self._rows] = self._buffer[: self._rows]
+        self._buffer = grown
+
+    def _blank(self, file_num: int) -> None:
+        """Autoblank the rows covered by one '.autob' file."""
+        autob_path = self.path.joinpath(f"{file_num}.autob")
+        if not autob_path.exists():
+            return
+        try:
+            events = read_nu_autob_events(autob_path)
+        except (OSError, EOFError, zlib.error):
+            _itk_log.exception("Could not read %s", autob_path)
+            return
+        events = _concat_nu_autob_events(self._open_event, events)
+        self._open_event = _unmatched_open_event(events)
+        blank_nu_signal_events(
+            events,
+            self.signals,
+            self.masses,
+            self.run_info["NumAccumulations1"] * self.run_info["NumAccumulations2"],
+            self.run_info["BlMassCalStartCoef"],
+            self.run_info["BlMassCalEndCoef"],
+        )
+
+    def poll(self) -> tuple[int, int] | None:
+        """
+        Read every '.integ' file completed since the previous poll.
+
+        Returns:
+            tuple | None: (first_row, end_row) of the rows added or changed,
+                or None if nothing new was read
+        """
+        if not self._load_run_info():
+            return None
+        index = _read_index(self.path.joinpath("integrated.index"))
+        if not index or self._next >= len(index):
+            return None
+        autob_files = set()
+        if self.autoblank:
+            autob_index = _read_index(self.path.joinpath("autob.index"))
+            if autob_index is None:
+                return None
+            autob_files = {idx["FileNum"] for idx in autob_index}
+
+        first_row = None
+        while self._next < len(index):
+            idx = index[self._next]
+            paths = [self.path.joinpath(f"{idx['FileNum']}.integ")]
+            if idx["FileNum"] in autob_files:
+                paths.append(self.path.joinpath(f"{idx['FileNum']}.autob"))
+            if not self._is_complete(paths, self._next + 1 < len(index)):
+                break
+            try:
+                integ = self._decode(idx)
+            except (OSError, ValueError):
+                _itk_log.exception("Could not decode %s.integ", idx["FileNum"])
+                integ = None
+            if integ is None:
+                break
+            self._pending.pop(paths[0].name, None)
+            self._next += 1
+            self.files_read += 1
+            if integ.size == 0:
+                continue
+
+            if self.masses is None:
+                segment_delays = {
+                    s["Num"]: s["AcquisitionTriggerDelayNs"]
+                    for s in self.run_info["SegmentInfo"]
+                }
+                self.masses = get_masses_from_nu_data(
+                    integ[:1], self.run_info["MassCalCoefficients"], segment_delays
+                )[0]
+
+            start, _ = self._append(integ)
+            if self.autoblank:
+                self._blank(idx["FileNum"])
+            first_row = start if first_row is None else min(first_row, start)
+
+        if first_row is None:
+            return None
+        return first_row, self._rows
+
+
+class NuLiveWatchThread(QThread):
+    """Poll a Nu run folder and detect particles in each new segment.
+
+    ``updated`` is emitted after every poll that read new data with a dict
+    holding 'num_acquisitions', 'acquired_s', 'files_read', 'new_particles'
+    (channel label to list of particle dicts found in this segment) and
+    'totals' (channel label to particle count so far).
+    """
+
+    updated = Signal(object)
+    error = Signal(str)
+
+    def __init__(self, folder_path, selected_masses: dict[str, float], params: dict,
+                 interval_s: float = DEFAULT_POLL_INTERVAL_S, max_mass_diff: float = 0.5):
+        """
+        Args:
+            folder_path (str | Path): Run folder to watch
+            selected_masses (dict[str, float]): Channel label to mass
+            params (dict): Detection parameters, see IncrementalParticleDetector
+            interval_s (float): Time between polls in seconds
+            max_mass_diff (float): Maximum difference (Da) between a selected
+                mass and the closest measured mass
+        """
+        QThread.__init__(self)
+        self.folder_path = Path(folder_path)
+        self.selected_masses = dict(selected_masses)
+        self.params = dict(params)
+        self.interval_s = float(interval_s)
+        self.max_mass_diff = max_mass_diff
+        self._stop = False
+
+    def stop(self):
+        """Ask the thread to finish after the current poll."""
+        self._stop = True
+
+    def _pause(self):
+        """Sleep one poll interval, returning early once stop() is called."""
+        deadline = time.perf_counter() + self.interval_s
+        while not self._stop:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            self.msleep(int(min(remaining, 0.05) * 1000) + 1)
+
+    def _wait_for_masses(self):
+        """Probe the folder until its first '.integ' file can be read."""
+        from loading.vitesse_loading import probe_nu_directory
+
+        while not self._stop:
+            try:
+                return probe_nu_directory(self.folder_path)["masses"]
+            except (OSError, ValueError, KeyError, EOFError, zlib.error):
+                self._pause()
+        return None
+
+    def run(self):
+        """Poll until stopped, emitting each new segment's particles."""
+        from processing.live_detection import IncrementalParticleDetector
+
+        try:
+            all_masses = self._wait_for_masses()
+            if all_masses is None:
+                return
+            labels = list(self.selected_masses)
+            wanted = np.array([self.selected_masses[k] for k in labels])
+            idx = np.clip(np.searchsorted(all_masses, wanted), 1, len(all_masses) - 1)
+            closer_left = np.abs(all_masses[idx - 1] - wanted) < np.abs(all_masses[idx] - wanted)
+            idx = np.where(closer_left, idx - 1, idx)
+            if np.any(np.abs(all_masses[idx] - wanted) > self.max_mass_diff):
+                raise ValueError("no measured mass close enough to the selected masses")
+
+            tail = NuRunTail(self.folder_path, mass_indices=idx)
+            columns = {label: int(np.searchsorted(tail.mass_indices, i))
+                       for label, i in zip(labels, idx)}
+            detector = None
+
+            while not self._stop:
+                t0 = time.perf_counter()
+                added = tail.poll()
+                if added is not None:
+                    if detector is None:
+                        detector = IncrementalParticleDetector(self.params, tail.dwell_time)
+                    signals = tail.signals[: tail.settled_rows]
+                    new_particles = {
+                        label: detector.update(label, signals[:, col])
+                        for label, col in columns.items()
+                    }
+                    self.updated.emit({
+                        'num_acquisitions': tail.num_acquisitions,
+                        'acquired_s': tail.num_acquisitions * tail.dwell_time,
+                        'files_read': tail.files_read,
+                        'new_particles': new_particles,
+                        'totals': {label: detector.particle_count(label) for label in columns},
+                        'poll_s': time.perf_counter() - t0,
+                    })
+                self._pause()
+
+            if detector is not None:
+                signals = tail.signals
+                new_particles = {
+                    label: detector.update(label, signals[:, col], final=True)
+                    for label, col in columns.items()
+                }
+                self.updated.emit({
+                    'num_acquisitions': tail.num_acquisitions,
+                    'acquired_s': tail.num_acquisitions * tail.dwell_time,
+                    'files_read': tail.files_read,
+                    'new_particles': new_particles,
+                    'totals': {label: detector.particle_count(label) for label in columns},
+                    'poll_s': 0.0,
+                })
+        except Exception as e:
+            _itk_log.exception("Handled exception in NuLiveWatchThread.run")
+            self.error.emit(str(e))
+
+
+class NuLiveWatchDialog(QDialog):
+    """Watch a Nu run folder and show particle counts as they are acquired.
+
+    The particle totals and rates cover the whole run; the median and the
+    histogram cover the last RECENT_PARTICLES particles of each channel, so
+    a long run does not grow the dialog's memory without bound.
+
+    Detection uses ``detection_params`` (the per-element keys of
+    sample_parameters: alpha, sigma, iterative, window and integration
+    settings), with the method and minimum points taken from the dialog.
+    The watch stops whenever the dialog is closed or dismissed.
+    """
+
+    def __init__(self, parent=None, detection_params: dict | None = None):
+        """
+        Args:
+            parent (QWidget | None): Parent widget
+            detection_params (dict | None): Starting detection parameters
+        """
+        from processing import detection_registry
+
+        super().__init__(parent)
+        self.setWindowTitle("Live Nu Acquisition")
+        self.setMinimumSize(560, 520)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+
+        self._thread = None
+        self._counts: dict[str, _RecentValues] = {}
+        self._params = dict(detection_params or {})
+
+        lay = QVBoxLayout(self)
+        lay.setSpacing(10)
+        lay.setContentsMargins(14, 14, 14, 12)
+
+        form = QFormLayout()
+        folder_row = QHBoxLayout()
+        self._folder_edit = QLineEdit()
+        self._folder_edit.setPlaceholderText("Run folder being acquired")
+        browse = QPushButton("Browse...")
+        browse.clicked.connect(self._browse)
+        folder_row.addWidget(self._folder_edit)
+        folder_row.addWidget(browse)
+        form.addRow("Folder:", folder_row)
+
+        self._masses_edit = QLineEdit()
+        self._masses_edit.setPlaceholderText("e.g. 107, 109, 197")
+        form.addRow("Masses:", self._masses_edit)
+
+        self._method_combo = QComboBox()
+        self._method_combo.addItems(detection_registry.selectable_labels())
+        form.addRow("Method:", self._method_combo)
+
+        self._min_points = QSpinBox()
+        self._min_points.setRange(1, 100)
+        form.addRow("Min. points:", self._min_points)
+
+        self._settings_label = QLabel()
+        self._settings_label.setWordWrap(True)
+        self._settings_label.setStyleSheet("color: #6B7280; font-size: 11px;")
+        form.addRow("Settings:", self._settings_label)
+
+        self._interval = QDoubleSpinBox()
+        self._interval.setRange(0.2, 60.0)
+        self._interval.setSingleStep(0.5)
+        self._interval.setSuffix(" s")
+        self._interval.setValue(DEFAULT_POLL_INTERVAL_S)
+        form.addRow("Poll every:", self._interval)
+        lay.addLayout(form)
+
+        btn_row = QHBoxLayout()
+        self._start_btn = QPushButton("Start")
+        self._start_btn.clicked.connect(self._start)
+        self._stop_btn = QPushButton("Stop")
+        self._stop_btn.setEnabled(False)
+        self._stop_btn.clicked.connect(self._stop)
+        btn_row.addWidget(self._start_btn)
+        btn_row.addWidget(self._stop_btn)
+        btn_row.addStretch()
+        lay.addLayout(btn_row)
+
+        self._status = QLabel("Not watching")
+        self._status.setStyleSheet("color: #6B7280; font-size: 11px;")
+        lay.addWidget(self._status)
+
+        self._table = QTableWidget(0, 4)
+        self._table.setHorizontalHeaderLabels(
+            ["Channel", "Particles", "Particles/s", "Median counts"])
+        self._table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self._table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._table.itemSelectionChanged.connect(self._refresh_histogram)
+        lay.addWidget(self._table)
+
+        self._plot = pg.PlotWidget()
+        self._plot.setBackground('w')
+        self._plot.setLabel('bottom', 'Counts per particle')
+        self._plot.setLabel('left', 'Particles')
+        self._plot.setMinimumHeight(180)
+        lay.addWidget(self._plot)
+
+        self.set_detection_params(self._params)
+
+    def set_detection_params(self, params: dict | None) -> None:
+        """
+        Use new detection parameters for the next watch started.
+
+        Args:
+            params (dict | None): Per-element detection parameters
+        """
+        self._params = dict(params or {})
+        method = self._params.get('method', 'Compound Poisson LogNormal')
+        if self._method_combo.findText(method) >= 0:
+            self._method_combo.setCurrentText(method)
+        self._min_points.setValue(int(self._params.get('min_continuous', 1)))
+
+        p = self._params
+        window = (f"window {int(p.get('window_size', 5000))}"
+                  if p.get('use_window_size', False) else "no window")
+        self._settings_label.setText(
+            f"alpha {p.get('alpha', 0.000001):g}, sigma {p.get('sigma', 0.55):g}, "
+            f"{'iterative' if p.get('iterative', True) else 'single pass'}, {window}, "
+            f"{p.get('integration_method', 'Background')} integration"
+        )
+
+    def is_watching(self) -> bool:
+        """Return True while a watch thread is running."""
+        return self._thread is not None and self._thread.isRunning()
+
+    def stop_watch(self) -> None:
+        """Stop the watch thread and wait for it to finish."""
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread.wait()
+
+    def _browse(self):
+        """Pick the run folder."""
+        folder = QFileDialog.getExistingDirectory(self, "Select Nu Run Folder")
+        if folder:
+            self._folder_edit.setText(folder)
+
+    def _parse_masses(self) -> dict[str, float]:
+        """Turn the masses field into channel labels and masses."""
+        masses = {}
+        for part in self._masses_edit.text().replace(";", ",").split(","):
+            part = part.strip()
+            if not part:
+                continue
+            masses[f"m/z {float(part):g}"] = float(part)
+        return masses
+
+    def _start(self):
+        """Start watching the selected folder."""
+        try:
+            masses = self._parse_masses()
+        except ValueError:
+            self._status.setText("Masses must be numbers separated by commas")
+            return
+        folder = self._folder_edit.text().strip()
+        if not folder or not masses:
+            self._status.setText("Select a folder and at least one mass")
+            return
+
+        params = dict(self._params)
+        params['method'] = self._method_combo.currentText()
+        params['min_continuous'] = self._min_points.value()
+
+        self._counts = {label: _RecentValues() for label in masses}
+        self._table.setRowCount(len(masses))
+        for row, label in enumerate(masses):
+            self._table.setItem(row, 0, QTableWidgetItem(label))
+            for col in range(1, 4):
+                self._table.setItem(row, col, QTableWidgetItem("0"))
+
+        self._thread = NuLiveWatchThread(folder, masses, params,
+                                         interval_s=self._interval.value())
+        self._thread.updated.connect(self._on_update)
+        self._thread.error.connect(self._on_error)
+        self._thread.finished.connect(self._on_finished)
+        self._thread.start()
+        self._start_btn.setEnabled(False)
+        self._stop_btn.setEnabled(True)
+        self._status.setText("Waiting for data...")
+
+    def _stop(self):
+        """Stop watching; particles pending at the end of the data are flushed."""
+        if self._thread is not None:
+            self._thread.stop()
+            self._stop_btn.setEnabled(False)
+
+    def _on_update(self, update: dict):
+        """Add a segment's particles to the table and histogram."""
+        acquired = update['acquired_s']
+        for row in range(self._table.rowCount()):
+            label = self._table.item(row, 0).text()
+            counts = self._counts.setdefault(label, _RecentValues())
+            counts.extend([p['total_counts'] for p in update['new_particles'].get(label, [])])
+            total = update['totals'].get(label, len(counts))
+            rate = total / acquired if acquired > 0 else 0.0
+            median = float(np.median(counts.values())) if len(counts) else 0.0
+            self._table.item(row, 1).setText(str(total))
+            self._table.item(row, 2).setText(f"{rate:.2f}")
+            self._table.item(row, 3).setText(f"{median:.1f}")
+        self._status.setText(
+            f"{update['files_read']} files, {update['num_acquisitions']} acquisitions "
+            f"({acquired:.1f} s), last update took {update['poll_s'] * 1000:.0f} ms"
+        )
+        self._refresh_histogram()
+
+    def _refresh_histogram(self):
+        """Plot the counts-per-particle histogram of the selected channel."""
+        self._plot.clear()
+        rows = self._table.selectionModel().selectedRows()
+        row = rows[0].row() if rows else 0
+        item = self._table.item(row, 0)
+        if item is None:
+            return
+        recent = self._counts.get(item.text())
+        if recent is None or len(recent) < 2:
+            return
+        counts = recent.values()
+        hist, edges = np.histogram(counts, bins=min(60, max(5, len(counts) // 5)))
+        self._plot.plot(edges, hist, stepMode="center", fillLevel=0,
+                        brush=(59, 130, 246, 120), pen=pg.mkPen('#2563EB'))
+
+    def _on_error(self, message: str):
+        """Show a watch error."""
+        self._status.setText(f"Error: {message}")
+
+    def _on_finished(self):
+        """Re-enable starting once the thread has stopped."""
+        self._start_btn.setEnabled(True)
+        self._stop_btn.setEnabled(False)
+        self._thread = None
+
+    def done(self, result):
+        """Stop the watch thread when the dialog is accepted or rejected (Esc)."""
+        self.stop_watch()
+        super().done(result)
+
+    def closeEvent(self, event):
+        """Stop the watch thread before closing."""
+        self.stop_watch()
+        super().closeEvent(event)
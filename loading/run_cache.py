@@ -0,0 +1,450 @@
+"""Persistent cache of decoded raw runs.
+
+Opening a Nu folder or a TOFWERK file means decompressing and parsing every
+'.integ' file or HDF5 chunk again, even when nothing about the run has changed
+since the last time it was opened. This keeps the decoded arrays on disk as
+plain ``.npy`` files, so a second open of an unchanged run is a memory map
+instead of a decode.
+
+Entries are keyed on the source files (path, size and modification time) and
+on the read settings (autoblank, cycle/segment, selected channels, ...). If any
+of those change the key changes, so a stale entry can never be returned; it
+simply ages out. The total size is capped and the least recently used entries
+are evicted first.
+
+The cache is opt-in: ``default_cache()`` returns None unless it has been
+enabled in the settings.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+import warnings
+from pathlib import Path
+
+import numpy as np
+from PySide6.QtCore import QSettings, QStandardPaths
+
+_itk_log = logging.getLogger("IsotopeTrack.loading.run_cache")
+
+SETTINGS_ENABLED = "run_cache/enabled"
+SETTINGS_MAX_MB = "run_cache/max_mb"
+DEFAULT_MAX_MB = 4096
+CACHE_VERSION = 1
+ENTRY_FILE = "entry.json"
+DIGEST_FILE = "content_digests.json"
+MAX_DIGESTS = 1024
+STALE_TMP_S = 3600
+
+
+def cache_dir() -> Path:
+    """Return (creating if needed) the per-user folder holding cached runs."""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    if not base:
+        base = str(Path.home() / ".isotopetrack")
+    d = Path(base) / "run_cache"
+    try:
+        d.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        _itk_log.exception("Could not create run cache directory")
+    return d
+
+
+def source_fingerprint(paths) -> list[list]:
+    """Describe source files by resolved path, size and modification time.
+
+    Args:
+        paths (iterable[Path | str]): Files the cached result was decoded from
+
+    Returns:
+        list[list]: One [path, size, mtime_ns] entry per existing file
+    """
+    out = []
+    for p in paths:
+        p = Path(p)
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        out.append([str(p.resolve()), st.st_size, st.st_mtime_ns])
+    return out
+
+
+def run_cache_key(kind: str, paths, settings: dict) -> str:
+    """Build the cache key for one decoded run.
+
+    Args:
+        kind (str): Reader name, e.g. 'nu' or 'tofwerk'
+        paths (iterable[Path | str]): Source files of the run
+        settings (dict): Read settings that change the decoded result; values
+            must be JSON-serialisable
+
+    Returns:
+        str: Hex digest identifying the entry
+    """
+    payload = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "kind": kind,
+            "sources": source_fingerprint(paths),
+            "settings": settings,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def file_content_digest(path: Path | str, block: int = 1 << 20) -> str:
+    """Hash the bytes of a file.
+
+    Args:
+        path (Path | str): File to hash
+        block (int): Read size in bytes
+
+    Returns:
+        str: Hex BLAKE2b digest of the content
+    """
+    h = hashlib.blake2b(digest_size=20)
+    with Path(path).open("rb") as fp:
+        for chunk in iter(lambda: fp.read(block), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def content_cache_key(kind: str, digests, settings: dict) -> str:
+    """Build the cache key for a result that depends on file content only.
+
+    Unlike run_cache_key the location of the source does not matter, so a
+    copied or renamed file with the same bytes finds the same entry.
+
+    Args:
+        kind (str): Reader name, e.g. 'csv'
+        digests (iterable[str]): Content digests of the source files
+        settings (dict): Read settings that change the result; values must be
+            JSON-serialisable
+
+    Returns:
+        str: Hex digest identifying the entry
+    """
+    payload = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "kind": kind,
+            "content": list(digests),
+            "settings": settings,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _dir_size(path: Path) -> int:
+    """Return the total size of the files directly inside ``path``."""
+    total = 0
+    try:
+        for f in path.iterdir():
+            try:
+                total += f.stat().st_size
+            except OSError:
+                pass
+    except OSError:
+        pass
+    return total
+
+
+def _remove_entry(path: Path) -> bool:
+    """Delete an entry folder, its entry.json last.
+
+    A memory-mapped array cannot be deleted on Windows while a caller still
+    holds it. The entry then keeps its entry.json, so it is still counted
+    against the size cap and its removal is tried again on the next eviction.
+
+    Args:
+        path (Path): Entry folder
+
+    Returns:
+        bool: True if the folder is gone
+    """
+    try:
+        children = list(path.iterdir())
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+    removed = True
+    for f in children:
+        if f.name == ENTRY_FILE:
+            continue
+        try:
+            if f.is_dir():
+                shutil.rmtree(f)
+            else:
+                f.unlink()
+        except OSError:
+            removed = False
+    if not removed:
+        return False
+    try:
+        (path / ENTRY_FILE).unlink(missing_ok=True)
+        path.rmdir()
+    except OSError:
+        return False
+    return True
+
+
+class RunCache:
+    """On-disk, size-capped LRU store of decoded run arrays.
+
+    Each entry is a folder holding one ``.npy`` file per array and an
+    ``entry.json`` with the JSON metadata. The modification time of
+    ``entry.json`` records the last use and drives eviction.
+    """
+
+    def __init__(self, root: Path | str | None = None, max_bytes: int | None = None):
+        """Open (creating if needed) a cache folder.
+
+        Args:
+            root (Path | str | None): Cache folder, or None for cache_dir()
+            max_bytes (int | None): Size cap, or None for DEFAULT_MAX_MB
+        """
+        self.root = Path(root) if root is not None else cache_dir()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes if max_bytes is not None
+                             else DEFAULT_MAX_MB * 1024 * 1024)
+        self._digest_lock = threading.Lock()
+
+    def content_digest(self, path: Path | str) -> str:
+        """Return the content digest of a file, hashing it only when it changed.
+
+        Digests are remembered against the file's path, size and modification
+        time, so a repeat import of an unchanged file costs a stat instead of
+        a read of the whole file.
+
+        Args:
+            path (Path | str): Source file
+
+        Returns:
+            str: Digest from file_content_digest
+        """
+        stamp = source_fingerprint([path])
+        if not stamp:
+            raise FileNotFoundError(path)
+        memo_key = json.dumps(stamp[0])
+        memo_path = self.root / DIGEST_FILE
+        with self._digest_lock:
+            memo = self._read_digests(memo_path)
+            digest = memo.get(memo_key)
+        if digest is not None:
+            return digest
+
+        digest = file_content_digest(path)
+        with self._digest_lock:
+            memo = self._read_digests(memo_path)
+            memo.pop(memo_key, None)
+            memo[memo_key] = digest
+            while len(memo) > MAX_DIGESTS:
+                memo.pop(next(iter(memo)))
+            tmp = self.root / f".tmp-{uuid.uuid4().hex}.json"
+            try:
+                with tmp.open("w") as fp:
+                    json.dump(memo, fp)
+                os.replace(tmp, memo_path)
+            except OSError:
+                _itk_log.exception("Could not store content digests")
+                try:
+                    tmp.unlink()
+                except OSError:
+                    pass
+        return digest
+
+    @staticmethod
+    def _read_digests(memo_path: Path) -> dict:
+        """Return the remembered digests, or an empty dict if unreadable."""
+        try:
+            with memo_path.open("r") as fp:
+                memo = json.load(fp)
+        except (OSError, ValueError):
+            return {}
+        return memo if isinstance(memo, dict) else {}
+
+    def _entries(self) -> list[Path]:
+        """Return the complete entry folders."""
+        try:
+            return [d for d in self.root.iterdir()
+                    if d.is_dir() and (d / ENTRY_FILE).exists()]
+        except OSError:
+            return []
+
+    def _orphans(self) -> list[Path]:
+        """Return folders without entry.json that no write is still filling.
+
+        These are entries whose removal was interrupted, and interrupted
+        writes (``.tmp-*``) older than STALE_TMP_S.
+        """
+        try:
+            children = list(self.root.iterdir())
+        except OSError:
+            return []
+        now = time.time()
+        out = []
+        for d in children:
+            if not d.is_dir() or (d / ENTRY_FILE).exists():
+                continue
+            if d.name.startswith(".tmp-"):
+                try:
+                    if now - d.stat().st_mtime < STALE_TMP_S:
+                        continue
+                except OSError:
+                    continue
+            out.append(d)
+        return out
+
+    def get(self, key: str) -> tuple[dict, dict] | None:
+        """Return a cached entry, or None on a miss.
+
+        Arrays are memory-mapped copy-on-write, so callers may modify them in
+        place without touching the cache.
+
+        Args:
+            key (str): Key from run_cache_key
+
+        Returns:
+            tuple | None: (arrays, meta) where arrays maps names to np.ndarray
+        """
+        entry = self.root / key
+        meta_path = entry / ENTRY_FILE
+        if not meta_path.exists():
+            return None
+        try:
+            with meta_path.open("r") as fp:
+                meta = json.load(fp)
+            arrays = {
+                name: np.load(entry / f"{name}.npy", mmap_mode="c")
+                for name in meta.get("arrays", [])
+            }
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            _itk_log.exception("Discarding unreadable run cache entry %s", key)
+            _remove_entry(entry)
+            return None
+        return arrays, meta.get("meta", {})
+
+    def put(self, key: str, arrays: dict[str, np.ndarray], meta: dict | None = None) -> bool:
+        """Store an entry, then evict old entries to respect the size cap.
+
+        The entry is written to a temporary folder and renamed into place, so
+        an interrupted write never leaves a partial entry behind.
+
+        Args:
+            key (str): Key from run_cache_key
+            arrays (dict[str, np.ndarray]): Arrays to store
+            meta (dict | None): JSON-serialisable metadata
+
+        Returns:
+            bool: True if the entry was stored
+        """
+        nbytes = sum(np.asarray(a).nbytes for a in arrays.values())
+        if nbytes > self.max_bytes:
+            return False
+        tmp = self.root / f".tmp-{uuid.uuid4().hex}"
+        try:
+            tmp.mkdir()
+            for name, array in arrays.items():
+                with warnings.catch_warnings():
+                    # h5py tags string fields with dtype metadata, which .npy
+                    # cannot store and the readers do not need.
+                    warnings.filterwarnings("ignore", message="metadata on a dtype")
+                    np.save(tmp / f"{name}.npy", np.asarray(array), allow_pickle=False)
+            with (tmp / ENTRY_FILE).open("w") as fp:
+                json.dump({"arrays": list(arrays), "meta": meta or {}}, fp, default=str)
+            entry = self.root / key
+            if entry.exists():
+                _remove_entry(entry)
+            os.replace(tmp, entry)
+        except (OSError, ValueError, TypeError):
+            _itk_log.exception("Could not write run cache entry %s", key)
+            _remove_entry(tmp)
+            return False
+        self.evict(keep=key)
+        return True
+
+    def size_bytes(self) -> int:
+        """Return the total size of all entries and leftover folders in bytes."""
+        return sum(_dir_size(d) for d in self._entries() + self._orphans())
+
+    def evict(self, keep: str | None = None) -> int:
+        """Delete least recently used entries until the size cap is met.
+
+        Leftover folders (see _orphans) are swept first; any that cannot be
+        deleted yet still count against the cap.
+
+        Args:
+            keep (str | None): Key that must not be evicted (the newest entry)
+
+        Returns:
+            int: Number of entries removed
+        """
+        total = 0
+        for d in self._orphans():
+            size = _dir_size(d)
+            if not _remove_entry(d):
+                total += size
+        entries = []
+        for d in self._entries():
+            try:
+                used = (d / ENTRY_FILE).stat().st_mtime_ns
+            except OSError:
+                continue
+            entries.append((used, d, _dir_size(d)))
+        total += sum(size for _, _, size in entries)
+        removed = 0
+        for _, d, size in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if d.name == keep:
+                continue
+            if not _remove_entry(d):
+                _itk_log.debug("Run cache entry %s still in use; left for later", d.name)
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Delete every entry, including interrupted writes."""
+        try:
+            children = list(self.root.iterdir())
+        except OSError:
+            return
+        for d in children:
+            if d.is_dir():
+                shutil.rmtree(d, ignore_errors=True)
+            elif d.name == DIGEST_FILE or d.name.startswith(".tmp-"):
+                try:
+                    d.unlink()
+                except OSError:
+                    pass
+
+
+def default_cache() -> RunCache | None:
+    """Return the user's run cache, or None if caching is disabled."""
+    settings = QSettings("IsotopeTrack", "IsotopeTrack")
+    if not settings.value(SETTINGS_ENABLED, False, type=bool):
+        return None
+    try:
+        max_mb = int(settings.value(SETTINGS_MAX_MB, DEFAULT_MAX_MB))
+    except (TypeError, ValueError):
+        max_mb = DEFAULT_MAX_MB
+    try:
+        return RunCache(max_bytes=max_mb * 1024 * 1024)
+    except OSError:
+        _itk_log.exception("Run cache unavailable")
+        return None
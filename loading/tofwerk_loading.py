@@ -1,12 +1,24 @@
 """Loading data from TOFWERK ICP-ToF."""
+import itertools
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 import h5py
 import numpy as np
-import numpy.lib.recfunctions as rfn
+from h5py import h5d, h5s, h5z
 import logging
 _itk_log = logging.getLogger("IsotopeTrack.loading.tofwerk_loading")
 
+_SUPPORTED_CHUNK_FILTERS = (h5z.FILTER_DEFLATE, h5z.FILTER_SHUFFLE)
+
+# Above this many separate bin runs, one selection per run costs more than
+# reading whole spectra, whatever fraction of the bins they cover.
+MAX_BIN_RUNS = 12
+
 
 def is_tofwerk_file(path: Path) -> bool:
     """
@@ -107,31 +119,20 @@ def factor_extraction_to_acquisition(h5: h5py._hl.files.File) -> float:
     )
 
 
-def integrate_tof_data(
-    h5: h5py._hl.files.File, idx: np.ndarray | None = None, progress_callback=None
-) -> np.ndarray:
+def _peak_window_bins(
+    h5: h5py._hl.files.File, idx: np.ndarray | None
+) -> tuple[np.ndarray, np.ndarray]:
     """
-    Integrate TofData to recreate PeakData.
-    
-    Returned data is in ions/extraction for compatibility with PeakData, it can be
-    converted to ions/acquisition by via * factor_extraction_to_acquisition.
-    Integration is summing from int(lower index limit) + 1 to int(upper index limit).
-
-    Reads TofData in chunks for better throughput than row-by-row.
+    Convert PeakTable integration limits to TofData bin indices.
 
     Args:
         h5 (h5py._hl.files.File): Opened h5 file
-        idx (np.ndarray | None): Only integrate these peak idx, or None for all
-        progress_callback (callable | None): Called with a 0..1 fraction after
-            each chunk of TofData is integrated, so callers can report progress
-            proportional to the amount of data read.
+        idx (np.ndarray | None): Only these peak idx, or None for all
 
     Returns:
-        np.ndarray: Data equivalent to PeakData
+        tuple[np.ndarray, np.ndarray]: Lower and upper bin index of each peak
     """
-    tof_data = h5["FullSpectra"]["TofData"]
     peak_table = h5["PeakData"]["PeakTable"]
-
     if idx is None:
         idx = np.arange(peak_table.shape[0])
     idx = np.asarray(idx)
@@ -150,16 +151,161 @@ def integrate_tof_data(
     upper = calibrate_mass_to_index(
         peak_table["upper integration limit"][idx], mode, ps
     )
-    indicies = np.stack((lower, upper + 1), axis=1)
+    return lower, upper
+
+
+def _tof_scale_factor(h5: h5py._hl.files.File) -> float:
+    """
+    Factor converting summed TofData to ions/extraction, as in PeakData.
+
+    Args:
+        h5 (h5py._hl.files.File): Opened h5 file
+
+    Returns:
+        float: Scale factor
+    """
+    return float(
+        (h5["FullSpectra"].attrs["SampleInterval"][0] * 1e9)
+        / h5["FullSpectra"].attrs["Single Ion Signal"][0]
+        / factor_extraction_to_acquisition(h5)
+    )
+
+
+def merge_tof_bin_windows(
+    starts: np.ndarray, stops: np.ndarray, max_gap: int = 64
+) -> list[tuple[int, int, np.ndarray]]:
+    """
+    Group peak integration windows into contiguous runs of TOF bins.
+
+    Windows that overlap or are separated by at most ``max_gap`` bins are
+    merged, so neighbouring isotopes are read with one hyperslab instead of
+    several small ones.
+
+    Args:
+        starts (np.ndarray): First bin of each window
+        stops (np.ndarray): One past the last bin of each window
+        max_gap (int): Largest gap (bins) bridged when merging
+
+    Returns:
+        list[tuple[int, int, np.ndarray]]: (first_bin, stop_bin, peaks) for each
+            run, where peaks are the positions in starts / stops it covers
+    """
+    order = np.argsort(starts, kind="stable")
+    spans = []
+    for i in order:
+        lo, hi = int(starts[i]), max(int(stops[i]), int(starts[i]) + 1)
+        if spans and lo <= spans[-1][1] + max_gap:
+            spans[-1][1] = max(spans[-1][1], hi)
+            spans[-1][2].append(i)
+        else:
+            spans.append([lo, hi, [i]])
+    return [(lo, hi, np.asarray(members)) for lo, hi, members in spans]
+
+
+def read_tof_bin_runs(
+    tof_data: h5py.Dataset, start: int, end: int, runs: list[tuple[int, int]]
+) -> np.ndarray:
+    """
+    Read rows start:end of TofData, restricted to a few runs of TOF bins.
+
+    The runs are selected as a union of hyperslabs and read with a single
+    H5Dread, so each HDF5 chunk is visited once however many runs it holds.
+
+    Args:
+        tof_data (h5py.Dataset): /FullSpectra/TofData
+        start (int): First row
+        end (int): One past the last row
+        runs (list[tuple[int, int]]): Sorted, non-overlapping (first_bin, stop_bin)
+
+    Returns:
+        np.ndarray: Rows with the runs' bins concatenated along the last axis
+    """
+    middle = tuple(tof_data.shape[1:-1])
+    fspace = tof_data.id.get_space()
+    for i, (lo, hi) in enumerate(runs):
+        fspace.select_hyperslab(
+            (start,) + (0,) * len(middle) + (lo,),
+            (end - start,) + middle + (hi - lo,),
+            op=h5s.SELECT_SET if i == 0 else h5s.SELECT_OR,
+        )
+    width = sum(hi - lo for lo, hi in runs)
+    out = np.empty((end - start, *middle, width), dtype=tof_data.dtype)
+    tof_data.id.read(h5s.create_simple(out.shape), fspace, out)
+    return out
+
+
+def integrate_tof_data(
+    h5: h5py._hl.files.File, idx: np.ndarray | None = None, progress_callback=None,
+    selected_bins_only: bool = True,
+) -> np.ndarray:
+    """
+    Integrate TofData to recreate PeakData.
+    
+    Returned data is in ions/extraction for compatibility with PeakData, it can be
+    converted to ions/acquisition by via * factor_extraction_to_acquisition.
+    Integration is summing from int(lower index limit) + 1 to int(upper index limit).
+
+    Reads TofData in chunks for better throughput than row-by-row. With
+    selected_bins_only, only the TOF bins inside the requested peak windows
+    are read (a union of one hyperslab per run of nearby windows), so
+    integrating a few isotopes costs a fraction of integrating the whole
+    PeakTable. The number of rows per read grows in proportion, keeping
+    each read about the size of a full-width one.
+
+    Args:
+        h5 (h5py._hl.files.File): Opened h5 file
+        idx (np.ndarray | None): Only integrate these peak idx, or None for all
+        progress_callback (callable | None): Called with a 0..1 fraction after
+            each chunk of TofData is integrated, so callers can report progress
+            proportional to the amount of data read.
+        selected_bins_only (bool): Read only the bins covered by the peak
+            windows instead of whole spectra. Falls back to whole spectra
+            when the windows cover a large part of the bins, or are spread
+            over more than MAX_BIN_RUNS runs.
+
+    Returns:
+        np.ndarray: Data equivalent to PeakData
+    """
+    tof_data = h5["FullSpectra"]["TofData"]
+    lower, upper = _peak_window_bins(h5, idx)
 
     n_samples = tof_data.shape[0]
+    n_bins = tof_data.shape[-1]
     peaks = np.empty((*tof_data.shape[:-1], lower.size), dtype=np.float32)
 
-    chunk_size = max(1, min(512, n_samples))
+    # Windows are grouped into runs of nearby bins; integration offsets are
+    # taken relative to each run's position in the compacted read. One
+    # extra bin is kept past each run so reduceat never indexes past its end.
+    runs = None
+    if selected_bins_only and lower.size > 0:
+        merged = merge_tof_bin_windows(lower.astype(np.int64), upper.astype(np.int64) + 1)
+        merged = [(lo, min(n_bins, hi + 1), members) for lo, hi, members in merged]
+        width = sum(hi - lo for lo, hi, _ in merged)
+        if len(merged) <= MAX_BIN_RUNS and 4 * width <= n_bins:
+            runs = merged
+
+    if runs is None:
+        read_width = n_bins
+        indicies = np.stack((lower, upper + 1), axis=1).astype(np.int64)
+        order = np.arange(lower.size)
+    else:
+        read_width = sum(hi - lo for lo, hi, _ in runs)
+        base = np.cumsum([0] + [hi - lo for lo, hi, _ in runs[:-1]])
+        order = np.concatenate([members for _, _, members in runs])
+        offset = np.concatenate([np.full(m.size, b - lo) for (lo, _, m), b in zip(runs, base)])
+        indicies = np.stack(
+            (lower[order].astype(np.int64) + offset, upper[order].astype(np.int64) + 1 + offset),
+            axis=1,
+        )
+
+    chunk_size = max(1, min(512 * n_bins // max(1, read_width), n_samples))
     for start in range(0, n_samples, chunk_size):
         end = min(start + chunk_size, n_samples)
-        chunk = tof_data[start:end]
-        peaks[start:end] = np.add.reduceat(
+        if runs is None:
+            chunk = tof_data[start:end]
+        else:
+            chunk = read_tof_bin_runs(tof_data, start, end, [(lo, hi) for lo, hi, _ in runs])
+        peaks[start:end, ..., order] = np.add.reduceat(
             chunk, indicies.flat, axis=-1
         )[..., ::2]
         if progress_callback is not None:
@@ -169,17 +315,385 @@ def integrate_tof_data(
                 _itk_log.exception("Handled exception in integrate_tof_data")
     chunk = None  
 
-    scale_factor = float(
-        (h5["FullSpectra"].attrs["SampleInterval"][0] * 1e9)
-        / h5["FullSpectra"].attrs["Single Ion Signal"][0]
-        / factor_extraction_to_acquisition(h5)
+    return peaks * _tof_scale_factor(h5)
+
+
+@dataclass
+class TofReadStats:
+    """Throughput of one chunked TofData integration.
+
+    ``stored_bytes`` is what was read from the file (compressed) and
+    ``decoded_bytes`` the size after decompression. ``read_s`` and
+    ``decode_s`` are summed over all workers, ``wall_s`` is elapsed time.
+    """
+
+    chunks: int = 0
+    stored_bytes: int = 0
+    decoded_bytes: int = 0
+    read_s: float = 0.0
+    decode_s: float = 0.0
+    wall_s: float = 0.0
+    workers: int = 1
+
+    @property
+    def stored_mb_per_s(self) -> float:
+        """Compressed MB read from the file per second of wall time."""
+        return self.stored_bytes / 1e6 / self.wall_s if self.wall_s > 0 else 0.0
+
+    @property
+    def decoded_mb_per_s(self) -> float:
+        """Decompressed MB integrated per second of wall time."""
+        return self.decoded_bytes / 1e6 / self.wall_s if self.wall_s > 0 else 0.0
+
+
+def tof_chunk_filters(tof_data: h5py.Dataset) -> list[int] | None:
+    """
+    Return the filter pipeline of a chunked dataset, if it can be decoded here.
+
+    Args:
+        tof_data (h5py.Dataset): Dataset to inspect
+
+    Returns:
+        list[int] | None: Filter ids in write order, or None if the dataset is
+            not chunked or uses a filter other than deflate and shuffle
+    """
+    plist = tof_data.id.get_create_plist()
+    if plist.get_layout() != h5d.CHUNKED:
+        return None
+    filters = [plist.get_filter(i)[0] for i in range(plist.get_nfilters())]
+    if any(f not in _SUPPORTED_CHUNK_FILTERS for f in filters):
+        return None
+    return filters
+
+
+def decode_tof_chunk(
+    raw: bytes, filter_mask: int, filters: list[int], dtype: np.dtype, chunk_shape: tuple
+) -> np.ndarray:
+    """
+    Undo the deflate / shuffle filters of one raw HDF5 chunk.
+
+    zlib releases the GIL, so chunks decode in parallel on a thread pool.
+
+    Args:
+        raw (bytes): Chunk as returned by read_direct_chunk
+        filter_mask (int): Bit i set when filter i was skipped for this chunk
+        filters (list[int]): Filter ids from tof_chunk_filters
+        dtype (np.dtype): Dataset dtype
+        chunk_shape (tuple): Dataset chunk shape
+
+    Returns:
+        np.ndarray: Chunk values with shape chunk_shape
+    """
+    data = raw
+    for i in reversed(range(len(filters))):
+        if filter_mask & (1 << i):
+            continue
+        if filters[i] == h5z.FILTER_DEFLATE:
+            data = zlib.decompress(data)
+        elif filters[i] == h5z.FILTER_SHUFFLE:
+            size = np.dtype(dtype).itemsize
+            data = np.frombuffer(data, dtype=np.uint8).reshape(size, -1).T.tobytes()
+    return np.frombuffer(data, dtype=dtype).reshape(chunk_shape)
+
+
+def integrate_tof_data_chunked(
+    h5: h5py._hl.files.File, idx: np.ndarray | None = None, progress_callback=None,
+    max_workers: int = 1, stats_callback=None,
+) -> np.ndarray:
+    """
+    Integrate TofData to recreate PeakData, one row of HDF5 chunks at a time.
+
+    Gives the same values as integrate_tof_data. Work is split along the
+    dataset's native chunks: each unit covers the rows of one chunk row and
+    reads only the chunks that hold bins of the requested peak windows.
+    Every chunk is therefore read and decompressed exactly once. Raw chunks
+    are read with read_direct_chunk and decompressed and integrated on a
+    thread pool, straight into the preallocated output. Datasets that are
+    contiguous or use other filters fall back to integrate_tof_data.
+
+    Args:
+        h5 (h5py._hl.files.File): Opened h5 file
+        idx (np.ndarray | None): Only integrate these peak idx, or None for all
+        progress_callback (callable | None): Called with a 0..1 fraction after
+            each chunk row is integrated
+        max_workers (int): Number of chunk rows decoded concurrently
+        stats_callback (callable | None): Called with a TofReadStats when done
+
+    Returns:
+        np.ndarray: Data equivalent to PeakData
+    """
+    tof_data = h5["FullSpectra"]["TofData"]
+    filters = tof_chunk_filters(tof_data)
+    t_start = time.perf_counter()
+    if filters is None:
+        peaks = integrate_tof_data(h5, idx=idx, progress_callback=progress_callback)
+        if stats_callback is not None:
+            nbytes = int(np.prod(tof_data.shape)) * tof_data.dtype.itemsize
+            wall = time.perf_counter() - t_start
+            try:
+                stats_callback(TofReadStats(
+                    stored_bytes=nbytes, decoded_bytes=nbytes, read_s=wall, wall_s=wall))
+            except Exception:
+                _itk_log.exception("Handled exception in integrate_tof_data_chunked")
+        return peaks
+
+    lower, upper = _peak_window_bins(h5, idx)
+    lower, upper = lower.astype(np.int64), upper.astype(np.int64)
+
+    shape = tof_data.shape
+    chunks = tof_data.chunks
+    n_bins = shape[-1]
+    dtype = tof_data.dtype
+    fill = tof_data.fillvalue
+    peaks = np.empty((*shape[:-1], lower.size), dtype=np.float32)
+
+    # Only the bin chunks touched by a window (plus the bin after it, which
+    # reduceat needs as a boundary) are read.
+    needed = np.zeros(-(-n_bins // chunks[-1]), dtype=bool)
+    for lo, hi in zip(lower, np.minimum(upper + 2, n_bins)):
+        needed[lo // chunks[-1] : -(-max(hi, lo + 1) // chunks[-1])] = True
+    bin_chunks = np.flatnonzero(needed)
+    bin_lo = int(bin_chunks[0]) * chunks[-1] if bin_chunks.size else 0
+    bin_hi = min(n_bins, (int(bin_chunks[-1]) + 1) * chunks[-1]) if bin_chunks.size else 0
+    indicies = np.stack((lower - bin_lo, upper + 1 - bin_lo), axis=1)
+
+    middle = [range(0, n, c) for n, c in zip(shape[1:-1], chunks[1:-1])]
+    row_starts = range(0, shape[0], chunks[0])
+
+    def _integrate_rows(r0):
+        """Read, decode and integrate the chunks of rows r0:r0 + chunks[0]."""
+        r1 = min(r0 + chunks[0], shape[0])
+        block = np.zeros((r1 - r0, *shape[1:-1], bin_hi - bin_lo), dtype=dtype)
+        stats = TofReadStats()
+        for mid in itertools.product(*middle):
+            for b in bin_chunks:
+                offset = (r0, *mid, int(b) * chunks[-1])
+                t0 = time.perf_counter()
+                try:
+                    mask, raw = tof_data.id.read_direct_chunk(offset)
+                except RuntimeError:
+                    raw = None
+                t1 = time.perf_counter()
+                if raw is None:
+                    values = np.full(chunks, fill, dtype=dtype)
+                else:
+                    values = decode_tof_chunk(raw, mask, filters, dtype, chunks)
+                    stats.stored_bytes += len(raw)
+                stats.decoded_bytes += values.nbytes
+                stats.chunks += 1
+                dst = tuple(
+                    slice(0, min(c, n - o)) for o, c, n in zip(offset, chunks, shape)
+                )
+                target = (slice(0, r1 - r0),) + tuple(
+                    slice(o, o + d.stop) for o, d in zip(mid, dst[1:-1])
+                ) + (slice(offset[-1] - bin_lo, offset[-1] - bin_lo + dst[-1].stop),)
+                block[target] = values[dst]
+                stats.read_s += t1 - t0
+                stats.decode_s += time.perf_counter() - t1
+        if lower.size:
+            t1 = time.perf_counter()
+            peaks[r0:r1] = np.add.reduceat(block, indicies.flat, axis=-1)[..., ::2]
+            stats.decode_s += time.perf_counter() - t1
+        return stats
+
+    def _report(done):
+        if progress_callback is not None:
+            try:
+                progress_callback(done / max(1, len(row_starts)))
+            except Exception:
+                _itk_log.exception("Handled exception in integrate_tof_data_chunked")
+
+    total = TofReadStats(workers=max(1, max_workers))
+    if max_workers is None or max_workers <= 1 or len(row_starts) <= 1:
+        results = []
+        for i, r0 in enumerate(row_starts):
+            results.append(_integrate_rows(r0))
+            _report(i + 1)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_integrate_rows, r0) for r0 in row_starts]
+            results = []
+            for i, future in enumerate(futures):
+                results.append(future.result())
+                _report(i + 1)
+
+    for st in results:
+        total.chunks += st.chunks
+        total.stored_bytes += st.stored_bytes
+        total.decoded_bytes += st.decoded_bytes
+        total.read_s += st.read_s
+        total.decode_s += st.decode_s
+    total.wall_s = time.perf_counter() - t_start
+    _itk_log.debug(
+        "integrate_tof_data_chunked: %d chunks, %.1f MB stored (%.0f MB/s), "
+        "%.1f MB decoded (%.0f MB/s), %d workers",
+        total.chunks, total.stored_bytes / 1e6, total.stored_mb_per_s,
+        total.decoded_bytes / 1e6, total.decoded_mb_per_s, total.workers,
     )
+    if stats_callback is not None:
+        try:
+            stats_callback(total)
+        except Exception:
+            _itk_log.exception("Handled exception in integrate_tof_data_chunked")
 
-    return peaks * scale_factor
+    peaks *= _tof_scale_factor(h5)
+    return peaks
+
+
+def probe_tofwerk_file(path: Path | str) -> dict:
+    """
+    Read the mass table and run summary of a TOFWERK file from metadata only.
+
+    Only the PeakTable, the attributes and the dataset shapes are read; no
+    PeakData or TofData values are touched.
+
+    Args:
+        path (Path | str): Path to .hdf archive
+
+    Returns:
+        dict: Dictionary with keys:
+            - masses (np.ndarray): Peak masses from the PeakTable
+            - dwell_time (float): Dwell time in seconds
+            - num_acquisitions (int): Number of acquisitions in the file
+            - run_info (dict): File attributes, plus 'PeakTable' (np.ndarray)
+              and 'HasPeakData' (bool)
+    """
+    path = Path(path)
+
+    with h5py.File(path, "r") as h5:
+        info = h5["PeakData"]["PeakTable"][()]
+        has_peak_data = "PeakData" in h5["PeakData"]
+        if has_peak_data:
+            shape = h5["PeakData"]["PeakData"].shape
+        else:
+            shape = h5["FullSpectra"]["TofData"].shape
+        dwell = (
+            float(h5["TimingData"].attrs["TofPeriod"][0])
+            * 1e-9
+            * factor_extraction_to_acquisition(h5)
+        )
+        run_info = {}
+        for key, value in h5.attrs.items():
+            if isinstance(value, bytes):
+                value = value.decode(errors="replace")
+            elif isinstance(value, np.ndarray) and value.size == 1:
+                value = value.item()
+                if isinstance(value, bytes):
+                    value = value.decode(errors="replace")
+            run_info[key] = value
+
+    if "mass" in info.dtype.names:
+        masses = info["mass"]
+    else:
+        masses = np.array([
+            float(label.decode() if isinstance(label, bytes) else label)
+            for label in info["label"]
+        ])
+
+    run_info["PeakTable"] = info
+    run_info["HasPeakData"] = has_peak_data
+
+    return {
+        "masses": masses,
+        "dwell_time": dwell,
+        "num_acquisitions": int(np.prod(shape[:-1])),
+        "run_info": run_info,
+    }
+
+
+def peak_columns_as_structured(data: np.ndarray, names: list[str]) -> np.ndarray:
+    """
+    View peak data as a structured array with one field per peak.
+
+    Unlike rfn.unstructured_to_structured this does not copy the values, so
+    a large read is not held in memory twice while it is converted.
+
+    Args:
+        data (np.ndarray): Peak data with the peaks on the last axis
+        names (list[str]): Field name for each peak
+
+    Returns:
+        np.ndarray: 1D structured array, one record per acquisition
+    """
+    k = data.shape[-1]
+    fields = np.dtype({"names": names, "formats": [data.dtype] * k})
+    data = np.ascontiguousarray(data.reshape(-1, k))
+    return data.view(fields).reshape(-1)
+
+
+class TofwerkChannelSource:
+    """Read single peak channels from a TOFWERK file on demand.
+
+    The file is opened on the first read and kept open until close(). Each
+    read returns only the requested peaks, from PeakData if the file has it,
+    otherwise integrated from the TofData chunks.
+    """
+
+    def __init__(self, path: Path | str, max_workers: int = 1):
+        """
+        Args:
+            path (Path | str): Path to .hdf archive
+            max_workers (int): Number of TofData chunk rows decoded concurrently
+                when the file has no PeakData
+        """
+        self.path = Path(path)
+        self.max_workers = max_workers
+        self._h5 = None
+        self._lock = threading.Lock()
+
+    def _file(self) -> h5py.File:
+        if self._h5 is None or not self._h5.id.valid:
+            self._h5 = h5py.File(self.path, "r")
+        return self._h5
+
+    def read(self, idx) -> np.ndarray:
+        """
+        Read peak channels in ions/acquisition.
+
+        Args:
+            idx (array-like): PeakTable indices to read
+
+        Returns:
+            np.ndarray: 2D array (acquisitions, len(idx)), columns in the
+                order of ``idx``
+        """
+        idx = np.asarray(idx, dtype=np.int64).reshape(-1)
+        order, inverse = np.unique(idx, return_inverse=True)
+        with self._lock:
+            h5 = self._file()
+            if "PeakData" in h5["PeakData"]:
+                data = h5["PeakData"]["PeakData"][..., order]
+            else:
+                data = integrate_tof_data_chunked(
+                    h5, idx=order, max_workers=self.max_workers)
+            data *= factor_extraction_to_acquisition(h5)
+        data = data.reshape(-1, order.size)
+        if order.size != idx.size or np.any(order != idx):
+            data = data[:, inverse]
+        return data
+
+    def close(self) -> None:
+        """Close the file; the next read opens it again."""
+        with self._lock:
+            if self._h5 is not None:
+                try:
+                    self._h5.close()
+                except Exception:
+                    _itk_log.exception("Handled exception in TofwerkChannelSource.close")
+                self._h5 = None
+
+    def __del__(self):
+        h5 = getattr(self, "_h5", None)
+        if h5 is not None:
+            try:
+                h5.close()
+            except Exception:
+                pass
 
 
 def read_tofwerk_file(
-    path: Path | str, idx: np.ndarray | None = None, progress_callback=None
+    path: Path | str, idx: np.ndarray | None = None, progress_callback=None,
+    cache=None, max_workers: int = 1, stats_callback=None,
 ) -> tuple[np.ndarray, np.ndarray, float]:
     """
     Read a TOFWERK TofDaq .hdf file and return peak data and peak info.
@@ -190,6 +704,12 @@ def read_tofwerk_file(
         progress_callback (callable | None): Called with a 0..1 fraction as the
             data is read. When the file stores precomputed PeakData the read is
             a single fast slice, so the callback only reports completion.
+        cache (RunCache | None): Decoded-run cache from loading.run_cache, or
+            None to always decode. A hit returns memory-mapped arrays.
+        max_workers (int): Number of TofData chunk rows decoded concurrently
+            when the file has no PeakData
+        stats_callback (callable | None): Called with a TofReadStats when
+            TofData was integrated, see integrate_tof_data_chunked
 
     Returns:
         tuple: (data, info, dwell_time) where:
@@ -199,6 +719,24 @@ def read_tofwerk_file(
     """
     path = Path(path)
 
+    cache_key = None
+    if cache is not None:
+        from loading.run_cache import run_cache_key
+
+        cache_key = run_cache_key(
+            "tofwerk", [path],
+            {"idx": None if idx is None else np.asarray(idx).tolist()},
+        )
+        hit = cache.get(cache_key)
+        if hit is not None:
+            arrays, meta = hit
+            if progress_callback is not None:
+                try:
+                    progress_callback(1.0)
+                except Exception:
+                    _itk_log.exception("Handled exception in read_tofwerk_file")
+            return arrays["data"], arrays["info"], meta["dwell"]
+
     with h5py.File(path, "r") as h5:
         if idx is None:
             idx = np.arange(h5["PeakData"]["PeakTable"].shape[0])
@@ -207,7 +745,10 @@ def read_tofwerk_file(
         if "PeakData" in h5["PeakData"]:
             data = h5["PeakData"]["PeakData"][..., idx]
         else:
-            data = integrate_tof_data(h5, idx=idx, progress_callback=progress_callback)
+            data = integrate_tof_data_chunked(
+                h5, idx=idx, progress_callback=progress_callback,
+                max_workers=max_workers, stats_callback=stats_callback,
+            )
 
         data *= factor_extraction_to_acquisition(h5)
         info = h5["PeakData"]["PeakTable"][idx]
@@ -223,9 +764,9 @@ def read_tofwerk_file(
         except Exception:
             _itk_log.exception("Handled exception in read_tofwerk_file")
 
-    names = [x.decode() for x in info["label"]]
-   
-    data = rfn.unstructured_to_structured(data.reshape(-1, data.shape[-1]), names=names)
-    del names  
+    data = peak_columns_as_structured(data, [x.decode() for x in info["label"]])
+
+    if cache_key is not None:
+        cache.put(cache_key, {"data": data, "info": info}, {"dwell": dwell})
 
     return data, info, dwell
\ No newline at end of file
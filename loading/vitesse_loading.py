@@ -2,6 +2,9 @@
 import gzip
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import BinaryIO, Generator
 
@@ -13,6 +16,23 @@ _itk_log = logging.getLogger("IsotopeTrack.loading.vitesse_loading")
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class NuIntegFileTiming:
+    """Wall-clock cost of reading one '.integ' file.
+
+    ``read_s`` is the time spent pulling the (possibly compressed) bytes off
+    disk and ``decode_s`` the time spent decompressing, parsing and reducing
+    them, so comparing the two shows whether a load is disk- or CPU-bound.
+    """
+
+    file_num: int
+    compressed_bytes: int = 0
+    decoded_bytes: int = 0
+    records: int = 0
+    read_s: float = 0.0
+    decode_s: float = 0.0
+
+
 def open_nu_binary(path: Path) -> BinaryIO:
     """
     Open a Nu binary file, transparently decompressing gzip if needed.
@@ -118,6 +138,106 @@ def blank_nu_signal_data(
     return signals
 
 
+def _ragged_arange(counts: np.ndarray) -> np.ndarray:
+    """
+    Concatenate arange(c) for every c in counts.
+
+    Args:
+        counts (np.ndarray): Non-negative lengths
+
+    Returns:
+        np.ndarray: Positions within each run, length counts.sum()
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def blank_nu_signal_events(
+    events: dict[str, np.ndarray],
+    signals: np.ndarray,
+    masses: np.ndarray,
+    num_acc: int,
+    start_coef: tuple[float, float],
+    end_coef: tuple[float, float],
+) -> np.ndarray:
+    """
+    Apply auto-blanking from flat event arrays in one vectorised pass.
+
+    Gives exactly the same result as blank_nu_signal_data: each blanker-open
+    event (type 0) is paired with the next blanker-close event (type 1), and
+    repeated opens or unmatched closes are ignored. Event pairing, the
+    edge-to-mass conversion and the column lookup are done for all events at
+    once, and the rows blanked for each distinct mass-column range are
+    written in a single assignment instead of one slice per event.
+
+    Args:
+        events (dict[str, np.ndarray]): Events from collect_nu_autob_events
+        signals (np.ndarray): Signals from get_signals_from_nu_data
+        masses (np.ndarray): 1D array of masses from get_masses_from_nu_data
+        num_acc (int): Number of accumulations per acquisition
+        start_coef (tuple[float, float]): Blanker open coefficients 'BlMassCalStartCoef'
+        end_coef (tuple[float, float]): Blanker close coefficients 'BlMassCalEndCoef'
+
+    Returns:
+        np.ndarray: Blanked data
+    """
+    types = events["type"]
+    relevant = np.flatnonzero((types == 0) | (types == 1))
+    if relevant.size == 0:
+        return signals
+    t = types[relevant]
+    prev = np.concatenate(([1], t[:-1]))
+    starts = relevant[(t == 0) & (prev != 0)]
+    ends = relevant[(t == 1) & (prev == 0)]
+    starts = starts[: ends.size]
+    if starts.size == 0:
+        return signals
+
+    n_rows = signals.shape[0]
+    acq_start = (events["acq_number"][starts] // num_acc).astype(np.int64) - 1
+    acq_end = (events["acq_number"][ends] // num_acc).astype(np.int64) - 1
+    # Python slice semantics, as in signals[acq_start:acq_end].
+    acq_start = np.where(acq_start < 0, acq_start + n_rows, acq_start)
+    acq_end = np.where(acq_end < 0, acq_end + n_rows, acq_end)
+    acq_start = np.clip(acq_start, 0, n_rows)
+    acq_end = np.clip(acq_end, 0, n_rows)
+
+    num_edges = events["num_edges"][starts].astype(np.int64)
+    num_pairs = np.maximum(num_edges, 0) // 2
+    pair_event = np.repeat(np.arange(starts.size), num_pairs)
+    pair_pos = _ragged_arange(num_pairs)
+    first_edge = events["edge_start"][starts][pair_event] + 2 * pair_pos
+    open_edges = events["edges"][first_edge]
+    close_edges = events["edges"][first_edge + 1]
+
+    start_masses = (start_coef[0] + start_coef[1] * open_edges * 1.25) ** 2
+    end_masses = (end_coef[0] + end_coef[1] * close_edges * 1.25) ** 2
+    col_start = np.searchsorted(masses, start_masses)
+    col_end = np.searchsorted(masses, end_masses)
+
+    row_start = acq_start[pair_event]
+    row_end = acq_end[pair_event]
+    keep = (col_start < col_end) & (row_start < row_end)
+    col_start, col_end = col_start[keep], col_end[keep]
+    row_start, row_end = row_start[keep], row_end[keep]
+    if col_start.size == 0:
+        return signals
+
+    # Blanker windows map onto a handful of distinct mass-column ranges, so
+    # group the rectangles by column range and blank all of their rows at once.
+    ranges, group = np.unique(
+        np.stack((col_start, col_end), axis=1), axis=0, return_inverse=True
+    )
+    group = group.ravel()
+    for g, (c0, c1) in enumerate(ranges):
+        members = np.flatnonzero(group == g)
+        heights = row_end[members] - row_start[members]
+        rows = np.repeat(row_start[members], heights) + _ragged_arange(heights)
+        signals[rows, c0:c1] = np.nan
+
+    return signals
+
+
 def collect_nu_autob_data(
     root: Path,
     index: list[dict],
@@ -158,16 +278,76 @@ def collect_nu_autob_data(
     return autobs
 
 
+def collect_nu_autob_events(
+    root: Path,
+    index: list[dict],
+    cyc_number: int | None = None,
+    seg_number: int | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Collect Nu autoblank events from multiple files as flat arrays.
+
+    Args:
+        root (Path): Root directory path
+        index (list[dict]): List of index dictionaries
+        cyc_number (int | None): Cycle number to filter, or None for all
+        seg_number (int | None): Segment number to filter, or None for all
+
+    Returns:
+        dict[str, np.ndarray]: Concatenated events, see read_nu_autob_events
+    """
+    parts = []
+    for idx in index:
+        autob_path = root.joinpath(f"{idx['FileNum']}.autob")
+        if autob_path.exists():
+            parts.append(read_nu_autob_events(autob_path))
+        else:
+            logger.warning(
+                f"collect_nu_autob_events: missing autob {idx['FileNum']}, skipping"
+            )
+
+    if not parts:
+        return _empty_nu_autob_events()
+
+    edge_base = np.cumsum([0] + [p["edges"].size for p in parts[:-1]])
+    events = {
+        key: np.concatenate([p[key] for p in parts])
+        for key in ("cyc_number", "seg_number", "acq_number", "type", "num_edges")
+    }
+    events["edge_start"] = np.concatenate(
+        [p["edge_start"] + base for p, base in zip(parts, edge_base)]
+    )
+    events["edges"] = np.concatenate([p["edges"] for p in parts])
+
+    keep = np.ones(events["type"].size, dtype=bool)
+    if cyc_number is not None:
+        keep &= events["cyc_number"] == cyc_number
+    if seg_number is not None:
+        keep &= events["seg_number"] == seg_number
+    if not np.all(keep):
+        for key in events:
+            if key != "edges":
+                events[key] = events[key][keep]
+    return events
+
+
 def collect_nu_integ_data(
     root: Path,
     index: list[dict],
     cyc_number: int | None = None,
     seg_number: int | None = None,
     progress_callback=None,
+    mass_indices: np.ndarray | None = None,
+    max_workers: int = 1,
+    timing_callback=None,
 ) -> list[np.ndarray]:
     """
     Collect Nu integrated data from multiple files.
 
+    With max_workers > 1 the files are read and decompressed on a thread pool
+    (zlib releases the GIL), then reassembled in index order, so the result is
+    identical to a sequential read.
+
     Args:
         root (Path): Root directory path
         index (list[dict]): List of index dictionaries
@@ -176,39 +356,157 @@ def collect_nu_integ_data(
         progress_callback (callable | None): Called with a 0..1 fraction after
             each integ file is read, so callers can report read progress that
             is proportional to the number of .integ files.
+        mass_indices (np.ndarray | None): Keep only these result columns, or
+            None for all. Each file is reduced as soon as it is decoded, so
+            only the selected channels are held in memory.
+        max_workers (int): Number of files decoded concurrently
+        timing_callback (callable | None): Called with a NuIntegFileTiming for
+            each file read, in index order.
 
     Returns:
         list[np.ndarray]: List of integrated data arrays
     """
-    integs = []
     total = max(1, len(index))
-    for file_pos, idx in enumerate(index):
+
+    def _read_one(idx):
+        """
+        Read, filter and reduce one integ file.
+
+        Args:
+            idx (dict): Index entry of the file
+
+        Returns:
+            tuple: (data or None, NuIntegFileTiming)
+        """
+        timing = NuIntegFileTiming(file_num=idx["FileNum"])
         integ_path = root.joinpath(f"{idx['FileNum']}.integ")
-        if integ_path.exists():
-            data = read_nu_integ_binary(
-                integ_path,
-                idx["FirstCycNum"],
-                idx["FirstSegNum"],
-                idx["FirstAcqNum"],
-            )
-            if cyc_number is not None:
-                data = data[data["cyc_number"] == cyc_number]
-            if seg_number is not None:
-                data = data[data["seg_number"] == seg_number]
-            if data.size > 0:
-                integs.append(data)
-        else:
+        if not integ_path.exists():
             logger.warning(
                 f"collect_nu_integ_data: missing integ {idx['FileNum']}, skipping"
             )
+            return None, timing
+
+        t0 = time.perf_counter()
+        raw = integ_path.read_bytes()
+        t1 = time.perf_counter()
+        timing.compressed_bytes = len(raw)
+        buffer = gzip.decompress(raw) if raw[:2] == b"\x1f\x8b" else raw
+        del raw
+        timing.decoded_bytes = len(buffer)
+        data = parse_nu_integ_buffer(
+            buffer,
+            idx["FirstCycNum"],
+            idx["FirstSegNum"],
+            idx["FirstAcqNum"],
+        )
+        keep = np.ones(data.size, dtype=bool)
+        if cyc_number is not None:
+            keep &= data["cyc_number"] == cyc_number
+        if seg_number is not None:
+            keep &= data["seg_number"] == seg_number
+        if mass_indices is not None:
+            data = select_nu_integ_channels(data, mass_indices, keep)
+        elif not np.all(keep):
+            data = data[keep]
+        timing.records = int(data.size)
+        timing.read_s = t1 - t0
+        timing.decode_s = time.perf_counter() - t1
+        return data, timing
+
+    def _report(done):
+        """
+        Forward read progress to progress_callback.
+
+        Args:
+            done (int): Number of files read so far
+        """
         if progress_callback is not None:
             try:
-                progress_callback((file_pos + 1) / total)
+                progress_callback(done / total)
+            except Exception:
+                _itk_log.exception("Handled exception in collect_nu_integ_data")
+
+    if max_workers is None or max_workers <= 1 or len(index) <= 1:
+        results = []
+        for file_pos, idx in enumerate(index):
+            results.append(_read_one(idx))
+            _report(file_pos + 1)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_read_one, idx) for idx in index]
+            results = []
+            for file_pos, future in enumerate(futures):
+                results.append(future.result())
+                _report(file_pos + 1)
+
+    integs = []
+    for data, timing in results:
+        if timing_callback is not None:
+            try:
+                timing_callback(timing)
             except Exception:
                 _itk_log.exception("Handled exception in collect_nu_integ_data")
+        if data is not None and data.size > 0:
+            integs.append(data)
+
+    if results:
+        read_s = sum(t.read_s for _, t in results)
+        decode_s = sum(t.decode_s for _, t in results)
+        logger.debug(
+            f"collect_nu_integ_data: {len(results)} files, "
+            f"read {read_s:.3f}s, decode {decode_s:.3f}s, workers {max_workers}"
+        )
     return integs
 
 
+def select_nu_integ_channels(
+    integ: np.ndarray, mass_indices: np.ndarray, rows: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Reduce integ records to a subset of their result columns.
+
+    The returned array has the same fields as read_nu_integ_binary, with
+    'result' holding only the selected centers and signals, so it can be
+    passed to get_masses_from_nu_data and get_signals_from_nu_data unchanged.
+    The data is copied, so the decoded file buffer can be released.
+
+    Args:
+        integ (np.ndarray): Data from read_nu_integ_binary
+        mass_indices (np.ndarray): Result column indices to keep
+        rows (np.ndarray | None): Boolean mask of records to keep, or None for all
+
+    Returns:
+        np.ndarray: Integ records with len(mass_indices) results each
+    """
+    mass_indices = np.asarray(mass_indices, dtype=np.intp)
+    if rows is None or np.all(rows):
+        rows = np.arange(integ.size)
+    else:
+        rows = np.flatnonzero(rows)
+    cells = np.ix_(rows, mass_indices)
+
+    dtype = np.dtype(
+        [
+            ("cyc_number", np.uint32),
+            ("seg_number", np.uint32),
+            ("acq_number", np.uint32),
+            ("num_results", np.uint32),
+            (
+                "result",
+                [("center", np.float32), ("signal", np.float32)],
+                mass_indices.size,
+            ),
+        ]
+    )
+    out = np.empty(rows.size, dtype=dtype)
+    for name in ("cyc_number", "seg_number", "acq_number"):
+        out[name] = integ[name][rows]
+    out["num_results"] = mass_indices.size
+    out["result"]["center"] = integ["result"]["center"][cells]
+    out["result"]["signal"] = integ["result"]["signal"][cells]
+    return out
+
+
 def get_dwelltime_from_info(info: dict) -> float:
     """
     Read the dwell time (total acquisition time) from run.info.
@@ -231,8 +529,11 @@ def get_signals_from_nu_data(integs: list[np.ndarray], num_acc: int) -> np.ndarr
     """
     Convert signals from integ data to counts.
 
-    Vectorized placement per-chunk — processes each integ array with
-    NumPy index math and writes directly into the output.
+    Every record's destination row is computed in one pass over the records:
+    the per-cycle acquisition counts give each cycle's row offset, and each
+    record lands at its acquisition index plus that offset. Signals are then
+    copied straight into the preallocated output, so the cost is linear in
+    the number of records regardless of the number of cycles.
 
     Args:
         integs (list[np.ndarray]): List of data from read_integ_binary
@@ -241,51 +542,39 @@ def get_signals_from_nu_data(integs: list[np.ndarray], num_acc: int) -> np.ndarr
     Returns:
         np.ndarray: Signals in counts
     """
-    all_cycles = set()
-    for integ in integs:
-        if integ.size > 0:
-            all_cycles.update(np.unique(integ["cyc_number"]))
-    all_cycles = sorted(all_cycles)
-
-    max_acq_per_cycle = {}
-    for cycle in all_cycles:
-        cycle_max = 0
-        for integ in integs:
-            if integ.size > 0:
-                mask = integ["cyc_number"] == cycle
-                if np.any(mask):
-                    cycle_max = max(cycle_max, np.max(integ["acq_number"][mask]))
-        max_acq_per_cycle[cycle] = cycle_max
-
-    cycle_offsets = {}
-    current_offset = 0
-    for cycle in all_cycles:
-        cycle_offsets[cycle] = current_offset
-        current_offset += max_acq_per_cycle[cycle] // num_acc
-
-    signal_length = current_offset
     signal_width = integs[0]["result"]["signal"].shape[1] if integs[0].size > 0 else 0
+    integs = [integ for integ in integs if integ.size > 0]
+    if not integs:
+        return np.full((0, signal_width), np.nan, dtype=np.float32)
+
+    cyc = np.concatenate([integ["cyc_number"] for integ in integs]).astype(np.int64)
+    acq = np.concatenate([integ["acq_number"] for integ in integs]).astype(np.int64)
+
+    if cyc.max() <= 4 * cyc.size:
+        present = np.bincount(cyc) > 0
+        cycle_code = cyc
+    else:
+        uniq, cycle_code = np.unique(cyc, return_inverse=True)
+        present = np.ones(uniq.size, dtype=bool)
+    max_acq = np.zeros(present.size, dtype=np.int64)
+    np.maximum.at(max_acq, cycle_code, acq)
+
+    cycle_rows = np.where(present, max_acq // num_acc, 0)
+    cycle_offsets = np.cumsum(cycle_rows) - cycle_rows
+    signal_length = int(cycle_rows.sum())
+
+    target = acq // num_acc - 1 + cycle_offsets[cycle_code]
     signals = np.full((signal_length, signal_width), np.nan, dtype=np.float32)
 
+    pos = 0
     for integ in integs:
-        if integ.size == 0:
-            continue
-
-        acq_indices = (integ["acq_number"] // num_acc).astype(np.int64) - 1
-
-        offsets = np.empty(len(integ), dtype=np.int64)
-        for cycle in all_cycles:
-            mask = integ["cyc_number"] == cycle
-            if np.any(mask):
-                offsets[mask] = cycle_offsets[cycle]
-
-        target_indices = acq_indices + offsets
-
-        valid = (target_indices >= 0) & (target_indices < signal_length)
+        rows = target[pos : pos + integ.size]
+        pos += integ.size
+        valid = (rows >= 0) & (rows < signal_length)
         if np.all(valid):
-            signals[target_indices] = integ["result"]["signal"]
+            signals[rows] = integ["result"]["signal"]
         else:
-            signals[target_indices[valid]] = integ["result"]["signal"][valid]
+            signals[rows[valid]] = integ["result"]["signal"][valid]
 
     return signals
 
@@ -383,6 +672,141 @@ def read_nu_autob_binary(
     return autob_events
 
 
+def _empty_nu_autob_events() -> dict[str, np.ndarray]:
+    """Return an event dictionary with no events."""
+    return {
+        "cyc_number": np.empty(0, dtype=np.uint32),
+        "seg_number": np.empty(0, dtype=np.uint32),
+        "acq_number": np.empty(0, dtype=np.uint32),
+        "type": np.empty(0, dtype=np.uint8),
+        "num_edges": np.empty(0, dtype=np.int32),
+        "edge_start": np.empty(0, dtype=np.int64),
+        "edges": np.empty(0, dtype=np.uint32),
+    }
+
+
+def read_nu_autob_events(path: Path) -> dict[str, np.ndarray]:
+    """
+    Read a Nu autoblank binary file into flat event arrays.
+
+    The file is read in one go; only the record boundaries are walked in
+    Python, every field is then gathered with NumPy. Supports both plain and
+    gzip-compressed '.autob' files.
+
+    Args:
+        path (Path): Path to .autob file
+
+    Returns:
+        dict[str, np.ndarray]: One entry per event for 'cyc_number',
+            'seg_number', 'acq_number', 'type' and 'num_edges', plus 'edges'
+            (all edges concatenated) and 'edge_start' (offset of each event's
+            first edge in 'edges').
+    """
+    header_size = 4 + 4 + 4 + 4 + 4 + 1 + 4
+
+    with open_nu_binary(path) as fp:
+        buffer = fp.read()
+
+    starts = []
+    pos = 0
+    end = len(buffer)
+    while pos + header_size <= end:
+        starts.append(pos)
+        size = int.from_bytes(buffer[pos + 21 : pos + 25], "little", signed=True)
+        pos += header_size + 4 * max(size, 0)
+    if not starts:
+        return _empty_nu_autob_events()
+
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    starts = np.asarray(starts, dtype=np.int64)
+
+    def field(offset, dtype):
+        """Gather one header field of every event."""
+        width = np.dtype(dtype).itemsize
+        cols = starts[:, None] + offset + np.arange(width)
+        return np.ascontiguousarray(raw[cols]).view(dtype).ravel()
+
+    num_edges = field(21, "<i4")
+    counts = np.maximum(num_edges, 0).astype(np.int64)
+    # A truncated final record keeps only the edges actually present.
+    avail = (end - (starts + header_size)) // 4
+    counts = np.minimum(counts, np.maximum(avail, 0))
+    edge_start = np.cumsum(counts) - counts
+    byte_pos = np.repeat(starts + header_size, counts) + 4 * _ragged_arange(counts)
+    edges = np.ascontiguousarray(
+        raw[byte_pos[:, None] + np.arange(4)]
+    ).view("<u4").ravel()
+
+    return {
+        "cyc_number": field(0, "<u4").astype(np.uint32),
+        "seg_number": field(4, "<u4").astype(np.uint32),
+        "acq_number": field(8, "<u4").astype(np.uint32),
+        "type": field(20, "u1").astype(np.uint8),
+        "num_edges": num_edges.astype(np.int32),
+        "edge_start": edge_start,
+        "edges": edges.astype(np.uint32),
+    }
+
+
+def nu_integ_dtype(size: int) -> np.dtype:
+    """
+    Build the numpy dtype for an integrated data record.
+
+    Args:
+        size (int): Number of integration results per record
+
+    Returns:
+        np.dtype: Structured dtype for the record
+    """
+    data_dtype = np.dtype(
+        {
+            "names": ["center", "signal"],
+            "formats": [np.float32, np.float32],
+            "itemsize": 4 + 4 + 4 + 1,
+        }
+    )
+    return np.dtype(
+        [
+            ("cyc_number", np.uint32),
+            ("seg_number", np.uint32),
+            ("acq_number", np.uint32),
+            ("num_results", np.uint32),
+            ("result", data_dtype, size),
+        ]
+    )
+
+
+def parse_nu_integ_buffer(
+    buffer: bytes,
+    first_cyc_number: int | None = None,
+    first_seg_number: int | None = None,
+    first_acq_number: int | None = None,
+) -> np.ndarray:
+    """
+    Parse the decompressed contents of a Nu '.integ' file.
+
+    Args:
+        buffer (bytes): Decompressed file contents
+        first_cyc_number (int | None): Expected first cycle number
+        first_seg_number (int | None): Expected first segment number
+        first_acq_number (int | None): Expected first acquisition number
+
+    Returns:
+        np.ndarray: Integrated data array (a view of buffer)
+    """
+    cyc_number, seg_number, acq_number, num_results = np.frombuffer(
+        buffer, dtype="<u4", count=4
+    )
+    if first_cyc_number is not None and cyc_number != first_cyc_number:
+        raise ValueError("read_integ_binary: incorrect FirstCycNum")
+    if first_seg_number is not None and seg_number != first_seg_number:
+        raise ValueError("read_integ_binary: incorrect FirstSegNum")
+    if first_acq_number is not None and acq_number != first_acq_number:
+        raise ValueError("read_integ_binary: incorrect FirstAcqNum")
+
+    return np.frombuffer(buffer, dtype=nu_integ_dtype(int(num_results)))
+
+
 def read_nu_integ_binary(
     path: Path,
     first_cyc_number: int | None = None,
@@ -403,47 +827,12 @@ def read_nu_integ_binary(
     Returns:
         np.ndarray: Integrated data array
     """
-    def integ_dtype(size: int) -> np.dtype:
-        """
-        Build the numpy dtype for an integrated data record.
-
-        Args:
-            size (int): Number of integration results per record
-
-        Returns:
-            np.dtype: Structured dtype for the record
-        """
-        data_dtype = np.dtype(
-            {
-                "names": ["center", "signal"],
-                "formats": [np.float32, np.float32],
-                "itemsize": 4 + 4 + 4 + 1,
-            }
-        )
-        return np.dtype(
-            [
-                ("cyc_number", np.uint32),
-                ("seg_number", np.uint32),
-                ("acq_number", np.uint32),
-                ("num_results", np.uint32),
-                ("result", data_dtype, size),
-            ]
-        )
-
     with open_nu_binary(path) as fp:
-        cyc_number = int.from_bytes(fp.read(4), "little")
-        if first_cyc_number is not None and cyc_number != first_cyc_number:
-            raise ValueError("read_integ_binary: incorrect FirstCycNum")
-        seg_number = int.from_bytes(fp.read(4), "little")
-        if first_seg_number is not None and seg_number != first_seg_number:
-            raise ValueError("read_integ_binary: incorrect FirstSegNum")
-        acq_number = int.from_bytes(fp.read(4), "little")
-        if first_acq_number is not None and acq_number != first_acq_number:
-            raise ValueError("read_integ_binary: incorrect FirstAcqNum")
-        num_results = int.from_bytes(fp.read(4), "little")
-        fp.seek(0)
+        buffer = fp.read()
 
-        return np.frombuffer(fp.read(), dtype=integ_dtype(num_results))
+    return parse_nu_integ_buffer(
+        buffer, first_cyc_number, first_seg_number, first_acq_number
+    )
 
 
 def read_nu_directory(
@@ -454,6 +843,10 @@ def read_nu_directory(
     segment: int | None = None,
     raw: bool = False,
     progress_callback=None,
+    mass_indices: np.ndarray | None = None,
+    max_workers: int = 1,
+    timing_callback=None,
+    cache=None,
 ) -> tuple[np.ndarray, np.ndarray, dict]:
     """
     Read the Nu Instruments raw data directory, returning data and run info.
@@ -473,6 +866,16 @@ def read_nu_directory(
         progress_callback (callable | None): Called with a 0..1 fraction as the
             read proceeds. Most of the range tracks the .integ files; the tail
             covers signal assembly and autoblanking.
+        mass_indices (np.ndarray | None): Only read these mass columns, or None
+            for all. Indices are sorted and de-duplicated; the returned masses
+            and signal columns follow that order. Unselected channels are
+            dropped as each '.integ' file is decoded, so memory scales with the
+            number of selected masses rather than the full mass table.
+        max_workers (int): Number of '.integ' files decoded concurrently
+        timing_callback (callable | None): Called with a NuIntegFileTiming per
+            '.integ' file, see collect_nu_integ_data.
+        cache (RunCache | None): Decoded-run cache from loading.run_cache, or
+            None to always decode. A hit returns memory-mapped arrays.
 
     Returns:
         tuple: (masses, signals, run_info) where:
@@ -500,6 +903,39 @@ def read_nu_directory(
 
     accumulations = run_info["NumAccumulations1"] * run_info["NumAccumulations2"]
 
+    if mass_indices is not None:
+        mass_indices = np.unique(np.asarray(mass_indices, dtype=np.intp))
+
+    cache_key = None
+    if cache is not None:
+        from loading.run_cache import run_cache_key
+
+        sources = [path.joinpath(n) for n in ("run.info", "integrated.index", "autob.index")]
+        sources += [path.joinpath(f"{idx['FileNum']}.integ") for idx in integ_index]
+        if autoblank:
+            sources += [path.joinpath(f"{idx['FileNum']}.autob") for idx in autob_index]
+        cache_key = run_cache_key(
+            "nu",
+            sources,
+            {
+                "max_integ_files": max_integ_files,
+                "autoblank": autoblank,
+                "cycle": cycle,
+                "segment": segment,
+                "raw": raw,
+                "mass_indices": None if mass_indices is None else mass_indices.tolist(),
+            },
+        )
+        hit = cache.get(cache_key)
+        if hit is not None:
+            arrays, meta = hit
+            if progress_callback is not None:
+                try:
+                    progress_callback(1.0)
+                except Exception:
+                    _itk_log.exception("Handled exception in read_nu_directory")
+            return arrays["masses"], arrays["signals"], meta["run_info"]
+
     def _integ_progress(frac):
         """
         Scale integ read progress into the 0..0.85 range.
@@ -515,7 +951,8 @@ def read_nu_directory(
 
     integs = collect_nu_integ_data(
         path, integ_index, cyc_number=cycle, seg_number=segment,
-        progress_callback=_integ_progress,
+        progress_callback=_integ_progress, mass_indices=mass_indices,
+        max_workers=max_workers, timing_callback=timing_callback,
     )
     masses = get_masses_from_nu_data(
         integs[0], run_info["MassCalCoefficients"], segment_delays
@@ -532,11 +969,11 @@ def read_nu_directory(
         signals /= run_info["AverageSingleIonArea"]
 
     if autoblank:
-        autobs = collect_nu_autob_data(
+        autob_events = collect_nu_autob_events(
             path, autob_index, cyc_number=cycle, seg_number=segment
         )
-        signals = blank_nu_signal_data(
-            autobs,
+        signals = blank_nu_signal_events(
+            autob_events,
             signals,
             masses,
             accumulations,
@@ -544,6 +981,11 @@ def read_nu_directory(
             run_info["BlMassCalEndCoef"],
         )
 
+    if cache_key is not None:
+        cache.put(
+            cache_key, {"masses": masses, "signals": signals}, {"run_info": run_info}
+        )
+
     if progress_callback is not None:
         try:
             progress_callback(1.0)
@@ -553,6 +995,83 @@ def read_nu_directory(
     return masses, signals, run_info
 
 
+def _nu_decoded_size(path: Path) -> int:
+    """
+    Return the decoded size of a Nu binary file without decompressing it.
+
+    For gzip files this is the ISIZE trailer (size modulo 2**32), which is
+    exact for the file sizes Nu writes.
+
+    Args:
+        path (Path): Path to the binary file
+
+    Returns:
+        int: Size of the decoded contents in bytes
+    """
+    with path.open("rb") as fp:
+        if fp.read(2) != b"\x1f\x8b":
+            return path.stat().st_size
+        fp.seek(-4, 2)
+        return int.from_bytes(fp.read(4), "little")
+
+
+def probe_nu_directory(path: str | Path) -> dict:
+    """
+    Read the mass table and run summary of a Nu directory from headers only.
+
+    Only 'run.info', the index file, the first record of the first '.integ'
+    file and the gzip size trailers of the others are read, so the cost does
+    not depend on the length of the run.
+
+    Args:
+        path (str | Path): Path to data directory
+
+    Returns:
+        dict: Dictionary with keys:
+            - masses (np.ndarray): Masses from first acquisition
+            - dwell_time (float): Dwell time in seconds
+            - num_acquisitions (int): Number of acquisitions over all cycles
+            - run_info (dict): Dictionary of parameters from run.info
+    """
+    path = Path(path)
+    if not is_nu_directory(path):
+        raise ValueError("probe_nu_directory: missing 'run.info' or 'integrated.index'")
+
+    with path.joinpath("run.info").open("r") as fp:
+        run_info = json.load(fp)
+    with path.joinpath("integrated.index").open("r") as fp:
+        integ_index = json.load(fp)
+
+    integ_paths = [
+        path.joinpath(f"{idx['FileNum']}.integ") for idx in integ_index
+    ]
+    integ_paths = [p for p in integ_paths if p.exists()]
+    if not integ_paths:
+        raise ValueError("probe_nu_directory: no '.integ' files found")
+
+    with open_nu_binary(integ_paths[0]) as fp:
+        header = fp.read(16)
+        num_results = int.from_bytes(header[12:16], "little")
+        dtype = nu_integ_dtype(num_results)
+        first = parse_nu_integ_buffer(header + fp.read(dtype.itemsize - 16))
+
+    segment_delays = {
+        s["Num"]: s["AcquisitionTriggerDelayNs"] for s in run_info["SegmentInfo"]
+    }
+    masses = get_masses_from_nu_data(
+        first, run_info["MassCalCoefficients"], segment_delays
+    )[0]
+
+    num_acquisitions = sum(_nu_decoded_size(p) for p in integ_paths) // dtype.itemsize
+
+    return {
+        "masses": masses,
+        "dwell_time": float(get_dwelltime_from_info(run_info)),
+        "num_acquisitions": int(num_acquisitions),
+        "run_info": run_info,
+    }
+
+
 def select_nu_signals(
     masses: np.ndarray,
     signals: np.ndarray,
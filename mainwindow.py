@@ -1,5 +1,6 @@
 import sys
 import gc
+import contextlib
 from pathlib import Path
 from PySide6.QtWidgets import (QApplication, QMainWindow, QPushButton, QVBoxLayout, QLineEdit, QScrollArea,
                                QFileDialog, QProgressBar, QLabel, QHBoxLayout, QComboBox, QSizePolicy,
@@ -30,6 +31,9 @@ from widget.calibration_info import CalibrationInfoDialog
 from loading.data_thread import DataProcessThread
 from tools.Info_table import InfoTooltip
 from processing.peak_detection import PeakDetection
+from processing.redetection import RedetectionScheduler
+from processing.particle_table import (ParticleTable, calculate_mass_data, field_list,
+                                       field_values, particle_clusters)
 from tools.info_file import FileInfoMenu
 from widget.batch_parameters import BatchElementParametersDialog
 from save_export.project_manager import ProjectManager
@@ -270,6 +274,11 @@ class MainWindow(QMainWindow):
         self.needs_initial_detection = set()
         self._results_attention = False
         self.peak_detector = PeakDetection()
+        self.redetection_scheduler = RedetectionScheduler(
+            self.peak_detector, self._collect_redetection_jobs,
+            self._publish_redetection, parent=self)
+        self.redetection_scheduler.started.connect(self._on_redetection_started)
+        self.redetection_scheduler.published.connect(self._on_redetection_published)
         self.sample_method_info = {}
         self.sample_to_folder_map = {}
         self.transport_rate_methods = calibration_registry.default_transport_labels()
@@ -976,6 +985,8 @@ class MainWindow(QMainWindow):
                                 shortcut=QKeySequence(QKeySequence.StandardKey.New))
         open_action = _ma('fa6s.folder-open', "Import Data", self.select_folder,
                           shortcut="Ctrl+I")
+        live_action = _ma('fa6s.tower-broadcast', "Watch Live Nu Run",
+                          self.open_live_nu_watch)
         save_action = _ma('fa6s.floppy-disk', "Save Project", self.save_project,
                           shortcut=QKeySequence(QKeySequence.StandardKey.Save))
         save_as_action = _ma('fa6s.floppy-disk', "Save Project As…", self.save_project_as,
@@ -992,6 +1003,7 @@ class MainWindow(QMainWindow):
         file_menu.addAction(new_window_action)
         file_menu.addSeparator()
         file_menu.addAction(open_action)
+        file_menu.addAction(live_action)
         file_menu.addAction(save_action)
         file_menu.addAction(save_as_action)
         file_menu.addAction(load_action)
@@ -1039,6 +1051,9 @@ class MainWindow(QMainWindow):
         autosave_action = _ma('fa6s.clock', "Auto Save Settings",
                               self.open_autosave_settings, shortcut="Ctrl+Shift+S")
         tools_menu.addAction(autosave_action)
+        run_cache_action = _ma('fa6s.database', "Raw Data Cache",
+                               self.open_run_cache_settings)
+        tools_menu.addAction(run_cache_action)
 
         view_menu = menu_bar.addMenu("View")
         self._menu_icon_items.append((view_menu, 'fa6s.eye'))
@@ -2701,10 +2716,14 @@ class MainWindow(QMainWindow):
 
             if getattr(self, 'csv_thread', None) is not None:
                 if self.csv_thread.isRunning():
+                    self.csv_thread.requestInterruption()
                     self.csv_thread.quit()
                     self.csv_thread.wait(3000)
                 try:
                     self.csv_thread.progress.disconnect()
+                    self.csv_thread.file_progress.disconnect()
+                    self.csv_thread.rows_read.disconnect()
+                    self.csv_thread.memory_peak.disconnect()
                     self.csv_thread.finished.disconnect()
                     self.csv_thread.error.disconnect()
                 except (RuntimeError, TypeError):
@@ -2714,6 +2733,9 @@ class MainWindow(QMainWindow):
 
             self.csv_thread = CSVDataProcessThread(filtered_config, self)
             self.csv_thread.progress.connect(self.update_progress)
+            self.csv_thread.file_progress.connect(self.update_csv_file_progress)
+            self.csv_thread.rows_read.connect(self.update_csv_row_progress)
+            self.csv_thread.memory_peak.connect(self.update_csv_memory_peak)
             self.csv_thread.finished.connect(self.handle_csv_finished)
             self.csv_thread.error.connect(self.handle_error)
             self.csv_thread.start()
@@ -4221,7 +4243,7 @@ class MainWindow(QMainWindow):
             total = len(particles) if particles else 0
             highlight_red = (
                     total >= 10 and
-                    sum(1 for p in particles if p.get('SNR', 0) <= 1.1) / total * 100 >= 90
+                    np.count_nonzero(field_values(particles, 'SNR') <= 1.1) / total * 100 >= 90
             )
 
             if highlight_red:
@@ -4330,6 +4352,7 @@ class MainWindow(QMainWindow):
             self._on_per_element_sigma_changed(row, value)
         else:
             self.on_parameter_changed(row)
+        self._schedule_redetection()
 
     def on_parameter_changed(self, row):
         """Handle parameter change in table."""
@@ -4783,6 +4806,11 @@ class MainWindow(QMainWindow):
         even on exception. As a safety net, any detected peak whose
         centre time still landed inside one of its applicable bands is
         dropped from the results.
+
+        With incremental detection enabled, the changed elements are
+        re-detected in the background by ``redetection_scheduler``, which
+        runs the samples in the detection pool, and this returns at once;
+        the results appear when the whole run is done.
         """
         self.user_action_logger.log_analysis_step(
             'Peak Detection Started',
@@ -4791,6 +4819,19 @@ class MainWindow(QMainWindow):
                 'elements': list(self.selected_isotopes.keys()) if self.selected_isotopes else []
             }
         )
+        self._prepare_detection_parameters()
+        if getattr(self.peak_detector, 'incremental_enabled', False):
+            self.redetection_scheduler.request(0)
+            return None
+
+        self.redetection_scheduler.cancel()
+        with self._exclusion_masked_signals():
+            result = self.peak_detector.detect_particles(self)
+        self._finish_detection()
+        return result
+
+    def _prepare_detection_parameters(self):
+        """Save the table's parameters and fill in missing sigmas before detection."""
         self.save_current_parameters()
         if hasattr(self, 'sigma_spinbox'):
             current_sigma = self.sigma_spinbox.value()
@@ -4801,6 +4842,12 @@ class MainWindow(QMainWindow):
                     if existing_sigma is None:
                         self.sample_parameters[sample_name][element_key]['sigma'] = current_sigma
 
+    @contextlib.contextmanager
+    def _exclusion_masked_signals(self):
+        """Mask the exclusion regions out of the sample signals while the
+        block runs (see detect_particles); the originals are restored on
+        exit, also on exception.
+        """
         backups = {}
         exclusion_map = getattr(self, '_exclusion_regions_by_sample', {}) or {}
 
@@ -4882,16 +4929,18 @@ class MainWindow(QMainWindow):
                     self.data = masked
 
         try:
-            if hasattr(self.peak_detector, 'incremental_enabled') and self.peak_detector.incremental_enabled:
-                result = self.peak_detector.detect_particles_incremental(self)
-            else:
-                result = self.peak_detector.detect_particles(self)
+            yield
         finally:
             for sname, original in backups.items():
                 self.data_by_sample[sname] = original
                 if sname == self.current_sample:
                     self.data = original
 
+    def _finish_detection(self):
+        """Drop detected particles inside exclusion regions, apply the
+        non-linearity filter and refresh the particle data after detection.
+        """
+        exclusion_map = getattr(self, '_exclusion_regions_by_sample', {}) or {}
         for sname, entries in exclusion_map.items():
             if not entries:
                 continue
@@ -4927,19 +4976,23 @@ class MainWindow(QMainWindow):
                 if not bands:
                     continue
 
-                kept = []
-                for p in particles:
-                    if p is None:
-                        continue
-                    left = int(p.get('left_idx', 0))
-                    right = int(min(p.get('right_idx', left), n - 1))
-                    if left < 0 or left >= n:
-                        kept.append(p);
-                        continue
-                    t_centre = 0.5 * (time_arr[left] + time_arr[right])
-                    if not any(x0 <= t_centre <= x1 for x0, x1 in bands):
-                        kept.append(p)
-                detected[key] = kept
+                if not isinstance(particles, ParticleTable):
+                    particles = [p for p in particles if p is not None]
+                left = field_values(particles, 'left_idx').astype(np.int64)
+                right = field_values(particles, 'right_idx', np.nan)
+                right = np.where(np.isnan(right), left, right).astype(np.int64)
+                right = np.minimum(right, n - 1)
+                inside = (left >= 0) & (left < n)
+                t_centre = np.full(len(left), np.nan)
+                t_centre[inside] = 0.5 * (time_arr[left[inside]] + time_arr[right[inside]])
+                excluded = np.zeros(len(left), dtype=bool)
+                for x0, x1 in bands:
+                    excluded |= (t_centre >= x0) & (t_centre <= x1)
+                if isinstance(particles, ParticleTable):
+                    detected[key] = particles.take(~excluded)
+                else:
+                    detected[key] = [p for p, drop in zip(particles, excluded.tolist())
+                                     if not drop]
 
         if getattr(self, 'saturation_filter_enabled', False):
             if self.current_sample:
@@ -4960,7 +5013,41 @@ class MainWindow(QMainWindow):
                 self.rebuild_particle_data(sname)
 
         self._mark_results_changed()
-        return result
+
+    def _collect_redetection_jobs(self):
+        """Snapshot the changed elements for ``redetection_scheduler``."""
+        self._prepare_detection_parameters()
+        with self._exclusion_masked_signals():
+            return self.peak_detector.incremental_jobs(self)
+
+    def _publish_redetection(self, jobs, results):
+        """Merge a finished background re-detection into the window."""
+        processed = self.peak_detector.publish_incremental(self, jobs, results)
+        self._finish_detection()
+        self.unsaved_changes = True
+        self.status_label.setText(
+            f"Incremental detection complete! Processed {processed} changed elements")
+
+    def _on_redetection_started(self, jobs):
+        """Show that a background re-detection is running."""
+        n_elements = sum(len(job['changed_elements']) for job in jobs)
+        self.status_label.setText(
+            f"Re-detecting {n_elements} changed element(s) in {len(jobs)} "
+            f"sample(s) in the background...")
+
+    def _on_redetection_published(self, sample_names):
+        """Report a re-detection request that found nothing to do."""
+        if not sample_names and not self.redetection_scheduler.is_busy():
+            self.status_label.setText("No changes detected - skipping detection")
+
+    def _schedule_redetection(self):
+        """Re-detect changed elements in the background after an edit, once
+        there are detection results to keep current.
+        """
+        if not getattr(self.peak_detector, 'incremental_enabled', False):
+            return
+        if any(getattr(self, 'sample_detected_peaks', {}).values()):
+            self.redetection_scheduler.request()
 
     def process_single_sample(self, sample_name):
         """Process particle detection for single sample."""
@@ -5003,6 +5090,7 @@ class MainWindow(QMainWindow):
         if sample_name not in self.detection_states:
             self.detection_states[sample_name] = {}
         self.detection_states[sample_name][element_key] = 'changed'
+        self._schedule_redetection()
 
     def get_parameter_hash(self, sample_name, element_key):
         """Generate hash of current parameters for change detection.
@@ -5071,21 +5159,25 @@ class MainWindow(QMainWindow):
         element_key = f"{element}-{isotope:.4f}"
         display_label = self.get_formatted_label(element_key)
 
-        for particle in detected_particles:
-            if particle is None:
-                continue
-
+        for left_idx, right_idx, total_counts, max_height, snr, threshold in zip(
+                field_list(detected_particles, 'left_idx'),
+                field_list(detected_particles, 'right_idx'),
+                field_list(detected_particles, 'total_counts'),
+                field_list(detected_particles, 'max_height'),
+                field_list(detected_particles, 'SNR'),
+                field_list(detected_particles, 'threshold', 1)):
             row = self.results_table.rowCount()
             self.results_table.insertRow(row)
 
-            snr = particle.get('SNR', particle['max_height'] / particle.get('threshold', 1))
+            if snr is None:
+                snr = max_height / threshold
 
             items = [
                 QTableWidgetItem(display_label),
-                NumericTableWidgetItem(f"{self.time_array[particle['left_idx']]:.4f}"),
-                NumericTableWidgetItem(f"{self.time_array[particle['right_idx']]:.4f}"),
-                NumericTableWidgetItem(f"{particle['total_counts']:.0f}"),
-                NumericTableWidgetItem(f"{particle['max_height']:.0f}"),
+                NumericTableWidgetItem(f"{self.time_array[left_idx]:.4f}"),
+                NumericTableWidgetItem(f"{self.time_array[right_idx]:.4f}"),
+                NumericTableWidgetItem(f"{total_counts:.0f}"),
+                NumericTableWidgetItem(f"{max_height:.0f}"),
                 NumericTableWidgetItem(f"{snr:.2f}")
             ]
 
@@ -5237,13 +5329,14 @@ class MainWindow(QMainWindow):
         display_label = self.get_formatted_label(element_key)
         particle_count = len(detected_particles) if detected_particles else 0
 
+        particle_counts = np.empty(0)
         if detected_particles and particle_count > 0:
-            valid_particles = [p for p in detected_particles if p is not None]
-            total_counts = sum(p.get('total_counts', 0) for p in valid_particles)
-            mean_counts = total_counts / len(valid_particles) if valid_particles else 0
+            particle_counts = field_values(detected_particles, 'total_counts')
+            total_counts = float(particle_counts.sum())
+            mean_counts = total_counts / len(particle_counts) if len(particle_counts) else 0
 
-            sorted_counts = sorted([p.get('total_counts', 0) for p in valid_particles])
-            median_counts = sorted_counts[len(sorted_counts) // 2] if sorted_counts else 0
+            sorted_counts = np.sort(particle_counts)
+            median_counts = float(sorted_counts[len(sorted_counts) // 2]) if len(sorted_counts) else 0
         else:
             total_counts = 0.00000
             mean_counts = 0.00000
@@ -5294,18 +5387,11 @@ class MainWindow(QMainWindow):
                 slope = method_data['slope']
                 conversion_factor = slope / (self.average_transport_rate * 1000)
 
-                if conversion_factor > 0:
-                    if detected_particles and valid_particles:
-                        for particle in valid_particles:
-                            counts = particle.get('total_counts', 0)
-                            mass_fg = counts / conversion_factor
-                            mass_values.append(mass_fg)
-
-                        if mass_values:
-                            total_mass_fg = sum(mass_values)
-                            mean_mass_fg = total_mass_fg / len(mass_values)
-                            sorted_mass = sorted(mass_values)
-                            median_mass_fg = sorted_mass[len(sorted_mass) // 2]
+                if conversion_factor > 0 and len(particle_counts):
+                    mass_values = np.sort(particle_counts / conversion_factor)
+                    total_mass_fg = float(mass_values.sum())
+                    mean_mass_fg = total_mass_fg / len(mass_values)
+                    median_mass_fg = float(mass_values[len(mass_values) // 2])
 
         sample = getattr(self, 'current_sample', None)
         particles_per_ml = self.particles_per_ml(sample, particle_count, element_key) if sample else 0.00000
@@ -5313,7 +5399,9 @@ class MainWindow(QMainWindow):
         total_particles_all_elements = 0
         if hasattr(self, 'detected_peaks') and self.detected_peaks:
             for (elem, iso), particles in self.detected_peaks.items():
-                total_particles_all_elements += len([p for p in particles if p is not None])
+                total_particles_all_elements += (
+                    len(particles) if isinstance(particles, ParticleTable)
+                    else len([p for p in particles if p is not None]))
 
         percentage_of_all = (
                 particle_count / total_particles_all_elements * 100) if total_particles_all_elements > 0 else 0.00000
@@ -5390,8 +5478,7 @@ class MainWindow(QMainWindow):
                     'element': element,
                     'isotope': isotope,
                     'signal': signal,
-                    'clusters': [(p['left_idx'], p['right_idx'])
-                                 for p in particles if p],
+                    'clusters': particle_clusters(particles),
                 })
 
         try:
@@ -5546,17 +5633,14 @@ class MainWindow(QMainWindow):
             peak_times = []
             peak_heights = []
 
-            for p in particles:
-                if p is None:
-                    continue
-                left_idx = p['left_idx']
-                right_idx = p['right_idx']
+            for left_idx, right_idx, p_method in zip(
+                    field_list(particles, 'left_idx'), field_list(particles, 'right_idx'),
+                    field_list(particles, 'integration_method', 'Background')):
                 end = min(right_idx + 1, len(signal), len(time_array))
                 start = min(left_idx, end)
                 if start >= end:
                     continue
 
-                p_method = p.get('integration_method', 'Background')
                 if np.isscalar(lambda_bkgd):
                     bkgd_l = lambda_bkgd
                     thresh_l = threshold
@@ -6150,50 +6234,52 @@ class MainWindow(QMainWindow):
                                 peak_data = {'x': [], 'y': [], 'info': []}
                                 integ_data = {'x': [], 'y': []}
 
-                                for particle in self.detected_peaks[(element, isotope)]:
-                                    if particle is None:
-                                        continue
-
-                                    particle_start = self.time_array[particle['left_idx']]
-                                    particle_end = self.time_array[particle['right_idx']]
-
-                                    if (particle_start <= end_time and particle_end >= start_time):
-                                        peak_idx = particle['left_idx'] + np.argmax(
-                                            signal[particle['left_idx']:particle['right_idx'] + 1])
-                                        peak_x = self.time_array[peak_idx]
-                                        peak_y = signal[peak_idx]
-
-                                        peak_data['x'].append(peak_x)
-                                        peak_data['y'].append(peak_y)
-
-                                        # ── Collect integrated points for this particle ──
-                                        p_left = particle['left_idx']
-                                        p_right = particle['right_idx']
-                                        p_method = particle.get('integration_method', 'Background')
-                                        end_i = min(p_right + 1, len(signal), len(self.time_array))
-                                        start_i = min(p_left, end_i)
-                                        if start_i < end_i:
-                                            if p_method == 'Threshold':
-                                                integ_level = threshold_val
-                                            elif p_method == 'Midpoint':
-                                                integ_level = (background_val + threshold_val) / 2.0
-                                            else:
-                                                integ_level = background_val
-                                            s_region = signal[start_i:end_i]
-                                            above = s_region > integ_level
-                                            valid = np.arange(start_i, end_i)[above]
-                                            integ_data['x'].extend(self.time_array[valid].tolist())
-                                            integ_data['y'].extend(signal[valid].tolist())
-
-                                        snr = particle.get('SNR', peak_y / particle.get('threshold', 1))
-                                        hover_info = (
-                                            f"Element: {display_label}\n"
-                                            f"Peak Height: {peak_y:.0f} counts\n"
-                                            f"SNR: {snr:.2f}\n"
-                                            f"Background: {background_val:.1f} counts\n"
-                                            f"Threshold: {threshold_val:.1f} counts"
-                                        )
-                                        peak_data['info'].append(hover_info)
+                                peaks = self.detected_peaks[(element, isotope)]
+                                if not isinstance(peaks, ParticleTable):
+                                    peaks = [p for p in peaks if p is not None]
+                                lefts = field_values(peaks, 'left_idx').astype(np.int64)
+                                rights = field_values(peaks, 'right_idx').astype(np.int64)
+                                in_view = ((self.time_array[lefts] <= end_time)
+                                           & (self.time_array[rights] >= start_time))
+
+                                for peak_row in np.flatnonzero(in_view).tolist():
+                                    particle = peaks[peak_row]
+                                    peak_idx = particle['left_idx'] + np.argmax(
+                                        signal[particle['left_idx']:particle['right_idx'] + 1])
+                                    peak_x = self.time_array[peak_idx]
+                                    peak_y = signal[peak_idx]
+
+                                    peak_data['x'].append(peak_x)
+                                    peak_data['y'].append(peak_y)
+
+                                    # ── Collect integrated points for this particle ──
+                                    p_left = particle['left_idx']
+                                    p_right = particle['right_idx']
+                                    p_method = particle.get('integration_method', 'Background')
+                                    end_i = min(p_right + 1, len(signal), len(self.time_array))
+                                    start_i = min(p_left, end_i)
+                                    if start_i < end_i:
+                                        if p_method == 'Threshold':
+                                            integ_level = threshold_val
+                                        elif p_method == 'Midpoint':
+                                            integ_level = (background_val + threshold_val) / 2.0
+                                        else:
+                                            integ_level = background_val
+                                        s_region = signal[start_i:end_i]
+                                        above = s_region > integ_level
+                                        valid = np.arange(start_i, end_i)[above]
+                                        integ_data['x'].extend(self.time_array[valid].tolist())
+                                        integ_data['y'].extend(signal[valid].tolist())
+
+                                    snr = particle.get('SNR', peak_y / particle.get('threshold', 1))
+                                    hover_info = (
+                                        f"Element: {display_label}\n"
+                                        f"Peak Height: {peak_y:.0f} counts\n"
+                                        f"SNR: {snr:.2f}\n"
+                                        f"Background: {background_val:.1f} counts\n"
+                                        f"Threshold: {threshold_val:.1f} counts"
+                                    )
+                                    peak_data['info'].append(hover_info)
 
                                 # ── Integrated points (element colour, small, under peak markers) ──
                                 if integ_data['x']:
@@ -6919,6 +7005,42 @@ class MainWindow(QMainWindow):
             new_enabled, new_interval_ms = dlg.result_values()
             self._autosave.reconfigure(new_enabled, new_interval_ms)
 
+    def open_run_cache_settings(self):
+        """Open the Raw Data Cache settings dialog."""
+        from widget.run_cache_settings import RunCacheSettingsDialog
+        RunCacheSettingsDialog(self).exec()
+
+    def _live_detection_params(self):
+        """Return the detection parameters live acquisition should use.
+
+        Taken from the selected row of the parameters table (the first row
+        if none is selected), so live counts match a normal detection of
+        the finished run. Empty when no sample is loaded.
+        """
+        rows = self.parameters_table.rowCount()
+        if rows == 0:
+            return {}
+        row = self.parameters_table.currentRow()
+        params = self.get_element_parameters(row if 0 <= row < rows else 0)
+        params.pop('element', None)
+        params.pop('include', None)
+        params['max_iterations'] = 4
+        return params
+
+    def open_live_nu_watch(self):
+        """Open the live Nu acquisition window, reusing the open one."""
+        from loading.nu_live import NuLiveWatchDialog
+        dialog = getattr(self, '_live_nu_dialog', None)
+        if dialog is None:
+            dialog = NuLiveWatchDialog(self, detection_params=self._live_detection_params())
+            dialog.destroyed.connect(lambda *_: setattr(self, '_live_nu_dialog', None))
+            self._live_nu_dialog = dialog
+        elif not dialog.is_watching():
+            dialog.set_detection_params(self._live_detection_params())
+        dialog.show()
+        dialog.raise_()
+        dialog.activateWindow()
+
     def maybe_prompt_dilution(self):
         """Show the one time dilution correction prompt when appropriate."""
         tools.dilution_utils.maybe_prompt_dilution(self)
@@ -6936,6 +7058,12 @@ class MainWindow(QMainWindow):
                         particle['_source_sample'] = sample_name
                         all_particles.append(particle)
             particles = all_particles
+        elif isinstance(particles, ParticleTable) and calculate_mass_data(
+                particles, element_cache, self.current_sample,
+                self.mass_fraction_service, self.periodic_table_info):
+            if progress:
+                progress.setValue(len(particles))
+            return
 
         for i, particle in enumerate(particles):
             if progress and i % 100 == 0:
@@ -7087,6 +7215,21 @@ class MainWindow(QMainWindow):
         """Update progress bar value."""
         self.progress_bar.setValue(value)
 
+    def update_csv_file_progress(self, files_done, total_files, file_name):
+        """Show which file of a CSV/Excel batch has just been read."""
+        self.status_label.setText(
+            f"Processing CSV files: {files_done}/{total_files} read ({file_name})")
+
+    def update_csv_row_progress(self, file_index, rows_done, rows_total):
+        """Show how far a large worksheet has been read."""
+        self.status_label.setText(
+            f"Reading worksheet: {rows_done:,} of ~{rows_total:,} rows")
+
+    def update_csv_memory_peak(self, file_index, peak_mb):
+        """Report the estimated peak memory a chunked text import needed."""
+        self.status_label.setText(
+            f"Text file read with an estimated peak of ~{peak_mb:,.0f} MB")
+
     def update_sample_progress(self, thread_progress, sample_name, current_sample, total_samples):
         """Update progress bar for sample processing."""
         sample_increment = 100 / total_samples
@@ -7446,14 +7589,17 @@ class MainWindow(QMainWindow):
 
             windows = []
             for key, particles in detected.items():
+                if not particles:
+                    continue
                 sig = None
                 sig_loaded = False
-                for p in particles or []:
-                    if p is None:
-                        continue
-                    snr = p.get('SNR')
-                    if snr is not None and float(snr) < self.saturation_min_snr:
-                        continue
+                rows = (particles if isinstance(particles, ParticleTable)
+                        else [p for p in particles if p is not None])
+                candidates = ~(field_values(rows, 'SNR', np.nan) < self.saturation_min_snr)
+                if isinstance(rows, ParticleTable) and rows.has_field('fwhm_s'):
+                    candidates &= ~(field_values(rows, 'fwhm_s', np.nan) <= max_s)
+                for i in np.flatnonzero(candidates).tolist():
+                    p = rows[i]
                     if not sig_loaded:
                         sig = _signal_for(key)
                         sig_loaded = True
@@ -7478,19 +7624,24 @@ class MainWindow(QMainWindow):
             for key, particles in list(detected.items()):
                 if not particles:
                     continue
-                kept, removed = [], []
-                for p in particles:
-                    if p is None:
-                        continue
-                    t_apex = self._particle_apex_time(p, time_arr)
-                    if any(t0 <= t_apex <= t1 for t0, t1 in windows):
-                        removed.append(p)
-                    else:
-                        kept.append(p)
-                if removed:
-                    detected[key] = kept
-                    store.setdefault(key, []).extend(removed)
-                    n_removed += len(removed)
+                rows = (particles if isinstance(particles, ParticleTable)
+                        else [p for p in particles if p is not None])
+                apex = field_values(rows, 'peak_time', np.nan)
+                for i in np.flatnonzero(np.isnan(apex)).tolist():
+                    apex[i] = self._particle_apex_time(rows[i], time_arr)
+                inside = np.zeros(len(apex), dtype=bool)
+                for t0, t1 in windows:
+                    inside |= (apex >= t0) & (apex <= t1)
+                if not inside.any():
+                    continue
+                if isinstance(rows, ParticleTable):
+                    kept, removed = rows.take(~inside), list(rows.take(inside))
+                else:
+                    kept = [p for p, hit in zip(rows, inside.tolist()) if not hit]
+                    removed = [p for p, hit in zip(rows, inside.tolist()) if hit]
+                detected[key] = kept
+                store.setdefault(key, []).extend(removed)
+                n_removed += len(removed)
 
             if sname == self.current_sample and getattr(self, 'multi_element_particles', None):
                 kept, removed = [], []
@@ -7934,6 +8085,12 @@ class MainWindow(QMainWindow):
         if getattr(self, '_undo_manager', None) is not None:
             self._undo_manager.stop()
 
+        if getattr(self, 'redetection_scheduler', None) is not None:
+            self.redetection_scheduler.shutdown()
+
+        if getattr(self, '_live_nu_dialog', None) is not None:
+            self._live_nu_dialog.stop_watch()
+
         for timer in self.findChildren(QTimer):
             timer.stop()
 
@@ -8095,7 +8252,7 @@ class MainWindow(QMainWindow):
             peak_count = len(peaks)
             total_peaks += peak_count
 
-            strong_peaks += sum(1 for p in peaks if p.get('SNR', 0) >= 2.5)
+            strong_peaks += int(np.count_nonzero(field_values(peaks, 'SNR') >= 2.5))
 
         if total_peaks == 0:
             return 0
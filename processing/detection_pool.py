@@ -0,0 +1,290 @@
+"""Particle detection in worker processes.
+
+PeakDetection.detect_particles used to run samples on a thread pool, where
+the per-particle Python work holds the GIL and the GUI thread competes for
+it. The pool here runs the GUI-free part of a sample's detection
+(PeakDetection.detect_sample_signals: thresholds and peaks) in separate
+processes instead.
+
+A sample's signals are copied once into a shared-memory block that the
+worker maps without unpickling, and the worker returns its peaks as
+ParticleTables, so only typed arrays cross the process boundary in either
+direction. Workers are started with the 'spawn' method (forking a process
+that runs Qt is not safe) and are kept for the session, so each worker pays
+its start-up imports and Numba loads once. A worker's threshold cache
+starts as a copy of the GUI process's shared one (processing.threshold_cache)
+and takes the same size limit. The thresholds a worker solves come back with
+its result and are added to the shared cache (the one saved on exit). They
+are also passed on with the next max_workers samples submitted, so they
+reach the other workers. Each task carries only those recent thresholds,
+not everything learned in the session.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from processing.threshold_cache import shared_cache
+
+_itk_log = logging.getLogger("IsotopeTrack.processing.detection_pool")
+
+#: Key of the time array in a sample's shared block.
+_TIME_KEY = '__time__'
+
+#: Byte alignment of each array in a shared block.
+_ALIGN = 64
+
+
+def default_worker_count() -> int:
+    """Return the default number of worker processes (all cores but one)."""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+class SharedSignals:
+    """Arrays copied into one shared-memory block for worker processes.
+
+    The creating process owns the block: close() releases and removes it.
+    ``descriptor`` is the small, picklable layout a worker passes to
+    attach_signals.
+    """
+
+    def __init__(self, arrays: dict):
+        """
+        Args:
+            arrays (dict): Name to array; each is stored C-contiguous
+        """
+        arrays = {key: np.ascontiguousarray(arr) for key, arr in arrays.items()}
+        layout, offset = {}, 0
+        for key, arr in arrays.items():
+            offset = -(-offset // _ALIGN) * _ALIGN
+            layout[key] = (offset, arr.dtype.str, arr.shape)
+            offset += arr.nbytes
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for key, arr in arrays.items():
+            start, dtype, shape = layout[key]
+            view = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=start)
+            view[...] = arr
+            del view
+        self.descriptor = (self._shm.name, layout)
+        self.nbytes = offset
+
+    def close(self) -> None:
+        """Release and remove the block; safe to call more than once."""
+        if self._shm is None:
+            return
+        shm, self._shm = self._shm, None
+        try:
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            _itk_log.debug("Shared signal block %s already removed", shm.name)
+
+
+def attach_signals(descriptor) -> tuple[shared_memory.SharedMemory, dict]:
+    """
+    Map a block made by SharedSignals in this process.
+
+    Args:
+        descriptor (tuple): SharedSignals.descriptor
+
+    Returns:
+        tuple: (SharedMemory, name -> read-only array view); close the
+        SharedMemory once the views are no longer used
+    """
+    name, layout = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    views = {}
+    for key, (start, dtype, shape) in layout.items():
+        view = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)
+        view.flags.writeable = False
+        views[key] = view
+    return shm, views
+
+
+_worker_detector = None
+
+
+def _init_worker(thresholds, max_entries):
+    """Worker initializer: seed the worker's threshold cache from the parent's."""
+    cache = shared_cache()
+    cache.max_entries = max(1, int(max_entries))
+    cache.merge(thresholds)
+
+
+def _detect_shared_sample(sample_name, descriptor, params, isotope_mapping, valid_elements,
+                          channel_workers=1, thresholds=None):
+    """
+    Worker entry point: detect one sample whose signals are in shared memory.
+
+    Returns:
+        tuple: (detect_sample_signals result, thresholds solved for the
+        sample, threshold cache misses of the sample)
+    """
+    global _worker_detector
+    if _worker_detector is None:
+        from processing.peak_detection import PeakDetection
+        _worker_detector = PeakDetection()
+    cache = _worker_detector.threshold_cache
+    if thresholds:
+        cache.merge(thresholds)
+    misses = cache.misses
+    shm, views = attach_signals(descriptor)
+    try:
+        time = views[_TIME_KEY]
+        signals = {key: views[isotope_key] for key, isotope_key in isotope_mapping.items()}
+        result = _worker_detector.detect_sample_signals(
+            sample_name, time, signals, params, isotope_mapping, valid_elements,
+            channel_workers=channel_workers)
+    finally:
+        time = signals = views = None
+        try:
+            shm.close()
+        except BufferError:
+            _itk_log.debug("Shared signals of %s still referenced; left mapped", sample_name)
+    return result, cache.take_new(), cache.misses - misses
+
+
+class DetectionPool:
+    """Process pool running PeakDetection.detect_sample_signals per sample.
+
+    ``worker_misses`` counts the threshold cache misses of the workers, i.e.
+    the thresholds they had to solve themselves.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        """
+        Args:
+            max_workers (int | None): Worker processes (default:
+                default_worker_count())
+        """
+        self.max_workers = max_workers or default_worker_count()
+        self._executor = None
+        # [sends left, thresholds] per result whose thresholds still go out
+        # with the next samples submitted.
+        self._learned = []
+        self._learned_lock = threading.Lock()
+        self.worker_misses = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            cache = shared_cache()
+            with self._learned_lock:
+                self._learned = []
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(cache.snapshot(), cache.max_entries))
+        return self._executor
+
+    def _record_learned(self, thresholds: dict) -> None:
+        """Queue thresholds a worker solved for the next max_workers samples."""
+        if thresholds:
+            with self._learned_lock:
+                self._learned.append([self.max_workers, dict(thresholds)])
+
+    def _take_learned(self) -> dict:
+        """Return the queued thresholds for one sample, counting the send."""
+        learned = {}
+        with self._learned_lock:
+            for entry in self._learned:
+                learned.update(entry[1])
+                entry[0] -= 1
+            self._learned = [entry for entry in self._learned if entry[0] > 0]
+        return learned
+
+    def submit(self, sample_name, time, signals, params, isotope_mapping,
+               valid_elements, channel_workers=1) -> Future:
+        """
+        Start detecting one sample.
+
+        Args:
+            sample_name (str): Sample name (for logging)
+            time (ndarray): Time array of the sample
+            signals (dict): Element key to signal array
+            params (dict): Element key to detection parameters
+            isotope_mapping (dict): Element key to isotope (data) key
+            valid_elements (list): (element, isotope, element_key,
+                isotope_key) per isotope to detect
+            channel_workers (int): Threads the worker uses for the sample's
+                channels (large samples only, see detect_sample_signals)
+
+        Returns:
+            Future: Resolves to detect_sample_signals' (detected_peaks,
+            thresholds); the thresholds the worker solved are added to this
+            process's shared threshold cache first, and sent to the workers
+            with the next max_workers samples
+
+        Raises:
+            concurrent.futures.process.BrokenProcessPool: If a worker died
+        """
+        arrays = {_TIME_KEY: time}
+        for element_key, isotope_key in isotope_mapping.items():
+            arrays.setdefault(isotope_key, signals[element_key])
+        shared = SharedSignals(arrays)
+        try:
+            pool = self._pool()
+            learned = self._take_learned()
+            future = pool.submit(
+                _detect_shared_sample, sample_name, shared.descriptor,
+                {k: dict(v) for k, v in params.items()}, dict(isotope_mapping),
+                list(valid_elements), channel_workers, learned)
+        except BaseException:
+            shared.close()
+            raise
+        outer = Future()
+        outer.set_running_or_notify_cancel()
+
+        def finish(done):
+            shared.close()
+            try:
+                result, new_thresholds, misses = done.result()
+            except BaseException as exc:
+                outer.set_exception(exc)
+                return
+            shared_cache().merge(new_thresholds)
+            if self._executor is pool:
+                self._record_learned(new_thresholds)
+            with self._learned_lock:
+                self.worker_misses += misses
+            outer.set_result(result)
+
+        future.add_done_callback(finish)
+        return outer
+
+    def reset(self) -> None:
+        """Drop the workers (e.g. after one died); new ones start on demand."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_pool = None
+
+
+def get_detection_pool() -> DetectionPool:
+    """Return the session's detection pool, created on first use."""
+    global _pool
+    if _pool is None:
+        _pool = DetectionPool()
+    return _pool
+
+
+def shutdown_detection_pool() -> None:
+    """Stop the session's detection workers, if any were started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
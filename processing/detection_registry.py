@@ -12,6 +12,8 @@ live in ``processing/peak_detection.py``.
 The numeric hooks mirror, expression for expression, the original branches they
 replaced, so detection results are unchanged. ``tests/test_detection_registry.py``
 checks that equivalence against a reference transcription of the old logic.
+A method may also provide a ``batch`` hook that evaluates many background
+values in one call; window-mode thresholds use it for their background grid.
 
 Only numpy is imported, so this module is safe to import (and unit-test) without
 PySide6, numba, or scipy.
@@ -55,9 +57,7 @@ def _analytic_interp_array(method, engine, lam_arr, alpha, sigma):
         return np.full_like(lam_arr, single_thresh)
     n_eval = min(30, max(5, int((max_bg - min_bg) / 0.5)))
     eval_bg = np.linspace(min_bg, max_bg, n_eval)
-    eval_thresh = np.array([
-        method.single_threshold(engine, bg, alpha, sigma) for bg in eval_bg
-    ])
+    eval_thresh = method.batch_threshold(engine, eval_bg, alpha, sigma)
     return np.interp(lam_arr, eval_bg, eval_thresh)
 
 
@@ -74,28 +74,57 @@ def _cpln_lognormal_single(engine, lam, alpha, sigma):
     return engine.compound_poisson_lognormal.get_threshold(lam, alpha, sigma=sigma)
 
 
+def _cpln_lognormal_batch(engine, lams, alpha, sigma):
+    """Analytic Compound Poisson Log-Normal thresholds for many backgrounds.
+
+    Solved together by ``get_thresholds``; equal to the single-value hook up
+    to one quantile grid step (see
+    ``compound_poisson_lognormal_quantile_batch``).
+    """
+    if sigma is None or sigma <= 0:
+        sigma = 0.55
+    return engine.compound_poisson_lognormal.get_thresholds(lams, alpha, sigma=sigma)
+
+
 def _cpln_table_single(engine, lam, alpha, sigma):
     """Lookup-table Compound Poisson Log-Normal threshold (uses caller sigma)."""
     return engine.compound_poisson_lognormal_lut.get_threshold(lam, alpha, sigma)
 
 
+def _cpln_table_batch(engine, lams, alpha, sigma):
+    """Lookup-table Compound Poisson Log-Normal thresholds for many backgrounds
+    in one table query (equal to the single-value hook)."""
+    return engine.compound_poisson_lognormal_lut.get_thresholds(lams, alpha, sigma)
+
+
 # ── Method type ───────────────────────────────────────────────────────────────
 class DetectionMethod:
     """One detection method: metadata plus the numeric hooks the engine calls."""
 
     def __init__(self, id, label, *, is_manual=False, user_selectable=True,
-                 single, array):
+                 single, array, batch=None):
         self.id = id
         self.label = label
         self.is_manual = is_manual
         self.user_selectable = user_selectable
         self._single = single
         self._array = array
+        self._batch = batch
 
     def single_threshold(self, engine, lambda_bkgd, alpha, sigma):
         """Threshold for a single background value."""
         return self._single(engine, lambda_bkgd, alpha, sigma)
 
+    def batch_threshold(self, engine, lambda_values, alpha, sigma):
+        """Thresholds for several background values at once.
+
+        Uses the method's batch hook if it has one, else the single-value
+        hook per value.
+        """
+        if self._batch is not None:
+            return np.asarray(self._batch(engine, lambda_values, alpha, sigma), dtype=float)
+        return np.array([self._single(engine, lam, alpha, sigma) for lam in lambda_values])
+
     def array_threshold(self, engine, lambda_bkgd_array, alpha, sigma):
         """Threshold for an array of background values (moving window)."""
         return self._array(self, engine, lambda_bkgd_array, alpha, sigma)
@@ -150,12 +179,14 @@ register(DetectionMethod(
     user_selectable=True,
     single=_cpln_lognormal_single,
     array=_analytic_interp_array,
+    batch=_cpln_lognormal_batch,
 ))
 register(DetectionMethod(
     "CPLN table", "CPLN table",
     user_selectable=True,
     single=_cpln_table_single,
     array=_analytic_interp_array,
+    batch=_cpln_table_batch,
 ))
 register(DetectionMethod(
     "Poisson", "Poisson 3-sigma",
@@ -0,0 +1,1074 @@
+"""Columnar storage for detected particles.
+
+Detection used to keep every particle as a Python dict: one per isotope peak
+in ``sample_detected_peaks`` and one per multi-element particle in
+``sample_particle_data``. ParticleTable holds the same data as one typed
+array per field, plus one (particle x label) matrix per element-keyed field
+such as ``elements`` (the counts of each element in each particle) or
+``element_mass_fg``.
+
+Code that still works particle by particle can index or iterate a table as
+before: each row comes back as a dict whose writes (including writes into
+its element dicts) go straight back into the columns. Rows are built a block
+at a time when they are read, and only the most recent block is kept, so a
+pass over every row does not leave a dict per particle behind. Code that
+touches every particle should prefer the columns: field_values, field_list
+and keyed_values read one field of a table or of a list of particle dicts
+alike, and calculate_mass_data is the column-wise mass calculation.
+"""
+from __future__ import annotations
+
+import logging
+import numbers
+from collections.abc import Sequence
+
+import numpy as np
+
+_itk_log = logging.getLogger("IsotopeTrack.processing.particle_table")
+
+#: Block size used when building rows; only the most recently read block of
+#: rows is kept.
+ITER_BLOCK_ROWS = 4096
+
+#: Fields of a per-isotope detection result, in dict key order.
+PEAK_FIELDS = ('peak_time', 'max_height', 'total_counts', 'SNR', 'left_idx',
+               'right_idx', 'peak_valid', 'integration_method', 'fwhm_s')
+
+_ELEMENT_DICT_KEYS = [
+    'elements', 'element_mass_fg', 'element_moles_fmol',
+    'particle_mass_fg', 'particle_moles_fmol',
+    'element_diameter_nm', 'particle_diameter_nm',
+    'mass_fractions_used', 'densities_used', 'molar_masses',
+    'mass_fg', 'mass_percentages', 'mole_percentages',
+]
+
+_SCALAR_KEYS = [
+    'start_time', 'end_time', 'left_idx', 'right_idx',
+    'max_height', 'total_counts', 'SNR', 'threshold',
+    'background', 'element_count',
+]
+
+_INT_SCALAR_KEYS = ('left_idx', 'right_idx', 'element_count')
+
+# Marks a field a row does not have while rows are being assembled.
+_ABSENT = object()
+
+
+def _kind(value) -> str:
+    """Return the column kind for a scalar: 'b', 'i', 'f' or 'O'."""
+    if isinstance(value, (bool, np.bool_)):
+        return 'b'
+    if isinstance(value, numbers.Integral):
+        return 'i'
+    if isinstance(value, numbers.Real):
+        return 'f'
+    return 'O'
+
+
+def _is_number(value) -> bool:
+    """True for real numbers other than bools."""
+    return isinstance(value, numbers.Number) and not isinstance(value, (bool, np.bool_))
+
+
+def _plain(value):
+    """Return ``value`` with row dicts replaced by plain dicts, recursively."""
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+
+class _Column:
+    """One scalar field: a typed array and an optional presence mask."""
+
+    __slots__ = ('values', 'present')
+
+    def __init__(self, values: np.ndarray, present: np.ndarray | None = None):
+        self.values = values
+        self.present = present
+
+    @classmethod
+    def empty(cls, n: int, kind: str) -> _Column:
+        if kind == 'f':
+            values = np.full(n, np.nan)
+        elif kind == 'i':
+            values = np.zeros(n, dtype=np.int64)
+        elif kind == 'b':
+            values = np.zeros(n, dtype=bool)
+        else:
+            values = np.full(n, None, dtype=object)
+        return cls(values, np.zeros(n, dtype=bool))
+
+    @property
+    def kind(self) -> str:
+        return self.values.dtype.kind
+
+    def is_set(self, i: int) -> bool:
+        return self.present is None or bool(self.present[i])
+
+    def set(self, i: int, value) -> None:
+        self.values[i] = value
+        if self.present is not None:
+            self.present[i] = True
+
+    def unset(self, i: int) -> None:
+        if self.present is None:
+            self.present = np.ones(len(self.values), dtype=bool)
+        self.present[i] = False
+
+    def to_object(self) -> _Column:
+        values = np.empty(len(self.values), dtype=object)
+        values[:] = self.values.tolist()
+        return _Column(values, None if self.present is None else self.present.copy())
+
+    def take(self, index) -> _Column:
+        return _Column(self.values[index],
+                       None if self.present is None else self.present[index])
+
+    def copy(self) -> _Column:
+        return _Column(self.values.copy(),
+                       None if self.present is None else self.present.copy())
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + (0 if self.present is None else self.present.nbytes)
+
+
+class _KeyedColumn:
+    """One element-keyed field: a (particle x label) float matrix, NaN where a
+    particle has no entry for a label, and whether each particle has the
+    field at all (an empty dict counts as present)."""
+
+    __slots__ = ('labels', 'index', 'values', 'present')
+
+    def __init__(self, n: int, labels=(), values: np.ndarray | None = None,
+                 present: np.ndarray | None = None):
+        self.labels = list(labels)
+        self.index = {lbl: j for j, lbl in enumerate(self.labels)}
+        self.values = (np.full((n, len(self.labels)), np.nan)
+                       if values is None else values)
+        self.present = np.zeros(n, dtype=bool) if present is None else present
+
+    def _column_for(self, label) -> int:
+        j = self.index.get(label)
+        if j is None:
+            j = len(self.labels)
+            self.labels.append(label)
+            self.index[label] = j
+            extra = np.full((self.values.shape[0], 1), np.nan)
+            self.values = np.hstack([self.values, extra])
+        return j
+
+    def set_row(self, i: int, entries: dict) -> None:
+        for label in entries:
+            self._column_for(label)
+        row = self.values[i]
+        row[:] = np.nan
+        for label, value in entries.items():
+            row[self.index[label]] = value
+        self.present[i] = True
+
+    def row(self, i: int) -> dict:
+        return {lbl: v for lbl, v in zip(self.labels, self.values[i].tolist()) if v == v}
+
+    def to_object(self) -> _Column:
+        values = np.full(self.values.shape[0], None, dtype=object)
+        for i in np.flatnonzero(self.present):
+            values[i] = self.row(i)
+        return _Column(values, self.present.copy())
+
+    def take(self, index) -> _KeyedColumn:
+        return _KeyedColumn(0, self.labels, self.values[index], self.present[index])
+
+    def copy(self) -> _KeyedColumn:
+        return _KeyedColumn(0, self.labels, self.values.copy(), self.present.copy())
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.present.nbytes
+
+
+def _read_only(values: np.ndarray) -> np.ndarray:
+    """Return a view of ``values`` that cannot be written through."""
+    view = values.view()
+    view.flags.writeable = False
+    return view
+
+
+class _RowDict(dict):
+    """A particle (or one of its element dicts) read from a ParticleTable.
+
+    It is a real dict, filled with the row's values when it is created;
+    every change made through it is also written back to the table.
+    """
+
+    __slots__ = ('_table', '_index', '_field')
+
+    def __init__(self, table: ParticleTable, index: int, field: str | None, entries=()):
+        dict.__init__(self, entries)
+        self._table = table
+        self._index = index
+        self._field = field
+
+    def _sync(self):
+        self._table._set_value(self._field, self._index, _plain(self))
+
+    def __setitem__(self, key, value):
+        if self._field is None:
+            self._table._set_value(key, self._index, _plain(value))
+            if isinstance(value, dict):
+                value = _RowDict(self._table, self._index, key, value)
+            dict.__setitem__(self, key, value)
+        else:
+            dict.__setitem__(self, key, value)
+            self._sync()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        if self._field is None:
+            self._table._delete_value(key, self._index)
+        else:
+            self._sync()
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = dict.__getitem__(self, key)
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self):
+        if not self:
+            raise KeyError('popitem(): dictionary is empty')
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def clear(self):
+        for key in list(self):
+            del self[key]
+
+    def copy(self) -> dict:
+        """Return a plain, detached copy."""
+        return _plain(self)
+
+    def __reduce__(self):
+        return dict, (_plain(self),)
+
+
+class ParticleTable(Sequence):
+    """Particles stored column by column.
+
+    Scalar fields are typed arrays (float64, int64, bool or object), each
+    element-keyed field is a (particle x label) float64 matrix, NaN where a
+    particle has no entry. ``table[i]`` and iteration give dict rows for
+    code that still expects a list of particle dicts; slicing or take()
+    gives a new table.
+    """
+
+    def __init__(self, n: int = 0):
+        """
+        Args:
+            n (int): Number of particles; fields are added with set_column,
+                set_keyed or by writing to rows
+        """
+        self._n = int(n)
+        self._fields: dict = {}
+        self._row_block = None
+
+    # ── construction ────────────────────────────────────────────────────
+
+    @classmethod
+    def from_peaks(cls, arrays: dict, integration_method: str) -> ParticleTable:
+        """
+        Table of one isotope's detected peaks.
+
+        Args:
+            arrays (dict): Field name to array, as from
+                PeakDetection.extract_particle_arrays
+            integration_method (str): Integration method label of every peak
+
+        Returns:
+            ParticleTable: Rows equal to the dicts find_particles returns
+        """
+        n = len(arrays['peak_time'])
+        table = cls(n)
+        for name in PEAK_FIELDS:
+            if name == 'peak_valid':
+                table.set_column(name, np.asarray(arrays['SNR']) >= 3)
+            elif name == 'integration_method':
+                values = np.empty(n, dtype=object)
+                values[:] = integration_method
+                table.set_column(name, values)
+            else:
+                table.set_column(name, arrays[name])
+        return table
+
+    @classmethod
+    def from_particles(cls, particles) -> ParticleTable:
+        """
+        Build a table from particle dicts (e.g. from an older project).
+
+        Args:
+            particles (Iterable[dict]): Particle dicts; None entries are skipped
+
+        Returns:
+            ParticleTable: One row per particle
+        """
+        if isinstance(particles, ParticleTable):
+            return particles.copy()
+        particles = [p for p in particles if p is not None]
+        n = len(particles)
+        table = cls(n)
+        keys = list(dict.fromkeys(k for p in particles for k in p))
+        for key in keys:
+            rows, values = [], []
+            for i, p in enumerate(particles):
+                if key in p:
+                    rows.append(i)
+                    values.append(p[key])
+            present = np.zeros(n, dtype=bool)
+            present[rows] = True
+            if all(isinstance(v, dict) and all(_is_number(x) for x in v.values())
+                   for v in values):
+                labels = list(dict.fromkeys(lbl for v in values for lbl in v))
+                index = {lbl: j for j, lbl in enumerate(labels)}
+                r_idx, c_idx, entries = [], [], []
+                for i, v in zip(rows, values):
+                    for lbl, x in v.items():
+                        r_idx.append(i)
+                        c_idx.append(index[lbl])
+                        entries.append(x)
+                mat = np.full((n, len(labels)), np.nan)
+                mat[r_idx, c_idx] = np.asarray(entries, dtype=np.float64)
+                table._fields[key] = _KeyedColumn(0, labels, mat, present)
+                continue
+            kinds = {_kind(v) for v in values}
+            kind = kinds.pop() if len(kinds) == 1 else 'O'
+            col = _Column.empty(n, kind)
+            if kind == 'O':
+                for i, v in zip(rows, values):
+                    col.values[i] = _plain(v)
+            else:
+                col.values[rows] = values
+            col.present = None if len(rows) == n else present
+            table._fields[key] = col
+        return table
+
+    @classmethod
+    def from_columnar(cls, col_data: dict) -> ParticleTable:
+        """
+        Build a table from the saved columnar form (fast_project_io);
+        equivalent to ``from_particles(_columnar_to_particles(col_data))``.
+
+        Args:
+            col_data (dict): Columnar data as written by to_columnar
+
+        Returns:
+            ParticleTable: The saved particles
+        """
+        n = int(col_data.get('n', 0))
+        table = cls(n)
+        if n == 0:
+            return table
+        labels = list(col_data.get('element_labels', []))
+        for key, arr in col_data.get('scalars', {}).items():
+            arr = np.asarray(arr, dtype=np.float64)
+            table.set_column(key, arr.astype(np.int64) if key in _INT_SCALAR_KEYS else arr.copy())
+        element_arrays = col_data.get('element_arrays', {})
+        for key, mat in element_arrays.items():
+            mat = np.array(mat, dtype=np.float64)
+            mat[mat == 0.0] = np.nan
+            table.set_keyed(key, labels, mat)
+        if 'elements' not in element_arrays:
+            table.set_keyed('elements', [], np.empty((n, 0)))
+        totals = col_data.get('totals', {})
+        if totals:
+            names = list(totals)
+            table.set_keyed('totals', names,
+                            np.column_stack([np.asarray(totals[k], dtype=np.float64)
+                                             for k in names]))
+        for i, extra in enumerate(col_data.get('extras', []) or []):
+            for key, value in (extra or {}).items():
+                table._set_value(key, i, value)
+        return table
+
+    def set_column(self, key: str, values, present=None) -> None:
+        """
+        Add or replace a scalar field.
+
+        Args:
+            key (str): Field name
+            values (array-like): One value per particle
+            present (array-like | None): Which particles have the field
+                (None: all)
+        """
+        values = np.asarray(values)
+        if values.shape != (self._n,):
+            raise ValueError(f"column {key!r} has shape {values.shape}, expected ({self._n},)")
+        if values.dtype.kind not in 'bifO':
+            values = values.astype(object)
+        elif values.dtype.kind in 'iu':
+            values = values.astype(np.int64, copy=False)
+        elif values.dtype.kind == 'f':
+            values = values.astype(np.float64, copy=False)
+        self._row_block = None
+        self._fields[key] = _Column(
+            values, None if present is None else np.asarray(present, dtype=bool).copy())
+
+    def set_keyed(self, key: str, labels, values, present=None) -> None:
+        """
+        Add or replace an element-keyed field.
+
+        Args:
+            key (str): Field name, e.g. 'elements' or 'element_mass_fg'
+            labels (list): Column labels (e.g. element display labels)
+            values (array-like): (particles x labels) floats, NaN for no entry
+            present (array-like | None): Which particles have the field
+                (None: all)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        labels = list(labels)
+        if values.shape != (self._n, len(labels)):
+            raise ValueError(f"field {key!r} has shape {values.shape}, "
+                             f"expected ({self._n}, {len(labels)})")
+        present = (np.ones(self._n, dtype=bool) if present is None
+                   else np.asarray(present, dtype=bool).copy())
+        self._row_block = None
+        self._fields[key] = _KeyedColumn(0, labels, values.copy(), present)
+
+    # ── column access ───────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def fields(self) -> list[str]:
+        """Field names, in row key order."""
+        return list(self._fields)
+
+    def has_field(self, key: str) -> bool:
+        return key in self._fields
+
+    def is_keyed(self, key: str) -> bool:
+        """True if ``key`` is stored as a (particle x label) matrix."""
+        return isinstance(self._fields.get(key), _KeyedColumn)
+
+    def column(self, key: str) -> np.ndarray:
+        """
+        Return a read-only view of a scalar field (no copy; float fields
+        hold NaN and other kinds hold a placeholder where a particle has no
+        value). Use set_column to change a field.
+
+        Raises:
+            KeyError: If the field is missing or element-keyed
+        """
+        col = self._fields.get(key)
+        if not isinstance(col, _Column):
+            raise KeyError(key)
+        return _read_only(col.values)
+
+    def present(self, key: str) -> np.ndarray:
+        """Return a bool array: which particles have field ``key``."""
+        col = self._fields.get(key)
+        if col is None:
+            return np.zeros(self._n, dtype=bool)
+        if col.present is None:
+            return np.ones(self._n, dtype=bool)
+        return col.present.copy()
+
+    def keyed(self, key: str) -> tuple[list, np.ndarray]:
+        """
+        Return (labels, matrix) of an element-keyed field; the matrix is a
+        read-only view (no copy). Use set_keyed or ensure_keyed to change it.
+
+        Raises:
+            KeyError: If the field is missing or not element-keyed
+        """
+        col = self._fields.get(key)
+        if not isinstance(col, _KeyedColumn):
+            raise KeyError(key)
+        return list(col.labels), _read_only(col.values)
+
+    def ensure_keyed(self, key: str, labels=(), rows=None) -> tuple[dict, np.ndarray]:
+        """
+        Make ``key`` an element-keyed field that the given particles have
+        (as an empty dict if nothing else), with a column for each of
+        ``labels``; existing entries are kept. Rows read before the
+        returned matrix is written do not see the writes.
+
+        Args:
+            key (str): Field name
+            labels (Iterable): Labels that need a column
+            rows (array-like | None): Bool mask of the particles that must
+                have the field (None: all)
+
+        Returns:
+            tuple: (label -> column index, matrix) - the matrix is the
+            table's own, so writes into it update the field
+
+        Raises:
+            TypeError: If ``key`` already holds values that are not
+                dicts of numbers
+        """
+        col = self._fields.get(key)
+        if col is None:
+            col = self._fields[key] = _KeyedColumn(self._n)
+        elif not isinstance(col, _KeyedColumn):
+            raise TypeError(f"field {key!r} is not element-keyed")
+        self._row_block = None
+        for label in labels:
+            col._column_for(label)
+        if rows is None:
+            col.present[:] = True
+        else:
+            col.present |= np.asarray(rows, dtype=bool)
+        return dict(col.index), col.values
+
+    @property
+    def element_labels(self) -> list:
+        """Element display labels, in column order of element_counts()."""
+        return self.keyed('elements')[0] if self.is_keyed('elements') else []
+
+    def element_counts(self) -> np.ndarray:
+        """Return the (particle x element) count matrix, 0 where absent."""
+        if not self.is_keyed('elements'):
+            return np.zeros((self._n, 0))
+        return np.nan_to_num(self.keyed('elements')[1], nan=0.0)
+
+    def clusters(self) -> list[tuple[int, int]]:
+        """Return the (left_idx, right_idx) pair of every particle."""
+        if not self._n:
+            return []
+        return list(zip(self.column('left_idx').tolist(),
+                        self.column('right_idx').tolist()))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the columns, in bytes (object payloads excluded)."""
+        return sum(col.nbytes for col in self._fields.values())
+
+    # ── rows ────────────────────────────────────────────────────────────
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(np.arange(self._n)[index])
+        if isinstance(index, (list, np.ndarray)):
+            return self.take(index)
+        i = int(index)
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError('particle index out of range')
+        return self._block(i // ITER_BLOCK_ROWS)[i % ITER_BLOCK_ROWS]
+
+    def __iter__(self):
+        for block in range(-(-self._n // ITER_BLOCK_ROWS)):
+            yield from self._block(block)
+
+    def _block(self, block: int) -> list:
+        """Return the rows of one block, replacing the kept block if it is another."""
+        if self._row_block is not None and self._row_block[0] == block:
+            return self._row_block[1]
+        start = block * ITER_BLOCK_ROWS
+        rows = list(self._rows(start, min(start + ITER_BLOCK_ROWS, self._n)))
+        self._row_block = (block, rows)
+        return rows
+
+    def _rows(self, start: int, stop: int):
+        """Yield rows start..stop-1, converting each column block at once."""
+        keys, columns = [], []
+        partial = False
+        for key, col in self._fields.items():
+            present = None if col.present is None else col.present[start:stop].tolist()
+            if isinstance(col, _KeyedColumn):
+                labels = col.labels
+                values = [_RowDict(self, i, key, {lbl: v for lbl, v in zip(labels, row) if v == v})
+                          for i, row in enumerate(col.values[start:stop].tolist(), start)]
+            else:
+                values = col.values[start:stop].tolist()
+                if col.kind == 'O':
+                    values = [_RowDict(self, i, key, v) if isinstance(v, dict) else v
+                              for i, v in enumerate(values, start)]
+            if present is not None and not all(present):
+                values = [v if p else _ABSENT for v, p in zip(values, present)]
+                partial = True
+            keys.append(key)
+            columns.append(values)
+        if not columns:
+            for i in range(start, stop):
+                yield _RowDict(self, i, None)
+            return
+        for i, values in enumerate(zip(*columns), start):
+            if partial:
+                yield _RowDict(self, i, None, [(k, v) for k, v in zip(keys, values)
+                                               if v is not _ABSENT])
+            else:
+                yield _RowDict(self, i, None, zip(keys, values))
+
+    def _set_value(self, key, i: int, value) -> None:
+        """Store one particle's value for ``key``, widening the column if needed."""
+        col = self._fields.get(key)
+        if isinstance(value, dict):
+            numeric = all(_is_number(v) for v in value.values())
+            if numeric and (col is None or isinstance(col, _KeyedColumn)):
+                if col is None:
+                    col = self._fields[key] = _KeyedColumn(self._n)
+                col.set_row(i, value)
+                return
+            if isinstance(col, _KeyedColumn):
+                col = self._fields[key] = col.to_object()
+            kind = 'O'
+        else:
+            kind = _kind(value)
+            if isinstance(col, _KeyedColumn):
+                col = self._fields[key] = col.to_object()
+        if col is None:
+            col = self._fields[key] = _Column.empty(self._n, kind)
+        elif col.kind != kind and col.kind != 'O':
+            col = self._fields[key] = col.to_object()
+        col.set(i, value)
+
+    def _delete_value(self, key, i: int) -> None:
+        col = self._fields.get(key)
+        if isinstance(col, _KeyedColumn):
+            col.present[i] = False
+            col.values[i] = np.nan
+        elif col is not None:
+            col.unset(i)
+
+    # ── whole-table operations ──────────────────────────────────────────
+
+    def take(self, index) -> ParticleTable:
+        """
+        Return a new table with the given rows.
+
+        Args:
+            index (array-like): Row indices or a boolean mask
+
+        Returns:
+            ParticleTable: Independent copy of the selected rows
+        """
+        index = np.asarray(index)
+        if index.dtype == bool:
+            index = np.flatnonzero(index)
+        table = ParticleTable(len(index))
+        table._fields = {k: col.take(index) for k, col in self._fields.items()}
+        return table
+
+    def copy(self) -> ParticleTable:
+        """Return an independent copy."""
+        table = ParticleTable(self._n)
+        table._fields = {k: col.copy() for k, col in self._fields.items()}
+        return table
+
+    def to_particles(self) -> list[dict]:
+        """Return the particles as plain, detached dicts."""
+        return [_plain(row) for row in self]
+
+    def to_columnar(self) -> dict:
+        """
+        Return the saved columnar form (see fast_project_io); equal to
+        ``_particles_to_columnar(self.to_particles())``.
+
+        Returns:
+            dict: 'n', 'element_labels', 'scalars', 'element_arrays',
+            'totals' and, if any, per-particle 'extras'
+        """
+        n = self._n
+        if n == 0:
+            return {'n': 0, 'element_labels': [], 'scalars': {}, 'element_arrays': {}}
+
+        for key in _SCALAR_KEYS:
+            col = self._fields.get(key)
+            if col is not None and (isinstance(col, _KeyedColumn) or col.kind == 'O'):
+                from save_export.fast_project_io import _particles_to_columnar
+                return _particles_to_columnar(self.to_particles())
+
+        element_labels = []
+        elements = self._fields.get('elements')
+        if isinstance(elements, _KeyedColumn):
+            used = ~np.isnan(elements.values[elements.present]).all(axis=0)
+            element_labels = sorted(lbl for lbl, u in zip(elements.labels, used) if u)
+        elif elements is not None:
+            element_labels = sorted({lbl for i in range(n) if elements.is_set(i)
+                                     and isinstance(elements.values[i], dict)
+                                     for lbl in elements.values[i]})
+        label_to_idx = {lbl: j for j, lbl in enumerate(element_labels)}
+
+        scalars = {}
+        for key in _SCALAR_KEYS:
+            col = self._fields.get(key)
+            if col is None:
+                continue
+            arr = np.array(col.values, dtype=np.float64)
+            if col.present is not None:
+                arr[~col.present] = 0.0
+            if np.any(arr != 0):
+                scalars[key] = arr
+
+        nested = set()
+        element_arrays = {}
+        for key in _ELEMENT_DICT_KEYS:
+            col = self._fields.get(key)
+            if col is None:
+                continue
+            mat = np.zeros((n, len(element_labels)))
+            has_data = False
+            if isinstance(col, _KeyedColumn):
+                rows = col.present
+                for lbl, j in label_to_idx.items():
+                    c = col.index.get(lbl)
+                    if c is None:
+                        continue
+                    values = col.values[:, c]
+                    hit = rows & ~np.isnan(values)
+                    if hit.any():
+                        mat[hit, j] = values[hit]
+                        has_data = True
+            else:
+                dicts = [col.values[i] if col.is_set(i) else None for i in range(n)]
+                if any(isinstance(d, dict) and any(not _is_number(v) for v in d.values())
+                       for d in dicts):
+                    nested.add(key)
+                    continue
+                for i, d in enumerate(dicts):
+                    if not isinstance(d, dict):
+                        continue
+                    for lbl, val in d.items():
+                        if lbl in label_to_idx:
+                            mat[i, label_to_idx[lbl]] = float(val)
+                            has_data = True
+            if has_data:
+                element_arrays[key] = mat
+
+        totals = {}
+        col = self._fields.get('totals')
+        if isinstance(col, _KeyedColumn):
+            for lbl, c in col.index.items():
+                values = col.values[:, c]
+                hit = col.present & ~np.isnan(values)
+                if hit.any():
+                    totals[lbl] = np.where(hit, values, 0.0)
+        elif col is not None:
+            for i in range(n):
+                t = col.values[i] if col.is_set(i) else None
+                if isinstance(t, dict):
+                    for lbl, v in t.items():
+                        totals.setdefault(lbl, np.zeros(n))[i] = v
+
+        skip = set(_SCALAR_KEYS) | {'totals'} | (set(_ELEMENT_DICT_KEYS) - nested)
+        extra_keys = [k for k in self._fields if k not in skip and not str(k).startswith('_')]
+        result = {
+            'n': n,
+            'element_labels': element_labels,
+            'scalars': scalars,
+            'element_arrays': element_arrays,
+            'totals': totals,
+        }
+        if extra_keys:
+            extras = [{} for _ in range(n)]
+            for key in extra_keys:
+                col = self._fields[key]
+                if isinstance(col, _KeyedColumn):
+                    for i in np.flatnonzero(col.present):
+                        extras[i][key] = col.row(i)
+                else:
+                    rows = range(n) if col.present is None else np.flatnonzero(col.present)
+                    for i in rows:
+                        value = col.values[i]
+                        extras[i][key] = value.item() if isinstance(value, np.generic) else value
+            if any(extras):
+                result['extras'] = extras
+        return result
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_row_block'] = None
+        return state
+
+    def __setstate__(self, state):
+        state.pop('_row_blocks', None)
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_row_block', None)
+
+    def __repr__(self):
+        return f"ParticleTable({self._n} particles, fields={self.fields})"
+
+
+def particle_clusters(particles) -> list[tuple[int, int]]:
+    """
+    Return the (left_idx, right_idx) pair of each detected peak.
+
+    Args:
+        particles (ParticleTable | list[dict]): One isotope's peaks
+
+    Returns:
+        list[tuple[int, int]]: Index ranges in particle order
+    """
+    if isinstance(particles, ParticleTable):
+        return particles.clusters()
+    return [(p['left_idx'], p['right_idx']) for p in particles if p]
+
+
+def field_values(particles, key: str, default: float = 0.0) -> np.ndarray:
+    """
+    Return one numeric field of every particle as a float array.
+
+    Equal to ``[p.get(key, default) for p in particles if p is not None]``,
+    read straight from the column for a ParticleTable.
+
+    Args:
+        particles (ParticleTable | list[dict]): Particles
+        key (str): Scalar field, e.g. 'total_counts' or 'SNR'
+        default (float): Value of particles without the field
+
+    Returns:
+        np.ndarray: float64 values in particle order
+    """
+    if isinstance(particles, ParticleTable):
+        col = particles._fields.get(key)
+        if col is None:
+            return np.full(len(particles), default, dtype=np.float64)
+        if isinstance(col, _Column) and col.kind != 'O':
+            values = col.values.astype(np.float64)
+            if col.present is not None:
+                values[~col.present] = default
+            return values
+    return np.array([p.get(key, default) for p in particles if p is not None],
+                    dtype=np.float64)
+
+
+def field_list(particles, key: str, default=None) -> list:
+    """
+    Return one scalar field of every particle as a list of Python values.
+
+    Equal to ``[p.get(key, default) for p in particles if p is not None]``,
+    read straight from the column for a ParticleTable, so it also suits
+    text fields such as 'integration_method'.
+
+    Args:
+        particles (ParticleTable | list[dict]): Particles
+        key (str): Scalar field
+        default: Value of particles without the field
+
+    Returns:
+        list: Values in particle order
+    """
+    if isinstance(particles, ParticleTable):
+        col = particles._fields.get(key)
+        if col is None:
+            return [default] * len(particles)
+        if isinstance(col, _Column):
+            values = col.values.tolist()
+            if col.present is not None:
+                values = [v if ok else default
+                          for v, ok in zip(values, col.present.tolist())]
+            return values
+    return [p.get(key, default) for p in particles if p is not None]
+
+
+def keyed_values(particles, key: str, label, default: float = 0.0) -> np.ndarray:
+    """
+    Return one label's entry of an element-keyed field for every particle.
+
+    Equal to ``[p.get(key, {}).get(label, default) for p in particles if p
+    is not None]``, read straight from the matrix for a ParticleTable.
+
+    Args:
+        particles (ParticleTable | list[dict]): Particles
+        key (str): Element-keyed field, e.g. 'elements'
+        label: Element display label
+        default (float): Value of particles without an entry
+
+    Returns:
+        np.ndarray: float64 values in particle order
+    """
+    if isinstance(particles, ParticleTable):
+        col = particles._fields.get(key)
+        if col is None:
+            return np.full(len(particles), default, dtype=np.float64)
+        if isinstance(col, _KeyedColumn):
+            j = col.index.get(label)
+            if j is None:
+                return np.full(len(particles), default, dtype=np.float64)
+            values = col.values[:, j].copy()
+            values[np.isnan(values) | ~col.present] = default
+            return values
+    return np.array([(p.get(key) or {}).get(label, default) for p in particles
+                     if p is not None], dtype=np.float64)
+
+
+def calculate_mass_data(particles, element_cache, sample_name, mass_fraction_service,
+                        periodic_table_info) -> bool:
+    """
+    Column-wise form of MainWindow._calculate_mass_data_optimized.
+
+    Fills the same fields with the same values, one element at a time
+    over all particles instead of one particle at a time.
+
+    Args:
+        particles (ParticleTable): Particles of one sample
+        element_cache (dict): Conversion data per element display label
+        sample_name (str): Sample whose mass fractions and densities apply
+        mass_fraction_service (MassFractionService): Mass fractions,
+            densities and molecular weights per element key and sample
+        periodic_table_info (PeriodicTableInfo): Element masses and densities
+
+    Returns:
+        bool: False (nothing changed) if the table holds fields that were
+        edited into a form only the row-by-row path can update
+    """
+    keyed_fields = ('element_mass_fg', 'element_moles_fmol', 'particle_mass_fg',
+                    'particle_moles_fmol', 'element_diameter_nm', 'particle_diameter_nm',
+                    'mass_fractions_used', 'molar_masses', 'mass_fg', 'totals',
+                    'mass_percentages', 'mole_percentages')
+    if not particles.is_keyed('elements'):
+        return False
+    if any(particles.has_field(k) and not particles.is_keyed(k) for k in keyed_fields):
+        return False
+    if particles.is_keyed('densities_used'):
+        return False
+
+    n = len(particles)
+    labels, counts = particles.keyed('elements')
+    service = mass_fraction_service
+    jobs = []
+    for j, label in enumerate(labels):
+        if label not in element_cache:
+            continue
+        rows = counts[:, j] > 0
+        if not rows.any():
+            continue
+        cache_entry = element_cache[label]
+        element_key = cache_entry['element_key']
+        element = element_key.split('-')[0]
+        isotope = float(element_key.split('-')[1])
+        atomic_mass = periodic_table_info.get_mass_by_element(element) or float(isotope)
+        mass_fraction = service.get_mass_fraction(element_key, sample_name)
+        if not all(isinstance(v, (int, float, np.number)) for v in (atomic_mass, mass_fraction)):
+            return False
+        jobs.append((label, rows, counts[rows, j], cache_entry['conversion_factor'],
+                     element_key, atomic_mass, mass_fraction,
+                     service.get_element_density(element_key, sample_name),
+                     periodic_table_info.get_density_by_element(element)))
+
+    job_labels = [job[0] for job in jobs]
+    out = {}
+    for key in keyed_fields[:9]:
+        if key == 'molar_masses':
+            if particles.has_field('densities_used'):
+                densities = [dict(d) if ok and isinstance(d, dict) else {}
+                             for d, ok in zip(particles.column('densities_used'),
+                                              particles.present('densities_used'))]
+            else:
+                densities = [{} for _ in range(n)]
+            holder = np.empty(n, dtype=object)
+            particles.set_column('densities_used', holder)
+        out[key] = particles.ensure_keyed(key, job_labels)
+
+    totals = np.zeros((n, 4))
+    for (label, rows, c, conversion_factor, element_key, atomic_mass, mass_fraction,
+         compound_density, element_density) in jobs:
+        values = {}
+        out['mass_fractions_used'][1][rows, out['mass_fractions_used'][0][label]] = mass_fraction
+        out['molar_masses'][1][rows, out['molar_masses'][0][label]] = atomic_mass
+        for i in np.flatnonzero(rows).tolist():
+            densities[i][label] = {
+                'element_density': element_density,
+                'compound_density': compound_density
+            }
+
+        if conversion_factor and conversion_factor > 0 and atomic_mass > 0:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                element_mass_fg = c / conversion_factor
+                element_moles_fmol = element_mass_fg / atomic_mass
+                particle_mass_fg = element_mass_fg / mass_fraction
+
+                compound_molecular_weight = service.get_molecular_weight(element_key, sample_name)
+                if compound_molecular_weight and compound_molecular_weight > 0:
+                    particle_moles_fmol = particle_mass_fg / compound_molecular_weight
+                else:
+                    particle_moles_fmol = element_moles_fmol
+
+                if element_density and element_density > 0:
+                    element_diameter_nm = _masses_to_diameters(element_mass_fg, element_density)
+                else:
+                    element_diameter_nm = np.zeros(len(c))
+                if compound_density and compound_density > 0:
+                    particle_diameter_nm = _masses_to_diameters(particle_mass_fg, compound_density)
+                else:
+                    particle_diameter_nm = element_diameter_nm
+
+            values = {
+                'element_mass_fg': element_mass_fg,
+                'element_moles_fmol': element_moles_fmol,
+                'particle_mass_fg': particle_mass_fg,
+                'particle_moles_fmol': particle_moles_fmol,
+                'element_diameter_nm': element_diameter_nm,
+                'particle_diameter_nm': particle_diameter_nm,
+                'mass_fg': particle_mass_fg,
+            }
+            totals[rows] += np.column_stack([element_mass_fg, element_moles_fmol,
+                                             particle_mass_fg, particle_moles_fmol])
+        else:
+            values = dict.fromkeys(('element_mass_fg', 'element_moles_fmol', 'particle_mass_fg',
+                                    'particle_moles_fmol', 'element_diameter_nm',
+                                    'particle_diameter_nm', 'mass_fg'), 0.0)
+        for key, v in values.items():
+            index, mat = out[key]
+            mat[rows, index[label]] = v
+
+    holder[:] = densities
+    particles.set_column('densities_used', holder)
+    particles.set_keyed('totals', ['total_element_mass_fg', 'total_element_moles_fmol',
+                                   'total_particle_mass_fg', 'total_particle_moles_fmol'],
+                        totals)
+
+    hit = totals[:, 0] > 0
+    if hit.any():
+        mass_index, mass_mat = out['element_mass_fg']
+        moles_mat = out['element_moles_fmol'][1]
+        shown = [(j, label) for j, label in enumerate(labels) if label in mass_index]
+        mass_pct = particles.ensure_keyed('mass_percentages', [lbl for _, lbl in shown], hit)
+        mole_pct = particles.ensure_keyed('mole_percentages', [lbl for _, lbl in shown], hit)
+        mass_pct[1][hit] = np.nan
+        mole_pct[1][hit] = np.nan
+        total_mass, total_moles = totals[:, 0], totals[:, 1]
+        for j, label in shown:
+            element_mass = mass_mat[:, mass_index[label]]
+            element_moles = moles_mat[:, mass_index[label]]
+            ok = hit & ~np.isnan(counts[:, j]) & ~np.isnan(element_mass)
+            if not ok.any():
+                continue
+            mass_pct[1][ok, mass_pct[0][label]] = element_mass[ok] / total_mass[ok] * 100
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mole_pct[1][ok, mole_pct[0][label]] = np.where(
+                    total_moles[ok] > 0, element_moles[ok] / total_moles[ok] * 100, 0)
+    return True
+
+
+def _masses_to_diameters(mass_fg, density):
+    """Array form of MainWindow.mass_to_diameter, with 0 where that returns NaN.
+
+    Returns:
+        np.ndarray: Diameters in nanometers
+    """
+    mass_fg = np.asarray(mass_fg, dtype=np.float64)
+    mass_g = mass_fg * 1e-15
+    with np.errstate(invalid='ignore'):
+        diameter_cm = ((6 * mass_g) / (np.pi * density)) ** (1 / 3)
+    return np.where(mass_fg > 0, np.nan_to_num(diameter_cm * 1e7, nan=0.0), 0.0)
@@ -2,17 +2,20 @@ import numpy as np
 from PySide6.QtGui import QColor
 import concurrent.futures
 from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import multiprocessing
 from PySide6.QtWidgets import QWidget, QLabel, QApplication
 from PySide6.QtCore import Qt
 import os
-from functools import lru_cache
 from scipy.stats import poisson
 from scipy.signal import find_peaks
 import logging
 _itk_log = logging.getLogger("IsotopeTrack.processing.peak_detection")
 from tools.logging_utils import log_context
 from processing import detection_registry
+from processing.particle_table import ParticleTable, particle_clusters
+from processing.detection_pool import default_worker_count, get_detection_pool
+from processing.threshold_cache import shared_cache, threshold_key
 
 os.environ['NUMBA_THREADING_LAYER'] = 'workqueue'
 
@@ -330,6 +333,90 @@ def compound_poisson_lognormal_quantile_approximation_fast(q: float, lam: float,
     return float(xs[hits[0]])
 
 
+#: Upper bound on the (λ, grid, k) CDF block compound_poisson_lognormal_quantile_batch
+#: evaluates at once (elements); bounds its scratch memory to about 16 MB.
+_CPLN_BATCH_BLOCK = 2_000_000
+
+
+def compound_poisson_lognormal_quantile_batch(q: float, lams: np.ndarray, sigma: float,
+                                              n_grid: int = 2000) -> np.ndarray:
+    """
+    Compound Poisson log-normal quantiles for many background levels at once.
+
+    Runs the grid search of compound_poisson_lognormal_quantile_approximation_fast
+    for every λ together. The Poisson truncation points and probabilities
+    come from one ppf/pmf call over all λ, the Fenton-Wilkinson parameters of
+    the k-ion sums are computed once for the largest k needed, and the
+    mixture CDFs are evaluated as one array per block of λ values.
+
+    Accuracy against the scalar path: each value is the same grid point the
+    scalar search finds unless floating-point summation order moves the
+    mixture CDF across ``q0`` at a grid point. The difference is therefore
+    either zero or one grid step, (upper quantile − λ) / (n_grid − 1), which
+    is below 0.1 % of the threshold for λ up to a few hundred.
+
+    Args:
+        q (float): Quantile value (1 − α)
+        lams (np.ndarray): Background means λ
+        sigma (float): Log standard deviation of the single-ion signal
+        n_grid (int): Grid points per λ (the scalar fast path uses 2000)
+
+    Returns:
+        np.ndarray: Quantiles, shaped like ``lams``; 0 where λ ≤ 0 or the
+        quantile lies in the zero atom
+    """
+    lams = np.asarray(lams, dtype=np.float64)
+    out = np.zeros(lams.shape)
+    flat_lams = lams.ravel()
+    positive = np.flatnonzero(flat_lams > 0)
+    q0 = zero_trunc_quantile(flat_lams[positive], q)
+    todo = positive[q0 > 0.0]
+    if todo.size == 0:
+        return out
+    lam = flat_lams[todo]
+    q0 = q0[q0 > 0.0]
+
+    uk = poisson.ppf(1.0 - 1e-12, lam).astype(int)
+    k = np.arange(1, int(uk.max()) + 1, dtype=int)
+    mus, sigmas = sum_iid_lognormals(k, np.log(1.0) - 0.5 * sigma ** 2, sigma)
+
+    pdf = poisson.pmf(k[None, :], lam[:, None])
+    valid = np.isfinite(pdf) & (pdf > 0) & (k[None, :] <= uk[:, None])
+    weights = np.where(valid, pdf, 0.0)
+    weights /= weights.sum(axis=1, keepdims=True)
+    last = valid.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+
+    upper_q = lognormal_quantile(q0, mus[last], sigmas[last])
+    bad = ~np.isfinite(upper_q)
+    upper_q[bad] = np.exp(mus[last[bad]] + 8.0 * sigmas[last[bad]])
+    xs = np.linspace(lam, upper_q, n_grid, axis=1)
+
+    # lognormal_cdf's expression, without scipy's per-call argument handling.
+    scales = np.exp(mus)
+    result = np.empty(lam.size)
+    order = np.argsort(lam, kind='stable')
+    start = 0
+    while start < order.size:
+        n_k = int(last[order[start]]) + 1
+        stop = start + 1
+        while stop < order.size:
+            n_k_next = max(n_k, int(last[order[stop]]) + 1)
+            if (stop - start + 1) * n_grid * n_k_next > _CPLN_BATCH_BLOCK:
+                break
+            n_k = n_k_next
+            stop += 1
+        rows = order[start:stop]
+        z = np.log(xs[rows, :, None] / scales[:n_k]) / sigmas[:n_k]
+        cdf = special.ndtr(z) @ weights[rows, :n_k, None]
+        above = cdf[:, :, 0] > q0[rows, None]
+        first = np.argmax(above, axis=1)
+        result[rows] = np.where(above.any(axis=1), xs[rows, first], upper_q[rows])
+        start = stop
+
+    out.ravel()[todo] = result
+    return out
+
+
 # ----------------------------------------------------------------------------------------------------------
 # ------------------------------------compound poisson lognormal class---------------------------------------
 # ----------------------------------------------------------------------------------------------------------
@@ -372,12 +459,23 @@ class CompoundPoissonLognormal:
 
 class CompoundPoissonLognormalOptimized:
     """
-    Optimized Compound Poisson-Lognormal with dict cache
+    Optimized Compound Poisson-Lognormal with a shared threshold cache
     keyed on rounded (lambda, alpha, sigma) + faster quantile approximation.
     """
 
-    def __init__(self):
-        self._threshold_cache = {}
+    #: Method name of this solver's entries in the threshold cache.
+    CACHE_METHOD = "Compound Poisson LogNormal"
+
+    def __init__(self, cache=None):
+        """
+        Args:
+            cache (ThresholdCache | None): Cache for the thresholds (default:
+                the process-wide shared_cache())
+        """
+        self._threshold_cache = cache if cache is not None else shared_cache()
+
+    def _key(self, lambda_bkgd, alpha, sigma):
+        return threshold_key(self.CACHE_METHOD, lambda_bkgd, alpha, sigma)
 
     def get_threshold(self, lambda_bkgd, alpha, sigma=0.55):
         """
@@ -393,9 +491,10 @@ class CompoundPoissonLognormalOptimized:
         """
         if lambda_bkgd <= 0:
             return 0.0
-        cache_key = (round(float(lambda_bkgd), 2), alpha, sigma)
-        if cache_key in self._threshold_cache:
-            return self._threshold_cache[cache_key]
+        cache_key = self._key(lambda_bkgd, alpha, sigma)
+        cached = self._threshold_cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
             quantile = 1.0 - alpha
             mu = np.log(1.0) - 0.5 * sigma ** 2
@@ -403,15 +502,57 @@ class CompoundPoissonLognormalOptimized:
                 quantile, lambda_bkgd, mu, sigma
             )
             result = float(threshold)
-            self._threshold_cache[cache_key] = result
+            self._threshold_cache.put(cache_key, result)
             return result
         except (ArithmeticError, ValueError) as e:
             _itk_log.exception("Handled exception in get_threshold")
             _itk_log.error(f"Lognormal approximation error: {e}, using simple approximation")
             result = lambda_bkgd + 3.0 * np.sqrt(lambda_bkgd)
-            self._threshold_cache[cache_key] = result
+            self._threshold_cache.put(cache_key, result)
             return result
 
+    def get_thresholds(self, lambda_bkgd, alpha, sigma=0.55):
+        """
+        Calculate compound Poisson thresholds for an array of backgrounds.
+
+        Cached values are reused and the missing ones are solved together by
+        compound_poisson_lognormal_quantile_batch (see there for the accuracy
+        against get_threshold). Backgrounds that share a cache key get the
+        value of the first of them, as repeated get_threshold calls would.
+
+        Args:
+            lambda_bkgd (np.ndarray): Background signal means
+            alpha (float): Significance level
+            sigma (float): Log standard deviation of single-ion signal
+
+        Returns:
+            np.ndarray: Threshold values, shaped like ``lambda_bkgd``
+        """
+        lams = np.asarray(lambda_bkgd, dtype=np.float64)
+        keys = [self._key(lam, alpha, sigma) for lam in lams.flat]
+        found, missing = {}, {}
+        for lam, key in zip(lams.flat, keys):
+            if lam > 0 and key not in found and key not in missing:
+                cached = self._threshold_cache.get(key)
+                if cached is None:
+                    missing[key] = float(lam)
+                else:
+                    found[key] = cached
+        if missing:
+            todo = np.fromiter(missing.values(), dtype=np.float64, count=len(missing))
+            try:
+                quantile = 1.0 - alpha
+                values = compound_poisson_lognormal_quantile_batch(quantile, todo, sigma)
+            except (ArithmeticError, ValueError) as e:
+                _itk_log.exception("Handled exception in get_thresholds")
+                _itk_log.error(f"Lognormal approximation error: {e}, using simple approximation")
+                values = todo + 3.0 * np.sqrt(todo)
+            for key, value in zip(missing, values.tolist()):
+                self._threshold_cache.put(key, value)
+                found[key] = value
+        return np.array([found[key] if lam > 0 else 0.0
+                         for lam, key in zip(lams.flat, keys)]).reshape(lams.shape)
+
     def clear_cache(self):
         """Clear the threshold cache (e.g. when sigma changes)."""
         self._threshold_cache.clear()
@@ -440,11 +581,24 @@ class CompoundPoissonLognormaltable:
     Routing:
         λ ≤ 0              → threshold = 0
         0 < λ ≤ table max  → table lookup (with Eqn-1 transform)
-        λ > table max      → analytical CPLN (lognormal) fallback
+        table max < λ ≤ EXTENSION_LAMBDA_MAX
+                           → extension: analytical CPLN solved at fixed
+                              log-spaced λ nodes, interpolated in log-log
+        λ above both       → analytical CPLN (lognormal) fallback
         y₀ ≤ 0             → threshold = 0 (the (1-α) quantile lies
                               inside the zero atom)
         table not loaded   → analytical CPLN (lognormal) fallback
 
+    Above the table, e^-λ is negligible, so y₀ = 1 - α and the extension only
+    depends on λ for a given (α, σ). Its nodes are solved on demand through
+    the fallback, so they land in the shared threshold cache (and its file)
+    like any other analytical threshold. With EXTENSION_NODES_PER_DECADE
+    nodes the interpolation stays within 0.1% of the analytical value, the
+    size of the analytical solver's own grid step.
+
+    get_thresholds answers a whole array of backgrounds with one
+    interpolator call.
+
     The unit-mean convention matches CompoundPoissonLognormal and
     CompoundPoissonLognormalOptimized in this module, so callers can mix
     methods without rescaling.
@@ -452,6 +606,11 @@ class CompoundPoissonLognormaltable:
 
     _lut_cache: dict = {}
 
+    #: Largest background served by the extension above the table.
+    EXTENSION_LAMBDA_MAX = 1000.0
+    #: Log-spaced extension nodes per decade of λ.
+    EXTENSION_NODES_PER_DECADE = 16
+
     def __init__(self, lut_path: str | None = None):
         self._ready   = False
         self._interp  = None
@@ -461,6 +620,7 @@ class CompoundPoissonLognormaltable:
         self._sig_max = 0.0
         self._y_min   = 0.0
         self._y_max   = 0.0
+        self._ext_nodes = None
         self._fallback = CompoundPoissonLognormalOptimized()
 
         if lut_path is None:
@@ -478,6 +638,7 @@ class CompoundPoissonLognormaltable:
              self._sig_min, self._sig_max,
              self._y_min,   self._y_max) = CompoundPoissonLognormaltable._lut_cache[path]
             self._ready = True
+            self._build_extension()
             return
 
         if not os.path.isfile(path):
@@ -507,6 +668,7 @@ class CompoundPoissonLognormaltable:
             self._y_min   = float(ys[0])
             self._y_max   = float(ys[-1])
             self._ready   = True
+            self._build_extension()
 
             CompoundPoissonLognormaltable._lut_cache[path] = (
                 self._interp,
@@ -519,6 +681,45 @@ class CompoundPoissonLognormaltable:
             _itk_log.error(f"[CompoundPoissonLognormaltable] Failed to load table: {exc} "
                   f"— using fallback.")
 
+    def _build_extension(self) -> None:
+        """Place the extension's λ nodes between the table max and EXTENSION_LAMBDA_MAX."""
+        if self._lam_max <= 0.0 or self._lam_max >= self.EXTENSION_LAMBDA_MAX:
+            self._ext_nodes = None
+            return
+        decades = np.log10(self.EXTENSION_LAMBDA_MAX / self._lam_max)
+        n_nodes = max(2, int(np.ceil(decades * self.EXTENSION_NODES_PER_DECADE)) + 1)
+        self._ext_nodes = np.geomspace(self._lam_max, self.EXTENSION_LAMBDA_MAX, n_nodes)
+
+    def _in_extension(self, lams: np.ndarray) -> np.ndarray:
+        if self._ext_nodes is None:
+            return np.zeros(lams.shape, dtype=bool)
+        return (lams > self._lam_max) & (lams <= self._ext_nodes[-1])
+
+    def _extension_thresholds(self, lams: np.ndarray, alpha: float, sigma: float) -> np.ndarray:
+        """
+        Thresholds above the table from the extension nodes around each λ.
+
+        Only the nodes bracketing ``lams`` are solved (once per (α, σ), then
+        they come from the threshold cache).
+
+        Args:
+            lams  (np.ndarray): Backgrounds within the extension
+            alpha (float):      False-positive rate
+            sigma (float):      Log-std of single-ion area distribution
+
+        Returns:
+            np.ndarray: Thresholds, one per background
+        """
+        nodes = self._ext_nodes
+        hi = np.clip(np.searchsorted(nodes, lams, side='left'), 1, len(nodes) - 1)
+        lo = hi - 1
+        needed = np.unique(np.concatenate([lo, hi]))
+        log_values = np.full(len(nodes), np.nan)
+        log_values[needed] = np.log(self._fallback.get_thresholds(nodes[needed], alpha, sigma))
+        log_nodes = np.log(nodes)
+        frac = (np.log(lams) - log_nodes[lo]) / (log_nodes[hi] - log_nodes[lo])
+        return np.exp(log_values[lo] + frac * (log_values[hi] - log_values[lo]))
+
     def get_threshold(self, lambda_bkgd: float, alpha: float, sigma: float = 0.55) -> float:
         """
         Return the CPLN detection threshold.
@@ -526,7 +727,8 @@ class CompoundPoissonLognormaltable:
         Routing:
           λ ≤ 0              → 0
           0 < λ ≤ table max  → table lookup (with Eqn-1 transform)
-          λ > table max      → analytical CPLN (lognormal) fallback
+          λ in the extension → interpolated analytical nodes
+          λ above both       → analytical CPLN (lognormal) fallback
           table not loaded   → analytical CPLN (lognormal) fallback
 
         Args:
@@ -541,6 +743,9 @@ class CompoundPoissonLognormaltable:
             return 0.0
 
         if not self._ready or lambda_bkgd > self._lam_max:
+            lam = np.array([float(lambda_bkgd)])
+            if self._ready and self._in_extension(lam)[0]:
+                return float(self._extension_thresholds(lam, alpha, sigma)[0])
             return self._fallback.get_threshold(lambda_bkgd, alpha, sigma)
 
         e_lam = np.exp(-lambda_bkgd)
@@ -568,6 +773,65 @@ class CompoundPoissonLognormaltable:
             _itk_log.error(f"[CompoundPoissonLognormaltable] interp failed, falling back: {exc}")
             return self._fallback.get_threshold(lambda_bkgd, alpha, sigma)
 
+    def get_thresholds(self, lambda_bkgd, alpha: float, sigma: float = 0.55) -> np.ndarray:
+        """
+        Return the CPLN detection thresholds for an array of backgrounds.
+
+        Routed like get_threshold, value for value, and equal to it; the
+        table backgrounds are looked up in one interpolator call and the
+        analytical fallback solves its backgrounds together.
+
+        Args:
+            lambda_bkgd (np.ndarray): Background Poisson means
+            alpha       (float):      False-positive rate (significance level)
+            sigma       (float):      Log-std of single-ion area distribution
+
+        Returns:
+            np.ndarray: Detection thresholds, shaped like ``lambda_bkgd``
+        """
+        lams = np.asarray(lambda_bkgd, dtype=np.float64)
+        flat = lams.ravel()
+        out = np.zeros(flat.shape)
+        if not self._ready:
+            positive = flat > 0.0
+            out[positive] = self._fallback.get_thresholds(flat[positive], alpha, sigma)
+            return out.reshape(lams.shape)
+
+        in_table = (flat > 0.0) & (flat <= self._lam_max)
+        extended = self._in_extension(flat)
+        beyond = (flat > self._lam_max) & ~extended
+        if extended.any():
+            out[extended] = self._extension_thresholds(flat[extended], alpha, sigma)
+        fallback = beyond
+
+        idx = np.flatnonzero(in_table)
+        if idx.size:
+            lam = flat[idx]
+            e_lam = np.exp(-lam)
+            denom = 1.0 - e_lam
+            with np.errstate(divide='ignore', invalid='ignore'):
+                y0 = np.where(denom <= 0.0, 1.0 - alpha, ((1.0 - alpha) - e_lam) / denom)
+            lookup = y0 > 0.0
+            idx, lam, y0 = idx[lookup], lam[lookup], y0[lookup]
+            points = np.column_stack([
+                np.log(np.clip(lam, self._lam_min, self._lam_max)),
+                np.full(lam.shape, float(np.clip(sigma, self._sig_min, self._sig_max))),
+                np.clip(y0, self._y_min, self._y_max),
+            ])
+            try:
+                result = np.asarray(self._interp(points), dtype=np.float64)
+            except (ValueError, ArithmeticError, IndexError) as exc:
+                _itk_log.exception("Handled exception in get_thresholds")
+                _itk_log.error(f"[CompoundPoissonLognormaltable] interp failed, falling back: {exc}")
+                result = np.full(lam.shape, np.nan)
+            bad = np.isnan(result) | (result < 0.0)
+            out[idx[~bad]] = result[~bad]
+            fallback[idx[bad]] = True
+
+        if fallback.any():
+            out[fallback] = self._fallback.get_thresholds(flat[fallback], alpha, sigma)
+        return out.reshape(lams.shape)
+
     def clear_cache(self) -> None:
         """No-op kept for interface compatibility with other classes."""
 
@@ -579,6 +843,11 @@ PEAK_SPLIT_METHODS = [
     "1D Watershed",
 ]
 
+#: Samples with at least this many signal points (all channels together)
+#: detect their channels on parallel threads; below it the thread start-up
+#: costs more than it saves.
+CHANNEL_PARALLEL_MIN_POINTS = 1_000_000
+
 
 # ----------------------------------------------------------------------------------------------------------
 # ------------------------------------module-level splitting helpers-----------------------------------------
@@ -612,6 +881,544 @@ def _assignments_to_regions(assignments: np.ndarray, n_peaks: int, start_idx: in
     return [(s, e) for s, e in sub_regions if e >= s]
 
 
+# ----------------------------------------------------------------------------------------------------------
+# ------------------------------------fused particle extraction---------------------------------------------
+# ----------------------------------------------------------------------------------------------------------
+
+PARTICLE_ARRAY_FIELDS = ('peak_time', 'max_height', 'total_counts', 'SNR',
+                         'left_idx', 'right_idx', 'fwhm_s')
+
+
+@jit(nopython=True, nogil=True, inline='always')
+def _value_at(values, i):
+    """Return ``values[i]``, or ``values[0]`` for a length-1 (scalar) array."""
+    if values.shape[0] == 1:
+        return values[0]
+    return values[i]
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _grow(values, size):
+    """Return a copy of ``values`` with room for ``size`` entries."""
+    out = np.empty(size, dtype=values.dtype)
+    out[:values.shape[0]] = values
+    return out
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _watershed_split_points(signal, start, end, threshold, min_valley_ratio, peaks, splits):
+    """
+    One pass of PeakDetection._split_watershed_1d over [start, end].
+
+    Local maxima are found the way ``scipy.signal.find_peaks`` does (plateau
+    midpoints, edges excluded, height >= mean threshold); two such maxima are
+    always at least two samples apart, so the default ``distance=2`` never
+    removes one and is not repeated here.
+
+    ``peaks`` and ``splits`` are scratch buffers of at least
+    (end - start + 1) // 2 + 1 entries; split positions relative to
+    ``start`` are written to the front of ``splits``.
+
+    Returns:
+        int: Number of split positions (0: no split)
+    """
+    n = end - start + 1
+    if n < 3:
+        return 0
+
+    if threshold.shape[0] == 1:
+        height = threshold[0]
+    else:
+        height = 0.0
+        for j in range(start, end + 1):
+            height += threshold[j]
+        height /= n
+
+    n_peaks = 0
+    i = 1
+    i_max = n - 1
+    while i < i_max:
+        if signal[start + i - 1] < signal[start + i]:
+            i_ahead = i + 1
+            while i_ahead < i_max and signal[start + i_ahead] == signal[start + i]:
+                i_ahead += 1
+            if signal[start + i_ahead] < signal[start + i]:
+                mid = (i + i_ahead - 1) // 2
+                if signal[start + mid] >= height:
+                    peaks[n_peaks] = mid
+                    n_peaks += 1
+                i = i_ahead
+        i += 1
+
+    if n_peaks <= 1:
+        return 0
+
+    n_splits = 0
+    kept = peaks[0]
+    for k in range(1, n_peaks):
+        li = kept
+        ri = peaks[k]
+        valley = signal[start + li]
+        valley_pos = li
+        for j in range(li + 1, ri + 1):
+            if signal[start + j] < valley:
+                valley = signal[start + j]
+                valley_pos = j
+        left_peak = signal[start + li]
+        right_peak = signal[start + ri]
+        min_peak = min(left_peak, right_peak)
+        ratio = valley / min_peak if min_peak > 0 else 0.0
+        if ratio < min_valley_ratio:
+            splits[n_splits] = valley_pos
+            n_splits += 1
+            kept = ri
+        elif right_peak > left_peak:
+            kept = ri
+    return n_splits
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _region_metrics(time, signal, start, end, lambda_bkgd, threshold,
+                    integration_level, min_continuous_points):
+    """
+    Per-particle metrics of PeakDetection._particle_from_region.
+
+    Returns:
+        tuple: (accepted, peak index, max height, total counts, SNR, FWHM s)
+    """
+    run = 0
+    best_run = 0
+    for j in range(start, end + 1):
+        if signal[j] > _value_at(threshold, j):
+            run += 1
+            if run > best_run:
+                best_run = run
+        else:
+            run = 0
+    if best_run < max(min_continuous_points, 1):
+        return False, 0, 0.0, 0.0, 0.0, 0.0
+
+    total_counts = 0.0
+    peak = start
+    for j in range(start, end + 1):
+        level = _value_at(integration_level, j)
+        if signal[j] > level:
+            total_counts += signal[j] - level
+        if signal[j] > signal[peak]:
+            peak = j
+    if total_counts <= 0:
+        return False, 0, 0.0, 0.0, 0.0, 0.0
+
+    max_height = signal[peak]
+    peak_thresh = _value_at(threshold, peak)
+    snr = max_height / peak_thresh if peak_thresh > 0 else 0.0
+
+    fwhm_s = 0.0
+    bkgd_at_peak = _value_at(lambda_bkgd, peak)
+    height_above_bkgd = max_height - bkgd_at_peak
+    if height_above_bkgd > 0:
+        half_level = bkgd_at_peak + 0.5 * height_above_bkgd
+        i = peak
+        while i > start and signal[i - 1] > half_level:
+            i -= 1
+        if i == start:
+            t_left = time[start]
+        else:
+            y0 = signal[i - 1]
+            y1 = signal[i]
+            frac = (half_level - y0) / (y1 - y0) if y1 != y0 else 0.0
+            t_left = time[i - 1] + frac * (time[i] - time[i - 1])
+        j = peak
+        while j < end and signal[j + 1] > half_level:
+            j += 1
+        if j == end:
+            t_right = time[end]
+        else:
+            y0 = signal[j]
+            y1 = signal[j + 1]
+            frac = (y0 - half_level) / (y0 - y1) if y0 != y1 else 0.0
+            t_right = time[j] + frac * (time[j + 1] - time[j])
+        fwhm_s = max(0.0, t_right - t_left)
+        if fwhm_s == 0.0 and time.shape[0] > 1:
+            fwhm_s = time[1] - time[0]
+
+    return True, peak, max_height, total_counts, snr, fwhm_s
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _next_region(signal, lambda_bkgd, threshold, integration_level,
+                 min_continuous_points, i):
+    """
+    Find the next run above background, at or after ``i``, that the region
+    stage of PeakDetection._find_particles_numba accepts: enough consecutive
+    points above threshold and positive integrated counts.
+
+    Kept out of _extract_particles_fused so the per-sample scan does not
+    carry that function's growable buffers (and their reference counting).
+
+    Returns:
+        tuple[int, int]: Inclusive (start, end), or (-1, -1) at the end
+    """
+    n = signal.shape[0]
+    while i < n:
+        if not signal[i] > _value_at(lambda_bkgd, i):
+            i += 1
+            continue
+        start = i
+        while i < n and signal[i] > _value_at(lambda_bkgd, i):
+            i += 1
+        end = i - 1
+
+        run = 0
+        best_run = 0
+        counts = 0.0
+        for j in range(start, end + 1):
+            if signal[j] > _value_at(threshold, j):
+                run += 1
+                if run > best_run:
+                    best_run = run
+            else:
+                run = 0
+            level = _value_at(integration_level, j)
+            if signal[j] > level:
+                counts += signal[j] - level
+        if best_run >= min_continuous_points and counts > 0:
+            return start, end
+    return -1, -1
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _extract_particles_fused(time, signal, lambda_bkgd, threshold, integration_level,
+                             min_continuous_points, split, min_valley_ratio):
+    """
+    Region finding, watershed splitting and particle metrics in one pass.
+
+    Equivalent to PeakDetection._find_particles_numba followed by
+    split_peak_region and _particle_from_region on every region. The
+    background, threshold and integration level are float64 arrays of
+    length 1 (constant) or len(signal) (window mode).
+
+    Args:
+        time                  (ndarray): Time array, float64
+        signal                (ndarray): Raw signal, float64
+        lambda_bkgd           (ndarray): Background level(s)
+        threshold             (ndarray): Detection threshold(s)
+        integration_level     (ndarray): Integration baseline(s)
+        min_continuous_points (int):     Minimum consecutive points above threshold
+        split                 (bool):    Apply the 1D watershed split
+        min_valley_ratio      (float):   Watershed valley-to-peak ratio
+
+    Returns:
+        tuple: Arrays in PARTICLE_ARRAY_FIELDS order
+    """
+    capacity = 1024
+    peak_time = np.empty(capacity, dtype=np.float64)
+    max_height = np.empty(capacity, dtype=np.float64)
+    total_counts = np.empty(capacity, dtype=np.float64)
+    snr = np.empty(capacity, dtype=np.float64)
+    left_idx = np.empty(capacity, dtype=np.int64)
+    right_idx = np.empty(capacity, dtype=np.int64)
+    fwhm_s = np.empty(capacity, dtype=np.float64)
+    count = 0
+
+    # pending sub-regions, popped depth-first so output stays in time order
+    stack_start = np.empty(64, dtype=np.int64)
+    stack_end = np.empty(64, dtype=np.int64)
+    stack_depth = np.empty(64, dtype=np.int64)
+    peaks = np.empty(64, dtype=np.int64)
+    splits = np.empty(64, dtype=np.int64)
+
+    region_start, region_end = _next_region(
+        signal, lambda_bkgd, threshold, integration_level, min_continuous_points, 0)
+    while region_start >= 0:
+        stack_start[0] = region_start
+        stack_end[0] = region_end
+        stack_depth[0] = 0
+        top = 1
+        while top > 0:
+            top -= 1
+            s = stack_start[top]
+            e = stack_end[top]
+            depth = stack_depth[top]
+
+            n_splits = 0
+            if split and depth <= 10:
+                if (e - s + 1) // 2 + 1 > peaks.shape[0]:
+                    peaks = np.empty(e - s + 1, dtype=np.int64)
+                    splits = np.empty(e - s + 1, dtype=np.int64)
+                n_splits = _watershed_split_points(signal, s, e, threshold,
+                                                   min_valley_ratio, peaks, splits)
+
+            if n_splits > 0:
+                needed = top + n_splits + 1
+                if needed > stack_start.shape[0]:
+                    size = max(needed, 2 * stack_start.shape[0])
+                    stack_start = _grow(stack_start, size)
+                    stack_end = _grow(stack_end, size)
+                    stack_depth = _grow(stack_depth, size)
+                # push the pieces last-first so the leftmost is popped next
+                sub_end = e
+                for k in range(n_splits - 1, -1, -1):
+                    g = s + splits[k]
+                    if sub_end >= g + 1:
+                        stack_start[top] = g + 1
+                        stack_end[top] = sub_end
+                        stack_depth[top] = depth + 1
+                        top += 1
+                    sub_end = g
+                if sub_end >= s:
+                    stack_start[top] = s
+                    stack_end[top] = sub_end
+                    stack_depth[top] = depth + 1
+                    top += 1
+                continue
+
+            ok, peak, height, counts, ratio, width = _region_metrics(
+                time, signal, s, e, lambda_bkgd, threshold,
+                integration_level, min_continuous_points)
+            if not ok:
+                continue
+            if count == capacity:
+                capacity *= 2
+                peak_time = _grow(peak_time, capacity)
+                max_height = _grow(max_height, capacity)
+                total_counts = _grow(total_counts, capacity)
+                snr = _grow(snr, capacity)
+                left_idx = _grow(left_idx, capacity)
+                right_idx = _grow(right_idx, capacity)
+                fwhm_s = _grow(fwhm_s, capacity)
+            peak_time[count] = time[peak]
+            max_height[count] = height
+            total_counts[count] = counts
+            snr[count] = ratio
+            left_idx[count] = s
+            right_idx[count] = e
+            fwhm_s[count] = width
+            count += 1
+
+        region_start, region_end = _next_region(
+            signal, lambda_bkgd, threshold, integration_level,
+            min_continuous_points, region_end + 1)
+
+    return (peak_time[:count].copy(), max_height[:count].copy(),
+            total_counts[:count].copy(), snr[:count].copy(),
+            left_idx[:count].copy(), right_idx[:count].copy(),
+            fwhm_s[:count].copy())
+
+
+def particle_dicts_from_arrays(arrays: dict, integration_method: str) -> list[dict]:
+    """
+    Build the per-particle dicts returned by PeakDetection.find_particles from
+    the arrays of PeakDetection.extract_particle_arrays.
+
+    Args:
+        arrays             (dict): Field name to array, see PARTICLE_ARRAY_FIELDS
+        integration_method (str):  Integration method label stored on each particle
+
+    Returns:
+        list[dict]: Particle dicts in time order
+    """
+    columns = [arrays[name].tolist() for name in PARTICLE_ARRAY_FIELDS]
+    return [
+        {
+            'peak_time': t, 'max_height': h, 'total_counts': c, 'SNR': r,
+            'left_idx': lo, 'right_idx': hi, 'peak_valid': r >= 3,
+            'integration_method': integration_method, 'fwhm_s': w,
+        }
+        for t, h, c, r, lo, hi, w in zip(*columns)
+    ]
+
+
+# ----------------------------------------------------------------------------------------------------------
+# ------------------------------------count-histogram background--------------------------------------------
+# ----------------------------------------------------------------------------------------------------------
+
+#: Integer-count signals spanning at most this many levels (max - min + 1) get
+#: their iterative background from a CountHistogram; wider or non-integer
+#: signals are scanned as before.
+COUNT_HISTOGRAM_MAX_LEVELS = 1 << 16
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _count_histogram(signal, max_levels):
+    """
+    Count each integer level of ``signal``.
+
+    Args:
+        signal     (np.ndarray): 1-D signal
+        max_levels (int):        Largest number of levels (max - min + 1)
+
+    Returns:
+        tuple: (counts, lowest level); counts is empty if a value is not an
+        integer (or NaN) or the signal spans more than ``max_levels`` levels
+    """
+    empty = np.zeros(0, dtype=np.int64)
+    lo = signal[0]
+    hi = signal[0]
+    for i in range(signal.shape[0]):
+        v = signal[i]
+        if v != np.floor(v):
+            return empty, 0.0
+        if v < lo:
+            lo = v
+        elif v > hi:
+            hi = v
+    if hi - lo >= max_levels:
+        return empty, 0.0
+    counts = np.zeros(np.int64(hi - lo) + 1, dtype=np.int64)
+    for i in range(signal.shape[0]):
+        counts[np.int64(signal[i] - lo)] += 1
+    return counts, np.float64(lo)
+
+
+class CountHistogram:
+    """
+    Count histogram of an integer-count signal.
+
+    Pulse-counting data has a few hundred distinct levels, so the mean of the
+    points below a threshold, asked for in every iteration of
+    PeakDetection.calculate_iterative_threshold, is a prefix of cumulative
+    sums over the levels instead of a scan of the whole signal. The sums are
+    of integers, so they are exact and the means equal ``np.mean`` of a
+    float64 or integer signal bit for bit.
+    """
+
+    def __init__(self, levels: np.ndarray, counts: np.ndarray):
+        """
+        Args:
+            levels (np.ndarray): Ascending signal levels
+            counts (np.ndarray): Number of points at each level
+        """
+        self.levels = np.asarray(levels, dtype=np.float64)
+        self.cum_counts = np.cumsum(counts)
+        self.cum_sums = np.cumsum(self.levels * counts)
+
+    @classmethod
+    def from_signal(cls, signal, max_levels: int | None = None):
+        """
+        Build the histogram of ``signal`` in two passes over it.
+
+        Args:
+            signal     (np.ndarray): 1-D signal
+            max_levels (int | None): Level limit (default:
+                COUNT_HISTOGRAM_MAX_LEVELS)
+
+        Returns:
+            CountHistogram | None: None if the signal is empty, has values
+            that are not integers, spans too many levels, or numba is missing
+        """
+        signal = np.asarray(signal)
+        if (not NUMBA_AVAILABLE or signal.ndim != 1 or signal.size == 0
+                or signal.dtype.kind not in 'iuf'):
+            return None
+        if max_levels is None:
+            max_levels = COUNT_HISTOGRAM_MAX_LEVELS
+        counts, lo = _count_histogram(signal, max_levels)
+        if counts.size == 0:
+            return None
+        return cls(lo + np.arange(counts.size, dtype=np.float64), counts)
+
+    def mean_below(self, threshold):
+        """
+        Return the mean of the points below ``threshold``.
+
+        Args:
+            threshold (float): Threshold (points equal to it are excluded)
+
+        Returns:
+            float | None: Mean, or None if no point is below the threshold
+        """
+        if not threshold > self.levels[0]:
+            return None
+        k = np.searchsorted(self.levels, threshold, side='left')
+        return self.cum_sums[k - 1] / self.cum_counts[k - 1]
+
+
+# ----------------------------------------------------------------------------------------------------------
+# ------------------------------------window-mode background------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------
+
+@jit(nopython=True, nogil=True, inline='always')
+def _mirror_index(i, n, edge_repeats):
+    """
+    Index into a signal of length ``n`` for position ``i`` of its mirrored
+    extension: scipy.ndimage 'reflect' (d c b a | a b c d | d c b a) if
+    ``edge_repeats``, else numpy.pad 'reflect' (d c b | a b c d | c b a).
+    """
+    if 0 <= i < n:
+        return i
+    if edge_repeats:
+        period = 2 * n
+        i = i % period
+        return i if i < n else period - 1 - i
+    if n == 1:
+        return 0
+    period = 2 * (n - 1)
+    i = i % period
+    return i if i < n else period - i
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _window_background(signal, threshold, window_size, edge_repeats):
+    """
+    Centred moving mean of the points below ``threshold``, in one pass.
+
+    The window of point i covers [i - w//2, i - w//2 + w - 1] of the mirrored
+    signal (see _mirror_index), as for np.convolve over a reflect-padded
+    signal or uniform_filter1d. One compensated running sum and one count are
+    updated per point, so the cost does not depend on the window size and no
+    temporary arrays are needed. Windows without a point below the threshold
+    get 0.
+
+    Args:
+        signal       (np.ndarray): 1-D signal
+        threshold    (np.ndarray): Threshold per point, or one for all
+        window_size  (int):        Window size in points
+        edge_repeats (bool):       Mirror mode, see _mirror_index
+
+    Returns:
+        np.ndarray: float64 local background per point
+    """
+    n = signal.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    half = window_size // 2
+    total = 0.0
+    comp = 0.0
+    count = 0
+    for j in range(-half, window_size - half):
+        k = _mirror_index(j, n, edge_repeats)
+        if signal[k] < _value_at(threshold, k):
+            y = signal[k] - comp
+            t = total + y
+            comp = (t - total) - y
+            total = t
+            count += 1
+    out[0] = total / count if count > 0 else 0.0
+    for i in range(1, n):
+        k = _mirror_index(i - 1 - half, n, edge_repeats)
+        if signal[k] < _value_at(threshold, k):
+            count -= 1
+            if count == 0:
+                total = 0.0
+                comp = 0.0
+            else:
+                y = -signal[k] - comp
+                t = total + y
+                comp = (t - total) - y
+                total = t
+        k = _mirror_index(i + window_size - 1 - half, n, edge_repeats)
+        if signal[k] < _value_at(threshold, k):
+            y = signal[k] - comp
+            t = total + y
+            comp = (t - total) - y
+            total = t
+            count += 1
+        out[i] = total / count if count > 0 else 0.0
+    return out
+
+
 # ----------------------------------------------------------------------------------------------------------
 # ------------------------------------PeakDetection class---------------------------------------------------
 # ----------------------------------------------------------------------------------------------------------
@@ -645,25 +1452,28 @@ class PeakDetection:
 
     def __init__(self):
         """Initialize PeakDetection instance."""
-        self._cache_hits = 0
-        self._cache_misses = 0
+        self.threshold_cache = shared_cache()
         self.iter_eps = 1e-3
         self.default_max_iters = 4
-        self.compound_poisson_lognormal     = CompoundPoissonLognormalOptimized()
+        self.compound_poisson_lognormal     = CompoundPoissonLognormalOptimized(self.threshold_cache)
         self.compound_poisson_lognormal_lut = CompoundPoissonLognormaltable()
         self.incremental_enabled = True
+        # 'processes': detect_particles runs samples in worker processes
+        # (processing.detection_pool); 'threads': on a thread pool
+        self.detection_backend = 'processes'
 
     def clear_threshold_cache(self) -> None:
-        """Reset the lru_cache on ``_cached_threshold_calculation``.
+        """Empty the shared threshold cache and reset its statistics.
 
-        Call this between detection runs (e.g. when samples or parameters
-        change) so stale (lambda, method, alpha, isotope) combinations do not
-        accumulate across the session.  With ``maxsize=512`` the cache is
-        bounded, but explicit clearing ensures deterministic memory use.
+        The cache is bounded (see processing.threshold_cache), so this is
+        only needed when cached values must not be reused, e.g. after a
+        change to a threshold method's numerics.
         """
-        self._cached_threshold_calculation.cache_clear()
-        self._cache_hits   = 0
-        self._cache_misses = 0
+        self.threshold_cache.clear()
+
+    def threshold_cache_stats(self) -> dict:
+        """Return the shared threshold cache's hits, misses, evictions and size."""
+        return self.threshold_cache.stats()
 
     # ----------------------------------------------------------------------------------------------------------
     # ------------------------------------performance-----------------------------------------------------------
@@ -833,6 +1643,11 @@ class PeakDetection:
 
             T_accel = T0 - (T1 - T0)² / (T2 - 2·T1 + T0)
 
+        Without a window, an integer-count signal is reduced to a
+        CountHistogram at the first refinement, so every iteration's
+        background is a lookup on a few hundred levels instead of a scan
+        of the signal. Non-integer (e.g. corrected) signals are scanned.
+
         Args:
             signal            (ndarray): Signal data
             method            (str):     Detection method
@@ -870,10 +1685,7 @@ class PeakDetection:
             }
 
         if use_window_size:
-            kernel = np.ones(window_size) / window_size
-            lambda_for_threshold = np.convolve(
-                np.pad(signal, window_size // 2, mode='reflect'), kernel, mode='valid'
-            )[:len(signal)]
+            lambda_for_threshold = self._window_mean(signal, window_size)
             threshold = np.full_like(signal, np.inf)
             prev_threshold = np.full_like(signal, np.inf)
         else:
@@ -885,6 +1697,7 @@ class PeakDetection:
         iter_eps = 1e-3
         thresh_history = []
         aitken_applied = False
+        histogram = None
 
         while iters < max_iters or iters == 0:
             if iters > 0:
@@ -892,8 +1705,15 @@ class PeakDetection:
                 if use_window_size:
                     lambda_for_threshold = self._rolling_background(signal, threshold, window_size)
                 else:
-                    below = signal[signal < threshold]
-                    lambda_for_threshold = np.mean(below) if len(below) > 0 else overall_mean_signal
+                    if histogram is None:
+                        # Built once: integer counts or False for a full scan.
+                        histogram = CountHistogram.from_signal(signal) or False
+                    if histogram:
+                        mean_below = histogram.mean_below(threshold)
+                    else:
+                        below = signal[signal < threshold]
+                        mean_below = np.mean(below) if len(below) > 0 else None
+                    lambda_for_threshold = overall_mean_signal if mean_below is None else mean_below
 
             if use_window_size:
                 threshold = self._calculate_array_threshold(lambda_for_threshold, method, alpha, sigma)
@@ -946,10 +1766,25 @@ class PeakDetection:
             'window_size_used': window_size if use_window_size else None,
         }
 
+    def _window_mean(self, signal, window_size):
+        """Centred moving mean of the signal, the starting background of window mode.
+        Mirrored at the ends like numpy.pad 'reflect'; one pass with numba,
+        independent of window_size.
+        """
+        if NUMBA_AVAILABLE and signal.ndim == 1:
+            return _window_background(signal, np.array([np.inf]), int(window_size), False)
+        kernel = np.ones(window_size) / window_size
+        return np.convolve(
+            np.pad(signal, window_size // 2, mode='reflect'), kernel, mode='valid'
+        )[:len(signal)]
+
     def _rolling_background(self, signal, threshold, window_size):
         """Calculates a dynamic rolling background excluding peaks above threshold.
-        Uses uniform_filter1d — O(n) regardless of window_size.
+        O(n) regardless of window_size: one pass with numba, else uniform_filter1d.
         """
+        if NUMBA_AVAILABLE and signal.ndim == 1:
+            threshold = np.atleast_1d(np.asarray(threshold, dtype=np.float64))
+            return _window_background(signal, threshold, int(window_size), True)
         valid_mask = signal < threshold
         valid_signal = signal * valid_mask
         mask_float = valid_mask.astype(np.float64)
@@ -982,21 +1817,25 @@ class PeakDetection:
         """
         return detection_registry.get(method).single_threshold(self, lambda_bkgd, alpha, sigma)
 
-    @lru_cache(maxsize=512)
     def _cached_threshold_calculation(self, lambda_bkgd, method, alpha, isotope_key):
         """
         Cached threshold calculation for performance.
 
+        Values are kept in the shared threshold cache under the exact
+        background; the result does not depend on the isotope.
+
         Args:
             lambda_bkgd (float): Background level
             method      (str):   Detection method
             alpha       (float): Significance level
-            isotope_key (str):   Isotope identifier for caching
+            isotope_key (str):   Isotope identifier (unused)
 
         Returns:
             float: Calculated threshold
         """
-        return detection_registry.get(method).single_threshold(self, lambda_bkgd, alpha, 0.55)
+        key = threshold_key(method, lambda_bkgd, alpha, 0.55, decimals=None)
+        return self.threshold_cache.get_or_compute(
+            key, lambda: detection_registry.get(method).single_threshold(self, lambda_bkgd, alpha, 0.55))
 
     def calculate_thresholds_batch_safe(self, signals_dict, params_dict,
                                         method_groups=None, isotope_mapping=None):
@@ -1396,57 +2235,100 @@ class PeakDetection:
             list[dict]: Detected particle dictionaries
         """
         signal = self.optimize_data_types(raw_signal)
+
+        if NUMBA_AVAILABLE and len(signal) > 500:
+            arrays = self.extract_particle_arrays(
+                time, signal, lambda_bkgd, threshold,
+                min_continuous_points, integration_method,
+                split_method=split_method,
+                min_valley_ratio=min_valley_ratio,
+            )
+            return particle_dicts_from_arrays(arrays, integration_method)
+
+        return self.find_particles_vectorized(
+            time, signal,
+            lambda_bkgd, threshold,
+            min_width, min_continuous_points,
+            integration_method,
+            split_method=split_method,
+            sigma=sigma,
+            min_valley_ratio=min_valley_ratio,
+        )
+
+    def extract_particle_arrays(self, time, raw_signal, lambda_bkgd, threshold,
+                                min_continuous_points=1,
+                                integration_method="Background",
+                                split_method="1D Watershed",
+                                min_valley_ratio=0.50):
+        """
+        Compiled particle extraction returning one array per particle field.
+
+        Region finding, 1D watershed splitting and the per-particle metrics
+        run in a single Numba pass (_extract_particles_fused); nothing is
+        built per particle in Python. Gives the same particles, in time
+        order, as running split_peak_region and _particle_from_region over
+        the regions of _find_particles_numba.
+
+        Args:
+            time                  (ndarray):        Time array
+            raw_signal            (ndarray):        Raw signal
+            lambda_bkgd   (float|ndarray):          Background level
+            threshold     (float|ndarray):          Detection threshold
+            min_continuous_points (int):            Minimum consecutive above-threshold points
+            integration_method    (str):            "Background", "Threshold", or "Midpoint"
+            split_method          (str):            One of PEAK_SPLIT_METHODS; anything
+                                                    but "1D Watershed" leaves regions whole
+            min_valley_ratio      (float):          Watershed valley-to-peak ratio
+
+        Returns:
+            dict: Field name (PARTICLE_ARRAY_FIELDS) to contiguous array;
+            left_idx/right_idx are int64, the rest float64
+        """
         integration_level = self._compute_integration_level(
             lambda_bkgd, threshold, integration_method
         )
 
-        if NUMBA_AVAILABLE and len(signal) > 500:
-            signal_f64 = signal.astype(np.float64)
-
-            if np.isscalar(threshold):
-                starts, ends, heights, counts = self._find_particles_numba(
-                    signal_f64,
-                    float(threshold),
-                    float(lambda_bkgd),
-                    min_continuous_points,
-                    float(integration_level),
-                )
-            else:
-                bkgd_arr = (np.asarray(lambda_bkgd, dtype=np.float64)
-                            if not np.isscalar(lambda_bkgd)
-                            else np.full(len(signal_f64), float(lambda_bkgd), dtype=np.float64))
-                integration_level_arr = np.asarray(integration_level, dtype=np.float64)
-                starts, ends, heights, counts = self._find_particles_numba_dynamic(
-                    signal_f64,
-                    threshold.astype(np.float64),
-                    bkgd_arr,
-                    min_continuous_points,
-                    integration_level_arr,
-                )
-
-            particles = []
-            for i in range(len(starts)):
-                s_idx, e_idx = starts[i], ends[i]
+        def levels(value):
+            return np.ascontiguousarray(np.atleast_1d(np.asarray(value, dtype=np.float64)))
 
-                sub_regions = self.split_peak_region(
-                    signal_f64, s_idx, e_idx,
-                    lambda_bkgd, threshold,
-                    split_method=split_method, sigma=sigma,
-                    min_valley_ratio=min_valley_ratio,
-                )
+        columns = _extract_particles_fused(
+            np.ascontiguousarray(time, dtype=np.float64),
+            np.ascontiguousarray(raw_signal, dtype=np.float64),
+            levels(lambda_bkgd), levels(threshold), levels(integration_level),
+            int(min_continuous_points),
+            split_method == "1D Watershed",
+            float(min_valley_ratio),
+        )
+        return dict(zip(PARTICLE_ARRAY_FIELDS, columns))
+
+    def find_particles_table(self, time, raw_signal, lambda_bkgd, threshold,
+                             min_width=3, min_continuous_points=1,
+                             integration_method="Background",
+                             split_method="1D Watershed",
+                             sigma=0.55,
+                             min_valley_ratio=0.50):
+        """
+        find_particles, returning the peaks as a ParticleTable.
 
-                for (ss, se) in sub_regions:
-                    p = self._particle_from_region(
-                        time, signal, ss, se,
-                        lambda_bkgd, threshold, integration_level,
-                        min_continuous_points, integration_method,
-                    )
-                    if p is not None:
-                        particles.append(p)
+        Long signals go straight from extract_particle_arrays into the
+        table without building a dict per particle.
 
-            return particles
+        Args:
+            (same as find_particles_safe)
 
-        return self.find_particles_vectorized(
+        Returns:
+            ParticleTable: Detected peaks, rows equal to find_particles' dicts
+        """
+        signal = self.optimize_data_types(raw_signal)
+        if NUMBA_AVAILABLE and len(signal) > 500:
+            arrays = self.extract_particle_arrays(
+                time, signal, lambda_bkgd, threshold,
+                min_continuous_points, integration_method,
+                split_method=split_method,
+                min_valley_ratio=min_valley_ratio,
+            )
+            return ParticleTable.from_peaks(arrays, integration_method)
+        return ParticleTable.from_particles(self.find_particles_vectorized(
             time, signal,
             lambda_bkgd, threshold,
             min_width, min_continuous_points,
@@ -1454,7 +2336,33 @@ class PeakDetection:
             split_method=split_method,
             sigma=sigma,
             min_valley_ratio=min_valley_ratio,
-        )
+        ))
+
+    @staticmethod
+    def _particle_result_rows(display_label, time, particles):
+        """
+        Rows of the detection results table for one isotope's peaks.
+
+        Args:
+            display_label (str):           Isotope label shown in the table
+            time          (ndarray):       Time array of the sample
+            particles     (ParticleTable): Detected peaks
+
+        Returns:
+            list[list[str]]: Label, start, end, counts, height and SNR per peak
+        """
+        if not len(particles):
+            return []
+        time = np.asarray(time)
+        starts = time[particles.column('left_idx')].tolist()
+        ends = time[particles.column('right_idx')].tolist()
+        return [
+            [display_label, f"{t0:.4f}", f"{t1:.4f}", f"{c:.0f}", f"{h:.0f}", f"{r:.2f}"]
+            for t0, t1, c, h, r in zip(starts, ends,
+                                       particles.column('total_counts').tolist(),
+                                       particles.column('max_height').tolist(),
+                                       particles.column('SNR').tolist())
+        ]
 
     def find_particles_vectorized(self, time, raw_signal, lambda_bkgd, threshold,
                                   min_width=3, min_continuous_points=1,
@@ -1554,106 +2462,190 @@ class PeakDetection:
     # ------------------------------------processing------------------------------------------------------------
     # ----------------------------------------------------------------------------------------------------------
 
-    def process_single_sample_safe(self, main_window, sample_name):
+    def process_single_sample_safe(self, main_window, sample_name, channel_workers=None):
         """Threading-safe sample processing with iterative calculation."""
         try:
-            local_data = main_window.data_by_sample[sample_name]
-            local_time = main_window.time_array_by_sample[sample_name]
-            sample_params = main_window.sample_parameters.get(sample_name, {})
+            inputs = self._sample_detection_inputs(main_window, sample_name)
+            if inputs is None:
+                return None
+            local_time, signals_for_batch, params_for_batch, isotope_mapping, valid_elements = inputs
+            detected_peaks_for_sample, local_thresholds = self.detect_sample_signals(
+                sample_name, local_time, signals_for_batch, params_for_batch,
+                isotope_mapping, valid_elements, channel_workers=channel_workers)
+            return self._sample_detection_result(
+                main_window, sample_name, inputs,
+                detected_peaks_for_sample, local_thresholds)
 
-            signals_for_batch = {}
-            params_for_batch = {}
-            isotope_mapping = {}
-            valid_elements = []
+        except Exception as e:
+            _itk_log.exception("Handled exception in process_single_sample_safe")
+            _itk_log.error(f"Error processing sample {sample_name}: {str(e)}")
+            return None
 
-            for element, isotopes in main_window.selected_isotopes.items():
-                for isotope in isotopes:
-                    element_key = f"{element}-{isotope:.4f}"
-                    if element_key in sample_params and sample_params[element_key].get('include', True):
-                        isotope_key = main_window.find_closest_isotope(
-                            isotope, local_data)
-                        if isotope_key is not None and isotope_key in local_data:
-                            signals_for_batch[element_key] = local_data[isotope_key]
-                            params_for_batch[element_key] = sample_params[element_key]
-                            isotope_mapping[element_key] = isotope_key
-                            valid_elements.append((element, isotope, element_key, isotope_key))
-
-            if not signals_for_batch:
-                return None
+    def _sample_detection_inputs(self, main_window, sample_name):
+        """
+        Collect the signals and parameters of one sample's included isotopes.
 
-            batch_threshold_data = self.calculate_thresholds_batch_safe(
-                signals_for_batch, params_for_batch, isotope_mapping=isotope_mapping
-            )
+        Args:
+            main_window: Main window holding the sample data and parameters
+            sample_name (str): Sample to detect
 
-            detected_peaks_for_sample = {}
-            all_particles = []
-            results_data = []
-            local_thresholds = {}
+        Returns:
+            tuple | None: (time, signals, params, isotope_mapping,
+            valid_elements) as taken by detect_sample_signals, or None if
+            the sample has nothing to detect
+        """
+        local_data = main_window.data_by_sample[sample_name]
+        local_time = main_window.time_array_by_sample[sample_name]
+        sample_params = main_window.sample_parameters.get(sample_name, {})
 
-            for element, isotope, element_key, isotope_key in valid_elements:
-                if element_key not in batch_threshold_data:
-                    continue
+        signals_for_batch = {}
+        params_for_batch = {}
+        isotope_mapping = {}
+        valid_elements = []
 
-                signal = local_data[isotope_key]
-                params = params_for_batch[element_key]
-                threshold_data = batch_threshold_data[element_key]
-                integration_method = params.get('integration_method', 'Background')
-                split_method = params.get('split_method', '1D Watershed')
-                sigma = params.get('sigma', 0.55)
-                min_valley_ratio = params.get('valley_ratio', 0.50)
+        for element, isotopes in main_window.selected_isotopes.items():
+            for isotope in isotopes:
+                element_key = f"{element}-{isotope:.4f}"
+                if element_key in sample_params and sample_params[element_key].get('include', True):
+                    isotope_key = main_window.find_closest_isotope(
+                        isotope, local_data)
+                    if isotope_key is not None and isotope_key in local_data:
+                        signals_for_batch[element_key] = local_data[isotope_key]
+                        params_for_batch[element_key] = sample_params[element_key]
+                        isotope_mapping[element_key] = isotope_key
+                        valid_elements.append((element, isotope, element_key, isotope_key))
+
+        if not signals_for_batch:
+            return None
+        return local_time, signals_for_batch, params_for_batch, isotope_mapping, valid_elements
 
-                with log_context(sample=sample_name, element=element, isotope=f"{isotope:.4f}"):
-                    try:
-                        detected_particles = self.find_particles_safe(
-                            local_time, signal,
-                            threshold_data['background'], threshold_data['threshold'],
-                            min_continuous_points=int(params['min_continuous']),
-                            integration_method=integration_method,
-                            split_method=split_method,
-                            sigma=sigma,
-                            min_valley_ratio=min_valley_ratio,
-                        )
+    def detect_sample_signals(self, sample_name, time, signals, params,
+                              isotope_mapping, valid_elements, channel_workers=None):
+        """
+        Thresholds and peaks of one sample. Touches no GUI state, so it can
+        run on a worker thread or in a worker process (detection_pool).
 
-                        detected_peaks_for_sample[(element, isotope)] = detected_particles
-                        local_thresholds[element_key] = threshold_data
-
-                        display_label = main_window.get_formatted_label(element_key)
-                        if detected_particles:
-                            all_particles.append({
-                                'element': element,
-                                'isotope': isotope,
-                                'signal': signal,
-                                'clusters': [(p['left_idx'], p['right_idx']) for p in detected_particles],
-                            })
-                            for particle in detected_particles:
-                                if particle is None:
-                                    continue
-                                results_data.append([
-                                    display_label,
-                                    f"{local_time[particle['left_idx']]:.4f}",
-                                    f"{local_time[particle['right_idx']]:.4f}",
-                                    f"{particle['total_counts']:.0f}",
-                                    f"{particle['max_height']:.0f}",
-                                    f"{particle['SNR']:.2f}",
-                                ])
-
-                    except (ValueError, KeyError, IndexError, ArithmeticError) as e:
-                        _itk_log.exception("Handled exception in process_single_sample_safe")
-                        _itk_log.error(f"Error processing {element}-{isotope}: {str(e)}")
-                        continue
+        Channels are independent, so a long sample detects them on parallel
+        threads: the threshold iteration is NumPy work that releases the GIL
+        and the particle extraction kernels are compiled with nogil.
 
-            return {
-                'sample_name': sample_name,
-                'detected_peaks': detected_peaks_for_sample,
-                'results_data': results_data,
-                'all_particles': all_particles,
-                'thresholds': local_thresholds,
-            }
+        Args:
+            sample_name    (str):     Sample name, for logging
+            time           (ndarray): Time array of the sample
+            signals        (dict):    Element key to signal array
+            params         (dict):    Element key to detection parameters
+            isotope_mapping (dict):   Element key to isotope (data) key
+            valid_elements (list):    (element, isotope, element_key,
+                                      isotope_key) per isotope to detect
+            channel_workers (int | None): Threads for the channels (default:
+                                      all cores but one); used when the
+                                      sample has CHANNEL_PARALLEL_MIN_POINTS
+                                      points or more
 
-        except Exception as e:
-            _itk_log.exception("Handled exception in process_single_sample_safe")
-            _itk_log.error(f"Error processing sample {sample_name}: {str(e)}")
-            return None
+        Returns:
+            tuple: ({(element, isotope): ParticleTable},
+            {element_key: threshold data})
+        """
+        jobs = [job for job in valid_elements if job[2] in signals]
+        workers = default_worker_count() if channel_workers is None else channel_workers
+        workers = min(workers, len(jobs))
+        n_points = sum(len(signals[job[2]]) for job in jobs)
+
+        def detect(job):
+            element, isotope, element_key, isotope_key = job
+            return self._detect_channel(
+                sample_name, time, signals[element_key], params[element_key],
+                element, isotope, element_key, isotope_key)
+
+        if workers > 1 and n_points >= CHANNEL_PARALLEL_MIN_POINTS:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(detect, jobs))
+        else:
+            outcomes = [detect(job) for job in jobs]
+
+        detected_peaks_for_sample = {}
+        local_thresholds = {}
+        for (element, isotope, element_key, _), (threshold_data, table) in zip(jobs, outcomes):
+            if table is not None:
+                detected_peaks_for_sample[(element, isotope)] = table
+                local_thresholds[element_key] = threshold_data
+
+        return detected_peaks_for_sample, local_thresholds
+
+    def _detect_channel(self, sample_name, time, signal, params, element, isotope,
+                        element_key, isotope_key):
+        """
+        Threshold and peaks of one channel of a sample.
+
+        Returns:
+            tuple: (threshold data, ParticleTable); the table is None if
+            detection failed
+        """
+        with log_context(sample=sample_name, element=element, isotope=f"{isotope:.4f}"):
+            threshold_data = self.calculate_thresholds_batch_safe(
+                {element_key: signal}, {element_key: params},
+                isotope_mapping={element_key: isotope_key},
+            ).get(element_key)
+            if threshold_data is None:
+                return None, None
+
+            try:
+                table = self.find_particles_table(
+                    time, signal,
+                    threshold_data['background'], threshold_data['threshold'],
+                    min_continuous_points=int(params['min_continuous']),
+                    integration_method=params.get('integration_method', 'Background'),
+                    split_method=params.get('split_method', '1D Watershed'),
+                    sigma=params.get('sigma', 0.55),
+                    min_valley_ratio=params.get('valley_ratio', 0.50),
+                )
+            except (ValueError, KeyError, IndexError, ArithmeticError) as e:
+                _itk_log.exception("Handled exception in detect_sample_signals")
+                _itk_log.error(f"Error processing {element}-{isotope}: {str(e)}")
+                return threshold_data, None
+        return threshold_data, table
+
+    def _sample_detection_result(self, main_window, sample_name, inputs,
+                                 detected_peaks_for_sample, local_thresholds):
+        """
+        Build the per-sample result detect_particles stores.
+
+        Args:
+            main_window: Main window (for display labels)
+            sample_name (str): Detected sample
+            inputs (tuple): _sample_detection_inputs of the sample
+            detected_peaks_for_sample (dict): Peaks per (element, isotope)
+            local_thresholds (dict): Threshold data per element key
+
+        Returns:
+            dict: 'sample_name', 'detected_peaks', 'results_data',
+            'all_particles' and 'thresholds'
+        """
+        local_time, signals, _, _, valid_elements = inputs
+        all_particles = []
+        results_data = []
+
+        for element, isotope, element_key, _ in valid_elements:
+            detected_particles = detected_peaks_for_sample.get((element, isotope))
+            if not detected_particles:
+                continue
+            display_label = main_window.get_formatted_label(element_key)
+            all_particles.append({
+                'element': element,
+                'isotope': isotope,
+                'signal': signals[element_key],
+                'clusters': detected_particles.clusters(),
+            })
+            results_data.extend(self._particle_result_rows(
+                display_label, local_time, detected_particles))
+
+        return {
+            'sample_name': sample_name,
+            'detected_peaks': detected_peaks_for_sample,
+            'results_data': results_data,
+            'all_particles': all_particles,
+            'thresholds': local_thresholds,
+        }
 
     def process_single_sample(self, main_window, sample_name):
         return self.process_single_sample_safe(main_window, sample_name)
@@ -1737,214 +2729,200 @@ class PeakDetection:
     # ------------------------------------incremental detection-------------------------------------------------
     # ----------------------------------------------------------------------------------------------------------
 
-    def detect_particles_incremental(self, main_window):
-        """Incremental particle detection for changed elements only."""
-        original_sample = main_window.current_sample
-        overlay = None
-
+    def process_sample_incremental(self, main_window, sample_name, changed_elements):
+        """Process only changed elements for a sample incrementally."""
         try:
-            overlay = QWidget(main_window)
-            overlay.setGeometry(main_window.rect())
-            overlay.setStyleSheet("background-color: rgba(0, 0, 0, 50);")
+            inputs = self._incremental_inputs(main_window, sample_name, changed_elements)
+            local_time, signals_for_batch, params_for_batch, isotope_mapping, valid_elements, _ = inputs
+            detected_peaks, thresholds = self.detect_sample_signals(
+                sample_name, local_time, signals_for_batch, params_for_batch,
+                isotope_mapping, valid_elements)
+            return self._incremental_result(
+                main_window, sample_name, inputs, detected_peaks, thresholds)
 
-            message_label = QLabel("Incremental iterative peak detection in progress...", overlay)
-            message_label.setStyleSheet(
-                "color: white; background-color: rgba(0, 0, 0, 0); "
-                "font-size: 16px; font-weight: bold;"
-            )
-            message_label.setAlignment(Qt.AlignCenter)
-            message_label.setGeometry(overlay.rect())
-            overlay.show()
-            QApplication.processEvents()
-
-            main_window.progress_bar.setVisible(True)
-            main_window.progress_bar.setValue(0)
-
-            total_changed_elements = 0
-            samples_to_process = {}
-
-            for sample_name in main_window.data_by_sample.keys():
-                main_window.load_or_initialize_parameters(sample_name)
-                changed_elements, _ = self.get_changed_elements(main_window, sample_name)
-                if changed_elements:
-                    samples_to_process[sample_name] = changed_elements
-                    total_changed_elements += len(changed_elements)
-
-            if total_changed_elements == 0:
-                main_window.status_label.setText("No changes detected - skipping detection")
-                main_window.progress_bar.setVisible(False)
-                if overlay:
-                    overlay.hide()
-                    overlay.deleteLater()
-                return
-
-            main_window.status_label.setText(
-                f"Processing {total_changed_elements} changed elements "
-                f"across {len(samples_to_process)} samples"
-            )
-            QApplication.processEvents()
-
-            processed_elements = 0
+        except Exception as e:
+            _itk_log.exception("Handled exception in process_sample_incremental")
+            _itk_log.error(f"Error in incremental processing for {sample_name}: {str(e)}")
+            return None
 
-            for sample_name, changed_elements in samples_to_process.items():
-                result = self.process_sample_incremental(main_window, sample_name, changed_elements)
+    def _incremental_inputs(self, main_window, sample_name, changed_elements, copy_params=False):
+        """
+        Collect the signals and parameters of a sample's changed elements.
 
-                if result:
-                    self.merge_detection_results(main_window, sample_name, result, changed_elements)
-                    processed_elements += len(changed_elements)
-                    progress = int((processed_elements / total_changed_elements) * 100)
-                    main_window.progress_bar.setValue(progress)
+        Args:
+            main_window: Main window holding the sample data and parameters
+            sample_name (str): Sample to re-detect
+            changed_elements (list): (element, isotope, element_key,
+                change_type) from get_changed_elements
+            copy_params (bool): Copy each element's parameter dict, for
+                detection that runs while the user keeps editing
 
-                    if overlay and message_label:
-                        message_label.setText(
-                            f"Incremental detection: {progress}% complete\n"
-                            f"Processed {processed_elements}/{total_changed_elements} elements"
-                        )
-                    QApplication.processEvents()
+        Returns:
+            tuple: (time, signals, params, isotope_mapping, valid_elements,
+            excluded_elements); the first five are detect_sample_signals'
+            arguments, excluded_elements are (element, isotope, element_key)
+            of changed elements that are no longer included
+        """
+        local_data = main_window.data_by_sample[sample_name]
+        local_time = main_window.time_array_by_sample[sample_name]
+        sample_params = main_window.sample_parameters.get(sample_name, {})
+
+        signals_for_batch = {}
+        params_for_batch = {}
+        isotope_mapping = {}
+        valid_elements = []
+        excluded_elements = []
+
+        no_parameters = []
+        no_signal = []
+        for element, isotope, element_key, change_type in changed_elements:
+            if element_key not in sample_params:
+                no_parameters.append(element_key)
+                continue
+            if not sample_params[element_key].get('include', True):
+                excluded_elements.append((element, isotope, element_key))
+                continue
+            isotope_key = main_window.find_closest_isotope(
+                isotope, local_data)
+            if isotope_key is None or isotope_key not in local_data:
+                no_signal.append(element_key)
+                continue
+            signals_for_batch[element_key] = local_data[isotope_key]
+            params = sample_params[element_key]
+            params_for_batch[element_key] = dict(params) if copy_params else params
+            isotope_mapping[element_key] = isotope_key
+            valid_elements.append((element, isotope, element_key, isotope_key))
+
+        if no_signal:
+            _itk_log.warning(
+                "%s: %d element(s) skipped, this sample has no channel for "
+                "them: %s. It holds %d channel(s): %s",
+                sample_name, len(no_signal), no_signal[:6],
+                len(local_data), sorted(local_data.keys())[:8])
+        if no_parameters:
+            _itk_log.warning(
+                "%s: %d element(s) skipped, no detection parameters were "
+                "initialised for them: %s",
+                sample_name, len(no_parameters), no_parameters[:6])
+
+        return (local_time, signals_for_batch, params_for_batch, isotope_mapping,
+                valid_elements, excluded_elements)
+
+    def _incremental_result(self, main_window, sample_name, inputs, detected_peaks, thresholds):
+        """
+        Build the result merge_detection_results takes from detected peaks.
 
-            if original_sample in samples_to_process:
-                self.update_current_sample_display(main_window, original_sample)
+        Args:
+            main_window: Main window (for display labels)
+            sample_name (str): Sample the peaks belong to
+            inputs (tuple): _incremental_inputs' result
+            detected_peaks (dict): (element, isotope) to ParticleTable
+            thresholds (dict): Element key to threshold data
 
-            main_window.progress_bar.setVisible(False)
-            main_window.status_label.setText(
-                f"Incremental detection complete! Processed {total_changed_elements} changed elements"
-            )
+        Returns:
+            dict: Updates of peaks, results rows and thresholds
+        """
+        local_time, _, _, _, valid_elements, excluded_elements = inputs
+        detected_peaks_updates = dict(detected_peaks)
+        threshold_updates = dict(thresholds)
+        results_data_updates = []
+        for element, isotope, element_key, _ in valid_elements:
+            if (element, isotope) in detected_peaks:
+                display_label = main_window.get_formatted_label(element_key)
+                results_data_updates.extend(self._particle_result_rows(
+                    display_label, local_time, detected_peaks[(element, isotope)]))
+
+        for element, isotope, element_key in excluded_elements:
+            detected_peaks_updates[(element, isotope)] = []
+            threshold_updates[element_key] = {
+                'threshold': 0, 'background': 0, 'LOD_counts': 0, 'LOD_MDL': 0,
+                'iterations': 0, 'convergence': 'element_excluded',
+                'method_used': 'Excluded', 'window_applied': False,
+                'window_size_used': None,
+            }
 
-        except Exception as e:
-            _itk_log.exception("Handled exception in detect_particles_incremental")
-            _itk_log.error(f"Error in incremental detect_particles: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            main_window.status_label.setText("Error during incremental detection")
-            main_window.progress_bar.setVisible(False)
-        finally:
-            if overlay:
-                overlay.hide()
-                overlay.deleteLater()
+        return {
+            'sample_name': sample_name,
+            'detected_peaks_updates': detected_peaks_updates,
+            'results_data_updates': results_data_updates,
+            'threshold_updates': threshold_updates,
+            'changed_elements': (
+                [f"{e}-{i:.4f}" for e, i, _, _ in valid_elements] +
+                [f"{e}-{i:.4f}" for e, i, _ in excluded_elements]
+            ),
+        }
 
-        main_window.unsaved_changes = True
+    def incremental_jobs(self, main_window):
+        """
+        Snapshot the re-detection work for background incremental detection.
 
-    def process_sample_incremental(self, main_window, sample_name, changed_elements):
-        """Process only changed elements for a sample incrementally."""
-        try:
-            local_data = main_window.data_by_sample[sample_name]
-            local_time = main_window.time_array_by_sample[sample_name]
-            sample_params = main_window.sample_parameters.get(sample_name, {})
+        Unlike get_changed_elements this changes no state: the parameter
+        hashes are stored by publish_incremental, once the results are in.
 
-            signals_for_batch = {}
-            params_for_batch = {}
-            valid_elements = []
-            excluded_elements = []
+        Args:
+            main_window: Main window holding the samples
 
-            no_parameters = []
-            no_signal = []
-            for element, isotope, element_key, change_type in changed_elements:
-                if element_key not in sample_params:
-                    no_parameters.append(element_key)
-                    continue
-                if not sample_params[element_key].get('include', True):
-                    excluded_elements.append((element, isotope, element_key))
-                    continue
-                isotope_key = main_window.find_closest_isotope(
-                    isotope, local_data)
-                if isotope_key is None or isotope_key not in local_data:
-                    no_signal.append(element_key)
+        Returns:
+            list: One dict per sample with changes: 'sample_name',
+            'changed_elements', 'inputs' (see _incremental_inputs, with
+            copied parameters), 'hashes' (element key to parameter hash)
+            and 'initial' (first detection of the sample)
+        """
+        jobs = []
+        for sample_name in list(main_window.data_by_sample.keys()):
+            try:
+                main_window.load_or_initialize_parameters(sample_name)
+                changed_elements, hashes, initial = self.pending_changes(main_window, sample_name)
+                if not changed_elements:
                     continue
-                signals_for_batch[element_key] = local_data[isotope_key]
-                params_for_batch[element_key] = sample_params[element_key]
-                valid_elements.append(
-                    (element, isotope, element_key, isotope_key, change_type))
-
-            if no_signal:
-                _itk_log.warning(
-                    "%s: %d element(s) skipped, this sample has no channel for "
-                    "them: %s. It holds %d channel(s): %s",
-                    sample_name, len(no_signal), no_signal[:6],
-                    len(local_data), sorted(local_data.keys())[:8])
-            if no_parameters:
-                _itk_log.warning(
-                    "%s: %d element(s) skipped, no detection parameters were "
-                    "initialised for them: %s",
-                    sample_name, len(no_parameters), no_parameters[:6])
-
-            detected_peaks_updates = {}
-            results_data_updates = []
-            threshold_updates = {}
-
-            if signals_for_batch:
-                batch_threshold_data = self.calculate_thresholds_batch_safe(
-                    signals_for_batch, params_for_batch
-                )
-
-                for element, isotope, element_key, isotope_key, change_type in valid_elements:
-                    if element_key not in batch_threshold_data:
-                        continue
-
-                    signal = local_data[isotope_key]
-                    params = params_for_batch[element_key]
-                    threshold_data = batch_threshold_data[element_key]
-                    integration_method = params.get('integration_method', 'Background')
-                    split_method = params.get('split_method', '1D Watershed')
-                    sigma = params.get('sigma', 0.55)
-                    min_valley_ratio = params.get('valley_ratio', 0.50)
-
-                    try:
-                        detected_particles = self.find_particles_safe(
-                            local_time, signal,
-                            threshold_data['background'], threshold_data['threshold'],
-                            min_continuous_points=int(params['min_continuous']),
-                            integration_method=integration_method,
-                            split_method=split_method,
-                            sigma=sigma,
-                            min_valley_ratio=min_valley_ratio,
-                        )
+                jobs.append({
+                    'sample_name': sample_name,
+                    'changed_elements': changed_elements,
+                    'inputs': self._incremental_inputs(
+                        main_window, sample_name, changed_elements, copy_params=True),
+                    'hashes': hashes,
+                    'initial': initial,
+                })
+            except Exception:
+                _itk_log.exception("Handled exception in incremental_jobs")
+        return jobs
 
-                        detected_peaks_updates[(element, isotope)] = detected_particles
-                        threshold_updates[element_key] = threshold_data
-
-                        display_label = main_window.get_formatted_label(element_key)
-                        if detected_particles:
-                            for particle in detected_particles:
-                                if particle is None:
-                                    continue
-                                results_data_updates.append([
-                                    display_label,
-                                    f"{local_time[particle['left_idx']]:.4f}",
-                                    f"{local_time[particle['right_idx']]:.4f}",
-                                    f"{particle['total_counts']:.0f}",
-                                    f"{particle['max_height']:.0f}",
-                                    f"{particle['SNR']:.2f}",
-                                ])
-
-                    except (ValueError, KeyError, IndexError, ArithmeticError) as e:
-                        _itk_log.exception("Handled exception in process_sample_incremental")
-                        _itk_log.error(f"Error processing {element}-{isotope}: {str(e)}")
-                        continue
+    def publish_incremental(self, main_window, jobs, results):
+        """
+        Merge background re-detection results into the main window.
 
-            for element, isotope, element_key in excluded_elements:
-                detected_peaks_updates[(element, isotope)] = []
-                threshold_updates[element_key] = {
-                    'threshold': 0, 'background': 0, 'LOD_counts': 0, 'LOD_MDL': 0,
-                    'iterations': 0, 'convergence': 'element_excluded',
-                    'method_used': 'Excluded', 'window_applied': False,
-                    'window_size_used': None,
-                }
+        Runs on the GUI thread in one go, so the window sees either none or
+        all of a job's samples updated. Samples whose data was replaced
+        since the snapshot (e.g. by loading a project) are skipped.
 
-            return {
-                'sample_name': sample_name,
-                'detected_peaks_updates': detected_peaks_updates,
-                'results_data_updates': results_data_updates,
-                'threshold_updates': threshold_updates,
-                'changed_elements': (
-                    [f"{e}-{i:.4f}" for e, i, _, _, _ in valid_elements] +
-                    [f"{e}-{i:.4f}" for e, i, _ in excluded_elements]
-                ),
-            }
+        Args:
+            main_window: Main window to update
+            jobs (list): incremental_jobs' result the detection ran for
+            results (dict): Sample name to detect_sample_signals' result
 
-        except Exception as e:
-            _itk_log.exception("Handled exception in process_sample_incremental")
-            _itk_log.error(f"Error in incremental processing for {sample_name}: {str(e)}")
-            return None
+        Returns:
+            int: Number of re-detected elements
+        """
+        processed_elements = 0
+        published_samples = set()
+        for job in jobs:
+            sample_name = job['sample_name']
+            inputs = job['inputs']
+            if (sample_name not in results or
+                    main_window.time_array_by_sample.get(sample_name) is not inputs[0]):
+                continue
+            detected_peaks, thresholds = results[sample_name]
+            result = self._incremental_result(
+                main_window, sample_name, inputs, detected_peaks, thresholds)
+            self.merge_detection_results(
+                main_window, sample_name, result, job['changed_elements'])
+            self.mark_detected(main_window, sample_name, job['hashes'], job['initial'])
+            processed_elements += len(job['changed_elements'])
+            published_samples.add(sample_name)
+
+        if main_window.current_sample in published_samples:
+            self.update_current_sample_display(main_window, main_window.current_sample)
+        return processed_elements
 
     def merge_detection_results(self, main_window, sample_name, new_results, changed_elements):
         """Merge new detection results with existing results."""
@@ -1986,7 +2964,7 @@ class PeakDetection:
                             'element': element,
                             'isotope': isotope,
                             'signal': signal,
-                            'clusters': [(p['left_idx'], p['right_idx']) for p in particles if p],
+                            'clusters': particle_clusters(particles),
                         })
 
             updated_multi_element_particles = self.process_multi_element_particles(
@@ -2031,35 +3009,60 @@ class PeakDetection:
 
     def get_changed_elements(self, main_window, sample_name):
         """Determine which elements need reprocessing for a sample."""
-        changed_elements = []
-        new_file_elements = []
+        changed_elements, hashes, initial = self.pending_changes(main_window, sample_name)
+        if changed_elements or initial:
+            self.mark_detected(main_window, sample_name, hashes, initial)
+        return changed_elements, []
 
-        if sample_name in main_window.needs_initial_detection:
-            for element, isotopes in main_window.selected_isotopes.items():
-                for isotope in isotopes:
-                    element_key = f"{element}-{isotope:.4f}"
-                    new_file_elements.append((element, isotope, element_key, 'new_file'))
-            main_window.needs_initial_detection.discard(sample_name)
-            return new_file_elements, []
+    def pending_changes(self, main_window, sample_name):
+        """
+        Elements of a sample whose detection is out of date, without
+        marking them as detected.
+
+        Args:
+            main_window: Main window holding the samples and parameters
+            sample_name (str): Sample to check
+
+        Returns:
+            tuple: (changed_elements, hashes, initial): (element, isotope,
+            element_key, change_type) per element to re-detect, element key
+            to current parameter hash, and whether the sample was never
+            detected (then every selected element is listed as 'new_file')
+        """
+        initial = sample_name in main_window.needs_initial_detection
+        stored_hashes = main_window.element_parameter_hashes.get(sample_name, {})
+        states = main_window.detection_states.get(sample_name, {})
+        changed_elements = []
+        hashes = {}
 
         for element, isotopes in main_window.selected_isotopes.items():
             for isotope in isotopes:
                 element_key = f"{element}-{isotope:.4f}"
                 current_hash = main_window.get_parameter_hash(sample_name, element_key)
-                stored_hash = main_window.element_parameter_hashes.get(sample_name, {}).get(element_key)
-
-                if (stored_hash != current_hash or
-                        main_window.detection_states.get(sample_name, {}).get(element_key) == 'changed'):
-                    changed_elements.append((element, isotope, element_key, 'changed'))
-
-                    if sample_name not in main_window.element_parameter_hashes:
-                        main_window.element_parameter_hashes[sample_name] = {}
-                    main_window.element_parameter_hashes[sample_name][element_key] = current_hash
+                if initial:
+                    change_type = 'new_file'
+                elif (stored_hashes.get(element_key) != current_hash or
+                        states.get(element_key) == 'changed'):
+                    change_type = 'changed'
+                else:
+                    continue
+                changed_elements.append((element, isotope, element_key, change_type))
+                hashes[element_key] = current_hash
 
-                    if sample_name in main_window.detection_states:
-                        main_window.detection_states[sample_name].pop(element_key, None)
+        return changed_elements, hashes, initial
 
-        return changed_elements, []
+    def mark_detected(self, main_window, sample_name, hashes, initial=False):
+        """
+        Record that a sample's elements were detected with the given
+        parameter hashes (from pending_changes).
+        """
+        main_window.element_parameter_hashes.setdefault(sample_name, {}).update(hashes)
+        states = main_window.detection_states.get(sample_name)
+        if states:
+            for element_key in hashes:
+                states.pop(element_key, None)
+        if initial:
+            main_window.needs_initial_detection.discard(sample_name)
 
     # ----------------------------------------------------------------------------------------------------------
     # ------------------------------------multi-element particle processing-------------------------------------
@@ -2069,7 +3072,12 @@ class PeakDetection:
                                         selected_isotopes, get_formatted_label_func,
                                         current_sample, element_thresholds, parameters_table,
                                         min_overlap_percentage=75.0):
-        """Process and identify multi-element particles."""
+        """Process and identify multi-element particles.
+
+        Returns:
+            ParticleTable: One row per particle with 'start_time',
+            'end_time' and the per-element 'elements' counts
+        """
         multi_element_particles = []
 
         included_elements = {}
@@ -2099,32 +3107,38 @@ class PeakDetection:
             display_label = get_formatted_label_func(element_key)
             element_particles = detected_peaks.get((element, isotope), [])
 
-            clusters_to_particles = {}
-            if element_particles:
-                for particle in element_particles:
-                    if particle is None:
-                        continue
-                    particle_range = (particle['left_idx'], particle['right_idx'])
-                    clusters_to_particles[particle_range] = particle
+            # (left_idx, right_idx, total_counts or None) per detected peak
+            if isinstance(element_particles, ParticleTable):
+                n_peaks = len(element_particles)
+                peak_counts = [None] * n_peaks
+                if n_peaks and element_particles.has_field('total_counts'):
+                    peak_counts = [c if ok else None for c, ok in zip(
+                        element_particles.column('total_counts').tolist(),
+                        element_particles.present('total_counts').tolist())]
+                peaks = [(l, r, c) for (l, r), c in
+                         zip(element_particles.clusters(), peak_counts)]
+            else:
+                peaks = [(p['left_idx'], p['right_idx'], p.get('total_counts'))
+                         for p in element_particles if p is not None]
+            clusters_to_counts = {(l, r): c for l, r, c in peaks}
 
             for i, cluster in enumerate(particle_data['clusters']):
                 start_time = time_array[cluster[0]]
                 end_time = time_array[cluster[1]]
 
-                particle = clusters_to_particles.get(cluster)
+                found = cluster in clusters_to_counts
+                peak_total = clusters_to_counts.get(cluster)
 
-                if particle is None:
-                    for p in element_particles:
-                        if p is None:
-                            continue
-                        if ((p['left_idx'] <= cluster[0] <= p['right_idx']) or
-                                (p['left_idx'] <= cluster[1] <= p['right_idx']) or
-                                (cluster[0] <= p['left_idx'] and cluster[1] >= p['right_idx'])):
-                            particle = p
+                if not found:
+                    for left, right, c in peaks:
+                        if ((left <= cluster[0] <= right) or
+                                (left <= cluster[1] <= right) or
+                                (cluster[0] <= left and cluster[1] >= right)):
+                            found, peak_total = True, c
                             break
 
-                if particle is not None and 'total_counts' in particle:
-                    counts = particle['total_counts']
+                if found and peak_total is not None:
+                    counts = peak_total
                 else:
                     signal = particle_data['signal']
                     background = 0
@@ -2162,7 +3176,7 @@ class PeakDetection:
                 else:
                     current_particle['elements'][range_data['display_label']] = range_data['counts']
 
-        return multi_element_particles
+        return ParticleTable.from_particles(multi_element_particles)
 
     def is_overlapping(self, particle, multi_particle, min_overlap_percentage=75.0):
         """Check if particles overlap by at least `min_overlap_percentage` percent.
@@ -2198,6 +3212,96 @@ class PeakDetection:
     # ------------------------------------main detection-------------------------------------------------------
     # ----------------------------------------------------------------------------------------------------------
 
+    def _iter_sample_results(self, main_window, sample_names):
+        """
+        Detect samples concurrently, yielding (sample_name, result) as each
+        finishes; result is as from process_single_sample_safe (None on
+        failure). The GUI keeps processing events while samples run.
+
+        With detection_backend 'processes' the samples run in the session's
+        detection pool, at most one per worker at a time so only that many
+        samples are in shared memory. If the pool cannot be used, the
+        remaining samples run on a thread pool. Cores the concurrent samples
+        leave idle go to detecting each sample's channels in parallel.
+
+        Args:
+            main_window: Main window holding the samples
+            sample_names (list): Samples to detect
+        """
+        pending = list(sample_names)
+        if self.detection_backend == 'processes':
+            pool = get_detection_pool()
+            channel_workers = self._channel_workers(len(pending), pool.max_workers)
+            running = {}
+            broken = False
+            while (pending or running) and not broken:
+                while pending and len(running) < pool.max_workers:
+                    sample_name = pending.pop(0)
+                    try:
+                        inputs = self._sample_detection_inputs(main_window, sample_name)
+                    except Exception:
+                        _itk_log.exception("Handled exception in _iter_sample_results")
+                        inputs = None
+                    if inputs is None:
+                        yield sample_name, None
+                        continue
+                    try:
+                        future = pool.submit(sample_name, *inputs,
+                                             channel_workers=channel_workers)
+                        running[future] = (sample_name, inputs)
+                    except (BrokenProcessPool, OSError, RuntimeError):
+                        _itk_log.exception("Handled exception in _iter_sample_results")
+                        pending.insert(0, sample_name)
+                        broken = True
+                        break
+                if broken or not running:
+                    continue
+                done, _ = concurrent.futures.wait(
+                    running, timeout=0.05, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    sample_name, inputs = running.pop(future)
+                    result = None
+                    try:
+                        detected, thresholds = future.result()
+                        result = self._sample_detection_result(
+                            main_window, sample_name, inputs, detected, thresholds)
+                    except BrokenProcessPool:
+                        _itk_log.exception("Handled exception in _iter_sample_results")
+                        pending.insert(0, sample_name)
+                        broken = True
+                        continue
+                    except Exception:
+                        _itk_log.exception("Handled exception in _iter_sample_results")
+                    yield sample_name, result
+                QApplication.processEvents()
+            if not broken:
+                return
+            pending[:0] = [name for name, _ in running.values()]
+            pool.reset()
+            _itk_log.warning("Detection pool unavailable; %d sample(s) run on threads", len(pending))
+
+        max_workers = max(1, multiprocessing.cpu_count() - 1)
+        channel_workers = self._channel_workers(len(pending), max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_sample = {
+                executor.submit(self.process_single_sample_safe, main_window, sample_name,
+                                channel_workers): sample_name
+                for sample_name in pending
+            }
+            running = set(future_to_sample)
+            while running:
+                done, running = concurrent.futures.wait(
+                    running, timeout=0.05, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield future_to_sample[future], future.result()
+                QApplication.processEvents()
+
+    @staticmethod
+    def _channel_workers(n_samples, sample_workers):
+        """Channel threads per sample when ``sample_workers`` samples run at once."""
+        concurrent_samples = max(1, min(n_samples, sample_workers))
+        return max(1, default_worker_count() // concurrent_samples)
+
     def detect_particles(self, main_window):
         """Main threading-safe particle detection function."""
         original_sample = main_window.current_sample
@@ -2231,79 +3335,67 @@ class PeakDetection:
             for sample_name in main_window.data_by_sample.keys():
                 main_window.load_or_initialize_parameters(sample_name)
 
-            max_workers = max(1, multiprocessing.cpu_count() - 1)
-            total_samples = len(main_window.data_by_sample)
+            sample_names = list(main_window.data_by_sample.keys())
+            total_samples = len(sample_names)
             completed_samples = 0
 
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_sample = {
-                    executor.submit(self.process_single_sample_safe, main_window, sample_name): sample_name
-                    for sample_name in main_window.data_by_sample.keys()
-                }
+            for sample_name, result in self._iter_sample_results(main_window, sample_names):
+                try:
+                    if result:
+                        temp_multi_element_particles = self.process_multi_element_particles(
+                            result['all_particles'],
+                            main_window.time_array_by_sample[sample_name],
+                            {sample_name: result['detected_peaks']},
+                            main_window.selected_isotopes,
+                            main_window.get_formatted_label,
+                            sample_name,
+                            {sample_name: result['thresholds']},
+                            main_window.parameters_table,
+                        )
 
-                for future in concurrent.futures.as_completed(future_to_sample):
-                    sample_name = future_to_sample[future]
-                    try:
-                        result = future.result()
-                        if result:
-                            temp_multi_element_particles = self.process_multi_element_particles(
-                                result['all_particles'],
-                                main_window.time_array_by_sample[sample_name],
-                                {sample_name: result['detected_peaks']},
-                                main_window.selected_isotopes,
-                                main_window.get_formatted_label,
-                                sample_name,
-                                {sample_name: result['thresholds']},
-                                main_window.parameters_table,
-                            )
-
-                            main_window.sample_detected_peaks[sample_name] = result['detected_peaks']
-                            main_window.sample_results_data[sample_name] = result['results_data']
-                            main_window.sample_particle_data[sample_name] = temp_multi_element_particles.copy()
-                            main_window.element_thresholds[sample_name] = result['thresholds']
-
-                            if sample_name == main_window.current_sample:
-                                detected_peaks = result['detected_peaks']
-                                if detected_peaks:
-                                    last_element = list(detected_peaks.keys())[-1]
-                                    main_window.update_results_table(
-                                        detected_peaks[last_element],
-                                        main_window.data_by_sample[sample_name][
-                                            main_window.find_closest_isotope(
-                                                last_element[1],
-                                                main_window.data_by_sample[sample_name])],
-                                        last_element[0],
-                                        last_element[1],
-                                    )
-
-                                for row in range(main_window.parameters_table.rowCount()):
-                                    display_label = main_window.parameters_table.item(row, 0).text()
-                                    for element, isotopes in main_window.selected_isotopes.items():
-                                        for isotope in isotopes:
-                                            if (element, isotope) in detected_peaks:
-                                                status_item = main_window.parameters_table.item(row, 9)
-                                                if status_item:
-                                                    status_item.setText(
-                                                        f"Found {len(detected_peaks[(element, isotope)])} peaks"
-                                                    )
-
-                                main_window.update_multi_element_table()
-
-                            completed_samples += 1
-                            progress = int((completed_samples / total_samples) * 100)
-                            main_window.progress_bar.setValue(progress)
-                            main_window.status_label.setText(
-                                f"Processing... ({completed_samples}/{total_samples})"
-                            )
-                            QApplication.processEvents()
-
-                    except Exception as e:
-                        _itk_log.exception("Handled exception in detect_particles")
-       
-                        _itk_log.error(f"Error processing {sample_name}: {str(e)}")
-                        del e 
-
-                del future_to_sample
+                        main_window.sample_detected_peaks[sample_name] = result['detected_peaks']
+                        main_window.sample_results_data[sample_name] = result['results_data']
+                        main_window.sample_particle_data[sample_name] = temp_multi_element_particles.copy()
+                        main_window.element_thresholds[sample_name] = result['thresholds']
+
+                        if sample_name == main_window.current_sample:
+                            detected_peaks = result['detected_peaks']
+                            if detected_peaks:
+                                last_element = list(detected_peaks.keys())[-1]
+                                main_window.update_results_table(
+                                    detected_peaks[last_element],
+                                    main_window.data_by_sample[sample_name][
+                                        main_window.find_closest_isotope(
+                                            last_element[1],
+                                            main_window.data_by_sample[sample_name])],
+                                    last_element[0],
+                                    last_element[1],
+                                )
+
+                            for row in range(main_window.parameters_table.rowCount()):
+                                display_label = main_window.parameters_table.item(row, 0).text()
+                                for element, isotopes in main_window.selected_isotopes.items():
+                                    for isotope in isotopes:
+                                        if (element, isotope) in detected_peaks:
+                                            status_item = main_window.parameters_table.item(row, 9)
+                                            if status_item:
+                                                status_item.setText(
+                                                    f"Found {len(detected_peaks[(element, isotope)])} peaks"
+                                                )
+
+                            main_window.update_multi_element_table()
+
+                        completed_samples += 1
+                        progress = int((completed_samples / total_samples) * 100)
+                        main_window.progress_bar.setValue(progress)
+                        main_window.status_label.setText(
+                            f"Processing... ({completed_samples}/{total_samples})"
+                        )
+                        QApplication.processEvents()
+
+                except Exception as e:
+                    _itk_log.exception("Handled exception in detect_particles")
+                    _itk_log.error(f"Error processing {sample_name}: {str(e)}")
 
             if original_sample in main_window.data_by_sample:
                 main_window.current_sample = original_sample
@@ -0,0 +1,253 @@
+"""Background incremental re-detection.
+
+Incremental detection used to run on the GUI thread: every sample with a
+changed element was re-detected in turn while the window pumped
+processEvents, so one alpha edit in a large project froze the UI, and edits
+made meanwhile queued up behind it.
+
+RedetectionScheduler moves that work onto a worker thread:
+
+- Requests are coalesced. Each edit restarts a short single-shot timer, and
+  only when it fires are the changed (sample, isotope) pairs collected.
+- A new request supersedes the running job. The job is cancelled between
+  samples, and its results are dropped even if it finishes anyway.
+- Only pairs whose parameter hash changed are collected, together with
+  copies of their parameters, so later edits cannot reach a running job.
+- Results are published in one GUI-thread call once the whole job is done,
+  so the window never shows half of a re-detection. A pair's parameter
+  hash is stored only then, so the pairs of a cancelled job are collected
+  again by the next one.
+
+The worker thread only dispatches: with the detector's 'processes' backend
+each job's sample runs in the session's detection pool (processing.
+detection_pool), otherwise on a thread pool, as many samples at a time as
+there are workers. Cancelling stops submitting samples; those still running
+finish in their workers and their results are dropped.
+
+The scheduler does not know about the main window. It calls ``collect`` to
+snapshot the jobs and ``publish`` to merge the results (see
+PeakDetection.incremental_jobs and PeakDetection.publish_incremental).
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PySide6.QtCore import QObject, QThread, QTimer, Signal
+
+from processing.detection_pool import default_worker_count, get_detection_pool
+
+_itk_log = logging.getLogger("IsotopeTrack.processing.redetection")
+
+#: Quiet time after the last edit before a re-detection starts (ms).
+COALESCE_DELAY_MS = 400
+
+
+class _RedetectionWorker(QThread):
+    """QThread that dispatches each job's sample and collects the results."""
+    done = Signal(int, object)
+
+    def __init__(self, detector, jobs, generation, parent=None):
+        """
+        Args:
+            detector (PeakDetection): Detector whose detect_sample_signals runs
+            jobs (list): Jobs from the scheduler's ``collect``
+            generation (int): Request generation the jobs were collected for
+            parent (QObject | None): Qt parent
+        """
+        super().__init__(parent)
+        self._detector = detector
+        self._jobs = jobs
+        self._generation = generation
+        self._cancel = False
+
+    def cancel(self):
+        """Request cancellation; the worker submits no further samples."""
+        self._cancel = True
+
+    def run(self):
+        """Detect each job's sample, then emit done(generation, results).
+
+        ``results`` maps sample name to detect_sample_signals' (peaks,
+        thresholds), or is None if the worker was cancelled.
+        """
+        results = {}
+        remaining = list(self._jobs)
+        if getattr(self._detector, 'detection_backend', 'threads') == 'processes':
+            remaining = self._run_in_pool(remaining, results)
+        if remaining and not self._cancel:
+            self._run_on_threads(remaining, results)
+        self.done.emit(self._generation, None if self._cancel else results)
+
+    def _run_in_pool(self, jobs, results):
+        """
+        Run jobs in the session's detection pool, one sample per worker.
+
+        Returns:
+            list: Jobs left undone because the pool could not be used
+        """
+        pool = get_detection_pool()
+        channel_workers = self._detector._channel_workers(len(jobs), pool.max_workers)
+        pending, running, broken = list(jobs), {}, False
+        while (pending or running) and not broken and not self._cancel:
+            while pending and len(running) < pool.max_workers:
+                job = pending.pop(0)
+                try:
+                    future = pool.submit(job['sample_name'], *job['inputs'][:5],
+                                         channel_workers=channel_workers)
+                except (BrokenProcessPool, OSError, RuntimeError):
+                    _itk_log.exception("Handled exception in _RedetectionWorker._run_in_pool")
+                    pending.insert(0, job)
+                    broken = True
+                    break
+                running[future] = job
+            if broken or not running:
+                continue
+            done, _ = concurrent.futures.wait(
+                running, timeout=0.05, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                try:
+                    results[job['sample_name']] = future.result()
+                except BrokenProcessPool:
+                    _itk_log.exception("Handled exception in _RedetectionWorker._run_in_pool")
+                    pending.insert(0, job)
+                    broken = True
+                except Exception:
+                    _itk_log.exception("Handled exception in _RedetectionWorker._run_in_pool")
+        if not broken or self._cancel:
+            return []
+        pool.reset()
+        remaining = pending + list(running.values())
+        _itk_log.warning("Detection pool unavailable; %d sample(s) re-detected on threads",
+                         len(remaining))
+        return remaining
+
+    def _run_on_threads(self, jobs, results):
+        """Run jobs on a thread pool, as many samples at a time as workers."""
+        max_workers = default_worker_count()
+        channel_workers = self._detector._channel_workers(len(jobs), max_workers)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            pending, running = list(jobs), {}
+            while (pending or running) and not self._cancel:
+                while pending and len(running) < max_workers:
+                    job = pending.pop(0)
+                    running[executor.submit(
+                        self._detector.detect_sample_signals, job['sample_name'],
+                        *job['inputs'][:5], channel_workers=channel_workers)] = job
+                done, _ = concurrent.futures.wait(
+                    running, timeout=0.05, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        results[job['sample_name']] = future.result()
+                    except Exception:
+                        _itk_log.exception("Handled exception in _RedetectionWorker._run_on_threads")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class RedetectionScheduler(QObject):
+    """Coalesces re-detection requests and runs them on a worker thread."""
+    #: Emitted when a job starts, with its jobs.
+    started = Signal(object)
+    #: Emitted after ``publish`` ran, with the published sample names.
+    published = Signal(object)
+
+    def __init__(self, detector, collect, publish, delay_ms=COALESCE_DELAY_MS, parent=None):
+        """
+        Args:
+            detector (PeakDetection): Detector the worker threads use
+            collect (callable): ``collect() -> list`` of jobs, each a dict with
+                'sample_name' and 'inputs' (time, signals, params,
+                isotope_mapping, valid_elements, ...); called on the GUI
+                thread when a request is due
+            publish (callable): ``publish(jobs, results)``; called on the GUI
+                thread with the results of a job nothing superseded
+            delay_ms (int): Coalescing delay of request()
+            parent (QObject | None): Qt parent
+        """
+        super().__init__(parent)
+        self._detector = detector
+        self._collect = collect
+        self._publish = publish
+        self.delay_ms = delay_ms
+        self._generation = 0
+        self._worker = None
+        self._jobs = None
+        self._launch_when_idle = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._launch)
+
+    def request(self, delay_ms=None):
+        """
+        Schedule a re-detection, superseding any pending or running one.
+
+        Args:
+            delay_ms (int | None): Wait this long for further requests
+                (default: ``delay_ms`` of the scheduler; 0 starts on the next
+                event loop turn)
+        """
+        self._generation += 1
+        if self._worker is not None:
+            self._worker.cancel()
+        self._timer.start(self.delay_ms if delay_ms is None else delay_ms)
+
+    def cancel(self):
+        """Drop any pending or running re-detection without publishing it."""
+        self._generation += 1
+        self._timer.stop()
+        self._launch_when_idle = False
+        if self._worker is not None:
+            self._worker.cancel()
+
+    def is_busy(self) -> bool:
+        """True while a re-detection is pending or running."""
+        return self._timer.isActive() or self._worker is not None
+
+    def shutdown(self, timeout_ms=10000):
+        """Cancel and wait for the worker thread (e.g. on application exit)."""
+        self.cancel()
+        worker = self._worker
+        if worker is not None and not worker.wait(timeout_ms):
+            _itk_log.warning("Re-detection thread did not stop before shutdown")
+
+    def _launch(self):
+        if self._worker is not None:
+            # The superseded worker stops at its next sample; start after it.
+            self._launch_when_idle = True
+            return
+        try:
+            jobs = self._collect()
+        except Exception:
+            _itk_log.exception("Handled exception in RedetectionScheduler._launch")
+            jobs = []
+        if not jobs:
+            self.published.emit([])
+            return
+        self._jobs = jobs
+        self._worker = _RedetectionWorker(self._detector, jobs, self._generation, self)
+        self._worker.done.connect(self._on_done)
+        self.started.emit(jobs)
+        self._worker.start()
+
+    def _on_done(self, generation, results):
+        worker, jobs = self._worker, self._jobs
+        self._worker = self._jobs = None
+        if worker is not None:
+            worker.wait()
+            worker.deleteLater()
+        if results is not None and generation == self._generation:
+            try:
+                self._publish(jobs, results)
+            except Exception:
+                _itk_log.exception("Handled exception in RedetectionScheduler._on_done")
+            self.published.emit(list(results))
+        if self._launch_when_idle:
+            self._launch_when_idle = False
+            if not self._timer.isActive():
+                self._launch()
@@ -0,0 +1,293 @@
+"""Shared, bounded cache of detection thresholds.
+
+Solving a Compound Poisson LogNormal threshold takes milliseconds, and
+detection asks for the same (λ, α, σ) combinations again and again: in
+every iteration, for every isotope and every sample. Each
+CompoundPoissonLognormalOptimized used to keep its own unbounded dict for
+them, and PeakDetection had an lru_cache on a bound method. Both were tied
+to one object and lost with it.
+
+ThresholdCache is one LRU store for the whole process:
+
+- a size limit (``max_entries``), with evictions counted;
+- hit, miss and eviction statistics;
+- thread safety, for channel-parallel detection.
+
+Keys are built by threshold_key from (method, λ, α, σ, quantisation). The
+application enables persistence at start-up (enable_persistence). The
+cache is then loaded from a JSON file in the user's cache folder and saved
+on exit, so a new session re-detecting the same project reuses the
+thresholds of the previous one. Detection worker processes keep an
+in-memory cache, seeded from this one when they start, and hand their new
+entries back with each result (see processing.detection_pool).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+from PySide6.QtCore import QSettings, QStandardPaths
+
+_itk_log = logging.getLogger("IsotopeTrack.processing.threshold_cache")
+
+SETTINGS_PERSIST = "threshold_cache/persist"
+SETTINGS_MAX_ENTRIES = "threshold_cache/max_entries"
+DEFAULT_MAX_ENTRIES = 50_000
+#: Bump when a cached method's numerics change, so saved values are dropped.
+CACHE_VERSION = 1
+CACHE_FILE = "threshold_cache.json"
+
+
+def threshold_key(method: str, lam: float, alpha: float, sigma: float,
+                  decimals: int | None = 2) -> tuple:
+    """
+    Build the cache key of one threshold.
+
+    Args:
+        method (str): Method (and solver) the value comes from
+        lam (float): Background mean λ
+        alpha (float): Significance level
+        sigma (float): Log-normal sigma of the single-ion signal
+        decimals (int | None): λ is rounded to this many decimals, so nearby
+            backgrounds share an entry; None keys on λ exactly
+
+    Returns:
+        tuple: (method, λ, α, σ, decimals)
+    """
+    lam = float(lam) if decimals is None else round(float(lam), decimals)
+    return (str(method), lam, float(alpha), float(sigma), decimals)
+
+
+class ThresholdCache:
+    """Thread-safe LRU store of thresholds keyed by threshold_key."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: Path | str | None = None):
+        """
+        Args:
+            max_entries (int): Entries kept before the least recently used
+                ones are evicted
+            path (Path | str | None): JSON file to load from and save to, or
+                None to keep the cache in memory only
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.path = Path(path) if path is not None else None
+        self._entries = OrderedDict()
+        self._new = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.path is not None:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Return the cached value of ``key`` (counting a hit or a miss)."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value: float) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        value = float(value)
+        with self._lock:
+            self._store(key, value)
+            self._new[key] = value
+
+    def _store(self, key, value: float) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._dirty = True
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, key, compute) -> float:
+        """
+        Return the cached value of ``key``, computing and storing it on a miss.
+
+        Args:
+            key (tuple): Key from threshold_key
+            compute (callable): ``compute() -> float``, called without the lock
+
+        Returns:
+            float: Threshold
+        """
+        value = self.get(key)
+        if value is None:
+            value = float(compute())
+            self.put(key, value)
+        return value
+
+    def take_new(self) -> dict:
+        """Return and forget the entries stored since the last call."""
+        with self._lock:
+            new, self._new = self._new, {}
+        return new
+
+    def merge(self, entries: dict) -> None:
+        """Add entries computed elsewhere (e.g. in a worker process)."""
+        with self._lock:
+            for key, value in entries.items():
+                self._store(tuple(key), float(value))
+
+    def snapshot(self) -> dict:
+        """Return a copy of the entries, least recently used first."""
+        with self._lock:
+            return dict(self._entries)
+
+    def stats(self) -> dict:
+        """Return hits, misses, evictions, entries and the size limit."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._new.clear()
+            self._dirty = True
+            self.hits = self.misses = self.evictions = 0
+
+    def load(self) -> int:
+        """
+        Load the entries saved in ``path`` (if any) under the in-memory ones.
+
+        Returns:
+            int: Number of entries read
+        """
+        if self.path is None:
+            return 0
+        try:
+            with self.path.open("r") as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError):
+            _itk_log.exception("Ignoring unreadable threshold cache %s", self.path)
+            return 0
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return 0
+        loaded = 0
+        with self._lock:
+            current = self._entries
+            self._entries = OrderedDict()
+            for item in data.get("entries", [])[-self.max_entries:]:
+                try:
+                    (method, lam, alpha, sigma, decimals), value = item
+                    key = (str(method), float(lam), float(alpha), float(sigma),
+                           None if decimals is None else int(decimals))
+                    self._entries[key] = float(value)
+                    loaded += 1
+                except (TypeError, ValueError):
+                    continue
+            for key, value in current.items():
+                self._store(key, value)
+            self._dirty = bool(current)
+        return loaded
+
+    def save(self) -> bool:
+        """
+        Write the entries to ``path``, least recently used first.
+
+        The file is written under a temporary name and renamed into place, so
+        an interrupted save never leaves a partial file behind.
+
+        Returns:
+            bool: True if the file was written
+        """
+        if self.path is None:
+            return False
+        with self._lock:
+            if not self._dirty:
+                return False
+            entries = [[list(key), value] for key, value in self._entries.items()]
+            self._dirty = False
+        tmp = self.path.with_name(f".tmp-{uuid.uuid4().hex}.json")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp.open("w") as fp:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, fp)
+            os.replace(tmp, self.path)
+        except OSError:
+            _itk_log.exception("Could not save threshold cache %s", self.path)
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return False
+        return True
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_cache() -> ThresholdCache:
+    """Return the process-wide threshold cache, created on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ThresholdCache()
+        return _shared
+
+
+def cache_path() -> Path:
+    """Return the file the shared cache persists to."""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    if not base:
+        base = str(Path.home() / ".isotopetrack")
+    return Path(base) / CACHE_FILE
+
+
+def enable_persistence() -> ThresholdCache:
+    """
+    Load the shared cache from disk and save it there on save_shared_cache,
+    unless persistence is switched off in the settings.
+
+    Returns:
+        ThresholdCache: The shared cache
+    """
+    cache = shared_cache()
+    settings = QSettings("IsotopeTrack", "IsotopeTrack")
+    try:
+        max_entries = int(settings.value(SETTINGS_MAX_ENTRIES, DEFAULT_MAX_ENTRIES))
+    except (TypeError, ValueError):
+        max_entries = DEFAULT_MAX_ENTRIES
+    cache.max_entries = max(1, max_entries)
+    if settings.value(SETTINGS_PERSIST, True, type=bool):
+        cache.path = cache_path()
+        loaded = cache.load()
+        _itk_log.debug("Loaded %d saved thresholds from %s", loaded, cache.path)
+    return cache
+
+
+def save_shared_cache() -> None:
+    """Save the shared cache if persistence is enabled and it changed."""
+    cache = shared_cache()
+    if cache.save():
+        _itk_log.debug("Saved threshold cache: %s", cache.stats())
@@ -14,6 +14,7 @@ import numpy as np
 import math
 import time
 
+from processing.particle_table import field_values, keyed_values
 from tools.theme import theme, dialog_qss
 from utils.unit import ExportUnits, load_units
 from tools.unit import show_advanced_dialog
@@ -746,7 +747,7 @@ def export_summary_file_with_mass_fractions(main_window: MainWindow, summary_fil
                         and (element, isotope) in main_window.sample_detected_peaks[sample_name]):
                     particles = main_window.sample_detected_peaks[sample_name][(element, isotope)]
                     if particles:
-                        counts = [p.get('total_counts', 0) for p in particles if p is not None]
+                        counts = field_values(particles, 'total_counts').tolist()
 
                         masses = []
                         moles = []
@@ -1290,54 +1291,54 @@ def export_sample_file_with_mass_fractions(main_window: MainWindow, sample_name,
             total_masses = {display_label: 0 for _, display_label, _, _, _ in all_elements}
             total_moles = {display_label: 0 for _, display_label, _, _, _ in all_elements}
 
-            for particle in particles:
-                for element_key, display_label, element, isotope, atomic_mass in all_elements:
-                    counts = particle['elements'].get(display_label, 0)
-                    mass_fg = 0
-                    moles = 0
-
-                    if counts > 0 and element_key in ionic_data:
-                        cal_data = ionic_data[element_key]
-                        preferred_method = main_window.isotope_method_preferences.get(element_key, 'Force through zero')
-                        method_map = {
-                            'Force through zero': 'zero',
-                            'Simple linear': 'simple',
-                            'Weighted': 'weighted',
-                            'Manual': 'manual',
-                        }
-                        method_key = method_map.get(preferred_method, 'zero')
-                        method_data = cal_data.get(method_key,
-                                                   cal_data.get('weighted',
-                                                                cal_data.get('simple',
+            for element_key, display_label, element, isotope, atomic_mass in all_elements:
+                counts = keyed_values(particles, 'elements', display_label)
+                counts = counts[counts > 0]
+                mass_fg = 0
+                moles = 0
+
+                if counts.size and element_key in ionic_data:
+                    cal_data = ionic_data[element_key]
+                    preferred_method = main_window.isotope_method_preferences.get(element_key, 'Force through zero')
+                    method_map = {
+                        'Force through zero': 'zero',
+                        'Simple linear': 'simple',
+                        'Weighted': 'weighted',
+                        'Manual': 'manual',
+                    }
+                    method_key = method_map.get(preferred_method, 'zero')
+                    method_data = cal_data.get(method_key,
+                                               cal_data.get('weighted',
+                                                            cal_data.get('simple',
+                                                                         cal_data.get(
+                                                                             'zero',
                                                                              cal_data.get(
-                                                                                 'zero',
-                                                                                 cal_data.get(
-                                                                                     'manual',
-                                                                                     {})))))
-
-                        if method_data and 'slope' in method_data and main_window.average_transport_rate > 0:
-                            slope = method_data['slope']
-                            conversion_factor = slope / (main_window.average_transport_rate * 1000)
-                            mass_fraction = mf_service.get_mass_fraction(element_key, sample_name)
-                            molecular_weight = mf_service.get_molecular_weight(element_key, sample_name)
-                            is_pure = is_pure_element(mass_fraction)
-
-                            if conversion_factor > 0 and atomic_mass > 0:
-                                element_mass = counts / conversion_factor
-
-                                use_particle_calc = (data_type == "particle" and not is_pure)
-                                if use_particle_calc:
-                                    mass_fg = element_mass / mass_fraction
-                                    if molecular_weight and molecular_weight > 0:
-                                        moles = mass_fg / molecular_weight
-                                    else:
-                                        moles = element_mass / atomic_mass
+                                                                                 'manual',
+                                                                                 {})))))
+
+                    if method_data and 'slope' in method_data and main_window.average_transport_rate > 0:
+                        slope = method_data['slope']
+                        conversion_factor = slope / (main_window.average_transport_rate * 1000)
+                        mass_fraction = mf_service.get_mass_fraction(element_key, sample_name)
+                        molecular_weight = mf_service.get_molecular_weight(element_key, sample_name)
+                        is_pure = is_pure_element(mass_fraction)
+
+                        if conversion_factor > 0 and atomic_mass > 0:
+                            element_mass = counts / conversion_factor
+
+                            use_particle_calc = (data_type == "particle" and not is_pure)
+                            if use_particle_calc:
+                                mass_fg = element_mass / mass_fraction
+                                if molecular_weight and molecular_weight > 0:
+                                    moles = mass_fg / molecular_weight
                                 else:
-                                    mass_fg = element_mass
                                     moles = element_mass / atomic_mass
+                            else:
+                                mass_fg = element_mass
+                                moles = element_mass / atomic_mass
 
-                    total_masses[display_label] += mass_fg
-                    total_moles[display_label] += moles
+                total_masses[display_label] += float(np.sum(mass_fg))
+                total_moles[display_label] += float(np.sum(moles))
 
             grand_total_mass = sum(total_masses.values())
             grand_total_moles = sum(total_moles.values())
@@ -16,6 +16,7 @@ from pathlib import Path
 
 import numpy as np
 from calibration_methods import calibration_registry
+from processing.particle_table import ParticleTable
 _itk_log = logging.getLogger("IsotopeTrack.save_export.fast_project_io")
 
 logger = logging.getLogger(__name__)
@@ -49,7 +50,8 @@ def _particles_to_columnar(particles):
     much better than pickled Python objects.
     
     Args:
-        particles (list): List of particle dictionaries from sample_particle_data
+        particles (ParticleTable | list): Particles from sample_particle_data;
+            a ParticleTable is converted column by column
         
     Returns:
         dict: Columnar representation with:
@@ -60,6 +62,8 @@ def _particles_to_columnar(particles):
             - 'totals': dict of key -> numpy array
             - 'extra_keys': pickled dict for any non-standard keys
     """
+    if isinstance(particles, ParticleTable):
+        return particles.to_columnar()
     if not particles:
         return {'n': 0, 'element_labels': [], 'scalars': {}, 'element_arrays': {}}
 
@@ -497,7 +501,7 @@ def load_project_v2(filepath, mw: MainWindow, progress_callback=None):
             if particles_path in zf.namelist():
                 buf = io.BytesIO(zf.read(particles_path))
                 col_data = pickle.loads(buf.getvalue())
-                mw.sample_particle_data[sample_name] = _columnar_to_particles(col_data)
+                mw.sample_particle_data[sample_name] = ParticleTable.from_columnar(col_data)
             else:
                 mw.sample_particle_data[sample_name] = []
 
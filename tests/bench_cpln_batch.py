@@ -0,0 +1,73 @@
+"""Benchmark of batched CPLN thresholds for window-mode detection.
+
+Window-mode detection turns a per-point background array into thresholds by
+evaluating the Compound Poisson LogNormal method on a grid of up to 30
+background values and interpolating (detection_registry._analytic_interp_array).
+That grid used to be solved one value at a time; it is now one
+CompoundPoissonLognormalOptimized.get_thresholds call. This compares both
+on cold caches for a few background ranges and reports how far the batched
+thresholds are from the scalar ones.
+
+Run from the project root::
+
+    python tests/bench_cpln_batch.py [points]
+"""
+from __future__ import annotations
+
+import pathlib
+import sys
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import numpy as np
+
+from processing import detection_registry
+from processing.peak_detection import PeakDetection
+
+N_POINTS = 1_000_000
+METHOD = "Compound Poisson LogNormal"
+RANGES = [(0.2, 2.0), (2.0, 15.0), (10.0, 60.0), (50.0, 300.0)]
+
+
+def scalar_array_threshold(engine, lam_arr, alpha, sigma):
+    """The window-mode thresholds as before: one scalar solve per grid value."""
+    method = detection_registry.get(METHOD)
+    min_bg, max_bg = np.min(lam_arr), np.max(lam_arr)
+    n_eval = min(30, max(5, int((max_bg - min_bg) / 0.5)))
+    eval_bg = np.linspace(min_bg, max_bg, n_eval)
+    eval_thresh = np.array([method.single_threshold(engine, bg, alpha, sigma) for bg in eval_bg])
+    return np.interp(lam_arr, eval_bg, eval_thresh)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_POINTS
+    rng = np.random.default_rng(0)
+    alpha, sigma = 1e-6, 0.55
+    method = detection_registry.get(METHOD)
+    print(f"{METHOD}, {n:,}-point background arrays, alpha={alpha:g}, sigma={sigma}")
+    warm_up = np.linspace(1.0, 3.0, 100)
+    scalar_array_threshold(PeakDetection(), warm_up, alpha, sigma)
+    method.array_threshold(PeakDetection(), warm_up, alpha, sigma)
+    print(f"  {'background':<14}{'scalar':>10}{'batched':>10}{'speed-up':>10}{'max rel diff':>15}")
+    for low, high in RANGES:
+        lam_arr = np.sort(rng.uniform(low, high, n))
+        engine = PeakDetection()
+        engine.clear_threshold_cache()
+        t0 = time.perf_counter()
+        expected = scalar_array_threshold(engine, lam_arr, alpha, sigma)
+        t_scalar = time.perf_counter() - t0
+
+        engine.clear_threshold_cache()
+        t0 = time.perf_counter()
+        got = method.array_threshold(engine, lam_arr, alpha, sigma)
+        t_batch = time.perf_counter() - t0
+        rel = float(np.max(np.abs(got - expected) / expected))
+        print(f"  {low:>5g}-{high:<7g}{t_scalar:8.3f} s{t_batch:8.3f} s"
+              f"{t_scalar / t_batch:9.1f}x{rel:15.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark of array queries on the CPLN lookup table.
+
+CompoundPoissonLognormaltable.get_threshold answers one background at a time
+through a scipy RegularGridInterpolator; get_thresholds answers an array in
+one interpolator call. Above the table (λ > 100) thresholds come from the
+extension, whose nodes are solved on first use and then cached. This times
+both queries on warm caches for a few background ranges, checks that they
+agree, and reports how far the extension is from the analytical thresholds.
+
+Run from the project root::
+
+    python tests/bench_cpln_table.py [points]
+"""
+from __future__ import annotations
+
+import pathlib
+import sys
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import numpy as np
+
+from processing.peak_detection import (CompoundPoissonLognormalOptimized,
+                                       CompoundPoissonLognormaltable)
+
+N_POINTS = 5_000
+RANGES = [(0.01, 1.0), (1.0, 20.0), (20.0, 100.0), (100.0, 300.0), (300.0, 900.0)]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_POINTS
+    rng = np.random.default_rng(0)
+    alpha, sigma = 1e-6, 0.55
+    table = CompoundPoissonLognormaltable()
+    analytic = CompoundPoissonLognormalOptimized()
+    print(f"CPLN table, {n:,} backgrounds per range, alpha={alpha:g}, sigma={sigma}")
+    print(f"  {'background':<14}{'single':>10}{'array':>10}{'speed-up':>10}"
+          f"{'equal':>7}{'vs analytic':>13}")
+    for low, high in RANGES:
+        lams = rng.uniform(low, high, n)
+        table.get_thresholds(lams, alpha, sigma)
+        t0 = time.perf_counter()
+        single = np.array([table.get_threshold(lam, alpha, sigma) for lam in lams])
+        t_single = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        array = table.get_thresholds(lams, alpha, sigma)
+        t_array = time.perf_counter() - t0
+        if low >= 100.0:
+            exact = analytic.get_thresholds(lams[:200], alpha, sigma)
+            rel = f"{float(np.max(np.abs(array[:200] - exact) / exact)):13.2e}"
+        else:
+            rel = f"{'-':>13}"
+        print(f"  {low:>6g}-{high:<7g}{t_single:8.3f} s{t_array:8.4f} s"
+              f"{t_single / t_array:9.0f}x{str(np.array_equal(single, array)):>7}{rel}")
+
+
+if __name__ == "__main__":
+    main()
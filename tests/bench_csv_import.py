@@ -0,0 +1,153 @@
+"""Benchmark of delimited-file import (loading/csv/dialog.py).
+
+Writes a wide instrument-style CSV export - a time column, a text column and
+many isotope columns - and imports a few mapped isotopes, once through the
+whole-file read and once through the column-projected typed read. Both must
+give identical signals; the timings and peak Python memory show what the
+projection saves. A repeat import through the run cache is timed next,
+then a workbook read whole by pd.read_excel against the streamed read.
+
+Run from the project root::
+
+    python tests/bench_csv_import.py [rows]
+"""
+from __future__ import annotations
+
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import numpy as np
+import pandas as pd
+
+from loading.csv.dialog import DataProcessThread, _FAST_CSV_ENGINES
+from loading.run_cache import RunCache
+
+N_ROWS = 1_000_000
+N_ISOTOPES = 40
+MAPPED = ("M107", "M197", "M56")
+
+SETTINGS = {
+    'delimiter': ',', 'encoding': 'utf-8', 'header_row': 0, 'skip_rows': 0,
+    'time_column': 'Time', 'time_unit': 'seconds', 'dwell_time_ms': 0.1,
+    'use_calculated_dwell': False, 'data_type': 'Counts',
+    'chunk_rows': 100_000,
+}
+
+
+def write_file(path: pathlib.Path, rows: int, seed: int = 0) -> None:
+    """Write the synthetic export in blocks so the writer stays small."""
+    rng = np.random.default_rng(seed)
+    masses = [f"M{m}" for m in range(50, 50 + N_ISOTOPES)]
+    masses = list(dict.fromkeys(list(MAPPED) + masses))[:N_ISOTOPES]
+    block = 200_000
+    for start in range(0, rows, block):
+        n = min(block, rows - start)
+        frame = pd.DataFrame({'Time': (start + np.arange(n)) * 1e-4, 'Flag': 'ok'})
+        for name in masses:
+            frame[name] = rng.poisson(2.0, n)
+        frame.to_csv(path, mode='a' if start else 'w', header=not start, index=False)
+
+
+def write_workbook(path: pathlib.Path, rows: int, seed: int = 0) -> None:
+    """Write a smaller export of the same shape as a workbook."""
+    import openpyxl
+
+    rng = np.random.default_rng(seed)
+    names = ['Time', 'Flag'] + [f"M{m}" for m in range(50, 50 + N_ISOTOPES)]
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Data")
+    ws.append(names)
+    counts = rng.poisson(2.0, (rows, N_ISOTOPES)).tolist()
+    for i in range(rows):
+        ws.append([i * 1e-4, 'ok'] + counts[i])
+    wb.save(path)
+
+
+def _measure(fn):
+    """Return (seconds, peak traced MB, result); memory is traced on a second run."""
+    t0 = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1e6, out
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else N_ROWS
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "export.csv"
+        write_file(path, rows)
+        size = path.stat().st_size / 1e6
+        print(f"{rows} rows x {N_ISOTOPES + 2} columns ({size:.0f} MB), "
+              f"{len(MAPPED)} isotopes mapped, engines {_FAST_CSV_ENGINES}")
+
+        mappings = {c: {'column_name': c, 'isotope': {'mass': float(c[1:])}}
+                    for c in MAPPED}
+        config = {'path': str(path), 'name': path.name, 'mappings': mappings}
+        thread = DataProcessThread({'settings': SETTINGS, 'files': [config]})
+        thread.run_cache = None
+
+        def whole():
+            df = thread._load_delimited(str(path), SETTINGS)
+            return thread._process_isotopes(df, mappings, SETTINGS, 1e-4)
+
+        def projected():
+            _, result = thread.process_file(config, 0)
+            return result['signals']
+
+        t_whole, m_whole, ref = _measure(whole)
+        t_proj, m_proj, got = _measure(projected)
+        for mass, expected in ref.items():
+            np.testing.assert_array_equal(got[mass], expected)
+
+        print(f"  whole-file read   {t_whole:7.2f} s   peak {m_whole:8.0f} MB")
+        print(f"  projected read    {t_proj:7.2f} s   peak {m_proj:8.0f} MB"
+              f"   ({t_whole / t_proj:.1f}x faster)")
+        data_mb = sum(a.nbytes for a in got.values()) / 1e6
+        print(f"  (signal arrays {data_mb:.0f} MB, read in blocks of "
+              f"{SETTINGS['chunk_rows']:,} rows)")
+
+        thread.run_cache = RunCache(pathlib.Path(tmp) / "cache")
+        projected()
+        t_hit, m_hit, cached = _measure(projected)
+        for mass, expected in ref.items():
+            np.testing.assert_array_equal(cached[mass], expected)
+        print(f"  cached re-import  {t_hit:7.3f} s   peak {m_hit:8.1f} MB")
+
+        book = pathlib.Path(tmp) / "export.xlsx"
+        book_rows = max(1, rows // 10)
+        write_workbook(book, book_rows)
+        book_config = {'path': str(book), 'name': book.name,
+                       'mappings': {c: {'column_name': c, 'isotope': {'mass': float(c[1:])}}
+                                    for c in ("M50", "M60", "M70")}}
+        thread.run_cache = None
+
+        def whole_book():
+            df = thread._load_excel(str(book), SETTINGS)
+            return thread._process_isotopes(df, book_config['mappings'], SETTINGS, 1e-4)
+
+        def streamed_book():
+            _, result = thread.process_file(book_config, 0)
+            return result['signals']
+
+        print(f"workbook: {book_rows} rows ({book.stat().st_size / 1e6:.0f} MB)")
+        t_whole, m_whole, ref = _measure(whole_book)
+        t_stream, m_stream, got = _measure(streamed_book)
+        for mass, expected in ref.items():
+            np.testing.assert_array_equal(got[mass], expected)
+        print(f"  pd.read_excel     {t_whole:7.2f} s   peak {m_whole:8.0f} MB")
+        print(f"  streamed columns  {t_stream:7.2f} s   peak {m_stream:8.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Benchmark of process-pool sample detection (processing/detection_pool.py).
+
+Detects a batch of synthetic multi-isotope samples - thresholds and peaks,
+the work PeakDetection.detect_sample_signals does per sample - on a thread
+pool and on the process pool for 1..N workers. Every run must find the same
+peaks as a plain serial run. Besides wall time it reports the longest gap
+between two wake-ups of the waiting main thread, which is how long the GUI
+would go without processing events. A last section detects one large
+sample with its channels on 1..N threads.
+
+Each timed run starts with cold threshold caches; the worker processes are
+started and warmed up on a small sample before their clock starts.
+
+Run from the project root::
+
+    python tests/bench_detection_pool.py [samples] [isotopes] [points]
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import pathlib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+TESTS_DIR = pathlib.Path(__file__).resolve().parent
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+from bench_particle_extraction import make_trace
+from processing.detection_pool import DetectionPool
+from processing.peak_detection import PeakDetection
+
+N_SAMPLES = 8
+N_ISOTOPES = 6
+N_POINTS = 1_000_000
+
+PARAMS = {
+    'include': True, 'method': "CPLN table", 'manual_threshold': 10.0,
+    'min_continuous': 1, 'alpha': 0.000001, 'integration_method': "Background",
+    'iterative': True, 'max_iterations': 4, 'sigma': 0.55,
+    'use_window_size': False, 'window_size': 5000,
+    'split_method': "1D Watershed", 'valley_ratio': 0.50,
+}
+
+
+def make_sample(n_isotopes: int, n_points: int, seed: int) -> tuple:
+    """Return one sample as detect_sample_signals' arguments after the name.
+
+    Args:
+        n_isotopes (int): Channels in the sample
+        n_points (int): Points per channel
+        seed (int): Random seed
+
+    Returns:
+        tuple: (time, signals, params, isotope_mapping, valid_elements)
+    """
+    signals, params, mapping, valid = {}, {}, {}, []
+    time_s = None
+    for k in range(n_isotopes):
+        isotope = 40.0 + 10 * k
+        element_key = f"E{k}-{isotope:.4f}"
+        time_s, signal = make_trace(n_points, lam=1.0 + k, tof=bool(k % 2), seed=seed * 100 + k)
+        signals[element_key] = signal
+        params[element_key] = dict(PARAMS)
+        mapping[element_key] = isotope
+        valid.append((f"E{k}", isotope, element_key, isotope))
+    return time_s, signals, params, mapping, valid
+
+
+def _wait_all(futures) -> tuple[list, float]:
+    """Wait like the GUI loop does; return (results, longest main-thread gap s)."""
+    running = set(futures)
+    last, worst = time.perf_counter(), 0.0
+    while running:
+        _, running = concurrent.futures.wait(
+            running, timeout=0.05, return_when=concurrent.futures.FIRST_COMPLETED)
+        now = time.perf_counter()
+        worst = max(worst, now - last)
+        last = now
+    return [f.result() for f in futures], worst
+
+
+def _same(a, b) -> bool:
+    """True if two detect_sample_signals results found the same peaks."""
+    return a[0].keys() == b[0].keys() and all(
+        a[0][k].to_particles() == b[0][k].to_particles() for k in b[0])
+
+
+def main():
+    n_samples = int(sys.argv[1]) if len(sys.argv) > 1 else N_SAMPLES
+    n_isotopes = int(sys.argv[2]) if len(sys.argv) > 2 else N_ISOTOPES
+    n_points = int(sys.argv[3]) if len(sys.argv) > 3 else N_POINTS
+    cores = os.cpu_count() or 1
+    samples = {f"S{i}": make_sample(n_isotopes, n_points, i) for i in range(n_samples)}
+    mb = sum(s.nbytes for smp in samples.values() for s in smp[1].values()) / 1e6
+    print(f"{n_samples} samples x {n_isotopes} isotopes x {n_points:,} points "
+          f"({mb:.0f} MB of signals), {cores} cores")
+
+    # Warm-up (imports, compiled kernels, lookup table) on a small sample, so
+    # that every timed run starts from cold threshold caches but warm code.
+    warm_up = make_sample(n_isotopes, 20_000, seed=999)
+    PeakDetection().detect_sample_signals("warm-up", *warm_up)
+
+    detector = PeakDetection()
+    t0 = time.perf_counter()
+    reference = [detector.detect_sample_signals(name, *smp) for name, smp in samples.items()]
+    serial = time.perf_counter() - t0
+    print(f"  serial            {serial:7.2f} s")
+
+    counts = sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+    for workers in counts:
+        detector = PeakDetection()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            t0 = time.perf_counter()
+            futures = [executor.submit(detector.detect_sample_signals, name, *smp)
+                       for name, smp in samples.items()]
+            results, gap = _wait_all(futures)
+            elapsed = time.perf_counter() - t0
+        assert all(_same(r, ref) for r, ref in zip(results, reference))
+        print(f"  threads   x{workers:<3}    {elapsed:7.2f} s   ({serial / elapsed:4.1f}x)"
+              f"   main thread stalled up to {gap * 1e3:6.0f} ms")
+
+    for workers in counts:
+        pool = DetectionPool(workers)
+        try:
+            _wait_all([pool.submit("warm-up", *warm_up) for _ in range(workers)])
+            t0 = time.perf_counter()
+            futures = [pool.submit(name, *smp) for name, smp in samples.items()]
+            results, gap = _wait_all(futures)
+            elapsed = time.perf_counter() - t0
+        finally:
+            pool.shutdown()
+        assert all(_same(r, ref) for r, ref in zip(results, reference))
+        print(f"  processes x{workers:<3}    {elapsed:7.2f} s   ({serial / elapsed:4.1f}x)"
+              f"   main thread stalled up to {gap * 1e3:6.0f} ms")
+
+    big = make_sample(n_isotopes, n_points * 4, seed=500)
+    print(f"one sample x {n_isotopes} isotopes x {n_points * 4:,} points")
+    reference = None
+    for workers in counts:
+        t0 = time.perf_counter()
+        result = PeakDetection().detect_sample_signals("big", *big, channel_workers=workers)
+        elapsed = time.perf_counter() - t0
+        if reference is None:
+            reference, single = result, elapsed
+        assert _same(result, reference)
+        print(f"  channel threads x{workers:<3} {elapsed:7.2f} s   ({single / elapsed:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
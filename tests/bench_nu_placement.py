@@ -0,0 +1,129 @@
+"""Benchmark of Nu signal placement (get_signals_from_nu_data).
+
+Compares the single-pass placement in loading/vitesse_loading.py with the
+previous per-cycle mask implementation, kept below as reference_get_signals,
+on synthetic multi-cycle acquisitions. Both must produce identical arrays;
+the timing shows how each scales with the number of cycles.
+
+Run from the project root::
+
+    python tests/bench_nu_placement.py
+"""
+from __future__ import annotations
+
+import pathlib
+import sys
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import numpy as np
+
+from loading.vitesse_loading import get_signals_from_nu_data, nu_integ_dtype
+
+
+def reference_get_signals(integs: list[np.ndarray], num_acc: int) -> np.ndarray:
+    """
+    Per-cycle mask placement, as get_signals_from_nu_data did before the
+    single-pass rewrite. Kept verbatim as the regression reference.
+
+    Args:
+        integs (list[np.ndarray]): List of data from read_integ_binary
+        num_acc (int): Number of accumulations per acquisition
+
+    Returns:
+        np.ndarray: Signals in counts
+    """
+    all_cycles = set()
+    for integ in integs:
+        if integ.size > 0:
+            all_cycles.update(np.unique(integ["cyc_number"]))
+    all_cycles = sorted(all_cycles)
+
+    max_acq_per_cycle = {}
+    for cycle in all_cycles:
+        cycle_max = 0
+        for integ in integs:
+            if integ.size > 0:
+                mask = integ["cyc_number"] == cycle
+                if np.any(mask):
+                    cycle_max = max(cycle_max, np.max(integ["acq_number"][mask]))
+        max_acq_per_cycle[cycle] = cycle_max
+
+    cycle_offsets = {}
+    current_offset = 0
+    for cycle in all_cycles:
+        cycle_offsets[cycle] = current_offset
+        current_offset += max_acq_per_cycle[cycle] // num_acc
+
+    signal_length = current_offset
+    signal_width = integs[0]["result"]["signal"].shape[1] if integs[0].size > 0 else 0
+    signals = np.full((signal_length, signal_width), np.nan, dtype=np.float32)
+
+    for integ in integs:
+        if integ.size == 0:
+            continue
+
+        acq_indices = (integ["acq_number"] // num_acc).astype(np.int64) - 1
+
+        offsets = np.empty(len(integ), dtype=np.int64)
+        for cycle in all_cycles:
+            mask = integ["cyc_number"] == cycle
+            if np.any(mask):
+                offsets[mask] = cycle_offsets[cycle]
+
+        target_indices = acq_indices + offsets
+
+        valid = (target_indices >= 0) & (target_indices < signal_length)
+        if np.all(valid):
+            signals[target_indices] = integ["result"]["signal"]
+        else:
+            signals[target_indices[valid]] = integ["result"]["signal"][valid]
+
+    return signals
+
+
+def make_integs(cycles: int, files_per_cycle: int, acq_per_file: int,
+                width: int = 8, num_acc: int = 2, seed: int = 0) -> list[np.ndarray]:
+    """Build synthetic integ records covering ``cycles`` cycles."""
+    rng = np.random.default_rng(seed)
+    integs = []
+    for cyc in range(1, cycles + 1):
+        for f in range(files_per_cycle):
+            rec = np.zeros(acq_per_file, dtype=nu_integ_dtype(width))
+            rec["cyc_number"] = cyc
+            rec["seg_number"] = 1
+            first = num_acc + f * acq_per_file * num_acc
+            rec["acq_number"] = first + np.arange(acq_per_file) * num_acc
+            rec["result"]["signal"] = rng.random((acq_per_file, width))
+            integs.append(rec)
+    return integs
+
+
+def _best_of(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    print(f"{'cycles':>7} {'files':>6} {'records':>9} {'reference s':>12} "
+          f"{'single-pass s':>14} {'speed-up':>9}")
+    for cycles, files in ((1, 200), (10, 40), (50, 20), (200, 10)):
+        integs = make_integs(cycles, files, acq_per_file=500)
+        t_ref, ref = _best_of(lambda: reference_get_signals(integs, 2))
+        t_new, new = _best_of(lambda: get_signals_from_nu_data(integs, 2))
+        if not np.array_equal(ref, new, equal_nan=True):
+            raise SystemExit("get_signals_from_nu_data differs from the reference")
+        records = sum(i.size for i in integs)
+        print(f"{cycles:>7} {cycles * files:>6} {records:>9} {t_ref:>12.4f} "
+              f"{t_new:>14.4f} {t_ref / t_new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Benchmark of the columnar particle store (processing/particle_table.py).
+
+Builds a project-sized set of multi-element particles, once as the list of
+dicts the detection code used to keep and once as a ParticleTable, and
+compares the memory each holds and the time of typical passes over them:
+iterating every particle, summing the counts of one element, selecting the
+particles that contain it, and converting to the saved columnar form.
+
+Run from the project root::
+
+    python tests/bench_particle_table.py [particles]
+"""
+from __future__ import annotations
+
+import gc
+import pathlib
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import numpy as np
+
+from processing.particle_table import ParticleTable
+from save_export.fast_project_io import _particles_to_columnar
+
+N_PARTICLES = 1_000_000
+LABELS = ('197Au', '107Ag', '56Fe', '63Cu', '48Ti', '27Al')
+
+
+def make_particles(n: int, seed: int = 0, with_mass: bool = False) -> list[dict]:
+    """Return ``n`` multi-element particle dicts shaped like detection output.
+
+    Args:
+        n (int): Number of particles
+        seed (int): Random seed
+        with_mass (bool): Also fill the fields the mass calculation adds
+
+    Returns:
+        list[dict]: Particles in time order
+    """
+    rng = np.random.default_rng(seed)
+    starts = np.cumsum(rng.exponential(0.01, n)).tolist()
+    widths = rng.uniform(1e-4, 5e-4, n).tolist()
+    left = np.cumsum(rng.integers(5, 100, n)).tolist()
+    has = (rng.random((n, len(LABELS))) < 0.4).tolist()
+    counts = rng.integers(1, 200, (n, len(LABELS))).astype(float).tolist()
+    particles = []
+    for i in range(n):
+        elements = {lbl: c for lbl, h, c in zip(LABELS, has[i], counts[i]) if h}
+        if not elements:
+            elements = {LABELS[0]: counts[i][0]}
+        p = {
+            'start_time': starts[i],
+            'end_time': starts[i] + widths[i],
+            'left_idx': left[i],
+            'right_idx': left[i] + 4,
+            'elements': elements,
+            'element_count': len(elements),
+        }
+        if with_mass:
+            p['element_mass_fg'] = {lbl: c / 2.5 for lbl, c in elements.items()}
+            p['densities_used'] = {lbl: {'element_density': 19.3, 'compound_density': 19.3}
+                                   for lbl in elements}
+            total = sum(p['element_mass_fg'].values())
+            p['totals'] = {'total_element_mass_fg': total, 'total_particle_mass_fg': total}
+        particles.append(p)
+    return particles
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def _traced_mb(build):
+    """Return (object, MB allocated by ``build`` and still held)."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, held / 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_PARTICLES
+    source = make_particles(n)
+    print(f"{n:,} particles, {len(LABELS)} element labels")
+
+    particles, dict_mb = _traced_mb(lambda: [
+        {**p, 'elements': dict(p['elements'])} for p in source])
+    table, table_mb = _traced_mb(lambda: ParticleTable.from_particles(source))
+    del source
+    print(f"  memory       list of dicts {dict_mb:8.0f} MB   table {table_mb:8.1f} MB"
+          f"   ({dict_mb / table_mb:.0f}x smaller)")
+
+    label = LABELS[0]
+    rows = []
+
+    def dict_pass():
+        return sum(p['end_time'] - p['start_time'] for p in particles)
+
+    def row_pass():
+        return sum(p['end_time'] - p['start_time'] for p in table)
+
+    def column_pass():
+        return float(np.sum(table.column('end_time') - table.column('start_time')))
+
+    rows.append(("iterate, dwell", dict_pass, row_pass, column_pass))
+
+    def dict_sum():
+        return sum(p['elements'].get(label, 0.0) for p in particles)
+
+    def column_sum():
+        labels, counts = table.keyed('elements')
+        return float(np.nansum(counts[:, labels.index(label)]))
+
+    rows.append((f"sum {label}", dict_sum, None, column_sum))
+
+    def dict_select():
+        return len([p for p in particles if label in p['elements']])
+
+    def column_select():
+        labels, counts = table.keyed('elements')
+        return len(table.take(~np.isnan(counts[:, labels.index(label)])))
+
+    rows.append((f"select {label}", dict_select, None, column_select))
+    rows.append(("to columnar", lambda: _particles_to_columnar(particles)['n'],
+                 None, lambda: table.to_columnar()['n']))
+
+    print(f"  {'pass':<16}{'dicts':>10}{'table rows':>12}{'columns':>10}")
+    for name, on_dicts, on_rows, on_columns in rows:
+        t_dicts, expected = _timed(on_dicts)
+        t_cols, got = _timed(on_columns)
+        assert np.isclose(got, expected), name
+        t_rows = ''
+        if on_rows is not None:
+            elapsed, via_rows = _timed(on_rows)
+            assert np.isclose(via_rows, expected), name
+            t_rows = f"{elapsed:10.3f} s"
+        print(f"  {name:<16}{t_dicts:8.3f} s{t_rows:>12}{t_cols:8.3f} s"
+              f"   ({t_dicts / t_cols:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark of chunk-aligned parallel TofData integration.
+
+Writes a gzip-compressed synthetic TofData file and integrates the whole
+PeakTable with integrate_tof_data (fixed 512-row slices on one thread) and
+with integrate_tof_data_chunked for an increasing number of workers. The
+results must be identical; throughput is reported in MB/s of decompressed
+and of stored data, to compare against the raw disk speed.
+
+Run from the project root::
+
+    python tests/bench_tofwerk_chunked.py
+"""
+from __future__ import annotations
+
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+import h5py
+import numpy as np
+
+from bench_tofwerk_integration import N_BINS, N_BUFS, N_WRITES, write_file
+from loading.tofwerk_loading import integrate_tof_data, integrate_tof_data_chunked
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "bench.h5"
+        write_file(path, compression="gzip")
+        stored = path.stat().st_size / 1e6
+        decoded = N_WRITES * N_BUFS * N_BINS * 4 / 1e6
+        print(f"TofData {N_WRITES}x{N_BUFS}x{N_BINS} float32, "
+              f"{decoded:.0f} MB decoded, {stored:.0f} MB on disk (gzip)")
+        print(f"{'reader':>22} {'time (s)':>9} {'decoded MB/s':>13} {'stored MB/s':>12}")
+
+        with h5py.File(path, "r") as h5:
+            t0 = time.perf_counter()
+            reference = integrate_tof_data(h5)
+            wall = time.perf_counter() - t0
+            print(f"{'512-row slices':>22} {wall:>9.3f} {decoded / wall:>13.0f} "
+                  f"{stored / wall:>12.0f}")
+
+            workers = 1
+            while workers <= max(1, os.cpu_count() or 1):
+                stats = []
+                result = integrate_tof_data_chunked(
+                    h5, max_workers=workers, stats_callback=stats.append)
+                np.testing.assert_array_equal(result, reference)
+                s = stats[0]
+                print(f"{f'chunked, {workers} workers':>22} {s.wall_s:>9.3f} "
+                      f"{s.decoded_mb_per_s:>13.0f} {s.stored_mb_per_s:>12.0f}")
+                workers *= 2
+
+
+if __name__ == "__main__":
+    main()
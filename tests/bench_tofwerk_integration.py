@@ -0,0 +1,99 @@
+"""Benchmark of TOFWERK FullSpectra integration (integrate_tof_data).
+
+Writes a synthetic TofData file with a realistic number of TOF bins and a
+full PeakTable, then integrates a few isotopes and the whole table, reading
+whole spectra and reading only the selected peak windows. Both reads must
+give identical values; the timing shows the windowed read scaling with the
+number of selected peaks.
+
+Run from the project root::
+
+    python tests/bench_tofwerk_integration.py
+"""
+from __future__ import annotations
+
+import pathlib
+import sys
+import tempfile
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import h5py
+import numpy as np
+
+from loading.tofwerk_loading import integrate_tof_data
+
+N_WRITES, N_BUFS, N_BINS = 200, 10, 20000
+P1, P2 = 1200.0, 100.0        # mode 0: index = p1 * sqrt(mass) + p2
+
+
+def write_file(path: pathlib.Path, seed: int = 0, chunked: bool = True,
+               compression: str | None = None) -> None:
+    """Write a TofData-only file with one PeakTable entry per integer mass.
+
+    With chunked, every chunk holds whole spectra, as TofDaq writes them;
+    otherwise TofData is stored contiguously.
+    """
+    rng = np.random.default_rng(seed)
+    masses = np.arange(6.0, 250.0)
+    table = np.zeros(masses.size, dtype=[
+        ("label", "S64"), ("mass", "<f4"),
+        ("lower integration limit", "<f4"), ("upper integration limit", "<f4"),
+    ])
+    table["label"] = [f"[{int(m)}]+".encode() for m in masses]
+    table["mass"] = masses
+    table["lower integration limit"] = masses - 0.2
+    table["upper integration limit"] = masses + 0.2
+
+    with h5py.File(path, "w") as h5:
+        for key in ("NbrWaveforms", "NbrBlocks", "NbrMemories", "NbrCubes"):
+            h5.attrs[key] = np.array([1], dtype=np.int32)
+        h5.create_group("TimingData").attrs["TofPeriod"] = np.array([46000], dtype=np.int32)
+        h5.create_group("PeakData").create_dataset("PeakTable", data=table)
+        fs = h5.create_group("FullSpectra")
+        fs.attrs["MassCalibMode"] = np.array([0], dtype=np.int32)
+        fs.attrs["MassCalibration p1"] = np.array([P1])
+        fs.attrs["MassCalibration p2"] = np.array([P2])
+        fs.attrs["SampleInterval"] = np.array([1e-9])
+        fs.attrs["Single Ion Signal"] = np.array([1.0])
+        tof = fs.create_dataset("TofData", (N_WRITES, N_BUFS, N_BINS), dtype=np.float32,
+                                chunks=(1, N_BUFS, N_BINS) if chunked else None,
+                                compression=compression if chunked else None)
+        for w in range(N_WRITES):
+            tof[w] = rng.poisson(0.05, (N_BUFS, N_BINS)).astype(np.float32)
+
+
+def _time(fn, repeats=3):
+    best = np.inf
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    mb = N_WRITES * N_BUFS * N_BINS * 4 / 1e6
+    print(f"TofData {N_WRITES}x{N_BUFS}x{N_BINS} float32 ({mb:.0f} MB)")
+    for chunked in (True, False):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / "bench.h5"
+            write_file(path, chunked=chunked)
+            print(f"\n{'chunked' if chunked else 'contiguous'} TofData")
+            print(f"{'peaks':>6} {'whole spectra (s)':>18} {'peak windows (s)':>17} {'speedup':>8}")
+            with h5py.File(path, "r") as h5:
+                n_peaks = h5["PeakData"]["PeakTable"].shape[0]
+                for idx in ([101], [101, 103, 191], list(range(0, n_peaks, 30)), None):
+                    t_full, full = _time(
+                        lambda: integrate_tof_data(h5, idx=idx, selected_bins_only=False))
+                    t_win, win = _time(lambda: integrate_tof_data(h5, idx=idx))
+                    np.testing.assert_array_equal(win, full)
+                    n = n_peaks if idx is None else len(idx)
+                    print(f"{n:>6} {t_full:>18.3f} {t_win:>17.3f} {t_full / t_win:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark of the streaming window-mode background.
+
+In window mode, PeakDetection.calculate_iterative_threshold starts from a
+centred moving mean of the signal and refines it with a moving mean of the
+points below the threshold (_rolling_background). The start used to be an
+np.convolve with a box kernel, O(n·w), and the refinement two
+uniform_filter1d passes over several full-length temporaries. Both are now
+one numba pass with a running sum (_window_background), O(n) whatever the
+window.
+
+This times the whole window-mode threshold with the previous engine (the
+path taken without numba) and the streaming one, for a few window sizes,
+and reports the largest relative difference of the threshold arrays.
+
+Run from the project root::
+
+    python tests/bench_window_background.py [points]
+"""
+from __future__ import annotations
+
+import pathlib
+import sys
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import numpy as np
+
+from processing import peak_detection
+from processing.peak_detection import PeakDetection
+
+N_POINTS = 2_000_000
+WINDOWS = [500, 5_000, 50_000]
+METHOD = "CPLN table"
+
+
+def make_channel(n, seed=0):
+    """Poisson background drifting from 2 to 8 counts, with particle spikes."""
+    rng = np.random.default_rng(seed)
+    signal = rng.poisson(np.linspace(2.0, 8.0, n)).astype(np.float64)
+    spikes = rng.integers(0, n, n // 500)
+    signal[spikes] += rng.integers(20, 400, spikes.size)
+    return signal
+
+
+def timed(detector, signal, window_size, streaming):
+    peak_detection.NUMBA_AVAILABLE = streaming
+    try:
+        t0 = time.perf_counter()
+        result = detector.calculate_iterative_threshold(
+            signal, METHOD, alpha=1e-6, max_iters=4,
+            use_window_size=True, window_size=window_size)
+        return time.perf_counter() - t0, result
+    finally:
+        peak_detection.NUMBA_AVAILABLE = True
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_POINTS
+    signal = make_channel(n)
+    detector = PeakDetection()
+    timed(detector, signal[:10_000], 100, True)
+    print(f"{METHOD} window mode, {n:,}-point channel")
+    print(f"  {'window':>8}{'previous':>11}{'streaming':>12}{'speed-up':>10}{'max rel diff':>15}")
+    for window_size in WINDOWS:
+        t_old, old = timed(detector, signal, window_size, False)
+        t_new, new = timed(detector, signal, window_size, True)
+        rel = float(np.max(np.abs(new['threshold'] - old['threshold']) / old['threshold']))
+        print(f"  {window_size:>8,}{t_old:9.3f} s{t_new:10.3f} s{t_old / t_new:9.1f}x{rel:15.2e}")
+
+
+if __name__ == "__main__":
+    main()
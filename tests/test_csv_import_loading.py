@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+"""Tests for the import worker in loading/csv/dialog.py.
+
+The column-projected typed read must give the same signals, time axis and
+run info as the original whole-file read, and must hand files it cannot
+parse as plain numbers back to that read.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from loading.csv.dialog import DataProcessThread
+from loading.csv.exclusions import apply_exclusions
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Return a process-wide offscreen QApplication for the Qt-backed tests."""
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    return app
+
+
+@pytest.fixture
+def wide_csv(tmp_path):
+    """Write a CSV with a time column, three isotopes and two unused columns."""
+    rng = np.random.default_rng(3)
+    n = 2000
+    frame = pd.DataFrame({
+        "Time [ms]": np.round(np.arange(n) * 0.1 + 1e5, 4),
+        "Comment": ["ok"] * n,
+        "Ag107": rng.poisson(3.0, n).astype(float),
+        "Au197": np.round(rng.gamma(2.0, 1.5, n), 5),
+        "Fe56": rng.poisson(40.0, n).astype(float),
+        "Pressure": rng.random(n),
+    })
+    path = tmp_path / "wide.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+
+def _settings(**overrides):
+    settings = {
+        'delimiter': ',', 'encoding': 'utf-8', 'header_row': 0, 'skip_rows': 0,
+        'time_column': 'Time [ms]', 'time_unit': 'milliseconds',
+        'dwell_time_ms': 0.1, 'use_calculated_dwell': True,
+        'data_type': 'Counts',
+    }
+    settings.update(overrides)
+    return settings
+
+
+def _file_config(path, columns=("Ag107", "Au197"), **extra):
+    masses = {"Ag107": 106.905, "Au197": 196.967, "Fe56": 55.935}
+    config = {
+        'path': str(path), 'name': path.name,
+        'mappings': {
+            c: {'column_name': c, 'isotope': {'mass': masses[c], 'label': c}}
+            for c in columns
+        },
+    }
+    config.update(extra)
+    return config
+
+
+def _legacy(thread, path, settings, file_config):
+    """The import as it was before the projected read."""
+    df = thread._load_delimited(str(path), settings)
+    df = apply_exclusions(df, file_config.get('excluded_columns', ()),
+                          file_config.get('excluded_rows', ()))
+    time_array, dwell = thread._process_time(df, settings)
+    signals = thread._process_isotopes(df, file_config['mappings'], settings, dwell)
+    return signals, time_array, thread._run_info(df, settings, str(path), dwell, '.csv')
+
+
+class TestProjectedDelimitedRead:
+    def test_reads_only_wanted_columns(self, qapp, wide_csv):
+        thread = DataProcessThread({'settings': _settings(), 'files': []})
+        df = thread._load_delimited_columns(
+            str(wide_csv), _settings(), ["Time [ms]", "Au197", "Ag107"])
+        assert list(df.columns) == ["Time [ms]", "Ag107", "Au197"]
+        assert df["Ag107"].dtype == np.float32
+        assert df["Time [ms]"].dtype == np.float64
+
+    @pytest.mark.parametrize("extra", [
+        {},
+        {'excluded_rows': {0, 5, 1999}},
+        {'excluded_columns': {'Au197'}},
+    ])
+    def test_matches_whole_file_read(self, qapp, wide_csv, extra):
+        settings = _settings()
+        config = _file_config(wide_csv, columns=("Ag107", "Au197", "Fe56"), **extra)
+        thread = DataProcessThread({'settings': settings, 'files': [config]})
+        name, result = thread.process_file(config, 0)
+        signals, time_array, run_info = _legacy(thread, wide_csv, settings, config)
+
+        assert name == "wide"
+        assert set(result['signals']) == set(signals)
+        for mass, expected in signals.items():
+            assert result['signals'][mass].dtype == np.float32
+            np.testing.assert_array_equal(result['signals'][mass], expected)
+        np.testing.assert_array_equal(result['time_array'], time_array)
+        assert result['run_info'] == run_info
+
+    def test_cps_data_scaled_by_dwell(self, qapp, wide_csv):
+        settings = _settings(data_type="Counts per second (CPS)")
+        config = _file_config(wide_csv)
+        thread = DataProcessThread({'settings': settings, 'files': [config]})
+        _, result = thread.process_file(config, 0)
+        signals, _, _ = _legacy(thread, wide_csv, settings, config)
+        for mass, expected in signals.items():
+            np.testing.assert_allclose(result['signals'][mass], expected, rtol=1e-6)
+
+    def test_footer_ends_the_typed_read(self, qapp, tmp_path):
+        path = tmp_path / "footer.csv"
+        lines = ["Time [ms],Ag107"]
+        lines += [f"{i * 0.1},{i % 7}" for i in range(60)]
+        lines += ["End of acquisition,", "Operator notes,here"]
+        path.write_text("\n".join(lines), encoding="utf-8")
+
+        settings = _settings()
+        config = _file_config(path, columns=("Ag107",))
+        thread = DataProcessThread({'settings': settings, 'files': [config]})
+        df = thread._load_delimited_columns(str(path), settings, ["Time [ms]", "Ag107"])
+        assert len(df) == 60 and df["Ag107"].dtype == np.float32
+        _, result = thread.process_file(config, 0)
+        assert len(result['time_array']) == 60
+        np.testing.assert_array_equal(
+            result['signals'][106.905], np.arange(60) % 7)
+
+    def test_no_mappings_uses_whole_file_read(self, qapp, wide_csv):
+        thread = DataProcessThread({'settings': _settings(), 'files': []})
+        assert thread._wanted_columns({'mappings': {}}, _settings(time_column=None)) == []
+        assert thread._load_delimited_columns(str(wide_csv), _settings(), []) is None
+
+
+class TestApplyExclusionsRows:
+    def test_drops_positional_rows(self):
+        frame = pd.DataFrame({"a": np.arange(10)})
+        result = apply_exclusions(frame, (), {9, 0, 4, 25})
+        assert result["a"].tolist() == [1, 2, 3, 5, 6, 7, 8]
+        assert result.index.tolist() == list(range(7))
+
+
+class TestParallelImport:
+    @pytest.fixture
+    def batch(self, tmp_path):
+        """Write five CSVs; the first is much longer so it finishes last."""
+        rng = np.random.default_rng(8)
+        paths = []
+        for i, n in enumerate([60000, 300, 500, 200, 400]):
+            frame = pd.DataFrame({
+                "Time [ms]": np.arange(n) * 0.1,
+                "Ag107": rng.poisson(2.0 + i, n).astype(float),
+                "Au197": rng.poisson(1.0, n).astype(float),
+            })
+            path = tmp_path / f"s{i}.csv"
+            frame.to_csv(path, index=False)
+            paths.append(path)
+        return paths
+
+    def _run(self, qapp, paths, workers, interrupt=False):
+        config = {'settings': _settings(),
+                  'files': [_file_config(p) for p in paths]}
+        thread = DataProcessThread(config, max_workers=workers)
+        samples, errors, steps = [], [], []
+        thread.finished.connect(
+            lambda sig, info, t, name, dt: samples.append((name, sig)))
+        thread.error.connect(errors.append)
+        thread.file_progress.connect(lambda done, total, name: steps.append(done))
+        if interrupt:
+            # Interruption is only seen by a running QThread.
+            thread.start()
+            thread.requestInterruption()
+            assert thread.wait(30000)
+        else:
+            thread.run()
+        # Signals emitted off this thread are queued back to it.
+        qapp.processEvents()
+        return samples, errors, steps
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_samples_arrive_in_file_order(self, qapp, batch, workers):
+        samples, errors, steps = self._run(qapp, batch, workers)
+        assert errors == []
+        assert [name for name, _ in samples] == [f"s{i}" for i in range(5)]
+        assert steps == [1, 2, 3, 4, 5]
+
+    def test_parallel_matches_sequential(self, qapp, batch):
+        one, _, _ = self._run(qapp, batch, 1)
+        four, _, _ = self._run(qapp, batch, 4)
+        for (n1, s1), (n4, s4) in zip(one, four):
+            assert n1 == n4 and s1.keys() == s4.keys()
+            for mass in s1:
+                np.testing.assert_array_equal(s1[mass], s4[mass])
+
+    def test_failed_file_reports_and_the_rest_load(self, qapp, batch, tmp_path):
+        broken = tmp_path / "broken.csv"
+        broken.write_text("Time [ms],Ag107\n", encoding="utf-8")
+        samples, errors, steps = self._run(qapp, [batch[1], broken, batch[2]], 3)
+        assert [name for name, _ in samples] == ["s1", "s2"]
+        assert len(errors) == 1 and "broken.csv" in errors[0]
+        assert steps == [1, 2, 3]
+
+    def test_interruption_stops_the_batch(self, qapp, batch):
+        samples, errors, steps = self._run(qapp, batch, 1, interrupt=True)
+        assert errors == []
+        # The file being read when the request lands may stop mid-file too.
+        assert len(samples) < len(batch) and len(steps) < len(batch)
+        assert [name for name, _ in samples] == [f"s{i}" for i in range(len(samples))]
+
+    def test_worker_count_from_config(self, qapp):
+        assert DataProcessThread({'files': [], 'max_workers': 3}).max_workers == 3
+        assert DataProcessThread({'files': []}, max_workers=0).max_workers == 1
+
+
+class TestImportCache:
+    def _thread(self, tmp_path, config):
+        from loading.run_cache import RunCache
+
+        thread = DataProcessThread(config)
+        thread.run_cache = RunCache(tmp_path / "cache")
+        return thread
+
+    def test_repeat_import_is_served_from_cache(self, qapp, tmp_path, wide_csv, monkeypatch):
+        settings = _settings()
+        config = _file_config(wide_csv, columns=("Ag107", "Fe56"), excluded_rows=[3])
+        thread = self._thread(tmp_path, {'settings': settings, 'files': [config]})
+        _, first = thread.process_file(config, 0)
+
+        def no_parse(*args, **kwargs):
+            raise AssertionError("file was parsed again")
+
+        monkeypatch.setattr(thread, "_load_delimited_columns", no_parse)
+        monkeypatch.setattr(thread, "_load_delimited", no_parse)
+        name, second = thread.process_file(config, 0)
+        assert name == "wide"
+        assert isinstance(second['time_array'], np.memmap)
+        np.testing.assert_array_equal(second['time_array'], first['time_array'])
+        for mass, data in first['signals'].items():
+            assert second['signals'][mass].dtype == np.float32
+            np.testing.assert_array_equal(second['signals'][mass], data)
+        assert second['run_info'] == first['run_info']
+
+    def test_copy_of_file_hits_with_its_own_name(self, qapp, tmp_path, wide_csv):
+        import shutil
+
+        settings = _settings()
+        thread = self._thread(tmp_path, {'settings': settings, 'files': []})
+        thread.process_file(_file_config(wide_csv), 0)
+        copy = tmp_path / "renamed.csv"
+        shutil.copy(wide_csv, copy)
+        config = _file_config(copy)
+        key = thread._cache_key(str(copy), settings, config)
+        assert thread.run_cache.get(key) is not None
+        name, result = thread.process_file(config, 0)
+        assert name == "renamed"
+        assert result['run_info']['OriginalFile'] == str(copy)
+
+    @pytest.mark.parametrize("change", [
+        {'excluded_rows': [1]},
+        {'excluded_columns': ['Au197']},
+        {'columns': ("Ag107",)},
+        {'time_unit': 'seconds'},
+    ])
+    def test_key_follows_the_profile(self, qapp, tmp_path, wide_csv, change):
+        settings = _settings()
+        thread = self._thread(tmp_path, {'settings': settings, 'files': []})
+        base = thread._cache_key(str(wide_csv), settings, _file_config(wide_csv))
+        change = dict(change)
+        other_settings = _settings(**{k: change.pop(k) for k in list(change)
+                                      if k in settings})
+        other = thread._cache_key(str(wide_csv), other_settings,
+                                  _file_config(wide_csv, **change))
+        assert other != base
+
+    def test_key_follows_the_content(self, qapp, tmp_path, wide_csv):
+        settings = _settings()
+        thread = self._thread(tmp_path, {'settings': settings, 'files': []})
+        config = _file_config(wide_csv)
+        before = thread._cache_key(str(wide_csv), settings, config)
+        wide_csv.write_text(wide_csv.read_text().replace(",ok,", ",OK,", 1))
+        assert thread._cache_key(str(wide_csv), settings, config) != before
+
+
+class TestStreamingExcelRead:
+    @pytest.fixture
+    def workbook(self, tmp_path):
+        """Write a sheet with two preamble rows, a text column and a footer."""
+        import openpyxl
+
+        rng = np.random.default_rng(5)
+        n = 9000
+        self.time = np.round(np.arange(n) * 0.1 + 5e4, 3)
+        self.ag = rng.poisson(3.0, n).astype(float)
+        self.au = np.round(rng.gamma(2.0, 1.5, n), 4)
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet("Data")
+        ws.append(["Instrument export"])
+        ws.append([])
+        ws.append(["Time [ms]", "Note", "Ag107", None, "Au197"])
+        for i in range(n):
+            note = "spike" if i == 17 else None
+            ag = "n/a" if i == 40 else int(self.ag[i])
+            ws.append([float(self.time[i]), note, ag, 1, float(self.au[i])])
+        ws.append([])
+        ws.append(["End of acquisition"])
+        path = tmp_path / "book.xlsx"
+        wb.save(path)
+        return path
+
+    def _thread(self):
+        settings = _settings(skip_rows=2, sheet_name=0)
+        thread = DataProcessThread({'settings': settings, 'files': []})
+        thread.run_cache = None
+        return thread, settings
+
+    def test_reads_kept_columns_up_to_footer(self, qapp, workbook):
+        thread, settings = self._thread()
+        progress = []
+        thread.rows_read.connect(lambda i, done, total: progress.append(done))
+        df = thread._load_excel_columns(
+            str(workbook), settings, ["Time [ms]", "Ag107", "Au197", "Unnamed: 3"])
+        assert list(df.columns) == ["Time [ms]", "Ag107", "Unnamed: 3", "Au197"]
+        assert len(df) == len(self.time)
+        assert df["Time [ms]"].dtype == np.float64 and df["Ag107"].dtype == np.float32
+        np.testing.assert_array_equal(df["Time [ms]"], self.time)
+        expected_ag = self.ag.astype(np.float32)
+        expected_ag[40] = np.nan
+        np.testing.assert_array_equal(df["Ag107"], expected_ag)
+        np.testing.assert_array_equal(df["Au197"], self.au.astype(np.float32))
+        assert progress[-1] == len(self.time) and progress == sorted(progress)
+
+    def test_process_file_uses_streaming_read(self, qapp, workbook, monkeypatch):
+        thread, settings = self._thread()
+        monkeypatch.setattr(thread, "_load_excel", lambda *a: pytest.fail("sheet loaded whole"))
+        config = _file_config(workbook, excluded_rows=[0])
+        name, result = thread.process_file(config, 0)
+        assert name == "book"
+        np.testing.assert_array_equal(result['signals'][196.967], self.au[1:].astype(np.float32))
+        np.testing.assert_array_equal(result['time_array'], self.time[1:] / 1e3)
+        assert result['run_info']['DataType'] == 'Excel'
+
+    def test_cancel_mid_sheet(self, qapp, workbook, monkeypatch):
+        thread, settings = self._thread()
+        checks = iter([False, True])
+        monkeypatch.setattr(thread, "isInterruptionRequested", lambda: next(checks, True))
+        errors = []
+        thread.error.connect(errors.append)
+        assert thread.process_file(_file_config(workbook), 0) is None
+        assert errors == []
+
+
+    @staticmethod
+    def _small_book(path, header, rows):
+        import openpyxl
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        for row in [header] + rows:
+            ws.append(row)
+        wb.save(path)
+        return path
+
+    def test_blank_kept_cell_mid_sheet_keeps_the_rest(self, qapp, tmp_path):
+        rows = [[i * 0.1, None if i == 5 else i % 7, 2 * i] for i in range(20)]
+        path = self._small_book(tmp_path / "gap.xlsx", ["Time [ms]", "Ag107", "Au197"], rows)
+        settings = _settings()
+        thread = DataProcessThread({'settings': settings, 'files': []})
+        whole = thread._load_excel(str(path), settings)
+        df = thread._load_excel_columns(str(path), settings, ["Ag107"])
+        assert df is None or len(df) == 20
+        _, result = thread.process_file(_file_config(path, columns=("Ag107",)), 0)
+        np.testing.assert_array_equal(result['signals'][106.905],
+                                      whole["Ag107"].to_numpy(np.float32))
+
+    def test_header_names_follow_the_whole_sheet_read(self, qapp, tmp_path):
+        rows = [[i, i + 1, i + 2, i + 3] for i in range(10)] + [[], ["End"]]
+        path = self._small_book(tmp_path / "dup.xlsx", ["Ag107", None, "Ag107", "Au197"], rows)
+        thread = DataProcessThread({'settings': _settings(), 'files': []})
+        settings = _settings(time_column=None)
+        whole = thread._load_excel(str(path), settings)
+        df = thread._load_excel_columns(str(path), settings, ["Unnamed: 1", "Ag107.1"])
+        assert list(df.columns) == ["Unnamed: 1", "Ag107.1"] == list(whole.columns[1:3])
+        np.testing.assert_array_equal(df["Ag107.1"], whole["Ag107.1"].to_numpy(np.float32))
+
+    def test_header_row_counts_after_skipped_rows(self, qapp, tmp_path):
+        rows = [["Ag107", "Au197"]] + [[i, 2 * i] for i in range(10)]
+        path = self._small_book(tmp_path / "late.xlsx", ["Export"], [[]] + rows)
+        thread = DataProcessThread({'settings': _settings(), 'files': []})
+        settings = _settings(time_column=None, skip_rows=1, header_row=1)
+        df = thread._load_excel_columns(str(path), settings, ["Au197"])
+        whole = thread._load_excel(str(path), settings)
+        np.testing.assert_array_equal(df["Au197"], np.arange(10, dtype=np.float32) * 2)
+        assert list(whole.columns) == ["Ag107", "Au197"] and len(whole) == 10
+
+
+class TestChunkedDelimitedRead:
+    def test_blocks_match_single_read(self, qapp, wide_csv):
+        columns = ["Time [ms]", "Ag107", "Au197", "Fe56"]
+        thread = DataProcessThread({'settings': _settings(), 'files': []})
+        whole = thread._load_delimited_columns(
+            str(wide_csv), _settings(chunk_rows=10**6), columns)
+
+        progress, peaks = [], []
+        thread.rows_read.connect(lambda i, done, total: progress.append((done, total)))
+        thread.memory_peak.connect(lambda i, mb: peaks.append(mb))
+        blocks = thread._load_delimited_columns(
+            str(wide_csv), _settings(chunk_rows=300), columns)
+
+        pd.testing.assert_frame_equal(blocks, whole)
+        assert [done for done, _ in progress] == list(range(300, 2000, 300)) + [2000]
+        data_mb = blocks.memory_usage(index=False).sum() / 1e6
+        assert len(peaks) == 1 and data_mb <= peaks[0] < 3 * data_mb
+
+    @pytest.mark.parametrize("chunk_rows", [100, 333])
+    def test_footer_in_a_later_block_ends_the_read(self, qapp, tmp_path, chunk_rows):
+        path = tmp_path / "footer.csv"
+        lines = ["Time [ms],Ag107"] + [f"{i * 0.1},{i % 7}" for i in range(1000)]
+        lines += ["", "End of acquisition,", "Operator,n/a"]
+        path.write_text("\n".join(lines), encoding="utf-8")
+        settings = _settings(chunk_rows=chunk_rows)
+        thread = DataProcessThread({'settings': settings, 'files': []})
+        df = thread._load_delimited_columns(str(path), settings, ["Time [ms]", "Ag107"])
+        assert len(df) == 1000
+        np.testing.assert_array_equal(df["Ag107"], np.arange(1000) % 7)
+        config = _file_config(path, columns=("Ag107",))
+        _, result = thread.process_file(config, 0)
+        assert len(result['time_array']) == 1000
+
+    @pytest.mark.parametrize("row", ["14.9,overload", ","])
+    def test_text_or_gap_before_more_data_falls_back(self, qapp, tmp_path, row):
+        path = tmp_path / "gap.csv"
+        lines = ["Time [ms],Ag107"] + [f"{i * 0.1},{i % 7}" for i in range(300)]
+        lines[150] = row
+        path.write_text("\n".join(lines), encoding="utf-8")
+        settings = _settings(chunk_rows=100)
+        thread = DataProcessThread({'settings': settings, 'files': []})
+        assert thread._load_delimited_columns(
+            str(path), settings, ["Time [ms]", "Ag107"]) is None
+
+    def test_missing_value_marker_reads_as_nan(self, qapp, tmp_path):
+        path = tmp_path / "na.csv"
+        lines = ["Time [ms],Ag107"] + [f"{i * 0.1},{i % 7}" for i in range(300)]
+        lines[150] = "14.9,n/a"
+        path.write_text("\n".join(lines), encoding="utf-8")
+        settings = _settings(chunk_rows=100)
+        thread = DataProcessThread({'settings': settings, 'files': []})
+        df = thread._load_delimited_columns(str(path), settings, ["Time [ms]", "Ag107"])
+        assert len(df) == 300 and np.isnan(df["Ag107"][149])
+        assert np.isnan(df["Ag107"]).sum() == 1
+
+    def test_column_buffer_grows_and_trims(self):
+        from loading.csv.dialog import _ColumnBuffer
+
+        buffer = _ColumnBuffer(["t", "a"], [np.float64, np.float32], capacity=4)
+        for start in range(0, 25, 5):
+            block = np.arange(start, start + 5)
+            buffer.append([block * 0.5, block])
+        assert buffer.rows == 25 and buffer.capacity >= 25
+        frame = buffer.frame()
+        assert len(frame) == 25 and frame["a"].dtype == np.float32
+        np.testing.assert_array_equal(frame["t"], np.arange(25) * 0.5)
+
+    def test_row_estimate(self, tmp_path):
+        from loading.csv.dialog import estimate_row_count
+
+        path = tmp_path / "rows.csv"
+        path.write_text("".join(f"{i:06d},{i % 10}\n" for i in range(20000)))
+        assert estimate_row_count(path) == 20000
+        assert estimate_row_count(path, sample_bytes=4096) == pytest.approx(20000, rel=0.2)
+        assert estimate_row_count(tmp_path / "missing.csv") == 0
+
+    def test_peak_estimate_scales_with_rows_not_blocks(self):
+        from loading.csv.dialog import estimate_import_peak_bytes
+
+        small = estimate_import_peak_bytes(10**6, 3, True, 250_000, 40)
+        large = estimate_import_peak_bytes(10**8, 3, True, 250_000, 40)
+        assert large - small == 2 * (10**8 - 10**6) * 20
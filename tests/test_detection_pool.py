@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""Tests for process-pool detection (processing/detection_pool.py).
+
+detect_particles now runs each sample's thresholds and peaks in worker
+processes that read the signals from shared memory. The results must equal
+in-process detection, shared blocks must be released, and if the pool
+cannot be used the samples must still be detected (on threads).
+"""
+from __future__ import annotations
+
+import types
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+from bench_detection_pool import make_sample
+from processing import peak_detection
+from processing.detection_pool import DetectionPool, SharedSignals, attach_signals
+from processing.peak_detection import PeakDetection
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Return a process-wide offscreen QApplication for the Qt-backed tests."""
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    return app
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = DetectionPool(1)
+    yield pool
+    pool.shutdown()
+
+
+def _assert_same_detection(got, expected):
+    peaks, thresholds = got
+    assert peaks.keys() == expected[0].keys()
+    for key, table in expected[0].items():
+        assert peaks[key].to_particles() == table.to_particles()
+    assert thresholds.keys() == expected[1].keys()
+    for key, data in expected[1].items():
+        assert thresholds[key]['threshold'] == pytest.approx(data['threshold'])
+        assert thresholds[key]['background'] == pytest.approx(data['background'])
+
+
+class TestSharedSignals:
+    def test_views_match_and_are_read_only(self):
+        arrays = {'time': np.arange(1000) * 1e-4,
+                  107.0: np.arange(1000, dtype=np.float32),
+                  'counts': np.arange(999, dtype=np.int64)[::-1]}
+        shared = SharedSignals(arrays)
+        try:
+            shm, views = attach_signals(shared.descriptor)
+            for key, arr in arrays.items():
+                np.testing.assert_array_equal(views[key], arr)
+                assert views[key].dtype == arr.dtype
+                assert not views[key].flags.writeable
+            views = None
+            shm.close()
+        finally:
+            shared.close()
+
+    def test_close_removes_block(self):
+        shared = SharedSignals({'x': np.ones(10)})
+        shared.close()
+        shared.close()
+        with pytest.raises(FileNotFoundError):
+            attach_signals(shared.descriptor)
+
+
+class TestDetectionPool:
+    def test_matches_in_process_detection(self, pool):
+        sample = make_sample(3, 40_000, seed=1)
+        expected = PeakDetection().detect_sample_signals("S", *sample)
+        got = pool.submit("S", *sample).result(timeout=600)
+        _assert_same_detection(got, expected)
+        assert sum(len(t) for t in got[0].values()) > 100
+
+    def test_channels_sharing_one_signal(self, pool):
+        time_s, signals, params, mapping, valid = make_sample(2, 20_000, seed=2)
+        key = next(iter(signals))
+        signals['Dup-40.0000'] = signals[key]
+        params['Dup-40.0000'] = params[key]
+        mapping['Dup-40.0000'] = mapping[key]
+        valid.append(('Dup', 40.0, 'Dup-40.0000', mapping[key]))
+        sample = (time_s, signals, params, mapping, valid)
+        expected = PeakDetection().detect_sample_signals("S", *sample)
+        _assert_same_detection(pool.submit("S", *sample).result(timeout=600), expected)
+
+
+class TestChannelThreads:
+    def test_parallel_channels_match_serial(self, monkeypatch):
+        sample = make_sample(4, 30_000, seed=3)
+        expected = PeakDetection().detect_sample_signals("S", *sample, channel_workers=1)
+        monkeypatch.setattr(peak_detection, 'CHANNEL_PARALLEL_MIN_POINTS', 0)
+        got = PeakDetection().detect_sample_signals("S", *sample, channel_workers=3)
+        _assert_same_detection(got, expected)
+        assert list(got[0]) == list(expected[0])
+
+    def test_small_sample_stays_serial(self, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("thread pool used for a small sample")
+
+        monkeypatch.setattr(peak_detection, 'ThreadPoolExecutor', fail)
+        peaks, _ = PeakDetection().detect_sample_signals(
+            "S", *make_sample(2, 5_000, seed=4), channel_workers=4)
+        assert len(peaks) == 2
+
+    def test_workers_split_between_samples(self, monkeypatch):
+        monkeypatch.setattr(peak_detection, 'default_worker_count', lambda: 8)
+        assert PeakDetection._channel_workers(1, 8) == 8
+        assert PeakDetection._channel_workers(3, 2) == 4
+        assert PeakDetection._channel_workers(20, 8) == 1
+
+
+class _Window:
+    """The parts of the main window sample detection reads."""
+
+    def __init__(self, n_samples):
+        self.data_by_sample, self.time_array_by_sample = {}, {}
+        self.sample_parameters, self.selected_isotopes = {}, {}
+        for i in range(n_samples):
+            time_s, signals, params, mapping, valid = make_sample(2, 20_000, seed=10 + i)
+            name = f"S{i}"
+            self.data_by_sample[name] = {mapping[k]: s for k, s in signals.items()}
+            self.time_array_by_sample[name] = time_s
+            self.sample_parameters[name] = params
+            for element, isotope, _, _ in valid:
+                self.selected_isotopes.setdefault(element, [isotope])
+        self.data_by_sample['empty'] = {}
+        self.time_array_by_sample['empty'] = time_s
+
+    def find_closest_isotope(self, isotope, data):
+        return isotope if isotope in data else None
+
+    def get_formatted_label(self, element_key):
+        return element_key
+
+
+class TestSampleResults:
+    def _run(self, detector, window):
+        return dict(detector._iter_sample_results(window, list(window.data_by_sample)))
+
+    def test_process_and_thread_backends_agree(self, qapp, pool, monkeypatch):
+        window = _Window(3)
+        monkeypatch.setattr(peak_detection, 'get_detection_pool', lambda: pool)
+        detector = PeakDetection()
+        by_process = self._run(detector, window)
+        detector.detection_backend = 'threads'
+        by_thread = self._run(detector, window)
+        assert by_process.keys() == by_thread.keys() == set(window.data_by_sample)
+        assert by_process['empty'] is None and by_thread['empty'] is None
+        for name in ('S0', 'S1', 'S2'):
+            got, expected = by_process[name], by_thread[name]
+            assert got['results_data'] == expected['results_data']
+            _assert_same_detection((got['detected_peaks'], got['thresholds']),
+                                   (expected['detected_peaks'], expected['thresholds']))
+            assert [p['clusters'] for p in got['all_particles']] == \
+                [p['clusters'] for p in expected['all_particles']]
+
+    def test_broken_pool_falls_back_to_threads(self, qapp, monkeypatch):
+        window = _Window(2)
+        resets = []
+
+        def submit(*args, **kwargs):
+            raise BrokenProcessPool("worker died")
+
+        broken = types.SimpleNamespace(max_workers=2, submit=submit,
+                                       reset=lambda: resets.append(True))
+        monkeypatch.setattr(peak_detection, 'get_detection_pool', lambda: broken)
+        results = self._run(PeakDetection(), window)
+        assert resets
+        assert results['S0']['detected_peaks'] and results['S1']['detected_peaks']
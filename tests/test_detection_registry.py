@@ -28,6 +28,9 @@ class _FakeThresholdEngine:
     def get_threshold(self, lam, alpha, sigma=0.55):
         return self.base + lam * 7.0 + alpha * 13.0 + sigma * 101.0
 
+    def get_thresholds(self, lams, alpha, sigma=0.55):
+        return np.array([self.get_threshold(lam, alpha, sigma) for lam in lams])
+
 
 class _FakeEngine:
     def __init__(self):
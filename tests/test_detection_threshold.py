@@ -9,11 +9,20 @@ particle index ranges that get integrated. Both are tested here.
 import numpy as np
 import pytest
 
+from processing import peak_detection
 from processing.peak_detection import (
     CompoundPoissonLognormal,
     CompoundPoissonLognormalOptimized,
+    CompoundPoissonLognormaltable,
+    CountHistogram,
+    PeakDetection,
     _assignments_to_regions,
 )
+from processing.threshold_cache import ThresholdCache, threshold_key
+
+
+def _key(lam, alpha, sigma=0.55):
+    return threshold_key(CompoundPoissonLognormalOptimized.CACHE_METHOD, lam, alpha, sigma)
 
 
 # --------------------------------------------------------------------------- #
@@ -49,7 +58,7 @@ class TestGetThreshold:
 # --------------------------------------------------------------------------- #
 class TestOptimizedThreshold:
     def setup_method(self):
-        self.opt = CompoundPoissonLognormalOptimized()
+        self.opt = CompoundPoissonLognormalOptimized(ThresholdCache())
 
     def test_agrees_with_reference(self):
         ref = CompoundPoissonLognormal().get_threshold(15.0, 0.05)
@@ -63,13 +72,156 @@ class TestOptimizedThreshold:
         a = self.opt.get_threshold(12.0, 0.05)
         b = self.opt.get_threshold(12.0, 0.05)
         assert a == b
-        assert (round(12.0, 2), 0.05, 0.55) in self.opt._threshold_cache
+        assert _key(12.0, 0.05) in self.opt._threshold_cache
+        assert self.opt._threshold_cache.stats()['hits'] == 1
 
     def test_clear_cache(self):
         self.opt.get_threshold(12.0, 0.05)
         assert self.opt._threshold_cache
         self.opt.clear_cache()
-        assert self.opt._threshold_cache == {}
+        assert len(self.opt._threshold_cache) == 0
+
+    def test_batch_matches_single_values(self):
+        lams = np.array([0.0, 0.4, 2.5, 12.0, 60.0])
+        batch = self.opt.get_thresholds(lams, 1e-6, sigma=0.7)
+        single = CompoundPoissonLognormalOptimized(ThresholdCache())
+        expected = [single.get_threshold(lam, 1e-6, sigma=0.7) for lam in lams]
+        np.testing.assert_allclose(batch, expected, rtol=1e-3)
+        assert _key(12.0, 1e-6, 0.7) in self.opt._threshold_cache
+
+    def test_batch_uses_cache_like_repeated_calls(self):
+        first = self.opt.get_threshold(12.001, 0.05)
+        got = self.opt.get_thresholds(np.array([12.004, 12.0, 30.0]), 0.05)
+        # 12.004 and 12.0 share the cache key of 12.001, as with get_threshold.
+        assert got[0] == got[1] == first
+        assert got[2] == self.opt.get_threshold(30.0, 0.05)
+
+
+# --------------------------------------------------------------------------- #
+# CompoundPoissonLognormaltable
+# --------------------------------------------------------------------------- #
+class TestLookupTable:
+    def setup_method(self):
+        self.lut = CompoundPoissonLognormaltable()
+        self.lut._fallback = CompoundPoissonLognormalOptimized(ThresholdCache())
+
+    @pytest.mark.parametrize("alpha,sigma", [(1e-6, 0.55), (0.05, 0.3), (0.5, 1.2)])
+    def test_array_query_equals_single_queries(self, alpha, sigma):
+        lams = np.array([-1.0, 0.0, 1e-4, 0.001, 0.3, 2.5, 47.0, 100.0,
+                         100.5, 380.0, 1000.0, 1400.0])
+        got = self.lut.get_thresholds(lams, alpha, sigma)
+        expected = [self.lut.get_threshold(lam, alpha, sigma) for lam in lams]
+        np.testing.assert_array_equal(got, expected)
+        assert self.lut.get_thresholds(lams.reshape(3, 4), alpha, sigma).shape == (3, 4)
+
+    def test_extension_follows_analytical_thresholds(self):
+        lams = np.geomspace(101.0, 990.0, 12)
+        got = self.lut.get_thresholds(lams, 1e-6, 0.55)
+        expected = CompoundPoissonLognormalOptimized(ThresholdCache()).get_thresholds(lams, 1e-6, 0.55)
+        np.testing.assert_allclose(got, expected, rtol=1e-3)
+        assert np.all(np.diff(got) > 0)
+
+    def test_extension_solves_only_the_bracketing_nodes(self):
+        self.lut.get_threshold(150.0, 1e-6)
+        self.lut.get_thresholds(np.array([140.0, 152.0]), 1e-6, 0.55)
+        stats = self.lut._fallback._threshold_cache.stats()
+        assert (stats['entries'], stats['misses']) == (2, 2)
+
+    def test_missing_table_uses_fallback(self, tmp_path):
+        lut = CompoundPoissonLognormaltable(str(tmp_path / "missing.npz"))
+        lams = np.array([0.0, 3.0, 250.0])
+        got = lut.get_thresholds(lams, 1e-3, 0.55)
+        assert got[0] == 0.0
+        np.testing.assert_allclose(got[1:], [lut.get_threshold(3.0, 1e-3), lut.get_threshold(250.0, 1e-3)])
+
+
+# --------------------------------------------------------------------------- #
+# CountHistogram (iterative background of integer-count signals)
+# --------------------------------------------------------------------------- #
+def _count_signal(n=50_000, seed=0):
+    rng = np.random.default_rng(seed)
+    signal = rng.poisson(2.5, n).astype(np.float64)
+    spikes = rng.integers(0, n, n // 200)
+    signal[spikes] += rng.integers(15, 200, spikes.size)
+    return signal
+
+
+class TestCountHistogram:
+    def test_mean_below_equals_scan(self):
+        signal = _count_signal()
+        hist = CountHistogram.from_signal(signal)
+        for threshold in (0.5, 1.0, 3.0, 7.25, 150.0, np.inf):
+            assert hist.mean_below(threshold) == np.mean(signal[signal < threshold])
+        assert hist.mean_below(0.0) is None
+        assert hist.mean_below(np.nan) is None
+
+    def test_only_integer_signals_within_the_level_limit(self):
+        signal = _count_signal(5_000)
+        assert CountHistogram.from_signal(signal.astype(np.int16)) is not None
+        assert CountHistogram.from_signal(signal * 1.03) is None
+        with_nan = signal.copy()
+        with_nan[-1] = np.nan
+        assert CountHistogram.from_signal(with_nan) is None
+        assert CountHistogram.from_signal(signal, max_levels=10) is None
+        assert CountHistogram.from_signal(np.array([])) is None
+
+    @pytest.mark.parametrize("method", ["CPLN table", "Compound Poisson LogNormal"])
+    @pytest.mark.parametrize("dtype", [np.float64, np.int32])
+    def test_iterative_threshold_unchanged(self, monkeypatch, method, dtype):
+        signal = _count_signal(seed=1).astype(dtype)
+        detector = PeakDetection()
+        with_histogram = detector.calculate_iterative_threshold(signal, method, max_iters=6)
+        monkeypatch.setattr(peak_detection, 'COUNT_HISTOGRAM_MAX_LEVELS', 0)
+        scanned = detector.calculate_iterative_threshold(signal, method, max_iters=6)
+        for key in ('threshold', 'background', 'iterations', 'convergence'):
+            assert with_histogram[key] == scanned[key]
+
+
+# --------------------------------------------------------------------------- #
+# Window-mode background (_window_mean / _rolling_background)
+# --------------------------------------------------------------------------- #
+def _convolve_mean(signal, window_size):
+    """The window-mode starting background as computed before the numba pass."""
+    kernel = np.ones(window_size) / window_size
+    return np.convolve(np.pad(signal, window_size // 2, mode='reflect'),
+                       kernel, mode='valid')[:len(signal)]
+
+
+def _filtered_background(signal, threshold, window_size):
+    """_rolling_background as computed before the numba pass."""
+    from scipy.ndimage import uniform_filter1d
+    valid_mask = signal < threshold
+    mean_signal = uniform_filter1d((signal * valid_mask).astype(np.float64),
+                                   size=window_size, mode='reflect')
+    mean_mask = uniform_filter1d(valid_mask.astype(np.float64), size=window_size, mode='reflect')
+    return mean_signal / np.maximum(mean_mask, 1.0 / window_size)
+
+
+class TestWindowBackground:
+    @pytest.mark.parametrize("n", [1, 2, 7, 1000])
+    @pytest.mark.parametrize("window_size", [1, 2, 5, 64, 1500])
+    def test_matches_convolution_and_filters(self, n, window_size):
+        rng = np.random.default_rng(n * 10_000 + window_size)
+        signal = rng.poisson(3.0, n) + rng.random(n)
+        detector = PeakDetection()
+        np.testing.assert_allclose(detector._window_mean(signal, window_size),
+                                   _convolve_mean(signal, window_size), rtol=1e-12)
+        for threshold in (rng.uniform(2.0, 6.0, n), 4.0, -1.0):
+            np.testing.assert_allclose(
+                detector._rolling_background(signal, threshold, window_size),
+                _filtered_background(signal, threshold, window_size), rtol=1e-12, atol=1e-12)
+
+    def test_window_mode_threshold_unchanged(self, monkeypatch):
+        signal = _count_signal(200_000, seed=2)
+        detector = PeakDetection()
+        streaming = detector.calculate_iterative_threshold(
+            signal, "CPLN table", max_iters=4, use_window_size=True, window_size=5000)
+        monkeypatch.setattr(peak_detection, 'NUMBA_AVAILABLE', False)
+        previous = detector.calculate_iterative_threshold(
+            signal, "CPLN table", max_iters=4, use_window_size=True, window_size=5000)
+        np.testing.assert_allclose(streaming['threshold'], previous['threshold'], rtol=1e-10)
+        np.testing.assert_allclose(streaming['background'], previous['background'], rtol=1e-10)
+        assert streaming['iterations'] == previous['iterations']
 
 
 # --------------------------------------------------------------------------- #
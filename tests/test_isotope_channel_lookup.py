@@ -136,5 +136,5 @@ class TestSourceStaysInStep:
         root = pathlib.Path(__file__).resolve().parents[1]
         peaks = (root / "processing" / "peak_detection.py").read_text(
             encoding="utf-8")
-        assert "find_closest_isotope(\n                            isotope, local_data)" in peaks
-        assert "find_closest_isotope(\n                    isotope, local_data)" in peaks
+        assert "find_closest_isotope(\n                        isotope, local_data)" in peaks
+        assert "find_closest_isotope(\n                isotope, local_data)" in peaks
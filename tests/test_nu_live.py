@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""Tests for live reading of a Nu run folder (loading/nu_live.py) and the
+incremental detector it feeds (processing/live_detection.py).
+
+Run folders are written file by file with write_live_nu_run.LiveNuRunWriter,
+polling while files are still half written, and the result is compared with
+a read of the finished folder and with detection over the whole trace.
+"""
+import numpy as np
+import pytest
+
+from loading import vitesse_loading as vl
+from loading.nu_live import NuLiveWatchDialog, NuRunTail, _RecentValues
+from processing.live_detection import IncrementalParticleDetector
+from processing.peak_detection import PeakDetection
+from write_live_nu_run import LiveNuRunWriter, N_MASSES, SPIKE_CHANNELS
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Return a process-wide offscreen QApplication for the dialog tests."""
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def _grow(tail, writer, n_files, cycles=1):
+    """Write n_files per cycle, polling mid-file and after every file."""
+    for c in range(cycles):
+        if c:
+            writer.new_cycle()
+        for _ in range(n_files):
+            writer.write_file(on_half=tail.poll)
+            tail.poll()
+    # The last file is only accepted once it has been seen unchanged twice.
+    tail.poll()
+    tail.poll()
+
+
+# --------------------------------------------------------------------------- #
+# tailing
+# --------------------------------------------------------------------------- #
+class TestNuRunTail:
+    @pytest.mark.parametrize("autoblank", [False, True])
+    def test_matches_full_read(self, tmp_path, autoblank):
+        writer = LiveNuRunWriter(tmp_path / "run", seed=1)
+        writer.start()
+        tail = NuRunTail(writer.root, autoblank=autoblank)
+        _grow(tail, writer, 7)
+
+        masses, signals, _ = vl.read_nu_directory(writer.root, autoblank=autoblank)
+        assert tail.files_read == 7
+        np.testing.assert_array_equal(tail.masses, masses)
+        np.testing.assert_array_equal(tail.signals, signals)
+        if autoblank:
+            assert np.isnan(tail.signals).any()
+
+    def test_multiple_cycles(self, tmp_path):
+        writer = LiveNuRunWriter(tmp_path / "run", seed=2, acq_per_file=150)
+        writer.start()
+        tail = NuRunTail(writer.root, autoblank=False)
+        _grow(tail, writer, 3, cycles=3)
+
+        _, signals, _ = vl.read_nu_directory(writer.root, autoblank=False)
+        np.testing.assert_array_equal(tail.signals, signals)
+
+    def test_half_written_file_is_not_read(self, tmp_path):
+        writer = LiveNuRunWriter(tmp_path / "run", seed=3)
+        writer.start()
+        tail = NuRunTail(writer.root)
+        writer.write_file()
+        writer.write_file(on_half=lambda: (tail.poll(), tail.poll()))
+        assert tail.files_read == 1
+        assert tail.num_acquisitions == writer.acq_per_file
+        # Finished, but it has to be seen unchanged on two polls.
+        assert tail.poll() is None
+        assert tail.poll() == (writer.acq_per_file, 2 * writer.acq_per_file)
+
+    def test_mass_selection(self, tmp_path):
+        writer = LiveNuRunWriter(tmp_path / "run", seed=4)
+        writer.start()
+        idx = np.array([7, 2, 4])
+        tail = NuRunTail(writer.root, mass_indices=idx)
+        _grow(tail, writer, 4)
+
+        masses, signals, _ = vl.read_nu_directory(writer.root, mass_indices=idx)
+        np.testing.assert_array_equal(tail.masses, masses)
+        np.testing.assert_array_equal(tail.signals, signals)
+
+    def test_rows_under_an_open_blanker_window_are_not_settled(self, tmp_path):
+        writer = LiveNuRunWriter(tmp_path / "run", seed=1)
+        writer.start()
+        tail = NuRunTail(writer.root)
+        _grow(tail, writer, 2)
+        # The second file leaves its blanker window open.
+        assert tail.settled_rows == writer.acq_per_file + 40
+        settled = tail.signals[: tail.settled_rows].copy()
+        _grow(tail, writer, 1)
+        assert tail.settled_rows == tail.num_acquisitions
+        np.testing.assert_array_equal(tail.signals[: len(settled)], settled)
+        assert np.isnan(tail.signals[len(settled) : 2 * writer.acq_per_file, 3]).all()
+
+    def test_empty_folder(self, tmp_path):
+        tail = NuRunTail(tmp_path / "missing")
+        assert tail.poll() is None
+        assert tail.signals.shape == (0, 0)
+
+
+# --------------------------------------------------------------------------- #
+# incremental detection
+# --------------------------------------------------------------------------- #
+PARAMS = {
+    "method": "Compound Poisson LogNormal",
+    "alpha": 1e-6,
+    "sigma": 0.55,
+    "min_continuous": 1,
+    "integration_method": "Background",
+    "split_method": "1D Watershed",
+    "valley_ratio": 0.5,
+}
+
+
+def _spiky_signal(n=60000, seed=0):
+    rng = np.random.default_rng(seed)
+    signal = rng.poisson(0.5, n).astype(np.float32)
+    hits = np.flatnonzero(rng.random(n) < 0.005)
+    for h in hits:
+        signal[h : h + 3] += rng.lognormal(3.0, 0.5, min(3, n - h)).astype(np.float32)
+    return signal
+
+
+def _run_incremental(detector, signal, steps):
+    found = []
+    for end in steps:
+        found += detector.update("ch", signal[:end])
+    found += detector.update("ch", signal, final=True)
+    return found
+
+
+class TestIncrementalParticleDetector:
+    def test_fixed_threshold_matches_whole_trace(self):
+        signal = _spiky_signal()
+        pd = PeakDetection()
+        threshold_data = {"background": 0.5, "threshold": 8.0}
+        dwell = 1e-4
+        time = np.arange(signal.size) * dwell
+        expected = pd.find_particles(
+            time, signal.astype(np.float64), 0.5, 8.0,
+            integration_method="Background", split_method="1D Watershed",
+        )
+
+        detector = IncrementalParticleDetector(
+            PARAMS, dwell, overlap=500, threshold_data=threshold_data, peak_detector=pd)
+        steps = np.cumsum(np.random.default_rng(1).integers(300, 4000, 40))
+        found = _run_incremental(detector, signal, steps[steps < signal.size])
+
+        assert len(found) == len(expected) > 50
+        assert [(p["left_idx"], p["right_idx"]) for p in found] == \
+            [(p["left_idx"], p["right_idx"]) for p in expected]
+        np.testing.assert_allclose([p["total_counts"] for p in found],
+                                   [p["total_counts"] for p in expected])
+        np.testing.assert_allclose([p["peak_time"] for p in found],
+                                   [p["peak_time"] for p in expected])
+        assert detector.particle_count("ch") == len(expected)
+
+    def test_adaptive_threshold_reports_each_particle_once(self):
+        signal = _spiky_signal(seed=5)
+        pd = PeakDetection()
+        whole = pd.calculate_iterative_threshold(signal, PARAMS["method"], alpha=1e-6)
+        expected = pd.find_particles(
+            np.arange(signal.size) * 1e-4, signal, whole["background"], whole["threshold"])
+
+        detector = IncrementalParticleDetector(PARAMS, 1e-4, overlap=5000, peak_detector=pd)
+        found = _run_incremental(detector, signal, range(2000, signal.size, 2000))
+
+        lefts = np.array([p["left_idx"] for p in found])
+        rights = np.array([p["right_idx"] for p in found])
+        assert np.all(np.diff(lefts) > 0)
+        assert np.all(lefts[1:] > rights[:-1])
+        assert abs(len(found) - len(expected)) <= 0.05 * len(expected)
+
+    def test_nothing_new(self):
+        detector = IncrementalParticleDetector(PARAMS, 1e-4)
+        signal = _spiky_signal(n=5000)
+        detector.update("ch", signal)
+        assert detector.update("ch", signal[: detector.committed("ch")]) == []
+
+    def test_live_run_end_to_end(self, tmp_path):
+        writer = LiveNuRunWriter(tmp_path / "run", seed=6)
+        writer.start()
+        tail = NuRunTail(writer.root)
+        detector = IncrementalParticleDetector(PARAMS, 1e-4, overlap=1000)
+        ch = SPIKE_CHANNELS[0]
+        counts = []
+        for _ in range(6):
+            writer.write_file()
+            tail.poll()
+            tail.poll()
+            if tail.num_acquisitions:
+                detector.update("spike", tail.signals[:, ch])
+                counts.append(detector.particle_count("spike"))
+        detector.update("spike", tail.signals[:, ch], final=True)
+        assert tail.signals.shape[1] == N_MASSES
+        assert counts == sorted(counts) and counts[-1] > 0
+
+    def test_committed_rows_are_not_blanked_later(self, tmp_path):
+        writer = LiveNuRunWriter(tmp_path / "run", seed=7)
+        writer.start()
+        tail = NuRunTail(writer.root)
+        detector = IncrementalParticleDetector(PARAMS, 1e-4, overlap=100)
+        seen = []
+        for _ in range(6):
+            writer.write_file()
+            tail.poll()
+            tail.poll()
+            signal = tail.signals[: tail.settled_rows, 3]
+            detector.update("blanked", signal)
+            seen.append(signal[: detector.committed("blanked")].copy())
+        for committed in seen:
+            np.testing.assert_array_equal(tail.signals[: len(committed), 3], committed)
+
+
+class TestRecentValues:
+    def test_keeps_the_last_values(self):
+        recent = _RecentValues(capacity=5)
+        recent.extend([1, 2, 3])
+        assert sorted(recent.values()) == [1, 2, 3]
+        recent.extend([4, 5, 6, 7])
+        assert len(recent) == 5 and sorted(recent.values()) == [3, 4, 5, 6, 7]
+        recent.extend(np.arange(10, 22))
+        assert sorted(recent.values()) == [17, 18, 19, 20, 21]
+        recent.extend([])
+        assert len(recent) == 5
+
+
+# --------------------------------------------------------------------------- #
+# dialog
+# --------------------------------------------------------------------------- #
+class TestNuLiveWatchDialog:
+    def _watching_dialog(self, tmp_path, params=None):
+        dialog = NuLiveWatchDialog(detection_params=params)
+        dialog._folder_edit.setText(str(tmp_path))
+        dialog._masses_edit.setText("107")
+        dialog._interval.setValue(60.0)
+        dialog._start()
+        assert dialog.is_watching()
+        return dialog
+
+    def test_reject_stops_the_watch(self, qapp, tmp_path):
+        dialog = self._watching_dialog(tmp_path)
+        thread = dialog._thread
+        dialog.reject()
+        assert not thread.isRunning()
+
+    def test_close_stops_the_watch(self, qapp, tmp_path):
+        dialog = self._watching_dialog(tmp_path)
+        thread = dialog._thread
+        dialog.close()
+        assert not thread.isRunning()
+
+    def test_uses_the_given_detection_params(self, qapp, tmp_path):
+        params = {'method': 'Manual', 'min_continuous': 3, 'alpha': 1e-3,
+                  'sigma': 0.4, 'use_window_size': True, 'window_size': 2000}
+        dialog = self._watching_dialog(tmp_path, params)
+        thread_params = dialog._thread.params
+        dialog.stop_watch()
+        assert thread_params['method'] == 'Manual' and thread_params['min_continuous'] == 3
+        assert thread_params['alpha'] == 1e-3 and thread_params['sigma'] == 0.4
+        assert thread_params['use_window_size'] and thread_params['window_size'] == 2000
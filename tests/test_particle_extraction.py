@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Tests for the fused particle extraction in processing/peak_detection.py.
+
+`extract_particle_arrays` does region finding, 1D watershed splitting and the
+per-particle metrics in one compiled pass, and `find_particles` builds its
+dicts from it. Every reported particle count, height and width comes out of
+this stage, so it is checked particle for particle against the previous
+region-by-region path (`reference_find_particles` in
+bench_particle_extraction.py) on synthetic counting and ToF traces.
+"""
+import numpy as np
+import pytest
+
+from bench_particle_extraction import make_trace, reference_find_particles
+from processing.peak_detection import PARTICLE_ARRAY_FIELDS, PeakDetection
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return PeakDetection()
+
+
+def _assert_same_particles(got, ref, rel=1e-12, fwhm_abs=1e-15):
+    assert len(got) == len(ref)
+    for a, b in zip(got, ref):
+        assert a.keys() == b.keys()
+        assert a['integration_method'] == b['integration_method']
+        assert a['peak_valid'] == b['peak_valid']
+        for name in PARTICLE_ARRAY_FIELDS:
+            abs_tol = fwhm_abs if name == 'fwhm_s' else 1e-15
+            assert a[name] == pytest.approx(b[name], rel=rel, abs=abs_tol), name
+
+
+def _levels(signal):
+    lam = float(np.median(signal))
+    return lam, lam + 3.0 * np.sqrt(max(lam, 1.0)) + 1.0
+
+
+class TestMatchesRegionwise:
+    @pytest.mark.parametrize("tof", [False, True])
+    @pytest.mark.parametrize("integration_method", ["Background", "Threshold", "Midpoint"])
+    @pytest.mark.parametrize("split_method", ["1D Watershed", "No Splitting"])
+    @pytest.mark.parametrize("min_points", [1, 3])
+    def test_constant_levels(self, detector, tof, integration_method, split_method, min_points):
+        time_s, signal = make_trace(50_000, tof=tof, seed=3)
+        lam, threshold = _levels(signal)
+        got = detector.find_particles(time_s, signal, lam, threshold, 3, min_points,
+                                      integration_method, split_method)
+        ref = reference_find_particles(detector, time_s, signal, lam, threshold,
+                                       min_points, integration_method, split_method)
+        assert len(got) > 100
+        _assert_same_particles(got, ref)
+
+    @pytest.mark.parametrize("integration_method", ["Background", "Midpoint"])
+    def test_window_levels(self, detector, integration_method):
+        time_s, signal = make_trace(50_000, lam=5.0, tof=True, seed=4)
+        rng = np.random.default_rng(0)
+        lam, threshold = _levels(signal)
+        bkgd = lam + 0.5 * np.sin(np.arange(signal.size) / 2000.0)
+        thresh = threshold + bkgd - lam + rng.random(signal.size)
+        got = detector.find_particles(time_s, signal, bkgd, thresh, 3, 2, integration_method)
+        ref = reference_find_particles(detector, time_s, signal, bkgd, thresh, 2,
+                                       integration_method)
+        _assert_same_particles(got, ref)
+
+    @pytest.mark.parametrize("ratio", [0.2, 0.8])
+    def test_valley_ratio(self, detector, ratio):
+        time_s, signal = make_trace(50_000, rate=0.05, seed=5)
+        lam, threshold = _levels(signal)
+        got = detector.find_particles(time_s, signal, lam, threshold, min_valley_ratio=ratio)
+        ref = reference_find_particles(detector, time_s, signal, lam, threshold,
+                                       min_valley_ratio=ratio)
+        _assert_same_particles(got, ref)
+
+    def test_nested_multiplets_split_like_recursion(self, detector):
+        # A comb of narrowing peaks inside one region exercises repeated splits.
+        signal = np.zeros(2_000)
+        for k, c in enumerate(range(100, 1_900, 12)):
+            signal[c - 4:c + 5] += (20 + 10 * (k % 5)) * np.hanning(9)
+        signal += 1.0
+        time_s = np.arange(signal.size) * 1e-4
+        got = detector.find_particles(time_s, signal, 0.5, 5.0)
+        ref = reference_find_particles(detector, time_s, signal, 0.5, 5.0)
+        assert len(got) > 100
+        _assert_same_particles(got, ref)
+
+
+class TestParticleArrays:
+    def test_layout(self, detector):
+        time_s, signal = make_trace(20_000, seed=6)
+        lam, threshold = _levels(signal)
+        arrays = detector.extract_particle_arrays(time_s, signal, lam, threshold)
+        assert tuple(arrays) == PARTICLE_ARRAY_FIELDS
+        n = len(arrays['peak_time'])
+        for name, values in arrays.items():
+            assert values.shape == (n,)
+            assert values.flags.c_contiguous
+            expected = np.int64 if name in ('left_idx', 'right_idx') else np.float64
+            assert values.dtype == expected
+        assert np.all(np.diff(arrays['left_idx']) > 0)
+        assert np.all(arrays['right_idx'][:-1] < arrays['left_idx'][1:])
+
+    def test_float32_signal(self, detector):
+        time_s, signal = make_trace(20_000, seed=7)
+        signal = np.round(signal).astype(np.float32)
+        lam, threshold = _levels(signal)
+        got = detector.find_particles(time_s, signal, lam, threshold)
+        ref = reference_find_particles(detector, time_s, signal, lam, threshold)
+        # the reference interpolates half-maximum crossing times in float32
+        _assert_same_particles(got, ref, rel=1e-6, fwhm_abs=1e-6)
+
+    def test_no_particles(self, detector):
+        time_s = np.arange(1_000) * 1e-4
+        arrays = detector.extract_particle_arrays(time_s, np.zeros(1_000), 1.0, 5.0)
+        assert all(len(v) == 0 for v in arrays.values())
+        assert detector.find_particles(time_s, np.zeros(1_000), 1.0, 5.0) == []
+
+    def test_doublet_is_split(self, detector):
+        signal = np.zeros(1_000)
+        signal[500:511] = [2, 10, 30, 10, 3, 2, 3, 12, 40, 12, 2]
+        time_s = np.arange(signal.size) * 1e-4
+        arrays = detector.extract_particle_arrays(time_s, signal, 0.5, 5.0)
+        np.testing.assert_array_equal(arrays['left_idx'], [500, 506])
+        np.testing.assert_array_equal(arrays['right_idx'], [505, 510])
+        np.testing.assert_array_equal(arrays['max_height'], [30.0, 40.0])
+        whole = detector.extract_particle_arrays(time_s, signal, 0.5, 5.0,
+                                                 split_method="No Splitting")
+        np.testing.assert_array_equal(whole['left_idx'], [500])
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+"""Tests for the columnar particle store in processing/particle_table.py.
+
+Detection results and multi-element particles are held as ParticleTables,
+while plots, filters, the canvas and the exports still read them as lists of
+dicts. These tests pin down that the dict view of a table is the same as the
+dicts it replaced, that writes through that view land in the columns, that
+a pass over the rows does not keep them, and that the saved columnar form
+and the mass calculation give the same results as the list-of-dicts code.
+"""
+import copy
+import gc
+import pickle
+import tracemalloc
+import types
+
+import numpy as np
+import pytest
+
+from bench_particle_extraction import make_trace
+from bench_particle_table import make_particles
+from processing.particle_table import (ITER_BLOCK_ROWS, ParticleTable, calculate_mass_data,
+                                       field_list, field_values, keyed_values,
+                                       particle_clusters)
+from processing.peak_detection import PeakDetection
+from save_export.fast_project_io import _columnar_to_particles, _particles_to_columnar
+
+
+def _assert_close(a, b, path=""):
+    if isinstance(a, dict):
+        assert isinstance(b, dict) and set(a) == set(b), path
+        for key in a:
+            _assert_close(a[key], b[key], f"{path}/{key}")
+    elif isinstance(a, str) or a is None:
+        assert a == b, path
+    else:
+        assert a == pytest.approx(b, rel=1e-12, abs=0), path
+
+
+class TestDictView:
+    def test_round_trip(self):
+        particles = make_particles(500, seed=1)
+        table = ParticleTable.from_particles(particles)
+        assert len(table) == 500
+        assert table.to_particles() == particles
+        assert [dict(p) for p in table] == particles
+        assert table[-1] == particles[-1]
+
+    def test_keyed_fields_are_matrices(self):
+        table = ParticleTable.from_particles(make_particles(50, seed=2))
+        assert table.is_keyed('elements')
+        labels, counts = table.keyed('elements')
+        assert counts.shape == (50, len(labels))
+        assert table.element_counts().shape == counts.shape
+        assert not np.isnan(table.element_counts()).any()
+
+    def test_writes_reach_the_columns(self):
+        table = ParticleTable.from_particles(make_particles(20, seed=3))
+        row = table[4]
+        row['note'] = 'checked'
+        row['elements']['197Au'] = 12.0
+        row['max_height'] = 99.5
+        again = table[4]
+        assert again['note'] == 'checked'
+        assert again['elements']['197Au'] == 12.0
+        assert again['max_height'] == 99.5
+        assert 'note' not in table[5]
+        del again['note']
+        assert 'note' not in table[4]
+
+    def test_nested_non_numeric_value_demotes_field(self):
+        table = ParticleTable.from_particles(make_particles(10, seed=4))
+        row = table[2]
+        row['densities_used'] = {}
+        row['densities_used']['197Au'] = {'element_density': 19.3, 'compound_density': 19.3}
+        assert table[2]['densities_used'] == {
+            '197Au': {'element_density': 19.3, 'compound_density': 19.3}}
+        assert not table.is_keyed('densities_used')
+
+    def test_take_slice_and_copy_are_independent(self):
+        particles = make_particles(30, seed=5)
+        table = ParticleTable.from_particles(particles)
+        part = table[10:20]
+        assert isinstance(part, ParticleTable)
+        assert part.to_particles() == particles[10:20]
+        mask = np.zeros(30, dtype=bool)
+        mask[[1, 7]] = True
+        assert table.take(mask).to_particles() == [particles[1], particles[7]]
+        part[0]['start_time'] = -1.0
+        assert table[10]['start_time'] == particles[10]['start_time']
+
+    def test_pickles_rows_as_plain_dicts(self):
+        table = ParticleTable.from_particles(make_particles(15, seed=6))
+        restored = pickle.loads(pickle.dumps(table))
+        assert restored.to_particles() == table.to_particles()
+        row = pickle.loads(pickle.dumps(table[3]))
+        assert type(row) is dict and row == table[3]
+
+    def test_rows_follow_column_changes(self):
+        table = ParticleTable.from_particles(make_particles(50, seed=7))
+        rows = list(table)
+        assert table[7] is rows[7]
+        table.set_column('max_height', np.arange(50.0))
+        assert table[7] is not rows[7] and table[7]['max_height'] == 7.0
+        table.ensure_keyed('mass_fg', ['197Au'])[1][3, 0] = 2.5
+        assert table[3]['mass_fg'] == {'197Au': 2.5}
+        restored = pickle.loads(pickle.dumps(table))
+        assert restored._row_block is None and restored.to_particles() == table.to_particles()
+
+    def test_columns_are_read_only(self):
+        table = ParticleTable.from_particles([{'total_counts': 1.0}, {'total_counts': 3.0}])
+        assert table[0]['total_counts'] == 1.0
+        with pytest.raises(ValueError):
+            table.column('total_counts')[0] = 99.0
+        with pytest.raises(ValueError):
+            ParticleTable.from_particles(make_particles(5, seed=7)).keyed('elements')[1][0] = 1.0
+        assert table[0]['total_counts'] == 1.0
+
+    def test_a_row_pass_keeps_at_most_one_block(self):
+        n = 10 * ITER_BLOCK_ROWS
+        table = ParticleTable.from_particles(make_particles(n, seed=9))
+
+        def retained(build):
+            gc.collect()
+            tracemalloc.start()
+            try:
+                kept = build()
+                gc.collect()
+                size = tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+            del kept
+            table._row_block = None
+            return size
+
+        def full_pass():
+            for p in table:
+                p.get('total_counts')
+
+        all_rows = retained(lambda: list(table))
+        after_pass = retained(full_pass)
+        assert after_pass < 0.2 * all_rows
+        assert table._row_block is None or len(table._row_block[1]) <= ITER_BLOCK_ROWS
+
+    def test_field_helpers_match_the_rows(self):
+        particles = make_particles(40, seed=8)
+        for p in particles[::3]:
+            p['SNR'] = 2.5
+        table = ParticleTable.from_particles(particles)
+        with_gaps = particles[:10] + [None] + particles[10:]
+        for source in (table, with_gaps):
+            np.testing.assert_array_equal(
+                field_values(source, 'SNR', -1.0),
+                [p.get('SNR', -1.0) for p in particles])
+            np.testing.assert_array_equal(
+                keyed_values(source, 'elements', '107Ag'),
+                [p['elements'].get('107Ag', 0.0) for p in particles])
+            assert field_list(source, 'SNR', -1.0) == [p.get('SNR', -1.0) for p in particles]
+        assert (field_values(table, 'missing', 3.0) == 3.0).all()
+        assert field_list(table, 'missing', 'x') == ['x'] * 40
+        assert (keyed_values(table, 'elements', 'none') == 0.0).all()
+
+    def test_empty(self):
+        table = ParticleTable.from_particles([])
+        assert len(table) == 0 and not table
+        assert table.clusters() == []
+        assert list(table) == []
+
+
+class TestColumnarForm:
+    def test_matches_list_conversion(self):
+        particles = make_particles(300, seed=7, with_mass=True)
+        particles[5]['custom'] = {'tag': 'x'}
+        particles[9]['_source_sample'] = 'dropped'
+        expected = _particles_to_columnar(copy.deepcopy(particles))
+        got = ParticleTable.from_particles(particles).to_columnar()
+        assert got.keys() == expected.keys()
+        assert got['n'] == expected['n']
+        assert got['element_labels'] == expected['element_labels']
+        for part in ('scalars', 'element_arrays', 'totals'):
+            assert got[part].keys() == expected[part].keys(), part
+            for key in expected[part]:
+                np.testing.assert_array_equal(got[part][key], expected[part][key])
+        assert got['extras'] == expected['extras']
+
+    def test_dispatch_in_project_io(self):
+        table = ParticleTable.from_particles(make_particles(40, seed=8, with_mass=True))
+        col = _particles_to_columnar(table)
+        assert ParticleTable.from_columnar(col).to_particles() == _columnar_to_particles(col)
+
+    def test_saved_nested_fields_load_back(self):
+        particles = make_particles(25, seed=9, with_mass=True)
+        col = _particles_to_columnar(particles)
+        table = ParticleTable.from_columnar(col)
+        assert table.to_particles() == _columnar_to_particles(col)
+        assert table[0]['densities_used'] == particles[0]['densities_used']
+
+
+@pytest.fixture(scope="module")
+def trace():
+    time_s, signal = make_trace(60_000, seed=11)
+    lam = float(np.median(signal))
+    return time_s, signal, lam, lam + 3.0 * np.sqrt(max(lam, 1.0)) + 1.0
+
+
+class TestDetectionTables:
+    @pytest.mark.parametrize("integration_method", ["Background", "Threshold", "Midpoint"])
+    def test_rows_equal_find_particles(self, trace, integration_method):
+        detector = PeakDetection()
+        time_s, signal, lam, threshold = trace
+        table = detector.find_particles_table(time_s, signal, lam, threshold,
+                                              integration_method=integration_method)
+        ref = detector.find_particles(time_s, signal, lam, threshold, 3, 1, integration_method)
+        assert len(table) == len(ref) > 50
+        assert table.to_particles() == ref
+        assert particle_clusters(table) == particle_clusters(ref)
+
+    def test_multi_element_particles_match_dict_input(self, trace):
+        detector = PeakDetection()
+        time_s, signal, lam, threshold = trace
+        _, second = make_trace(60_000, seed=12)
+        keys = {('Au', 197.0): signal, ('Ag', 107.0): second}
+        tables, dicts = {}, {}
+        for key, sig in keys.items():
+            tables[key] = detector.find_particles_table(time_s, sig, lam, threshold)
+            dicts[key] = detector.find_particles(time_s, sig, lam, threshold)
+
+        class Cell:
+            def __init__(self, text):
+                self._text = text
+
+            def text(self):
+                return self._text
+
+            def isChecked(self):
+                return True
+
+        labels = [f"{el}-{iso:.4f}" for el, iso in keys]
+        params = types.SimpleNamespace(rowCount=lambda: len(labels),
+                                       cellWidget=lambda r, c: Cell(''),
+                                       item=lambda r, c: Cell(labels[r]))
+        selected = {'Au': [197.0], 'Ag': [107.0]}
+
+        def run(peaks):
+            all_particles = [{'element': el, 'isotope': iso, 'signal': keys[(el, iso)],
+                              'clusters': particle_clusters(peaks[(el, iso)])}
+                             for el, iso in keys]
+            return detector.process_multi_element_particles(
+                all_particles, time_s, {'s': peaks}, selected, lambda k: k, 's',
+                {'s': {}}, params)
+
+        from_tables, from_dicts = run(tables), run(dicts)
+        assert isinstance(from_tables, ParticleTable)
+        assert len(from_tables) > 50
+        assert from_tables.to_particles() == from_dicts.to_particles()
+
+
+@pytest.fixture(scope="module")
+def window():
+    from mainwindow import MainWindow
+
+    class Service:
+        def get_mass_fraction(self, key, sample):
+            return {'Au-197': 1.0, 'Ag-107': 0.8, 'Fe-56': 0.7}[key]
+
+        def get_element_density(self, key, sample):
+            return {'Au-197': 19.3, 'Ag-107': 0.0, 'Fe-56': 5.2}[key]
+
+        def get_molecular_weight(self, key, sample):
+            return {'Au-197': 197.0, 'Ag-107': 0, 'Fe-56': 159.7}[key]
+
+    class Table:
+        def get_mass_by_element(self, element):
+            return {'Au': 196.97, 'Ag': 107.87, 'Fe': 55.85}[element]
+
+        def get_density_by_element(self, element):
+            return {'Au': 19.3, 'Ag': 10.5, 'Fe': 0}[element]
+
+    stub = types.SimpleNamespace(mass_fraction_service=Service(),
+                                 periodic_table_info=Table(), current_sample='s')
+    stub.mass_to_diameter = types.MethodType(MainWindow.mass_to_diameter, stub)
+    stub.calculate = types.MethodType(MainWindow._calculate_mass_data_optimized, stub)
+    return stub
+
+
+class TestMassCalculation:
+    CACHE = {'197Au': {'conversion_factor': 2.5, 'element_key': 'Au-197'},
+             '107Ag': {'conversion_factor': 1.5, 'element_key': 'Ag-107'},
+             '56Fe': {'conversion_factor': 0, 'element_key': 'Fe-56'}}
+
+    def test_table_path_matches_dict_path(self, window):
+        particles = make_particles(2000, seed=13)
+        table = ParticleTable.from_particles(particles)
+        for _ in range(2):
+            window.calculate(particles, self.CACHE)
+            window.calculate(table, self.CACHE)
+            got = table.to_particles()
+            for a, b in zip(particles, got):
+                assert list(a) == list(b)
+                _assert_close(a, b)
+
+    def test_edited_table_falls_back_to_rows(self, window):
+        particles = make_particles(200, seed=14)
+        table = ParticleTable.from_particles(particles)
+        table[0]['mass_fg'] = {'197Au': 'n/a'}
+        particles[0]['mass_fg'] = {'197Au': 'n/a'}
+        assert not calculate_mass_data(table, self.CACHE, 's', window.mass_fraction_service,
+                                       window.periodic_table_info)
+        window.calculate(particles, self.CACHE)
+        window.calculate(table, self.CACHE)
+        for a, b in zip(particles, table.to_particles()):
+            _assert_close(a, b)
@@ -156,3 +156,25 @@ class TestCompoundPoissonLognormalQuantile:
         fast = pd.compound_poisson_lognormal_quantile_approximation_fast(0.99, lam, mu, sigma)
         # Different grid resolutions (10000 vs 2000 points) -> close, not equal.
         assert fast == pytest.approx(slow, rel=0.05)
+
+    @pytest.mark.parametrize("sigma", [0.3, 0.55, 0.9])
+    @pytest.mark.parametrize("q", [0.99, 1.0 - 1e-6])
+    def test_batch_matches_fast_path(self, q, sigma):
+        lams = np.concatenate([np.geomspace(0.05, 5.0, 10), np.linspace(8.0, 250.0, 8)])
+        mu = -0.5 * sigma ** 2
+        scalar = np.array([pd.compound_poisson_lognormal_quantile_approximation_fast(q, lam, mu, sigma)
+                           for lam in lams])
+        batch = pd.compound_poisson_lognormal_quantile_batch(q, lams, sigma)
+        # Documented bound: at most one grid step apart, in practice equal.
+        np.testing.assert_allclose(batch, scalar, rtol=1e-3)
+        assert np.mean(batch == scalar) >= 0.9
+
+    def test_batch_zero_cases_and_shape(self):
+        lams = np.array([[0.0, -1.0], [1e-4, 3.0]])
+        out = pd.compound_poisson_lognormal_quantile_batch(0.99, lams, 0.55)
+        assert out.shape == lams.shape
+        # lambda <= 0, and a 0.99 quantile inside the zero atom (exp(-1e-4) > 0.99).
+        assert out[0, 0] == out[0, 1] == out[1, 0] == 0.0
+        assert out[1, 1] == pd.compound_poisson_lognormal_quantile_approximation_fast(
+            0.99, 3.0, -0.5 * 0.55 ** 2, 0.55)
+
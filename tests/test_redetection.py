@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""Tests for background incremental re-detection (processing/redetection.py).
+
+Parameter edits are re-detected on a worker thread: requests are coalesced,
+a new request supersedes the running job, only (sample, isotope) pairs whose
+parameter hash changed are detected, samples run in the detection pool, and
+results and hashes are published together on the GUI thread.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import types
+
+import pytest
+
+from bench_detection_pool import make_sample
+from processing import redetection
+from processing.detection_pool import DetectionPool
+from processing.peak_detection import PeakDetection
+from processing.redetection import RedetectionScheduler
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Return a process-wide offscreen QApplication for the Qt-backed tests."""
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    return app
+
+
+class _Cell:
+    def __init__(self, text):
+        self._text = text
+
+    def text(self):
+        return self._text
+
+    def isChecked(self):
+        return True
+
+
+class _Window:
+    """The parts of the main window incremental detection reads and writes."""
+
+    def __init__(self, n_samples=2):
+        self.data_by_sample, self.time_array_by_sample = {}, {}
+        self.sample_parameters, self.selected_isotopes = {}, {}
+        self.element_parameter_hashes, self.detection_states = {}, {}
+        self.sample_detected_peaks, self.element_thresholds = {}, {}
+        self.sample_results_data, self.sample_particle_data = {}, {}
+        self.needs_initial_detection = set()
+        self.current_sample = None
+        labels = []
+        for i in range(n_samples):
+            time_s, signals, params, mapping, valid = make_sample(2, 20_000, seed=30 + i)
+            name = f"S{i}"
+            self.data_by_sample[name] = {mapping[k]: s for k, s in signals.items()}
+            self.time_array_by_sample[name] = time_s
+            self.sample_parameters[name] = params
+            self.needs_initial_detection.add(name)
+            for element, isotope, element_key, _ in valid:
+                self.selected_isotopes.setdefault(element, [isotope])
+                if element_key not in labels:
+                    labels.append(element_key)
+        self.parameters_table = types.SimpleNamespace(
+            rowCount=lambda: len(labels), cellWidget=lambda r, c: _Cell(''),
+            item=lambda r, c: _Cell(labels[r]), currentRow=lambda: -1)
+
+    def load_or_initialize_parameters(self, sample_name):
+        pass
+
+    def get_parameter_hash(self, sample_name, element_key):
+        return str(sorted(self.sample_parameters[sample_name].get(element_key, {}).items()))
+
+    def find_closest_isotope(self, isotope, data):
+        return isotope if isotope in data else None
+
+    def get_formatted_label(self, element_key):
+        return element_key
+
+
+def _wait(qapp, condition, timeout=120.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for re-detection"
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+def _block_detection(detector, release):
+    """Make detector's sample detection wait for ``release`` first.
+
+    The detection runs on threads, where the patched method is the one called.
+    """
+    detector.detection_backend = 'threads'
+    detect = detector.detect_sample_signals
+
+    def blocking_detect(*args, **kwargs):
+        release.wait(60)
+        return detect(*args, **kwargs)
+
+    detector.detect_sample_signals = blocking_detect
+
+
+def _scheduler(detector, window, delay_ms=20):
+    calls = {'collect': 0, 'published': []}
+
+    def collect():
+        calls['collect'] += 1
+        return detector.incremental_jobs(window)
+
+    def publish(jobs, results):
+        calls['published'].append([job['sample_name'] for job in jobs])
+        detector.publish_incremental(window, jobs, results)
+
+    return RedetectionScheduler(detector, collect, publish, delay_ms=delay_ms), calls
+
+
+class TestPendingChanges:
+    def test_only_changed_pairs_until_marked(self):
+        window = _Window(1)
+        detector = PeakDetection()
+        changed, hashes, initial = detector.pending_changes(window, 'S0')
+        assert initial and {c[3] for c in changed} == {'new_file'} and len(changed) == 2
+        assert 'S0' in window.needs_initial_detection
+        detector.mark_detected(window, 'S0', hashes, initial)
+        assert detector.pending_changes(window, 'S0')[0] == []
+
+        window.sample_parameters['S0']['E1-50.0000']['alpha'] = 1e-4
+        changed, hashes, _ = detector.pending_changes(window, 'S0')
+        assert [c[2] for c in changed] == ['E1-50.0000'] and set(hashes) == {'E1-50.0000'}
+        window.detection_states['S0'] = {'E0-40.0000': 'changed'}
+        assert len(detector.pending_changes(window, 'S0')[0]) == 2
+
+    def test_background_result_matches_incremental_processing(self, qapp):
+        window, reference = _Window(2), _Window(2)
+        detector = PeakDetection()
+        for name in reference.data_by_sample:
+            changed, _ = detector.get_changed_elements(reference, name)
+            detector.merge_detection_results(
+                reference, name, detector.process_sample_incremental(reference, name, changed),
+                changed)
+        scheduler, calls = _scheduler(detector, window)
+        scheduler.request()
+        _wait(qapp, lambda: calls['published'])
+        assert window.sample_detected_peaks.keys() == reference.sample_detected_peaks.keys()
+        for name, peaks in reference.sample_detected_peaks.items():
+            assert peaks.keys() == window.sample_detected_peaks[name].keys()
+            for key, table in peaks.items():
+                assert window.sample_detected_peaks[name][key].to_particles() == table.to_particles()
+            assert window.sample_results_data[name] == reference.sample_results_data[name]
+        assert window.element_parameter_hashes == reference.element_parameter_hashes
+        assert not window.needs_initial_detection
+
+
+class TestScheduler:
+    def test_requests_are_coalesced(self, qapp):
+        window = _Window(2)
+        scheduler, calls = _scheduler(PeakDetection(), window)
+        for _ in range(5):
+            scheduler.request()
+        _wait(qapp, lambda: calls['published'] and not scheduler.is_busy())
+        assert calls['collect'] == 1
+        assert calls['published'] == [['S0', 'S1']]
+
+        window.sample_parameters['S1']['E0-40.0000']['alpha'] = 1e-3
+        scheduler.request()
+        _wait(qapp, lambda: len(calls['published']) == 2 and not scheduler.is_busy())
+        assert calls['published'][1] == ['S1']
+        assert window.sample_detected_peaks['S1'].keys() == {('E0', 40.0), ('E1', 50.0)}
+
+        scheduler.request()
+        _wait(qapp, lambda: calls['collect'] == 3 and not scheduler.is_busy())
+        assert len(calls['published']) == 2
+
+    def test_superseded_job_is_not_published(self, qapp):
+        window = _Window(2)
+        release = threading.Event()
+        detector = PeakDetection()
+        _block_detection(detector, release)
+        scheduler, calls = _scheduler(detector, window)
+        started = []
+        scheduler.started.connect(started.append)
+        scheduler.request(0)
+        _wait(qapp, lambda: started)
+
+        window.sample_parameters['S0']['E0-40.0000']['alpha'] = 1e-3
+        scheduler.request(0)
+        release.set()
+        _wait(qapp, lambda: calls['published'] and not scheduler.is_busy())
+        assert len(started) == 2 and calls['collect'] == 2
+        assert len(calls['published']) == 1
+        assert window.element_parameter_hashes['S0']['E0-40.0000'] == \
+            window.get_parameter_hash('S0', 'E0-40.0000')
+
+    def test_cancel_drops_running_job(self, qapp):
+        window = _Window(1)
+        release = threading.Event()
+        detector = PeakDetection()
+        _block_detection(detector, release)
+        scheduler, calls = _scheduler(detector, window)
+        scheduler.request(0)
+        _wait(qapp, lambda: scheduler._worker is not None)
+        scheduler.cancel()
+        release.set()
+        _wait(qapp, lambda: not scheduler.is_busy())
+        assert calls['published'] == []
+        assert 'S0' in window.needs_initial_detection
+        assert window.sample_detected_peaks == {}
+
+    def test_samples_run_in_the_detection_pool(self, qapp, monkeypatch):
+        window = _Window(2)
+        submitted = []
+
+        class _CountingPool(DetectionPool):
+            def submit(self, sample_name, *args, **kwargs):
+                submitted.append(sample_name)
+                return super().submit(sample_name, *args, **kwargs)
+
+        pool = _CountingPool(2)
+        monkeypatch.setattr(redetection, "get_detection_pool", lambda: pool)
+        detector = PeakDetection()
+        detector.detection_backend = 'processes'
+        scheduler, calls = _scheduler(detector, window)
+        try:
+            scheduler.request(0)
+            _wait(qapp, lambda: calls['published'] and not scheduler.is_busy())
+        finally:
+            pool.shutdown()
+        assert sorted(submitted) == ['S0', 'S1']
+        assert calls['published'] == [['S0', 'S1']]
+        assert window.sample_detected_peaks['S1'].keys() == {('E0', 40.0), ('E1', 50.0)}
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""Tests for the decoded-run cache in loading/run_cache.py.
+
+A stale cache entry would silently hand back the signal of a run as it was
+before it was re-exported, so the key must follow the source files and the
+read settings. Eviction and clearing are checked on a temporary cache folder.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from loading import run_cache, vitesse_loading
+from loading.run_cache import RunCache, run_cache_key
+
+from test_vitesse_loading import write_nu_run
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RunCache(tmp_path / "cache", max_bytes=10 * 1024 * 1024)
+
+
+# --------------------------------------------------------------------------- #
+# keys
+# --------------------------------------------------------------------------- #
+class TestRunCacheKey:
+    def test_changes_with_settings(self, tmp_path):
+        f = tmp_path / "a.bin"
+        f.write_bytes(b"abc")
+        assert run_cache_key("nu", [f], {"autoblank": True}) != \
+            run_cache_key("nu", [f], {"autoblank": False})
+
+    def test_changes_when_source_is_rewritten(self, tmp_path):
+        f = tmp_path / "a.bin"
+        f.write_bytes(b"abc")
+        before = run_cache_key("nu", [f], {})
+        f.write_bytes(b"abcd")
+        assert run_cache_key("nu", [f], {}) != before
+
+    def test_changes_with_mtime_only(self, tmp_path):
+        f = tmp_path / "a.bin"
+        f.write_bytes(b"abc")
+        before = run_cache_key("nu", [f], {})
+        st = f.stat()
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert run_cache_key("nu", [f], {}) != before
+
+
+class TestContentKey:
+    def test_same_bytes_elsewhere_share_a_key(self, tmp_path, cache):
+        a, b = tmp_path / "a.csv", tmp_path / "b.csv"
+        a.write_bytes(b"1,2,3\n")
+        b.write_bytes(b"1,2,3\n")
+        keys = [run_cache.content_cache_key("csv", [cache.content_digest(p)], {})
+                for p in (a, b)]
+        assert keys[0] == keys[1]
+        assert run_cache.content_cache_key("csv", [cache.content_digest(a)], {"x": 1}) != keys[0]
+
+    def test_digest_is_remembered_until_the_file_changes(self, tmp_path, cache, monkeypatch):
+        f = tmp_path / "a.csv"
+        f.write_bytes(b"abc")
+        first = cache.content_digest(f)
+        calls = []
+        real = run_cache.file_content_digest
+        monkeypatch.setattr(run_cache, "file_content_digest",
+                            lambda p: calls.append(p) or real(p))
+        assert cache.content_digest(f) == first and calls == []
+        f.write_bytes(b"abcd")
+        assert cache.content_digest(f) != first and len(calls) == 1
+
+    def test_clear_forgets_digests(self, tmp_path, cache):
+        f = tmp_path / "a.csv"
+        f.write_bytes(b"abc")
+        cache.content_digest(f)
+        cache.clear()
+        assert not (cache.root / run_cache.DIGEST_FILE).exists()
+
+
+# --------------------------------------------------------------------------- #
+# store
+# --------------------------------------------------------------------------- #
+class TestRunCacheStore:
+    def test_roundtrip(self, cache):
+        a = np.arange(12, dtype=np.float32).reshape(3, 4)
+        assert cache.put("k", {"a": a}, {"dwell": 1e-4})
+        arrays, meta = cache.get("k")
+        np.testing.assert_array_equal(arrays["a"], a)
+        assert meta == {"dwell": 1e-4}
+
+    def test_hit_is_writable_without_touching_cache(self, cache):
+        cache.put("k", {"a": np.zeros(4, dtype=np.float32)})
+        arrays, _ = cache.get("k")
+        arrays["a"][:] = 5.0
+        np.testing.assert_array_equal(cache.get("k")[0]["a"], 0.0)
+
+    def test_miss_returns_none(self, cache):
+        assert cache.get("missing") is None
+
+    def test_lru_eviction(self, tmp_path):
+        block = np.zeros(100_000, dtype=np.float32)          # ~400 kB
+        cache = RunCache(tmp_path / "c", max_bytes=1_000_000)
+        cache.put("old", {"a": block})
+        cache.put("mid", {"a": block})
+        os.utime(cache.root / "old" / run_cache.ENTRY_FILE, ns=(1, 1))
+        os.utime(cache.root / "mid" / run_cache.ENTRY_FILE, ns=(2, 2))
+        cache.get("old")                                    # now most recent
+        cache.put("new", {"a": block})
+        assert cache.get("mid") is None
+        assert cache.get("old") is not None
+        assert cache.get("new") is not None
+        assert cache.size_bytes() <= cache.max_bytes
+
+    def test_oversized_entry_is_not_stored(self, tmp_path):
+        cache = RunCache(tmp_path / "c", max_bytes=1000)
+        assert not cache.put("big", {"a": np.zeros(1000)})
+        assert cache.get("big") is None
+
+    def test_entry_in_use_stays_counted_until_removed(self, tmp_path, monkeypatch):
+        block = np.zeros(100_000, dtype=np.float32)          # ~400 kB
+        cache = RunCache(tmp_path / "c", max_bytes=600_000)
+        cache.put("old", {"a": block})
+        os.utime(cache.root / "old" / run_cache.ENTRY_FILE, ns=(1, 1))
+        real_unlink = Path.unlink
+
+        def mapped(self, *args, **kwargs):
+            # As on Windows, a memory-mapped file cannot be deleted.
+            if self.parent.name == "old" and self.suffix == ".npy":
+                raise PermissionError(self)
+            return real_unlink(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "unlink", mapped)
+        cache.put("new", {"a": block})
+        assert (cache.root / "old" / run_cache.ENTRY_FILE).exists()
+        assert cache.size_bytes() > cache.max_bytes
+        monkeypatch.undo()
+        assert cache.evict(keep="new") == 1
+        assert not (cache.root / "old").exists()
+        assert cache.size_bytes() <= cache.max_bytes
+
+    def test_leftover_folders_are_counted_and_swept(self, cache):
+        cache.put("k", {"a": np.zeros(10)})
+        orphan, stale, fresh = (cache.root / n for n in ("orphan", ".tmp-stale", ".tmp-fresh"))
+        for d in (orphan, stale, fresh):
+            d.mkdir()
+            (d / "a.npy").write_bytes(b"x" * 1000)
+        os.utime(stale, (1, 1))
+        entry = cache.root / "k"
+        assert cache.size_bytes() == sum(
+            f.stat().st_size for d in (entry, orphan, stale) for f in d.iterdir())
+        cache.evict()
+        assert not orphan.exists() and not stale.exists()
+        assert fresh.exists() and cache.get("k") is not None
+
+    def test_module_does_not_load_widgets(self):
+        code = ("import sys, loading.run_cache; "
+                "sys.exit('PySide6.QtWidgets' in sys.modules)")
+        root = Path(run_cache.__file__).resolve().parents[1]
+        assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0
+
+    def test_clear(self, cache):
+        cache.put("k", {"a": np.zeros(3)})
+        cache.clear()
+        assert cache.get("k") is None
+        assert cache.size_bytes() == 0
+
+
+# --------------------------------------------------------------------------- #
+# reader integration
+# --------------------------------------------------------------------------- #
+class TestNuReadThroughCache:
+    def test_second_read_is_a_hit_with_identical_data(self, tmp_path, cache):
+        run = write_nu_run(tmp_path / "run")
+        m1, s1, info1 = vitesse_loading.read_nu_directory(run, cache=cache, mass_indices=[1, 4])
+        assert len(list(cache.root.iterdir())) == 1
+        m2, s2, info2 = vitesse_loading.read_nu_directory(run, cache=cache, mass_indices=[1, 4])
+        assert isinstance(s2, np.memmap)
+        np.testing.assert_array_equal(m1, m2)
+        np.testing.assert_array_equal(s1, s2)
+        assert info1 == info2
+
+    def test_different_selection_is_a_separate_entry(self, tmp_path, cache):
+        run = write_nu_run(tmp_path / "run")
+        vitesse_loading.read_nu_directory(run, cache=cache, mass_indices=[1])
+        _, s, _ = vitesse_loading.read_nu_directory(run, cache=cache, mass_indices=[2, 3])
+        assert s.shape[1] == 2
+        assert len(list(cache.root.iterdir())) == 2
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""Tests for the shared threshold cache (processing/threshold_cache.py).
+
+Thresholds are cached in one bounded LRU store per process, keyed on
+(method, λ, α, σ, quantisation). The cache must evict in LRU order, count
+hits and misses, survive a save/load round trip (and ignore files of another
+version), take in the thresholds detection worker processes solved, and
+seed those workers so they do not solve what the GUI process already has.
+"""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from bench_detection_pool import make_sample
+from processing import threshold_cache
+from processing.detection_pool import DetectionPool
+from processing.peak_detection import PeakDetection
+from processing.threshold_cache import ThresholdCache, threshold_key
+
+METHOD = "Compound Poisson LogNormal"
+
+
+class TestKeys:
+    def test_quantisation(self):
+        assert threshold_key(METHOD, 12.001, 0.05, 0.55) == threshold_key(METHOD, 12.004, 0.05, 0.55)
+        assert threshold_key(METHOD, 12.001, 0.05, 0.55, decimals=None) != \
+            threshold_key(METHOD, 12.004, 0.05, 0.55, decimals=None)
+        assert threshold_key(METHOD, 12.0, 0.05, 0.55) != threshold_key("Manual", 12.0, 0.05, 0.55)
+        # Keys of different quantisations never collide.
+        assert threshold_key(METHOD, 12.0, 0.05, 0.55) != \
+            threshold_key(METHOD, 12.0, 0.05, 0.55, decimals=None)
+
+
+class TestThresholdCache:
+    def test_lru_eviction_and_stats(self):
+        cache = ThresholdCache(max_entries=2)
+        a, b, c = (threshold_key(METHOD, lam, 0.05, 0.55) for lam in (1.0, 2.0, 3.0))
+        cache.put(a, 1.5)
+        cache.put(b, 2.5)
+        assert cache.get(a) == 1.5
+        cache.put(c, 3.5)
+        assert b not in cache and a in cache and c in cache
+        assert cache.get(b) is None
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (1, 1, 1, 2)
+        assert stats['hit_rate'] == pytest.approx(0.5)
+
+    def test_get_or_compute_computes_once(self):
+        cache = ThresholdCache()
+        calls = []
+        key = threshold_key(METHOD, 5.0, 0.05, 0.55)
+        for _ in range(3):
+            assert cache.get_or_compute(key, lambda: calls.append(1) or 7.0) == 7.0
+        assert len(calls) == 1
+        assert cache.take_new() == {key: 7.0}
+        assert cache.take_new() == {}
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        path = tmp_path / "cache" / "thresholds.json"
+        cache = ThresholdCache(path=path)
+        keys = [threshold_key(METHOD, 1.0, 0.05, 0.55), threshold_key("Manual", 2.5, 1e-6, 0.7, None)]
+        for i, key in enumerate(keys):
+            cache.put(key, float(i) + 0.25)
+        assert cache.save()
+        assert not cache.save()
+        assert [p.name for p in path.parent.iterdir()] == [path.name]
+
+        loaded = ThresholdCache(max_entries=10, path=path)
+        assert len(loaded) == 2
+        for i, key in enumerate(keys):
+            assert loaded.get(key) == float(i) + 0.25
+
+    def test_load_respects_size_limit_and_keeps_newer_entries(self, tmp_path):
+        path = tmp_path / "thresholds.json"
+        cache = ThresholdCache(path=path)
+        for lam in range(5):
+            cache.put(threshold_key(METHOD, lam, 0.05, 0.55), float(lam))
+        cache.save()
+        small = ThresholdCache(max_entries=3)
+        small.put(threshold_key(METHOD, 4, 0.05, 0.55), 40.0)
+        small.path = path
+        small.load()
+        assert len(small) == 3
+        # The in-memory value wins over the saved one.
+        assert small.get(threshold_key(METHOD, 4, 0.05, 0.55)) == 40.0
+        assert threshold_key(METHOD, 3, 0.05, 0.55) in small
+
+    def test_other_version_or_corrupt_file_is_ignored(self, tmp_path):
+        path = tmp_path / "thresholds.json"
+        key = threshold_key(METHOD, 1.0, 0.05, 0.55)
+        path.write_text(json.dumps({"version": threshold_cache.CACHE_VERSION + 1,
+                                    "entries": [[list(key), 1.0]]}))
+        assert len(ThresholdCache(path=path)) == 0
+        path.write_text("{not json")
+        assert len(ThresholdCache(path=path)) == 0
+
+
+class TestDetectionUsesSharedCache:
+    def test_detectors_share_thresholds(self):
+        first, second = PeakDetection(), PeakDetection()
+        first.clear_threshold_cache()
+        value = first.compound_poisson_lognormal.get_threshold(7.25, 1e-6)
+        assert second.compound_poisson_lognormal.get_threshold(7.25, 1e-6) == value
+        assert second.threshold_cache_stats()['hits'] == 1
+
+    def test_worker_thresholds_reach_the_parent(self):
+        detector = PeakDetection()
+        detector.clear_threshold_cache()
+        time_s, signals, params, mapping, valid = make_sample(2, 20_000, seed=5)
+        for element_params in params.values():
+            element_params['method'] = METHOD
+        pool = DetectionPool(1)
+        try:
+            pool.submit("S", time_s, signals, params, mapping, valid).result(timeout=600)
+        finally:
+            pool.shutdown()
+        assert len(detector.threshold_cache) > 0
+        assert detector.threshold_cache.stats()['misses'] == 0
+
+    def test_warm_parent_cache_seeds_the_workers(self):
+        detector = PeakDetection()
+        detector.clear_threshold_cache()
+        time_s, signals, params, mapping, valid = make_sample(2, 20_000, seed=6)
+        for element_params in params.values():
+            element_params['method'] = METHOD
+        detector.detect_sample_signals("S", time_s, signals, params, mapping, valid)
+        assert detector.threshold_cache.stats()['misses'] > 0
+        pool = DetectionPool(1)
+        try:
+            pool.submit("S", time_s, signals, params, mapping, valid).result(timeout=600)
+        finally:
+            pool.shutdown()
+        assert pool.worker_misses == 0
+
+    def test_restarted_workers_keep_what_earlier_ones_solved(self):
+        PeakDetection().clear_threshold_cache()
+        sample = make_sample(2, 20_000, seed=7)
+        for element_params in sample[2].values():
+            element_params['method'] = METHOD
+        pool = DetectionPool(1)
+        try:
+            pool.submit("A", *sample).result(timeout=600)
+            solved = pool.worker_misses
+            pool.reset()
+            pool.submit("B", *sample).result(timeout=600)
+        finally:
+            pool.shutdown()
+        assert solved > 0 and pool.worker_misses == solved
+
+    def test_learned_thresholds_go_out_with_the_next_samples_only(self):
+        pool = DetectionPool(2)
+        pool._record_learned({'a': 1.0})
+        pool._record_learned({'b': 2.0})
+        assert pool._take_learned() == {'a': 1.0, 'b': 2.0}
+        pool._record_learned({'c': 3.0})
+        assert pool._take_learned() == {'a': 1.0, 'b': 2.0, 'c': 3.0}
+        assert pool._take_learned() == {'c': 3.0}
+        assert pool._take_learned() == {}
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""Tests for the TOFWERK reader in loading/tofwerk_loading.py.
+
+A small synthetic TofDaq HDF5 file is written with h5py — a PeakTable, the
+attributes the reader needs and either precomputed PeakData or raw
+FullSpectra/TofData — so the reader can be checked against values that are
+known by construction.
+"""
+import h5py
+import numpy as np
+import pytest
+
+from loading import tofwerk_loading as tl
+
+
+N_WRITES, N_BUFS, N_SAMPLES = 40, 25, 400
+P1, P2 = 20.0, 10.0          # mode 0: index = p1 * sqrt(mass) + p2
+
+
+def write_tofwerk_file(path, peak_data=True, seed=0):
+    """Write a synthetic TOFWERK file and return its path."""
+    rng = np.random.default_rng(seed)
+    masses = np.array([24.0, 56.0, 107.0, 140.0, 197.0, 238.0])
+    table = np.zeros(masses.size, dtype=[
+        ("label", "S64"), ("mass", "<f4"),
+        ("lower integration limit", "<f4"), ("upper integration limit", "<f4"),
+    ])
+    table["label"] = [f"[{int(m)}]+".encode() for m in masses]
+    table["mass"] = masses
+    table["lower integration limit"] = masses - 0.3
+    table["upper integration limit"] = masses + 0.3
+
+    tof = rng.poisson(0.2, (N_WRITES, N_BUFS, N_SAMPLES)).astype(np.float32)
+
+    with h5py.File(path, "w") as h5:
+        for key in ("NbrWaveforms", "NbrBlocks", "NbrMemories", "NbrCubes"):
+            h5.attrs[key] = np.array([2 if key == "NbrWaveforms" else 1], dtype=np.int32)
+        h5.attrs["TofDAQ Version"] = np.array([1.99], dtype=np.float32)
+        h5.create_group("TimingData").attrs["TofPeriod"] = np.array([46000], dtype=np.int32)
+        pd_group = h5.create_group("PeakData")
+        pd_group.create_dataset("PeakTable", data=table)
+        fs = h5.create_group("FullSpectra")
+        fs.attrs["MassCalibMode"] = np.array([0], dtype=np.int32)
+        fs.attrs["MassCalibration p1"] = np.array([P1])
+        fs.attrs["MassCalibration p2"] = np.array([P2])
+        fs.attrs["SampleInterval"] = np.array([1e-9])
+        fs.attrs["Single Ion Signal"] = np.array([1.0])
+        fs.create_dataset("TofData", data=tof)
+    if peak_data:
+        with h5py.File(path, "r+") as h5:
+            h5["PeakData"].create_dataset(
+                "PeakData", data=tl.integrate_tof_data(h5)
+            )
+    return path
+
+
+@pytest.fixture
+def tof_file(tmp_path):
+    return write_tofwerk_file(tmp_path / "sample.h5")
+
+
+# --------------------------------------------------------------------------- #
+# metadata probe
+# --------------------------------------------------------------------------- #
+class TestProbeTofwerkFile:
+    @pytest.mark.parametrize("peak_data", [True, False])
+    def test_matches_full_read(self, tmp_path, peak_data):
+        path = write_tofwerk_file(tmp_path / "s.h5", peak_data=peak_data)
+        data, info, dwell = tl.read_tofwerk_file(path)
+        probe = tl.probe_tofwerk_file(path)
+        np.testing.assert_array_equal(probe["masses"], info["mass"])
+        assert probe["dwell_time"] == pytest.approx(dwell)
+        assert probe["num_acquisitions"] == len(data)
+        assert probe["run_info"]["HasPeakData"] is peak_data
+
+    def test_attributes_are_plain_values(self, tof_file):
+        run_info = tl.probe_tofwerk_file(tof_file)["run_info"]
+        assert run_info["NbrWaveforms"] == 2
+
+
+# --------------------------------------------------------------------------- #
+# decoded-run cache
+# --------------------------------------------------------------------------- #
+class TestTofwerkReadThroughCache:
+    def test_hit_matches_decode(self, tmp_path):
+        from loading.run_cache import RunCache
+
+        path = write_tofwerk_file(tmp_path / "s.h5", peak_data=False)
+        cache = RunCache(tmp_path / "cache")
+        d1, i1, w1 = tl.read_tofwerk_file(path, idx=[1, 3], cache=cache)
+        d2, i2, w2 = tl.read_tofwerk_file(path, idx=[1, 3], cache=cache)
+        assert d2.dtype.names == d1.dtype.names
+        for name in d1.dtype.names:
+            np.testing.assert_array_equal(d1[name], d2[name])
+        np.testing.assert_array_equal(i1, i2)
+        assert w1 == w2
+
+
+# --------------------------------------------------------------------------- #
+# selected-peak integration
+# --------------------------------------------------------------------------- #
+class TestSelectedPeakIntegration:
+    @pytest.mark.parametrize("idx", [[1, 3], [0], [5, 0, 2], None])
+    def test_matches_whole_spectrum_read(self, tmp_path, idx):
+        path = write_tofwerk_file(tmp_path / "s.h5", peak_data=False)
+        with h5py.File(path, "r") as h5:
+            full = tl.integrate_tof_data(h5, idx=idx, selected_bins_only=False)
+            windowed = tl.integrate_tof_data(h5, idx=idx)
+        np.testing.assert_array_equal(windowed, full)
+
+    def test_chunked_compressed_dataset(self, tmp_path):
+        path = write_tofwerk_file(tmp_path / "s.h5", peak_data=False)
+        with h5py.File(path, "r+") as h5:
+            tof = h5["FullSpectra"]["TofData"][()]
+            del h5["FullSpectra"]["TofData"]
+            h5["FullSpectra"].create_dataset(
+                "TofData", data=tof, chunks=(4, N_BUFS, 100), compression="gzip")
+        with h5py.File(path, "r") as h5:
+            full = tl.integrate_tof_data(h5, selected_bins_only=False)
+            windowed = tl.integrate_tof_data(h5, idx=[2, 4])
+        np.testing.assert_array_equal(windowed, full[..., [2, 4]])
+
+    def test_merge_windows(self):
+        spans = tl.merge_tof_bin_windows(
+            np.array([500, 100, 110, 900]), np.array([505, 104, 120, 901]), max_gap=8)
+        assert [(lo, hi) for lo, hi, _ in spans] == [(100, 120), (500, 505), (900, 901)]
+        assert [m.tolist() for _, _, m in spans] == [[1, 2], [0], [3]]
+
+
+# --------------------------------------------------------------------------- #
+# chunk-aligned parallel integration
+# --------------------------------------------------------------------------- #
+def _rechunk(path, **kwargs):
+    with h5py.File(path, "r+") as h5:
+        tof = h5["FullSpectra"]["TofData"][()]
+        del h5["FullSpectra"]["TofData"]
+        h5["FullSpectra"].create_dataset("TofData", data=tof, **kwargs)
+
+
+class TestChunkedIntegration:
+    @pytest.mark.parametrize("layout", [
+        dict(chunks=(1, N_BUFS, N_SAMPLES), compression="gzip"),
+        dict(chunks=(7, 10, 100), compression="gzip", shuffle=True),
+        dict(chunks=(3, N_BUFS, 64)),
+    ])
+    @pytest.mark.parametrize("workers", [1, 4])
+    @pytest.mark.parametrize("idx", [None, [1, 3]])
+    def test_matches_integrate_tof_data(self, tmp_path, layout, workers, idx):
+        path = write_tofwerk_file(tmp_path / "s.h5", peak_data=False)
+        _rechunk(path, **layout)
+        stats = []
+        with h5py.File(path, "r") as h5:
+            expected = tl.integrate_tof_data(h5, idx=idx, selected_bins_only=False)
+            got = tl.integrate_tof_data_chunked(
+                h5, idx=idx, max_workers=workers, stats_callback=stats.append)
+        np.testing.assert_array_equal(got, expected)
+        assert stats[0].chunks > 0 and stats[0].decoded_mb_per_s > 0
+
+    def test_selected_peaks_skip_bin_chunks(self, tmp_path):
+        path = write_tofwerk_file(tmp_path / "s.h5", peak_data=False)
+        _rechunk(path, chunks=(N_WRITES, N_BUFS, 50), compression="gzip")
+        stats = []
+        with h5py.File(path, "r") as h5:
+            tl.integrate_tof_data_chunked(h5, idx=[0], stats_callback=stats.append)
+        assert stats[0].chunks < N_SAMPLES // 50
+
+    def test_unwritten_chunks_read_as_fill_value(self, tmp_path):
+        path = write_tofwerk_file(tmp_path / "s.h5", peak_data=False)
+        with h5py.File(path, "r+") as h5:
+            del h5["FullSpectra"]["TofData"]
+            tof = h5["FullSpectra"].create_dataset(
+                "TofData", (N_WRITES, N_BUFS, N_SAMPLES), dtype=np.float32,
+                chunks=(5, N_BUFS, N_SAMPLES), compression="gzip")
+            tof[:10] = 1.0
+        with h5py.File(path, "r") as h5:
+            expected = tl.integrate_tof_data(h5)
+            got = tl.integrate_tof_data_chunked(h5, max_workers=2)
+        np.testing.assert_array_equal(got, expected)
+
+    def test_contiguous_falls_back(self, tmp_path):
+        path = write_tofwerk_file(tmp_path / "s.h5", peak_data=False)
+        stats = []
+        with h5py.File(path, "r") as h5:
+            assert tl.tof_chunk_filters(h5["FullSpectra"]["TofData"]) is None
+            got = tl.integrate_tof_data_chunked(h5, max_workers=4, stats_callback=stats.append)
+            np.testing.assert_array_equal(got, tl.integrate_tof_data(h5))
+        assert len(stats) == 1
+
+    def test_read_file_with_workers(self, tmp_path):
+        path = write_tofwerk_file(tmp_path / "s.h5", peak_data=False)
+        _rechunk(path, chunks=(4, N_BUFS, N_SAMPLES), compression="gzip")
+        d1, _, _ = tl.read_tofwerk_file(path, idx=[2, 5])
+        d4, _, _ = tl.read_tofwerk_file(path, idx=[2, 5], max_workers=4)
+        for name in d1.dtype.names:
+            np.testing.assert_array_equal(d1[name], d4[name])
+
+
+# --------------------------------------------------------------------------- #
+# lazy channel access
+# --------------------------------------------------------------------------- #
+class TestLazyChannels:
+    def test_structured_view_matches_rfn(self, tof_file):
+        import numpy.lib.recfunctions as rfn
+
+        with h5py.File(tof_file, "r") as h5:
+            raw = h5["PeakData"]["PeakData"][()] * tl.factor_extraction_to_acquisition(h5)
+            names = [x.decode() for x in h5["PeakData"]["PeakTable"]["label"]]
+        expected = rfn.unstructured_to_structured(raw.reshape(-1, raw.shape[-1]), names=names)
+        data, _, _ = tl.read_tofwerk_file(tof_file)
+        assert data.dtype.names == expected.dtype.names
+        for name in names:
+            np.testing.assert_array_equal(data[name], expected[name])
+
+    @pytest.mark.parametrize("peak_data", [True, False])
+    def test_source_matches_full_read(self, tmp_path, peak_data):
+        path = write_tofwerk_file(tmp_path / "s.h5", peak_data=peak_data)
+        data, _, _ = tl.read_tofwerk_file(path)
+        source = tl.TofwerkChannelSource(path)
+        try:
+            got = source.read([4, 1, 4])
+        finally:
+            source.close()
+        names = data.dtype.names
+        for col, i in enumerate([4, 1, 4]):
+            np.testing.assert_array_equal(got[:, col], data[names[i]])
+
+    def test_channels_load_on_first_access(self, tof_file):
+        from loading.lazy_channels import LazyChannelData
+
+        source = tl.TofwerkChannelSource(tof_file)
+        calls = []
+
+        def load(keys):
+            calls.append(list(keys))
+            cols = source.read([int(k) for k in keys])
+            return {k: cols[:, i].copy() for i, k in enumerate(keys)}
+
+        lazy = LazyChannelData(["0", "3", "5"], load)
+        assert list(lazy) == ["0", "3", "5"] and "3" in lazy and "9" not in lazy
+        assert calls == []
+
+        first = lazy["3"]
+        assert lazy.is_loaded("3") and not lazy.is_loaded("0")
+        assert lazy["3"] is first and calls == [["3"]]
+
+        clone = lazy.copy()
+        clone["3"] = first * 2
+        np.testing.assert_array_equal(lazy["3"], first)
+        lazy.load(["0", "5"])
+        assert calls[-1] == ["0", "5"]
+        assert lazy.loaded_nbytes() == 3 * first.nbytes
+
+        lazy.release()
+        assert not lazy.is_loaded("3")
+        np.testing.assert_array_equal(lazy["3"], first)
+        with pytest.raises(KeyError):
+            lazy["9"]
+        source.close()
+
+    def test_without_keep_loaded_reads_every_time(self):
+        from loading.lazy_channels import LazyChannelData
+
+        calls = []
+
+        def load(keys):
+            calls.append(list(keys))
+            return {k: np.zeros(3) for k in keys}
+
+        lazy = LazyChannelData(["a"], load, keep_loaded=False)
+        lazy["a"]
+        lazy["a"]
+        assert len(calls) == 2 and not lazy.is_loaded("a")
+        assert set(lazy.materialize()) == {"a"}
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""Tests for the Nu Instruments reader in loading/vitesse_loading.py.
+
+A small synthetic run folder (run.info, index files, gzipped .integ and .autob
+files) is written to a temporary directory, so the whole read path — decoding,
+signal placement, autoblanking and channel selection — is exercised without
+real instrument data.
+"""
+import gzip
+import json
+
+import numpy as np
+import pytest
+
+from loading import vitesse_loading as vl
+
+
+N_MASSES = 12
+ACQ_PER_FILE = 50
+NUM_ACC = 2
+
+
+def _integ_bytes(cyc, seg, first_acq, n_acq, rng):
+    """Encode ``n_acq`` integ records in the on-disk Nu layout."""
+    result = np.dtype(
+        {"names": ["center", "signal"], "formats": [np.float32, np.float32],
+         "itemsize": 13}
+    )
+    dtype = np.dtype([
+        ("cyc_number", np.uint32), ("seg_number", np.uint32),
+        ("acq_number", np.uint32), ("num_results", np.uint32),
+        ("result", result, N_MASSES),
+    ])
+    rec = np.zeros(n_acq, dtype=dtype)
+    rec["cyc_number"] = cyc
+    rec["seg_number"] = seg
+    rec["acq_number"] = first_acq + np.arange(n_acq) * NUM_ACC
+    rec["num_results"] = N_MASSES
+    rec["result"]["center"] = np.linspace(1000.0, 5000.0, N_MASSES, dtype=np.float32)
+    rec["result"]["signal"] = rng.poisson(5.0, (n_acq, N_MASSES)).astype(np.float32)
+    return rec.tobytes()
+
+
+def _autob_bytes(cyc, seg, acq, kind, edges):
+    edges = np.asarray(edges, dtype=np.uint32)
+    head = np.array(
+        [(cyc, seg, acq, 0, 0, kind, edges.size)],
+        dtype=[("c", "<u4"), ("s", "<u4"), ("a", "<u4"), ("ts", "<u4"),
+               ("te", "<u4"), ("t", "u1"), ("n", "<i4")],
+    )
+    return head.tobytes() + edges.tobytes()
+
+
+def write_nu_run(root, n_files=3, seed=0, cycles=1):
+    """Write a synthetic Nu run folder and return its path."""
+    rng = np.random.default_rng(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    run_info = {
+        "SegmentInfo": [{"Num": 1, "AcquisitionTriggerDelayNs": 0.0,
+                         "AcquisitionPeriodNs": 50000.0}],
+        "NumAccumulations1": NUM_ACC, "NumAccumulations2": 1,
+        "MassCalCoefficients": [0.0, 0.01],
+        "AverageSingleIonArea": 2.0,
+        "BlMassCalStartCoef": [0.0, 0.008],
+        "BlMassCalEndCoef": [0.0, 0.008],
+    }
+    (root / "run.info").write_text(json.dumps(run_info))
+
+    integ_index, autob_index = [], []
+    num = 0
+    for cyc in range(1, cycles + 1):
+        for f in range(n_files):
+            first_acq = NUM_ACC + f * ACQ_PER_FILE * NUM_ACC
+            entry = {"FileNum": num, "FirstCycNum": cyc, "FirstSegNum": 1,
+                     "FirstAcqNum": first_acq}
+            integ_index.append(entry)
+            autob_index.append(entry)
+            with gzip.open(root / f"{num}.integ", "wb") as fp:
+                fp.write(_integ_bytes(cyc, 1, first_acq, ACQ_PER_FILE, rng))
+            # Blank masses ~ channels 3-5 for ten acquisitions of each file.
+            edges = [1000, 1500]
+            with gzip.open(root / f"{num}.autob", "wb") as fp:
+                fp.write(_autob_bytes(cyc, 1, first_acq + 10 * NUM_ACC, 0, edges))
+                fp.write(_autob_bytes(cyc, 1, first_acq + 20 * NUM_ACC, 1, []))
+            num += 1
+    (root / "integrated.index").write_text(json.dumps(integ_index))
+    (root / "autob.index").write_text(json.dumps(autob_index))
+    return root
+
+
+@pytest.fixture
+def nu_run(tmp_path):
+    return write_nu_run(tmp_path / "run")
+
+
+# --------------------------------------------------------------------------- #
+# full read
+# --------------------------------------------------------------------------- #
+class TestReadNuDirectory:
+    def test_shapes_and_order(self, nu_run):
+        masses, signals, _ = vl.read_nu_directory(nu_run)
+        assert masses.shape == (N_MASSES,)
+        assert signals.shape == (3 * ACQ_PER_FILE, N_MASSES)
+        assert np.all(np.diff(masses) > 0)
+
+    def test_autoblank_blanks_some_cells(self, nu_run):
+        _, blanked, _ = vl.read_nu_directory(nu_run, autoblank=True)
+        _, plain, _ = vl.read_nu_directory(nu_run, autoblank=False)
+        assert np.isnan(blanked).any()
+        assert not np.isnan(plain).any()
+
+
+# --------------------------------------------------------------------------- #
+# mass-selective read
+# --------------------------------------------------------------------------- #
+class TestMassSelectiveRead:
+    @pytest.mark.parametrize("autoblank", [False, True])
+    def test_matches_full_read_columns(self, nu_run, autoblank):
+        full_m, full_s, _ = vl.read_nu_directory(nu_run, autoblank=autoblank)
+        idx = np.array([7, 1, 4])
+        sel_m, sel_s, _ = vl.read_nu_directory(
+            nu_run, autoblank=autoblank, mass_indices=idx
+        )
+        order = np.sort(idx)
+        np.testing.assert_array_equal(sel_m, full_m[order])
+        np.testing.assert_array_equal(sel_s, full_s[:, order])
+
+    def test_signal_width_is_selection_width(self, nu_run):
+        _, signals, _ = vl.read_nu_directory(nu_run, mass_indices=[2, 3])
+        assert signals.shape[1] == 2
+
+    def test_channel_reduction_keeps_fields(self, nu_run):
+        integ = vl.read_nu_integ_binary(nu_run / "0.integ")
+        rows = integ["acq_number"] > 20
+        out = vl.select_nu_integ_channels(integ, [0, 5], rows)
+        assert out.size == int(rows.sum())
+        np.testing.assert_array_equal(out["acq_number"], integ["acq_number"][rows])
+        np.testing.assert_array_equal(
+            out["result"]["signal"], integ["result"]["signal"][rows][:, [0, 5]]
+        )
+
+
+# --------------------------------------------------------------------------- #
+# parallel integ decoding
+# --------------------------------------------------------------------------- #
+class TestParallelIntegRead:
+    def test_parallel_matches_sequential(self, tmp_path):
+        run = write_nu_run(tmp_path / "run", n_files=6, cycles=2)
+        _, seq, _ = vl.read_nu_directory(run, max_workers=1)
+        _, par, _ = vl.read_nu_directory(run, max_workers=4)
+        np.testing.assert_array_equal(seq, par)
+
+    def test_timings_reported_in_index_order(self, tmp_path):
+        run = write_nu_run(tmp_path / "run", n_files=5)
+        timings = []
+        vl.read_nu_directory(run, max_workers=3, timing_callback=timings.append)
+        assert [t.file_num for t in timings] == list(range(5))
+        for t in timings:
+            assert t.records == ACQ_PER_FILE
+            assert t.decoded_bytes > 0
+            assert t.read_s >= 0.0 and t.decode_s >= 0.0
+
+    def test_progress_reaches_one(self, nu_run):
+        fractions = []
+        vl.collect_nu_integ_data(
+            nu_run, json.loads((nu_run / "integrated.index").read_text()),
+            progress_callback=fractions.append, max_workers=2,
+        )
+        assert fractions == sorted(fractions)
+        assert fractions[-1] == pytest.approx(1.0)
+
+
+# --------------------------------------------------------------------------- #
+# header-only probe
+# --------------------------------------------------------------------------- #
+class TestProbeNuDirectory:
+    def test_matches_full_read(self, tmp_path):
+        run = write_nu_run(tmp_path / "run", n_files=4, cycles=2)
+        masses, signals, run_info = vl.read_nu_directory(run, autoblank=False)
+        probe = vl.probe_nu_directory(run)
+        np.testing.assert_array_equal(probe["masses"], masses)
+        assert probe["num_acquisitions"] == len(signals)
+        assert probe["dwell_time"] == pytest.approx(vl.get_dwelltime_from_info(run_info))
+        assert probe["run_info"] == run_info
+
+    def test_rejects_non_nu_folder(self, tmp_path):
+        with pytest.raises(ValueError):
+            vl.probe_nu_directory(tmp_path)
+
+
+# --------------------------------------------------------------------------- #
+# bulk autob decoding and vectorised blanking
+# --------------------------------------------------------------------------- #
+def _write_random_autob(path, n_events, seed):
+    rng = np.random.default_rng(seed)
+    chunks = []
+    for _ in range(n_events):
+        kind = rng.choice([0, 0, 1, 1, 2])
+        n_edges = 2 * rng.integers(0, 3) if kind == 0 else int(rng.integers(0, 2))
+        edges = np.sort(rng.integers(500, 2600, n_edges))
+        acq = int(rng.integers(0, 320))
+        chunks.append(_autob_bytes(1, 1, acq, kind, edges))
+    with gzip.open(path, "wb") as fp:
+        fp.write(b"".join(chunks))
+
+
+class TestBulkAutoblank:
+    def test_events_match_per_struct_reader(self, tmp_path):
+        path = tmp_path / "0.autob"
+        _write_random_autob(path, 200, seed=1)
+        slow = vl.read_nu_autob_binary(path)
+        fast = vl.read_nu_autob_events(path)
+        assert fast["type"].size == len(slow)
+        for i, ev in enumerate(slow):
+            assert fast["acq_number"][i] == ev["acq_number"][0]
+            assert fast["type"][i] == ev["type"][0]
+            n = fast["num_edges"][i]
+            start = fast["edge_start"][i]
+            np.testing.assert_array_equal(
+                fast["edges"][start:start + n], ev["edges"][0]
+            )
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_blanking_is_bit_identical(self, tmp_path, seed):
+        path = tmp_path / "0.autob"
+        _write_random_autob(path, 300, seed=seed)
+        rng = np.random.default_rng(seed)
+        masses = np.sort(rng.uniform(20.0, 260.0, 40))
+        signals = rng.random((150, 40)).astype(np.float32)
+        start_coef, end_coef = (0.0, 0.006), (0.5, 0.006)
+
+        expected = vl.blank_nu_signal_data(
+            vl.read_nu_autob_binary(path), signals.copy(), masses,
+            NUM_ACC, start_coef, end_coef,
+        )
+        got = vl.blank_nu_signal_events(
+            vl.read_nu_autob_events(path), signals.copy(), masses,
+            NUM_ACC, start_coef, end_coef,
+        )
+        assert np.isnan(expected).any()
+        np.testing.assert_array_equal(got, expected)
+
+    def test_collect_filters_and_offsets_edges(self, tmp_path):
+        run = write_nu_run(tmp_path / "run", cycles=2)
+        index = json.loads((run / "autob.index").read_text())
+        events = vl.collect_nu_autob_events(run, index, cyc_number=2)
+        assert np.all(events["cyc_number"] == 2)
+        opens = events["type"] == 0
+        for start, n in zip(events["edge_start"][opens], events["num_edges"][opens]):
+            np.testing.assert_array_equal(
+                events["edges"][start:start + n], [1000, 1500]
+            )
+
+    def test_empty_autob_leaves_signals_untouched(self, tmp_path):
+        path = tmp_path / "0.autob"
+        with gzip.open(path, "wb"):
+            pass
+        signals = np.ones((10, 3), dtype=np.float32)
+        out = vl.blank_nu_signal_events(
+            vl.read_nu_autob_events(path), signals, np.arange(3.0), 1,
+            (0.0, 1.0), (0.0, 1.0),
+        )
+        assert not np.isnan(out).any()
+
+
+# --------------------------------------------------------------------------- #
+# single-pass signal placement
+# --------------------------------------------------------------------------- #
+class TestSignalPlacement:
+    def test_matches_reference_multi_cycle(self):
+        from bench_nu_placement import make_integs, reference_get_signals
+
+        integs = make_integs(cycles=7, files_per_cycle=5, acq_per_file=30)
+        np.testing.assert_array_equal(
+            vl.get_signals_from_nu_data(integs, 2),
+            reference_get_signals(integs, 2),
+        )
+
+    def test_gaps_and_out_of_range_rows(self):
+        from bench_nu_placement import make_integs, reference_get_signals
+
+        integs = make_integs(cycles=3, files_per_cycle=4, acq_per_file=20)
+        del integs[5]                                  # missing file -> NaN gap
+        integs[0] = integs[0].copy()
+        integs[0]["acq_number"][0] = 0                 # row -1 is dropped
+        np.testing.assert_array_equal(
+            vl.get_signals_from_nu_data(integs, 2),
+            reference_get_signals(integs, 2),
+        )
+
+    def test_unordered_large_cycle_numbers(self):
+        from bench_nu_placement import make_integs, reference_get_signals
+
+        integs = make_integs(cycles=3, files_per_cycle=2, acq_per_file=10)
+        for integ, cyc in zip(integs, [900, 900, 5, 5, 70000, 70000]):
+            integ["cyc_number"] = cyc
+        integs = integs[::-1]
+        np.testing.assert_array_equal(
+            vl.get_signals_from_nu_data(integs, 2),
+            reference_get_signals(integs, 2),
+        )
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""Write a synthetic Nu run folder progressively, like the Vitesse does.
+
+Used by test_nu_live.py, and handy by hand to try the live watch window
+without an instrument::
+
+    python tests/write_live_nu_run.py /tmp/live_run --files 60 --interval 1
+
+Each '.integ' file is written in two halves with a pause in between, and
+listed in 'integrated.index' before it is complete, so readers see
+half-written files exactly as they would during a real acquisition. The
+signal is Poisson background with particle spikes on a few channels.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+N_MASSES = 12
+ACQ_PER_FILE = 400
+NUM_ACC = 2
+SPIKE_CHANNELS = (2, 7)
+
+
+def _integ_bytes(cyc, seg, first_acq, signal):
+    """Encode one block of integ records in the on-disk Nu layout."""
+    result = np.dtype(
+        {"names": ["center", "signal"], "formats": [np.float32, np.float32],
+         "itemsize": 13}
+    )
+    dtype = np.dtype([
+        ("cyc_number", np.uint32), ("seg_number", np.uint32),
+        ("acq_number", np.uint32), ("num_results", np.uint32),
+        ("result", result, signal.shape[1]),
+    ])
+    rec = np.zeros(signal.shape[0], dtype=dtype)
+    rec["cyc_number"] = cyc
+    rec["seg_number"] = seg
+    rec["acq_number"] = first_acq + np.arange(signal.shape[0]) * NUM_ACC
+    rec["num_results"] = signal.shape[1]
+    rec["result"]["center"] = np.linspace(1000.0, 5000.0, signal.shape[1], dtype=np.float32)
+    rec["result"]["signal"] = signal
+    return rec.tobytes()
+
+
+def _autob_bytes(cyc, seg, acq, kind, edges):
+    """Encode one autoblank event."""
+    edges = np.asarray(edges, dtype=np.uint32)
+    head = np.array(
+        [(cyc, seg, acq, 0, 0, kind, edges.size)],
+        dtype=[("c", "<u4"), ("s", "<u4"), ("a", "<u4"), ("ts", "<u4"),
+               ("te", "<u4"), ("t", "u1"), ("n", "<i4")],
+    )
+    return head.tobytes() + edges.tobytes()
+
+
+class LiveNuRunWriter:
+    """Append '.integ' / '.autob' files to a Nu run folder one at a time."""
+
+    def __init__(self, root, seed=0, particle_rate=0.01, compress=True,
+                 acq_per_file=ACQ_PER_FILE):
+        """
+        Args:
+            root (str | Path): Run folder to create
+            seed (int): Random seed
+            particle_rate (float): Chance per acquisition of a particle on
+                each spike channel
+            compress (bool): Gzip the files, as the Vitesse does
+            acq_per_file (int): Acquisitions per '.integ' file
+        """
+        self.root = Path(root)
+        self.rng = np.random.default_rng(seed)
+        self.particle_rate = particle_rate
+        self.compress = compress
+        self.acq_per_file = acq_per_file
+        self.index = []
+        self.autob_index = []
+        self.cycle = 1
+        self.next_acq = NUM_ACC
+
+    def start(self):
+        """Write run.info and empty index files."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        run_info = {
+            "SegmentInfo": [{"Num": 1, "AcquisitionTriggerDelayNs": 0.0,
+                             "AcquisitionPeriodNs": 50000.0}],
+            "NumAccumulations1": NUM_ACC, "NumAccumulations2": 1,
+            "MassCalCoefficients": [0.0, 0.01],
+            "AverageSingleIonArea": 2.0,
+            "BlMassCalStartCoef": [0.0, 0.008],
+            "BlMassCalEndCoef": [0.0, 0.008],
+        }
+        (self.root / "run.info").write_text(json.dumps(run_info))
+        self._write_index()
+
+    def _write_index(self):
+        """Rewrite both index files."""
+        (self.root / "integrated.index").write_text(json.dumps(self.index))
+        (self.root / "autob.index").write_text(json.dumps(self.autob_index))
+
+    def _signal(self):
+        """Background plus particle spikes for one file, in ADC units."""
+        n = self.acq_per_file
+        signal = self.rng.poisson(0.5, (n, N_MASSES)).astype(np.float32)
+        for ch in SPIKE_CHANNELS:
+            hits = np.flatnonzero(self.rng.random(n) < self.particle_rate)
+            for h in hits:
+                width = int(self.rng.integers(1, 4))
+                height = self.rng.lognormal(3.5, 0.5, width)
+                signal[h : h + width, ch] += height[: n - h].astype(np.float32)
+        return signal * 2.0
+
+    def new_cycle(self):
+        """Start the next cycle; acquisition numbers restart."""
+        self.cycle += 1
+        self.next_acq = NUM_ACC
+
+    def write_file(self, halves_pause=0.0, on_half=None):
+        """
+        Write the next file pair.
+
+        Args:
+            halves_pause (float): Seconds to wait between the two halves
+            on_half (callable | None): Called after the first half is on disk,
+                while the file is incomplete but already listed in the index
+        """
+        num = len(self.index)
+        first_acq = self.next_acq
+        entry = {"FileNum": num, "FirstCycNum": self.cycle, "FirstSegNum": 1,
+                 "FirstAcqNum": first_acq}
+        data = _integ_bytes(self.cycle, 1, first_acq, self._signal())
+        if self.compress:
+            data = gzip.compress(data)
+        half = len(data) // 2
+
+        path = self.root / f"{num}.integ"
+        with path.open("wb") as fp:
+            fp.write(data[:half])
+        self.index.append(entry)
+        self.autob_index.append(entry)
+        self._write_index()
+        if on_half is not None:
+            on_half()
+        if halves_pause:
+            time.sleep(halves_pause)
+        with path.open("ab") as fp:
+            fp.write(data[half:])
+
+        # One blanker window per file on channels 3-5. Every third window is
+        # left open and closed early in the next file, so pairing of events
+        # across files is exercised too.
+        autob = b""
+        if num % 3 == 2:
+            autob += _autob_bytes(self.cycle, 1, first_acq + 5 * NUM_ACC, 1, [])
+        autob += _autob_bytes(self.cycle, 1, first_acq + 40 * NUM_ACC, 0, [1000, 1500])
+        if num % 3 != 1:
+            autob += _autob_bytes(self.cycle, 1, first_acq + 60 * NUM_ACC, 1, [])
+        if self.compress:
+            autob = gzip.compress(autob)
+        (self.root / f"{num}.autob").write_bytes(autob)
+
+        self.next_acq += self.acq_per_file * NUM_ACC
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("folder", type=Path)
+    parser.add_argument("--files", type=int, default=60)
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="seconds between files")
+    parser.add_argument("--rate", type=float, default=0.01,
+                        help="particle chance per acquisition")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    writer = LiveNuRunWriter(args.folder, seed=args.seed, particle_rate=args.rate)
+    writer.start()
+    for i in range(args.files):
+        writer.write_file(halves_pause=args.interval / 2)
+        print(f"wrote file {i + 1}/{args.files}", flush=True)
+        time.sleep(args.interval / 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Settings dialog for the raw data cache and lazy TOFWERK channel reads."""
+from PySide6.QtCore import QSettings
+from PySide6.QtWidgets import (QCheckBox, QDialog, QFrame, QHBoxLayout, QLabel,
+                               QMessageBox, QPushButton, QSpinBox, QVBoxLayout)
+
+from loading.lazy_channels import (SETTINGS_TOFWERK_KEEP, SETTINGS_TOFWERK_LAZY,
+                                   tofwerk_lazy_settings)
+from loading.run_cache import (DEFAULT_MAX_MB, SETTINGS_ENABLED, SETTINGS_MAX_MB,
+                               RunCache, cache_dir)
+import logging
+_itk_log = logging.getLogger("IsotopeTrack.widget.run_cache_settings")
+
+
+class RunCacheSettingsDialog(QDialog):
+    """Modal dialog for the run cache and how TOFWERK channels are read."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Raw Data Cache")
+        self.setMinimumWidth(360)
+        self.setModal(True)
+
+        settings = QSettings("IsotopeTrack", "IsotopeTrack")
+        enabled = settings.value(SETTINGS_ENABLED, False, type=bool)
+        try:
+            max_mb = int(settings.value(SETTINGS_MAX_MB, DEFAULT_MAX_MB))
+        except (TypeError, ValueError):
+            max_mb = DEFAULT_MAX_MB
+        lazy, keep = tofwerk_lazy_settings()
+
+        lay = QVBoxLayout(self)
+        lay.setSpacing(14)
+        lay.setContentsMargins(18, 18, 18, 14)
+
+        self._enabled_cb = QCheckBox("Keep decoded raw data for faster re-opening")
+        self._enabled_cb.setChecked(enabled)
+        lay.addWidget(self._enabled_cb)
+
+        sep = QFrame()
+        sep.setFrameShape(QFrame.Shape.HLine)
+        sep.setFrameShadow(QFrame.Shadow.Sunken)
+        lay.addWidget(sep)
+
+        size_row = QHBoxLayout()
+        size_row.addWidget(QLabel("Maximum size:"))
+        self._size_spin = QSpinBox()
+        self._size_spin.setRange(1, 1024)
+        self._size_spin.setSuffix(" GB")
+        self._size_spin.setValue(max(1, round(max_mb / 1024)))
+        size_row.addWidget(self._size_spin)
+        size_row.addStretch()
+        lay.addLayout(size_row)
+
+        self._usage_label = QLabel()
+        self._usage_label.setStyleSheet("color: #6B7280; font-size: 11px;")
+        lay.addWidget(self._usage_label)
+        self._refresh_usage()
+
+        sep = QFrame()
+        sep.setFrameShape(QFrame.Shape.HLine)
+        sep.setFrameShadow(QFrame.Shadow.Sunken)
+        lay.addWidget(sep)
+
+        self._lazy_cb = QCheckBox("Read TOFWERK channels only when first used")
+        self._lazy_cb.setToolTip(
+            "Opening a TOFWERK file reads only its mass table. Each channel's\n"
+            "signal is read from the file when detection, plotting or export\n"
+            "first needs it. The file must stay available while it is open."
+        )
+        self._lazy_cb.setChecked(lazy)
+        lay.addWidget(self._lazy_cb)
+        self._keep_cb = QCheckBox("Keep channels in memory once read")
+        self._keep_cb.setToolTip(
+            "Off: every access reads the channel again, so memory stays\n"
+            "bounded at the cost of repeated reads."
+        )
+        self._keep_cb.setChecked(keep)
+        self._keep_cb.setEnabled(lazy)
+        self._lazy_cb.toggled.connect(self._keep_cb.setEnabled)
+        lay.addWidget(self._keep_cb)
+
+        btn_row = QHBoxLayout()
+        clear_btn = QPushButton("Clear Cache")
+        clear_btn.clicked.connect(self._clear)
+        btn_row.addWidget(clear_btn)
+        btn_row.addStretch()
+        ok_btn = QPushButton("OK")
+        ok_btn.setDefault(True)
+        ok_btn.clicked.connect(self._save_and_accept)
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.reject)
+        btn_row.addWidget(ok_btn)
+        btn_row.addWidget(cancel_btn)
+        lay.addLayout(btn_row)
+
+    def _refresh_usage(self):
+        """Show the current cache size and location."""
+        root = cache_dir()
+        used = RunCache(root).size_bytes() / (1024 * 1024)
+        self._usage_label.setText(f"Currently using {used:.0f} MB in\n{root}")
+
+    def _clear(self):
+        """Delete every cached run after confirmation."""
+        reply = QMessageBox.question(
+            self, "Clear Cache", "Delete all cached raw data?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            RunCache(cache_dir()).clear()
+            self._refresh_usage()
+
+    def _save_and_accept(self):
+        """Persist the settings and trim the cache to the new cap."""
+        settings = QSettings("IsotopeTrack", "IsotopeTrack")
+        settings.setValue(SETTINGS_ENABLED, self._enabled_cb.isChecked())
+        settings.setValue(SETTINGS_MAX_MB, self._size_spin.value() * 1024)
+        settings.setValue(SETTINGS_TOFWERK_LAZY, self._lazy_cb.isChecked())
+        settings.setValue(SETTINGS_TOFWERK_KEEP, self._keep_cb.isChecked())
+        RunCache(cache_dir(), max_bytes=self._size_spin.value() * 1024 ** 3).evict()
+        self.accept()